@@ -0,0 +1,109 @@
+"""グラフローダーのベンチマーク
+
+従来の一括読み込み（json.load + MemoryGraph(**data)）と
+ストリーミングローダーの所要時間・ピークRSSを比較する。
+ピークRSSはプロセス単位の値のため、各ローダーは別プロセスで計測する。
+
+使い方:
+    python -m benchmarks.bench_loader --entities 100000 --relations 500000
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from services.graph_loader import load_graph_streaming, peak_rss_bytes
+from models.memory import MemoryGraph
+
+
+def write_sample_file(path: Path, entities: int, relations: int, seed: int = 0) -> None:
+    """ベンチマーク用のグラフJSONファイルを生成する
+
+    Args:
+        path: 出力先パス
+        entities: エンティティ数
+        relations: リレーション数
+        seed: 乱数シード
+    """
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"entities": [')
+        for i in range(entities):
+            if i:
+                f.write(",")
+            json.dump({
+                "name": f"entity-{i}",
+                "entityType": rng.choice(["user", "tool", "project", "concept"]),
+                "observations": [f"観測データ {i}-{j}" for j in range(rng.randint(1, 5))],
+            }, f, ensure_ascii=False)
+        f.write('], "relations": [')
+        for i in range(relations):
+            if i:
+                f.write(",")
+            json.dump({
+                "from": f"entity-{rng.randrange(entities)}",
+                "to": f"entity-{rng.randrange(entities)}",
+                "relationType": rng.choice(["uses", "created", "runs on"]),
+            }, f, ensure_ascii=False)
+        f.write("]}")
+
+
+def load_legacy(path: Path) -> MemoryGraph:
+    """従来の一括読み込み"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return MemoryGraph(**data)
+
+
+def run_single(loader: str, path: Path) -> dict:
+    """1つのローダーを現在のプロセスで実行して計測する"""
+    started = time.perf_counter()
+    if loader == "legacy":
+        graph = load_legacy(path)
+    else:
+        graph, _ = load_graph_streaming(path, progress=None)
+    return {
+        "loader": loader,
+        "duration_sec": round(time.perf_counter() - started, 4),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "entities": len(graph.entities),
+        "relations": len(graph.relations),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=50_000)
+    parser.add_argument("--relations", type=int, default=200_000)
+    parser.add_argument("--file", type=Path, help="既存のグラフファイルを使う場合に指定")
+    parser.add_argument("--single", choices=["legacy", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_single(args.single, args.file)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = Path(tmp) / "memory_graph.json"
+            write_sample_file(path, args.entities, args.relations)
+
+        results = []
+        for loader in ("legacy", "streaming"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_loader", "--single", loader, "--file", str(path)],
+                check=True, capture_output=True, text=True,
+            )
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+        print(json.dumps({"file_bytes": path.stat().st_size, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""グラフキャッシュのメモリ使用量ベンチマーク
+
+従来のキャッシュ（全件Pydanticモデルの MemoryGraph）と、
+コンパクト表現（CompactGraph + GraphStore の隣接索引）の保持メモリを比較する。
+保持メモリは tracemalloc で読み込み後に残っている確保量として計測する
+（NumPy配列の確保も含まれる）。各表現は別プロセスで計測する。
+
+使い方:
+    python -m benchmarks.bench_memory --entities 100000 --relations 500000
+"""
+
+import argparse
+import gc
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_loader import load_legacy, write_sample_file
+from services.graph_loader import load_graph_streaming
+from services.graph_store import GraphStore
+
+
+def run_single(representation: str, path: Path) -> dict:
+    """1つの表現でグラフを読み込み、保持メモリを計測する"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    if representation == "memory_graph":
+        cache = load_legacy(path)
+        entities, relations = len(cache.entities), len(cache.relations)
+    else:
+        graph, _ = load_graph_streaming(path, progress=None)
+        cache = GraphStore(graph)
+        entities, relations = cache.entity_count, len(cache.relations)
+    duration = time.perf_counter() - started
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "representation": representation,
+        "retained_bytes": retained,
+        "peak_bytes": peak,
+        "duration_sec": round(duration, 4),
+        "entities": entities,
+        "relations": relations,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=50_000)
+    parser.add_argument("--relations", type=int, default=200_000)
+    parser.add_argument("--file", type=Path, help="既存のグラフファイルを使う場合に指定")
+    parser.add_argument("--single", choices=["memory_graph", "compact"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_single(args.single, args.file)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = Path(tmp) / "memory_graph.json"
+            write_sample_file(path, args.entities, args.relations)
+
+        results = []
+        for representation in ("memory_graph", "compact"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_memory", "--single", representation, "--file", str(path)],
+                check=True, capture_output=True, text=True,
+            )
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+        baseline = results[0]["retained_bytes"]
+        for result in results:
+            result["retained_ratio"] = round(result["retained_bytes"] / baseline, 3) if baseline else None
+        print(json.dumps({"file_bytes": path.stat().st_size, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
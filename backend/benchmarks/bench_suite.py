@@ -0,0 +1,265 @@
+"""バックエンドのベンチマークスイート
+
+合成グラフ（benchmarks.generate_graph）をサイズ・形式ごとに生成し、次を計測する。
+
+- load: _load_from_file の所要時間とピークRSS
+- read_graph: キャッシュ済みの read_graph() 1回あたりの時間
+- get_entity: get_entity() のレイテンシ（p50 / p95 / p99）
+- api_graph / api_graph_gzip / api_entity: ASGIアプリ経由の
+  /api/graph と /api/entities/{name} のスループットとレイテンシ
+
+ピークRSSはプロセス単位の値のため、サイズ・形式ごとに別プロセスで計測する。
+結果はJSONで出力し、--baseline に前回の結果を渡すと指標ごとの比を付ける。
+
+使い方:
+    python -m benchmarks.bench_suite --sizes 1000,10000,100000 --output bench.json
+    python -m benchmarks.bench_suite --baseline bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from benchmarks.generate_graph import FORMATS, GraphSpec, write_graph
+from services.graph_loader import peak_rss_bytes
+
+# 指標ごとの向き（比較時に値が小さいほど良い指標）
+LOWER_IS_BETTER = ("_sec", "_us", "_bytes")
+
+# 比較の対象にしない項目（計測条件・件数）
+NOT_METRICS = {"size", "format", "benchmark", "file_bytes", "entities", "relations", "count", "concurrency"}
+
+
+def _latency_summary(samples: List[float]) -> Dict[str, float]:
+    """レイテンシ（秒）の分布をマイクロ秒で要約する"""
+    values = np.asarray(samples) * 1e6
+    return {
+        "count": len(samples),
+        "mean_us": round(float(values.mean()), 2),
+        "p50_us": round(float(np.percentile(values, 50)), 2),
+        "p95_us": round(float(np.percentile(values, 95)), 2),
+        "p99_us": round(float(np.percentile(values, 99)), 2),
+    }
+
+
+async def _bench_client(client, names: List[str], iterations: int) -> List[dict]:
+    """クライアントAPI（read_graph / get_entity）を計測する"""
+    graph = await client.read_graph()  # 参照を保持してキャッシュヒットを計測する
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        assert await client.read_graph() is graph
+        samples.append(time.perf_counter() - started)
+    results = [{"benchmark": "read_graph", **_latency_summary(samples)}]
+
+    samples = []
+    for name in names:
+        started = time.perf_counter()
+        await client.get_entity(name)
+        samples.append(time.perf_counter() - started)
+    results.append({"benchmark": "get_entity", **_latency_summary(samples)})
+    return results
+
+
+async def _bench_http(
+    benchmark: str, app, paths: List[str], concurrency: int, headers: Optional[dict] = None
+) -> dict:
+    """ASGIアプリにリクエストを送り、スループットとレイテンシを計測する"""
+    transport = httpx.ASGITransport(app=app)
+    samples: List[float] = []
+    queue = list(reversed(paths))
+    received = 0
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        async def worker():
+            nonlocal received
+            while queue:
+                path = queue.pop()
+                started = time.perf_counter()
+                # 転送量を計測するため、圧縮された本体は展開せずに読む
+                async with http.stream("GET", path, headers=headers) as response:
+                    assert response.status_code == 200, path
+                    async for chunk in response.aiter_raw():
+                        received += len(chunk)
+                samples.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "benchmark": benchmark,
+        "concurrency": concurrency,
+        "requests_per_sec": round(len(paths) / elapsed, 2),
+        "response_bytes": received // max(1, len(paths)),
+        **_latency_summary(samples),
+    }
+
+
+def run_single(path: Path, requests: int, concurrency: int, seed: int) -> List[dict]:
+    """1つのグラフファイルについて全項目を計測する（現在のプロセスで実行）"""
+    from main import app
+    from services.memory_client import get_memory_client
+
+    client = get_memory_client()
+    client.set_mcp_pool(None)
+    client.set_data_file(path)
+
+    started = time.perf_counter()
+    store = client._load_from_file()
+    results = [{
+        "benchmark": "load",
+        "duration_sec": round(time.perf_counter() - started, 4),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "entities": store.entity_count,
+        "relations": len(store.relations),
+    }]
+
+    rng = random.Random(seed)
+    names = store.entity_names()
+    sample = [rng.choice(names) for _ in range(requests)]
+
+    async def bench():
+        out = await _bench_client(client, sample, requests)
+        # /api/graph は本体のエンコードを1回済ませてから計測する（版ごとにキャッシュされるため）
+        graph_requests = max(1, requests // 10)
+        for benchmark, headers in (
+            ("api_graph", {"Accept-Encoding": "identity"}),
+            ("api_graph_gzip", {"Accept-Encoding": "gzip"}),
+        ):
+            await _bench_http(benchmark, app, ["/api/graph"], 1, headers)
+            out.append(await _bench_http(
+                benchmark, app, ["/api/graph"] * graph_requests, concurrency, headers
+            ))
+        out.append(await _bench_http(
+            "api_entity", app, [f"/api/entities/{name}" for name in sample], concurrency
+        ))
+        return out
+
+    results.extend(asyncio.run(bench()))
+    return results
+
+
+def compare(results: List[dict], baseline: dict) -> None:
+    """前回の結果と同じ (size, format, benchmark) の数値指標に比を付ける（今回 / 前回）"""
+    previous = {
+        (r["size"], r["format"], r["benchmark"]): r for r in baseline.get("results", [])
+    }
+    for result in results:
+        before = previous.get((result["size"], result["format"], result["benchmark"]))
+        if before is None:
+            continue
+        ratios = {}
+        for key, value in result.items():
+            old = before.get(key)
+            if key in NOT_METRICS or not isinstance(value, (int, float)):
+                continue
+            if isinstance(old, (int, float)) and old:
+                ratios[key] = round(value / old, 3)
+        result["vs_baseline"] = ratios
+        result["regressed"] = sorted(
+            key for key, ratio in ratios.items()
+            if (key.endswith(LOWER_IS_BETTER) and ratio > 1.1)
+            or (key == "requests_per_sec" and ratio < 0.9)
+        )
+
+
+def _git_commit() -> Optional[str]:
+    """現在のコミットID（取得できなければNone）"""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="エンティティ数（カンマ区切り）")
+    parser.add_argument("--formats", default="json,jsonl", help="ファイル形式（カンマ区切り）")
+    parser.add_argument("--relations-per-entity", type=float, default=2.0)
+    parser.add_argument("--observations", type=float, default=3.0)
+    parser.add_argument("--requests", type=int, default=1000, help="get_entity・/api/entities の要求数")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="結果JSONの出力先（省略時は標準出力）")
+    parser.add_argument("--baseline", type=Path, help="比較対象の前回の結果JSON")
+    parser.add_argument("--single", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_single(args.single, args.requests, args.concurrency, args.seed)))
+        return
+
+    formats = [f for f in args.formats.split(",") if f]
+    for fmt in formats:
+        if fmt not in FORMATS:
+            parser.error(f"unsupported format: {fmt}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(",") if s):
+            spec = GraphSpec(
+                size,
+                relations_per_entity=args.relations_per_entity,
+                observations=args.observations,
+                seed=args.seed,
+            )
+            for fmt in formats:
+                path = write_graph(Path(tmp) / f"graph-{size}.{fmt}", spec)
+                out = subprocess.run(
+                    [
+                        sys.executable, "-m", "benchmarks.bench_suite", "--single", str(path),
+                        "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+                        "--seed", str(args.seed),
+                    ],
+                    check=True, capture_output=True, text=True,
+                )
+                for result in json.loads(out.stdout.strip().splitlines()[-1]):
+                    results.append({
+                        "size": size,
+                        "format": fmt,
+                        "file_bytes": path.stat().st_size,
+                        **result,
+                    })
+                path.unlink()
+
+    if args.baseline:
+        compare(results, json.loads(args.baseline.read_text(encoding="utf-8")))
+
+    report = json.dumps({
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "relations_per_entity": args.relations_per_entity,
+            "observations": args.observations,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "results": results,
+    }, indent=2)
+    if args.output:
+        args.output.write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
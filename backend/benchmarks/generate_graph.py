@@ -0,0 +1,188 @@
+"""ベンチマーク用の合成グラフ生成
+
+次数がべき乗則に従うMemory MCPグラフを、シードを固定して再現可能に生成する。
+リレーションの端点は Chung-Lu モデル（ノード i の重みを (i+1)^(-1/(γ-1)) とし、
+重みに比例して選ぶ）で決めるため、少数のハブと多数の低次数ノードができる。
+ハブがエンティティの先頭に偏らないよう、重みの順位はランダムに並べ替える。
+
+出力形式:
+    json:  {"entities": [...], "relations": [...]}（data/memory_graph.json と同じ）
+    jsonl: Memory MCPの保存形式（1行1レコード、"type" で種類を区別）
+
+使い方:
+    python -m benchmarks.generate_graph --entities 100000 --output graph.jsonl
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+FORMATS = ("json", "jsonl")
+
+BASE_ENTITY_TYPES = ["user", "project", "tool", "concept", "environment", "organization"]
+BASE_RELATION_TYPES = ["uses", "created", "runs on", "depends on", "knows", "part of"]
+
+
+def _vocabulary(base: List[str], count: int, prefix: str) -> List[str]:
+    """種類名の一覧（base を使い切ったら連番で補う）"""
+    return base[:count] + [f"{prefix}-{i}" for i in range(len(base), count)]
+
+
+class GraphSpec:
+    """合成グラフの生成条件"""
+
+    def __init__(
+        self,
+        entities: int,
+        relations_per_entity: float = 2.0,
+        observations: float = 3.0,
+        max_observations: int = 20,
+        entity_types: int = 6,
+        relation_types: int = 6,
+        exponent: float = 2.5,
+        seed: int = 0,
+    ):
+        """初期化
+
+        Args:
+            entities: エンティティ数
+            relations_per_entity: エンティティあたりのリレーション数（平均次数の半分）
+            observations: エンティティあたりのobservations数の平均（ポアソン分布）
+            max_observations: エンティティあたりのobservations数の上限
+            entity_types: entityTypeの種類数
+            relation_types: relationTypeの種類数
+            exponent: 次数分布のべき指数 γ（2より大きい値、小さいほどハブが大きい）
+            seed: 乱数シード
+        """
+        if exponent <= 2:
+            raise ValueError("exponent must be greater than 2")
+        self.entities = entities
+        self.relations = int(entities * relations_per_entity)
+        self.observations = observations
+        self.max_observations = max_observations
+        self.entity_types = _vocabulary(BASE_ENTITY_TYPES, max(1, entity_types), "type")
+        self.relation_types = _vocabulary(BASE_RELATION_TYPES, max(1, relation_types), "relation")
+        self.exponent = exponent
+        self.seed = seed
+
+
+def iter_records(spec: GraphSpec) -> Iterator[dict]:
+    """エンティティ→リレーションの順にレコードを生成する
+
+    Args:
+        spec: 生成条件
+
+    Yields:
+        dict: Memory MCPのJSONL形式のレコード
+    """
+    rng = np.random.default_rng(spec.seed)
+    n = spec.entities
+
+    type_ids = rng.integers(0, len(spec.entity_types), n)
+    obs_counts = np.minimum(rng.poisson(spec.observations, n), spec.max_observations)
+    for i, (type_id, count) in enumerate(zip(type_ids.tolist(), obs_counts.tolist())):
+        yield {
+            "type": "entity",
+            "name": f"entity-{i}",
+            "entityType": spec.entity_types[type_id],
+            "observations": [f"observation {j} of entity-{i}" for j in range(count)],
+        }
+
+    if n < 2 or spec.relations == 0:
+        return
+    weights = np.arange(1, n + 1, dtype=np.float64) ** (-1.0 / (spec.exponent - 1))
+    weights = weights[rng.permutation(n)]
+    weights /= weights.sum()
+    src = rng.choice(n, spec.relations, p=weights)
+    dst = rng.choice(n, spec.relations, p=weights)
+    # 自己ループは隣のノードにずらす
+    dst = np.where(src == dst, (dst + 1) % n, dst)
+    rel_types = rng.integers(0, len(spec.relation_types), spec.relations)
+    for s, d, t in zip(src.tolist(), dst.tolist(), rel_types.tolist()):
+        yield {
+            "type": "relation",
+            "from": f"entity-{s}",
+            "to": f"entity-{d}",
+            "relationType": spec.relation_types[t],
+        }
+
+
+def write_graph(path: Path, spec: GraphSpec, fmt: Optional[str] = None) -> Path:
+    """合成グラフをファイルに書き出す
+
+    Args:
+        path: 出力先パス
+        spec: 生成条件
+        fmt: "json" または "jsonl"（省略時は拡張子から判定）
+
+    Returns:
+        Path: 出力先パス
+
+    Raises:
+        ValueError: 未対応の形式が指定された場合
+    """
+    fmt = fmt or path.suffix.lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    with open(path, "w", encoding="utf-8") as f:
+        if fmt == "jsonl":
+            for record in iter_records(spec):
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+            return path
+
+        f.write('{"entities": [')
+        section = "entity"
+        first = True
+        for record in iter_records(spec):
+            if record["type"] != section:
+                f.write('], "relations": [')
+                section = record["type"]
+                first = True
+            if not first:
+                f.write(",")
+            first = False
+            json.dump(record, f, ensure_ascii=False)
+        if section == "entity":
+            f.write('], "relations": [')
+        f.write("]}")
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=10_000)
+    parser.add_argument("--relations-per-entity", type=float, default=2.0)
+    parser.add_argument("--observations", type=float, default=3.0, help="observations数の平均")
+    parser.add_argument("--entity-types", type=int, default=6)
+    parser.add_argument("--relation-types", type=int, default=6)
+    parser.add_argument("--exponent", type=float, default=2.5, help="次数分布のべき指数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=FORMATS, help="省略時は出力先の拡張子から判定")
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args()
+
+    spec = GraphSpec(
+        args.entities,
+        relations_per_entity=args.relations_per_entity,
+        observations=args.observations,
+        entity_types=args.entity_types,
+        relation_types=args.relation_types,
+        exponent=args.exponent,
+        seed=args.seed,
+    )
+    write_graph(args.output, spec, args.format)
+    print(json.dumps({
+        "output": str(args.output),
+        "entities": spec.entities,
+        "relations": spec.relations,
+        "file_bytes": args.output.stat().st_size,
+    }))
+
+
+if __name__ == "__main__":
+    main()
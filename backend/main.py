@@ -4,25 +4,133 @@ FastAPIベースのREST APIサーバー
 Memory MCPのナレッジグラフデータを提供
 """
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
+import shlex
 from pathlib import Path
 
 from routers import memory
+from services.file_watcher import FileWatcher
+from services.graph_registry import GraphRegistry, get_graph_registry, set_graph_registry
+from services.mcp_stdio import DEFAULT_COMMAND, MemoryServerPool
+from services.metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware
 from services.memory_client import get_memory_client
+from services.shared_snapshot import SharedSnapshot
+from services.snapshot_cache import SnapshotCache
+from services.snapshot_sync import SnapshotSync
 
 # 環境変数読み込み
 load_dotenv()
 
-# Memory MCPクライアントにJSONファイルパスを設定
+# Memory MCPサーバーに接続する場合は、起動コマンドと接続プールを設定
+# （それ以外はJSONファイル、なければダミーデータを使う）
 data_file = Path(__file__).parent / "data" / "memory_graph.json"
-if data_file.exists():
+if os.getenv("MEMORY_MCP_ENABLED", "false").lower() == "true":
+    command = shlex.split(os.getenv("MEMORY_MCP_COMMAND", DEFAULT_COMMAND))
+    get_memory_client().set_mcp_pool(MemoryServerPool(
+        command,
+        size=int(os.getenv("MEMORY_MCP_POOL_SIZE", 2)),
+        timeout=int(os.getenv("MEMORY_MCP_TIMEOUT_MS", 30000)) / 1000,
+    ))
+    print(f"[OK] Memory MCP server: {' '.join(command)}")
+elif data_file.exists():
     client = get_memory_client()
     client.set_data_file(data_file)
+    # 解析結果をスナップショットファイルとして保存し、次回の起動時は解析せずに使う
+    if os.getenv("MEMORY_SNAPSHOT_CACHE_ENABLED", "true").lower() == "true":
+        client.set_snapshot_cache(SnapshotCache(Path(
+            os.getenv("MEMORY_SNAPSHOT_CACHE_DIR", str(data_file.parent / ".snapshot-cache"))
+        )))
     print(f"[OK] Memory MCP data loaded from: {data_file}")
 
+# 複数ワーカーで起動する場合、読み込み・索引構築を1ワーカーに集約し、
+# 他のワーカーはスナップショットファイルをメモリマップして共有する
+shared_dir = os.getenv("MEMORY_SHARED_SNAPSHOT_DIR")
+if shared_dir:
+    get_memory_client().set_shared_snapshot(SharedSnapshot(
+        Path(shared_dir),
+        wait_timeout=int(os.getenv("MEMORY_SHARED_SNAPSHOT_WAIT_MS", 60000)) / 1000,
+    ))
+
+# 複数のグラフ（ディレクトリ内の {graph_id}.jsonl / {graph_id}.json）を
+# /api/graphs/{graph_id}/... で提供する（必要になったときに読み込み、LRUで破棄する）
+graphs_dir = os.getenv("MEMORY_GRAPHS_DIR")
+if graphs_dir:
+    graphs_cache = None
+    if os.getenv("MEMORY_SNAPSHOT_CACHE_ENABLED", "true").lower() == "true":
+        graphs_cache = SnapshotCache(Path(
+            os.getenv("MEMORY_SNAPSHOT_CACHE_DIR", str(Path(graphs_dir) / ".snapshot-cache"))
+        ))
+    set_graph_registry(GraphRegistry(
+        Path(graphs_dir),
+        memory_budget=int(os.getenv("MEMORY_GRAPHS_MEMORY_BUDGET_MB", 1024)) * 1024 * 1024,
+        idle_timeout=int(os.getenv("MEMORY_GRAPHS_IDLE_TIMEOUT_S", 600)),
+        snapshot_cache=graphs_cache,
+    ))
+    print(f"[OK] Serving graphs from: {graphs_dir}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """アプリケーションのライフサイクル管理
+
+    起動時に最初の要求を待たずにグラフを読み込み（/api/health は完了まで準備中を返す）、
+    データファイルの監視を開始して、変更があれば自動で再読み込みする。
+    共有スナップショットを使う場合、監視はリーダーのワーカーだけが行い、
+    他のワーカーは公開されたスナップショットに追従する。
+    複数グラフを提供する場合は、使われていないグラフの定期破棄を開始する。
+    終了時にMemory MCPサーバーとの接続を閉じる。
+    """
+    watcher = None
+    sync = None
+    warmup = None
+    client = get_memory_client()
+    registry = get_graph_registry()
+    if registry is not None:
+        registry.start()
+    if client.data_file and os.getenv("MEMORY_WATCH_ENABLED", "true").lower() == "true":
+        watcher = FileWatcher(
+            client,
+            debounce=int(os.getenv("MEMORY_WATCH_DEBOUNCE_MS", 500)) / 1000,
+            poll_interval=int(os.getenv("MEMORY_WATCH_POLL_INTERVAL_MS", 1000)) / 1000,
+        )
+
+    if client.shared is not None and not client.shared.try_acquire():
+        sync = SnapshotSync(
+            client,
+            client.shared,
+            poll_interval=int(os.getenv("MEMORY_SHARED_SNAPSHOT_POLL_MS", 500)) / 1000,
+            on_leader=watcher.start if watcher else None,
+        )
+        sync.start()
+    elif watcher:
+        watcher.start()
+
+    if os.getenv("MEMORY_WARMUP_ENABLED", "true").lower() == "true":
+        # 共有スナップショットのリーダーは読み込んで公開し、フォロワーは公開を待ってマップする
+        warmup = asyncio.create_task(client.get_store())
+
+    yield
+
+    if warmup:
+        warmup.cancel()
+        await asyncio.gather(warmup, return_exceptions=True)
+    if sync:
+        await sync.stop()
+    if registry is not None:
+        await registry.stop()
+    if watcher:
+        await watcher.stop()
+    if client.mcp is not None:
+        await client.mcp.close()
+    if client.shared is not None:
+        client.shared.release()
+
+
 # FastAPIアプリケーション作成
 app = FastAPI(
     title="Memory MCP Visualization API",
@@ -30,6 +138,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS設定（フロントエンドからのアクセスを許可）
@@ -41,8 +150,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # フロントエンドがグラフの版番号（レイアウト・変更フィードとの突き合わせ用）を読めるようにする
+    expose_headers=["ETag", "X-Graph-Version", "X-Graph-Epoch"],
 )
 
+# リクエスト数・処理時間の計測（/metrics で公開）
+app.add_middleware(MetricsMiddleware)
+
 # ルーター登録
 app.include_router(memory.router)
 
@@ -62,6 +176,17 @@ async def root():
     }
 
 
+@app.get("/metrics", tags=["root"], include_in_schema=False)
+async def metrics() -> Response:
+    """メトリクス（Prometheusテキスト形式）
+
+    Returns:
+        Response: ルートごとの処理時間、読み込み・エンコード時間、キャッシュのヒット率、
+            スナップショットの経過時間・件数など
+    """
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,6 +1,6 @@
 """Memory MCP データモデル"""
 
-from typing import List
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -75,12 +75,29 @@ class MemoryGraph(BaseModel):
     )
 
 
+class Subgraph(MemoryGraph):
+    """部分グラフモデル（近傍探索の応答用）"""
+    center: str = Field(..., description="探索の中心エンティティ名")
+    depth: int = Field(..., description="探索した最大ホップ数")
+    truncated: bool = Field(
+        False, description="ノード数上限・ハブの展開制限により結果が打ち切られたか"
+    )
+
+
 class EntityDetail(BaseModel):
     """エンティティ詳細モデル（API応答用）"""
     name: str
     entityType: str
     observations: List[str]
+    observationCount: Optional[int] = Field(
+        None, description="observations の総数（observationLimit で省略した分も含む）"
+    )
     relatedEntities: List[str] = Field(default_factory=list, description="関連エンティティ名リスト")
+    degree: Optional[int] = Field(None, description="入出力リレーション数（centrality=true 指定時のみ）")
+    pagerank: Optional[float] = Field(None, description="PageRank（centrality=true 指定時のみ）")
+    betweenness: Optional[float] = Field(
+        None, description="媒介中心性の近似値（centrality=true 指定時のみ）"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -88,7 +105,320 @@ class EntityDetail(BaseModel):
                 "name": "湧心くん",
                 "entityType": "user",
                 "observations": ["Pythonが好き", "フルスタックエンジニア"],
+                "observationCount": 2,
                 "relatedEntities": ["Windows環境", "kakuho"]
             }
         }
     )
+
+
+class EntityBatchRequest(BaseModel):
+    """エンティティ詳細の一括取得要求"""
+    names: List[str] = Field(..., max_length=5000, description="取得するエンティティ名リスト")
+
+
+class EntityBatch(BaseModel):
+    """エンティティ詳細の一括取得結果（API応答用）"""
+    entities: List[EntityDetail] = Field(
+        default_factory=list, description="見つかったエンティティの詳細（要求順、重複は1件）"
+    )
+    notFound: List[str] = Field(default_factory=list, description="見つからなかったエンティティ名")
+    version: int = Field(..., description="参照したグラフスナップショットの版番号")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "entities": [
+                    {
+                        "name": "湧心くん",
+                        "entityType": "user",
+                        "observations": ["Pythonが好き"],
+                        "relatedEntities": ["Windows環境"]
+                    }
+                ],
+                "notFound": ["存在しないエンティティ"],
+                "version": 1
+            }
+        }
+    )
+
+
+class ObservationPage(BaseModel):
+    """エンティティの observations のページ（API応答用）"""
+    name: str = Field(..., description="エンティティ名")
+    observations: List[str] = Field(default_factory=list, description="offset 番目から最大 limit 件の observations")
+    offset: int = Field(..., description="先頭の observation の位置")
+    total: int = Field(..., description="observations の総数")
+    version: int = Field(..., description="参照したグラフスナップショットの版番号")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "name": "湧心くん",
+                "observations": ["Pythonが好き", "フルスタックエンジニア"],
+                "offset": 0,
+                "total": 27,
+                "version": 1
+            }
+        }
+    )
+
+
+class EntityPage(BaseModel):
+    """エンティティのページ（API応答用）"""
+    entities: List[Dict[str, Any]] = Field(
+        default_factory=list, description="エンティティリスト（fieldsで指定したフィールドのみ）"
+    )
+    nextCursor: Optional[str] = Field(None, description="次ページのカーソル（最終ページならnull）")
+    total: int = Field(..., description="エンティティ総数")
+    version: int = Field(..., description="グラフスナップショットの版番号")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "entities": [{"name": "湧心くん", "entityType": "user"}],
+                "nextCursor": "MTo1MDA",
+                "total": 1200,
+                "version": 1
+            }
+        }
+    )
+
+
+class RelationPage(BaseModel):
+    """リレーションのページ（API応答用）"""
+    relations: List[Relation] = Field(default_factory=list, description="リレーションリスト")
+    nextCursor: Optional[str] = Field(None, description="次ページのカーソル（最終ページならnull）")
+    total: int = Field(..., description="リレーション総数")
+    version: int = Field(..., description="グラフスナップショットの版番号")
+
+
+class ObservationChange(BaseModel):
+    """エンティティごとのobservations差分"""
+    entityName: str = Field(..., description="エンティティ名")
+    observations: List[str] = Field(default_factory=list, description="追加または削除されたobservations")
+
+
+class GraphDelta(BaseModel):
+    """連続する2つのスナップショット間の構造差分
+
+    entityTypeが変わったエンティティは削除と追加の両方に含まれる（削除→追加の順に適用する）。
+    """
+    fromVersion: int = Field(..., description="差分の起点となる版番号")
+    toVersion: int = Field(..., description="差分適用後の版番号")
+    addedEntities: List[Entity] = Field(default_factory=list, description="追加されたエンティティ")
+    removedEntities: List[str] = Field(default_factory=list, description="削除されたエンティティ名")
+    addedObservations: List[ObservationChange] = Field(default_factory=list)
+    removedObservations: List[ObservationChange] = Field(default_factory=list)
+    addedRelations: List[Relation] = Field(default_factory=list, description="追加されたリレーション")
+    removedRelations: List[Relation] = Field(default_factory=list, description="削除されたリレーション")
+
+
+class GraphChanges(BaseModel):
+    """変更フィード（API応答用）"""
+    version: int = Field(..., description="現在の版番号")
+    epoch: str = Field(..., description="サーバーインスタンス識別子（再起動で変わる）")
+    fullReloadRequired: bool = Field(
+        False, description="差分履歴が足りないため /api/graph の再取得が必要か"
+    )
+    changes: List[GraphDelta] = Field(default_factory=list, description="古い順の差分リスト")
+
+
+class SearchMatch(BaseModel):
+    """検索ヒット中の一致箇所"""
+    field: str = Field(..., description="一致したフィールド（name または observation）")
+    text: str = Field(..., description="一致したテキスト")
+    highlights: List[List[int]] = Field(
+        default_factory=list, description="一致位置 [開始, 終了) のリスト（文字単位）"
+    )
+
+
+class SearchHit(BaseModel):
+    """検索ヒット"""
+    name: str
+    entityType: str
+    score: float = Field(..., description="関連度スコア（大きいほど上位）")
+    matches: List[SearchMatch] = Field(default_factory=list)
+
+
+class SearchResult(BaseModel):
+    """検索結果（API応答用）"""
+    query: str
+    total: int = Field(..., description="一致したエンティティ総数")
+    hits: List[SearchHit] = Field(default_factory=list, description="スコア順のヒット")
+    version: int = Field(..., description="検索したグラフスナップショットの版番号")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "query": "記憶",
+                "total": 1,
+                "hits": [
+                    {
+                        "name": "湧心くん",
+                        "entityType": "user",
+                        "score": 1.2,
+                        "matches": [
+                            {
+                                "field": "observation",
+                                "text": "記憶システムに興味がある",
+                                "highlights": [[0, 2]]
+                            }
+                        ]
+                    }
+                ],
+                "version": 1
+            }
+        }
+    )
+
+
+class GraphLayout(BaseModel):
+    """グラフ全体のレイアウト（API応答用）"""
+    algorithm: str = Field(..., description="レイアウトアルゴリズム")
+    version: int = Field(..., description="レイアウトを計算したグラフスナップショットの版番号")
+    positions: Dict[str, List[float]] = Field(
+        default_factory=dict, description="エンティティ名 → [x, y]（0〜1000）"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "algorithm": "force",
+                "version": 1,
+                "positions": {"湧心くん": [512.3, 488.1], "Claude": [620.0, 401.7]}
+            }
+        }
+    )
+
+
+class ClusterNode(BaseModel):
+    """クラスタ（スーパーノード）"""
+    id: str = Field(..., description="クラスタID（版ごとに大きい順に c0, c1, ...）")
+    size: int = Field(..., description="所属エンティティ数")
+    label: str = Field(..., description="代表エンティティ名（クラスタ内で次数最大）")
+    entityTypes: Dict[str, int] = Field(
+        default_factory=dict, description="entityType → 件数（多い順に上位のみ）"
+    )
+
+
+class ClusterEdge(BaseModel):
+    """クラスタ間の集約エッジ（向きは区別しない）"""
+    source: str = Field(..., description="クラスタID")
+    target: str = Field(..., description="クラスタID")
+    weight: int = Field(..., description="クラスタ間のリレーション数")
+
+
+class ClusterGraph(BaseModel):
+    """クラスタ単位に縮約したグラフ（API応答用）"""
+    version: int = Field(..., description="グラフスナップショットの版番号")
+    clusterCount: int = Field(..., description="クラスタ総数")
+    clusters: List[ClusterNode] = Field(default_factory=list, description="大きい順のクラスタ")
+    edges: List[ClusterEdge] = Field(default_factory=list, description="返したクラスタ間の集約エッジ")
+    truncated: bool = Field(False, description="クラスタ数の上限で打ち切られたか")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "version": 1,
+                "clusterCount": 2,
+                "clusters": [
+                    {"id": "c0", "size": 3, "label": "湧心くん", "entityTypes": {"user": 1, "project": 2}},
+                    {"id": "c1", "size": 1, "label": "Windows環境", "entityTypes": {"environment": 1}}
+                ],
+                "edges": [{"source": "c0", "target": "c1", "weight": 1}],
+                "truncated": False
+            }
+        }
+    )
+
+
+class ClusterLink(BaseModel):
+    """クラスタ内エンティティから他クラスタへの集約エッジ"""
+    entity: str = Field(..., description="クラスタ内のエンティティ名")
+    cluster: str = Field(..., description="接続先のクラスタID")
+    weight: int = Field(..., description="リレーション数")
+
+
+class ClusterExpansion(MemoryGraph):
+    """1つのクラスタを展開した部分グラフ（API応答用）"""
+    cluster: ClusterNode = Field(..., description="展開したクラスタ")
+    version: int = Field(..., description="グラフスナップショットの版番号")
+    externalEdges: List[ClusterLink] = Field(
+        default_factory=list, description="返したエンティティから他クラスタへの集約エッジ"
+    )
+    truncated: bool = Field(False, description="エンティティ数の上限で打ち切られたか")
+
+
+class EntityCentrality(BaseModel):
+    """エンティティの中心性"""
+    name: str = Field(..., description="エンティティ名")
+    entityType: str = Field(..., description="エンティティタイプ")
+    degree: int = Field(..., description="入出力リレーション数")
+    pagerank: float = Field(..., description="PageRank（全エンティティの合計が1）")
+    betweenness: float = Field(..., description="媒介中心性の近似値（0〜1に正規化）")
+
+
+class GraphAnalytics(BaseModel):
+    """中心性の上位エンティティ（API応答用）"""
+    version: int = Field(..., description="計算したグラフスナップショットの版番号")
+    metric: str = Field(..., description="並べ替えに使った指標")
+    entityCount: int = Field(..., description="エンティティ総数")
+    betweennessSamples: int = Field(..., description="媒介中心性の推定に使った始点の数")
+    entities: List[EntityCentrality] = Field(default_factory=list, description="指標の大きい順")
+    truncated: bool = Field(False, description="件数の上限で打ち切られたか")
+
+
+class GraphInfo(BaseModel):
+    """提供できるグラフ"""
+    id: str = Field(..., description="グラフID（/api/graphs/{id}/...）")
+    loaded: bool = Field(False, description="読み込み済みか")
+    version: Optional[int] = Field(None, description="スナップショットの版番号（読み込み済みの場合）")
+    bytes: Optional[int] = Field(None, description="推定メモリ使用量（読み込み済みの場合）")
+
+
+class GraphList(BaseModel):
+    """提供できるグラフの一覧（API応答用）"""
+    graphs: List[GraphInfo] = Field(default_factory=list, description="グラフID順")
+    memoryBudget: int = Field(..., description="読み込んだグラフの推定メモリ使用量の上限（バイト）")
+    memoryUsed: int = Field(..., description="読み込んだグラフの推定メモリ使用量の合計（バイト）")
+
+
+class GraphPath(BaseModel):
+    """2つのエンティティを結ぶ経路"""
+    entities: List[str] = Field(..., description="経路上のエンティティ名（始点から終点の順）")
+    relations: List[Relation] = Field(
+        ..., description="各ホップのリレーション（向きは元のリレーションのまま）"
+    )
+
+
+class PathResult(BaseModel):
+    """最短経路の探索結果（API応答用）"""
+    source: str = Field(..., description="始点エンティティ名")
+    target: str = Field(..., description="終点エンティティ名")
+    length: Optional[int] = Field(None, description="最短経路のホップ数（見つからなければnull）")
+    paths: List[GraphPath] = Field(default_factory=list, description="最短経路（最大k件）")
+    version: int = Field(..., description="探索したグラフスナップショットの版番号")
+    truncated: bool = Field(
+        False, description="ハブの展開制限・訪問数の上限により探索が打ち切られたか"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "source": "湧心くん",
+                "target": "Windows環境",
+                "length": 1,
+                "paths": [
+                    {
+                        "entities": ["湧心くん", "Windows環境"],
+                        "relations": [
+                            {"type": "relation", "from": "湧心くん", "to": "Windows環境", "relationType": "uses"}
+                        ]
+                    }
+                ],
+                "version": 1,
+                "truncated": False
+            }
+        }
+    )
@@ -1,9 +1,56 @@
 """Memory MCP API エンドポイント"""
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
-from models.memory import MemoryGraph, EntityDetail
+import asyncio
+from typing import Any, Callable, List, Optional, Union
+from fastapi import APIRouter, HTTPException, Depends, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from models.memory import (
+    MemoryGraph,
+    EntityDetail,
+    EntityBatch,
+    ObservationPage,
+    EntityBatchRequest,
+    EntityPage,
+    RelationPage,
+    Subgraph,
+    GraphChanges,
+    SearchResult,
+    GraphLayout,
+    ClusterGraph,
+    ClusterExpansion,
+    GraphAnalytics,
+    GraphList,
+    PathResult,
+)
+from services.graph_encoding import IDENTITY, choose_encoding, etag_matches
+from services.graph_filter import GraphFilter
+from services.graph_formats import (
+    JSON,
+    MEDIA_TYPES,
+    RECORD_MEDIA_TYPES,
+    choose_media_type,
+    render_model,
+)
+from services.graph_registry import get_graph_registry
 from services.memory_client import MemoryMCPClient, get_memory_client
+from services.metrics import SERIALIZATION_DURATION
+from services.pagination import (
+    StaleCursorError,
+    decode_cursor,
+    iter_ndjson,
+    paginate,
+    parse_fields,
+    project_entity,
+)
+
+# ページングの既定件数・上限
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+
+# エンティティ詳細に含める observations の既定件数・上限（続きは /observations で取得）
+DEFAULT_OBSERVATION_LIMIT = 100
+MAX_OBSERVATION_LIMIT = 1000
 
 router = APIRouter(
     prefix="/api",
@@ -12,18 +59,194 @@ router = APIRouter(
 )
 
 
-@router.get("/graph", response_model=MemoryGraph, summary="グラフ全体を取得")
+async def get_graph_client(
+    request: Request,
+    default: MemoryMCPClient = Depends(get_memory_client)
+) -> MemoryMCPClient:
+    """要求の対象グラフのクライアントを取得
+
+    /api/graphs/{graph_id}/... ではレジストリからグラフIDのクライアントを取得し
+    （未読み込みなら読み込む）、それ以外は既定のグラフのクライアントを返す。
+
+    Raises:
+        HTTPException: グラフが存在しない場合は404、読み込みに失敗した場合は500
+    """
+    graph_id = request.path_params.get("graph_id")
+    if graph_id is None:
+        return default
+    registry = get_graph_registry()
+    try:
+        client = await registry.get(graph_id) if registry is not None else None
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to load graph '{graph_id}': {str(e)}"
+        )
+    if client is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Graph '{graph_id}' not found"
+        )
+    return client
+
+
+def _graph_id(
+    graph_id: str = Path(..., description="グラフID（データファイル名から拡張子を除いたもの）")
+) -> str:
+    """/api/graphs/{graph_id}/... のグラフID（OpenAPIに記載するためのパラメータ）"""
+    return graph_id
+
+
+def graph_endpoint(method: str, path: str, **kwargs: Any) -> Callable[[Callable], Callable]:
+    """グラフを対象とするエンドポイントを /api{path} と /api/graphs/{graph_id}{path} に登録する
+
+    Args:
+        method: HTTPメソッド
+        path: /api からの相対パス
+        **kwargs: APIRouter.add_api_route の引数（response_model・summary など）
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        router.add_api_route(path, endpoint, methods=[method], **kwargs)
+        router.add_api_route(
+            f"/graphs/{{graph_id}}{path}",
+            endpoint,
+            methods=[method],
+            dependencies=[Depends(_graph_id)],
+            **kwargs,
+        )
+        return endpoint
+
+    return decorator
+
+
+def _negotiate(request: Request, available: List[str] = MEDIA_TYPES) -> str:
+    """Acceptヘッダーから応答形式を決める
+
+    Args:
+        request: リクエスト
+        available: 提供可能な形式（優先度の高い順）
+
+    Raises:
+        HTTPException: 受け入れ可能な形式がない場合は406
+    """
+    media_type = choose_media_type(request.headers.get("accept"), available)
+    if media_type is None:
+        raise HTTPException(
+            status_code=406,
+            detail=f"Acceptable media types: {', '.join(available)}"
+        )
+    return media_type
+
+
+async def _negotiated(request: Request, model: BaseModel) -> Union[BaseModel, Response]:
+    """応答をAcceptヘッダーに応じた形式で返す
+
+    JSONの場合はモデルをそのまま返し（response_modelで検証・出力）、
+    それ以外はワーカースレッドでエンコードしたバイト列を返す。
+    Arrowはグラフ形式の応答（MemoryGraphを継承したモデル）でのみ提供する。
+
+    Args:
+        request: リクエスト
+        model: 応答モデル
+
+    Returns:
+        応答モデル、またはエンコード済みのレスポンス
+    """
+    available = MEDIA_TYPES if isinstance(model, MemoryGraph) else RECORD_MEDIA_TYPES
+    media_type = _negotiate(request, available)
+    if media_type == JSON:
+        return model
+    with SERIALIZATION_DURATION.time(media_type, IDENTITY):
+        body = await asyncio.to_thread(render_model, model, media_type)
+    return Response(content=body, media_type=media_type, headers={"Vary": "Accept"})
+
+
+async def _encoded_graph_response(
+    request: Request, client: MemoryMCPClient, graph_filter: Optional[GraphFilter] = None
+) -> Response:
+    """エンコード済みのグラフ本体からレスポンスを作成
+
+    スナップショット・形式（・絞り込み条件）ごとに生成済みの本体（圧縮版）をそのまま返す。
+    形式はAcceptヘッダーで選ぶ（JSON、MessagePack、Arrow）。
+    If-None-MatchがETagと一致すれば本体なしの304を返す。
+
+    Args:
+        request: リクエスト
+        client: Memory MCPクライアント
+        graph_filter: 絞り込み条件（オプション）
+
+    Returns:
+        Response: グラフデータのレスポンス
+
+    Raises:
+        HTTPException: 受け入れ可能な形式がない場合は406
+    """
+    media_type = _negotiate(request)
+    _, etag = await client.get_encoded_graph(media_type=media_type, graph_filter=graph_filter)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept, Accept-Encoding",
+        # 変更フィード（/api/graph/changes）の起点
+        "X-Graph-Version": str(client.version),
+        "X-Graph-Epoch": client.epoch,
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    body, headers["ETag"] = await client.get_encoded_graph(encoding, media_type, graph_filter)
+    if encoding != IDENTITY:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+@graph_endpoint(
+    "GET",
+    "/graph",
+    response_model=MemoryGraph,
+    summary="グラフ全体を取得",
+    responses={
+        304: {"description": "Not modified (If-None-Match matched ETag)"},
+        406: {"description": "No acceptable media type"},
+    },
+)
 async def get_graph(
-    client: MemoryMCPClient = Depends(get_memory_client)
-) -> MemoryGraph:
+    request: Request,
+    entityType: Optional[List[str]] = Query(
+        None, description="含めるentityType（複数指定可、省略時は全種類）"
+    ),
+    excludeEntityType: Optional[List[str]] = Query(None, description="除外するentityType（複数指定可）"),
+    relationType: Optional[List[str]] = Query(
+        None, description="含めるrelationType（複数指定可、省略時は全種類）"
+    ),
+    excludeRelationType: Optional[List[str]] = Query(None, description="除外するrelationType（複数指定可）"),
+    minDegree: int = Query(
+        0, ge=0, description="含めるエンティティの最小次数（絞り込み前のグラフでの入出力リレーション数）"
+    ),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> Response:
     """Memory MCPからグラフ全体（エンティティとリレーション）を取得
 
+    レスポンスはグラフの版・形式ごとに一度だけエンコード・圧縮され、
+    ETagによる条件付きリクエスト（If-None-Match → 304）に対応する。
+    Acceptヘッダーで application/msgpack または
+    application/vnd.apache.arrow.stream を指定すると、その形式で返す（既定はJSON）。
+
+    絞り込み条件を指定すると、条件に一致するエンティティと、両端が残るリレーションだけを返す。
+    絞り込み結果も版・条件ごとにキャッシュする。
+
     Returns:
         MemoryGraph: エンティティとリレーションを含むグラフデータ
     """
+    graph_filter = GraphFilter.of(
+        entityType, excludeEntityType, relationType, excludeRelationType, minDegree
+    )
     try:
-        graph = await client.read_graph()
-        return graph
+        return await _encoded_graph_response(request, client, graph_filter)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -31,18 +254,21 @@ async def get_graph(
         )
 
 
-@router.get("/graph/refresh", response_model=MemoryGraph, summary="グラフを強制更新")
+@graph_endpoint("GET", "/graph/refresh", response_model=MemoryGraph, summary="グラフを強制更新")
 async def refresh_graph(
-    client: MemoryMCPClient = Depends(get_memory_client)
-) -> MemoryGraph:
-    """Memory MCPから最新のグラフデータを取得（キャッシュクリア）
+    request: Request,
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> Response:
+    """Memory MCPから最新のグラフデータを取得（キャッシュ更新）
 
     Returns:
         MemoryGraph: 最新のグラフデータ
     """
     try:
-        graph = await client.refresh()
-        return graph
+        await client.refresh()
+        return await _encoded_graph_response(request, client)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -50,19 +276,330 @@ async def refresh_graph(
         )
 
 
-@router.get(
+def _page_error(e: ValueError) -> HTTPException:
+    """ページング・射影パラメータのエラーをHTTPエラーに変換"""
+    if isinstance(e, StaleCursorError):
+        return HTTPException(status_code=410, detail=str(e))
+    return HTTPException(status_code=400, detail=str(e))
+
+
+@graph_endpoint("GET", "/graph/changes", response_model=GraphChanges, summary="グラフの変更差分を取得")
+async def get_graph_changes(
+    since: int = Query(..., ge=0, description="クライアントが保持している版番号"),
+    epoch: Optional[str] = Query(None, description="クライアントが保持しているX-Graph-Epoch"),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> GraphChanges:
+    """指定した版以降の構造差分（エンティティ・observations・リレーションの追加削除）を取得
+
+    /api/graph のレスポンスヘッダー X-Graph-Version / X-Graph-Epoch を起点にポーリングする。
+    差分履歴が足りない場合は fullReloadRequired=true を返すので、/api/graph を取り直す。
+
+    Returns:
+        GraphChanges: 差分リスト
+    """
+    try:
+        await client.get_store()
+        return client.get_changes(since, epoch)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch graph changes: {str(e)}"
+        )
+
+
+@graph_endpoint("GET", "/graph/layout", response_model=GraphLayout, summary="グラフ全体のレイアウトを取得")
+async def get_graph_layout(
+    algorithm: str = Query("force", pattern="^(force|circle)$", description="レイアウトアルゴリズム"),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> GraphLayout:
+    """サーバー側で計算したエンティティの座標を取得
+
+    フロントエンドはこの座標を preset レイアウトとして使い、ブラウザでの
+    力学計算を省略できる。レイアウトは版ごとにキャッシュされ、グラフ更新時は
+    前の版の座標から計算し直すため、ノードの位置が大きく動かない。
+
+    Returns:
+        GraphLayout: エンティティ名 → [x, y]
+    """
+    try:
+        return await client.get_layout(algorithm)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to compute graph layout: {str(e)}"
+        )
+
+
+@graph_endpoint("GET", "/graph/clusters", response_model=ClusterGraph, summary="クラスタ単位に縮約したグラフを取得")
+async def get_graph_clusters(
+    limit: int = Query(200, ge=1, le=5000, description="返すクラスタの最大数（大きい順）"),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> ClusterGraph:
+    """コミュニティ検出でまとめたスーパーノードとクラスタ間の集約エッジを取得
+
+    大規模グラフの概観表示用。各クラスタは /api/graph/clusters/{cluster_id} で展開できる。
+    クラスタIDは版（version）ごとに振り直される。
+
+    Returns:
+        ClusterGraph: 縮約グラフ
+    """
+    try:
+        return await client.get_clusters(limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch clusters: {str(e)}"
+        )
+
+
+@graph_endpoint(
+    "GET",
+    "/graph/clusters/{cluster_id}",
+    response_model=ClusterExpansion,
+    summary="クラスタを展開",
+)
+async def expand_cluster(
+    request: Request,
+    cluster_id: str,
+    limit: int = Query(500, ge=1, le=5000, description="返すエンティティの最大数（次数の大きい順）"),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> ClusterExpansion:
+    """クラスタ内のエンティティとリレーション、他クラスタへの集約エッジを取得
+
+    Args:
+        cluster_id: クラスタID
+
+    Returns:
+        ClusterExpansion: 展開結果
+
+    Raises:
+        HTTPException: クラスタが存在しない場合は404
+    """
+    try:
+        expansion = await client.expand_cluster(cluster_id, limit)
+        if expansion is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Cluster '{cluster_id}' not found"
+            )
+        return await _negotiated(request, expansion)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to expand cluster: {str(e)}"
+        )
+
+
+@graph_endpoint("GET", "/graph/analytics", response_model=GraphAnalytics, summary="中心性の上位エンティティを取得")
+async def get_graph_analytics(
+    metric: str = Query(
+        "pagerank", pattern="^(degree|pagerank|betweenness)$", description="並べ替えに使う指標"
+    ),
+    limit: int = Query(100, ge=1, le=5000, description="返すエンティティの最大数（指標の大きい順）"),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> GraphAnalytics:
+    """次数・PageRank・媒介中心性（近似）で重要なエンティティを取得
+
+    表示するノードの優先順位付け用。中心性は版（version）ごとに一度だけ計算する。
+
+    Returns:
+        GraphAnalytics: 指標の大きい順のエンティティ
+    """
+    try:
+        return await client.get_analytics(metric, limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to compute graph analytics: {str(e)}"
+        )
+
+
+@graph_endpoint("GET", "/graph/entities", response_model=EntityPage, summary="エンティティをページ単位で取得")
+async def get_entity_page(
+    cursor: Optional[str] = Query(None, description="前ページのnextCursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="最大件数"),
+    fields: Optional[str] = Query(
+        None, description="出力フィールド（カンマ区切り、例: name,entityType）"
+    ),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> EntityPage:
+    """エンティティをカーソルページングで取得
+
+    fieldsでobservationsを省略すると、ノード描画に必要な情報だけを小さく取得できる。
+
+    Returns:
+        EntityPage: エンティティのページ
+
+    Raises:
+        HTTPException: パラメータ不正は400、ページング中にグラフが更新された場合は410
+    """
+    try:
+        store = await client.get_store()
+        try:
+            selected = parse_fields(fields)
+            offset = decode_cursor(cursor, store.version)
+        except ValueError as e:
+            raise _page_error(e)
+        indexes, next_cursor = paginate(range(store.entity_count), offset, limit, store.version)
+        return EntityPage(
+            entities=[project_entity(store.compact, i, selected) for i in indexes],
+            nextCursor=next_cursor,
+            total=len(store.entities),
+            version=store.version,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch entities: {str(e)}"
+        )
+
+
+@graph_endpoint("GET", "/graph/relations", response_model=RelationPage, summary="リレーションをページ単位で取得")
+async def get_relation_page(
+    cursor: Optional[str] = Query(None, description="前ページのnextCursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="最大件数"),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> RelationPage:
+    """リレーションをカーソルページングで取得
+
+    Returns:
+        RelationPage: リレーションのページ
+
+    Raises:
+        HTTPException: パラメータ不正は400、ページング中にグラフが更新された場合は410
+    """
+    try:
+        store = await client.get_store()
+        try:
+            offset = decode_cursor(cursor, store.version)
+        except ValueError as e:
+            raise _page_error(e)
+        relations, next_cursor = paginate(store.relations, offset, limit, store.version)
+        return RelationPage(
+            relations=relations,
+            nextCursor=next_cursor,
+            total=len(store.relations),
+            version=store.version,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch relations: {str(e)}"
+        )
+
+
+@graph_endpoint(
+    "GET",
+    "/graph/stream",
+    summary="グラフをNDJSONでストリーミング取得",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def stream_graph(
+    fields: Optional[str] = Query(
+        None, description="エンティティの出力フィールド（カンマ区切り、例: name,entityType）"
+    ),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> StreamingResponse:
+    """グラフ全体をNDJSON（1行1レコード）でストリーミング取得
+
+    1行目はメタ情報（版番号・件数）、以降はエンティティ、リレーションの順。
+    クライアントは受信しながら描画を始められる。
+
+    Returns:
+        StreamingResponse: application/x-ndjson のレスポンス
+    """
+    try:
+        selected = parse_fields(fields)
+    except ValueError as e:
+        raise _page_error(e)
+
+    try:
+        store = await client.get_store()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch graph data: {str(e)}"
+        )
+
+    header = {
+        "version": store.version,
+        "entities": len(store.entities),
+        "relations": len(store.relations),
+    }
+    return StreamingResponse(
+        iter_ndjson(store.compact, store.relations, selected, header),
+        media_type="application/x-ndjson",
+    )
+
+
+@graph_endpoint(
+    "POST",
+    "/entities:batch",
+    response_model=EntityBatch,
+    summary="複数のエンティティ詳細を一括取得"
+)
+async def get_entities_batch(
+    request: Request,
+    body: EntityBatchRequest,
+    centrality: bool = Query(False, description="中心性（degree・pagerank・betweenness）を付けるか"),
+    observationLimit: int = Query(
+        DEFAULT_OBSERVATION_LIMIT,
+        ge=0,
+        le=MAX_OBSERVATION_LIMIT,
+        description="エンティティごとに返す observations の最大件数（総数は observationCount、続きは /observations で取得）"
+    ),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> EntityBatch:
+    """複数のエンティティの詳細を1回の要求で取得
+
+    サイドバー・ホバープレビューなどで多数のノードを一度に表示するために使う。
+    見つからない名前はエラーにせず notFound に返す。
+
+    Returns:
+        EntityBatch: エンティティの詳細（要求順）と見つからなかった名前
+    """
+    try:
+        return await _negotiated(request, await client.get_entities(body.names, centrality, observationLimit))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch entities: {str(e)}"
+        )
+
+
+@graph_endpoint(
+    "GET",
     "/entities/{entity_name}",
     response_model=EntityDetail,
     summary="エンティティ詳細を取得"
 )
 async def get_entity(
     entity_name: str,
-    client: MemoryMCPClient = Depends(get_memory_client)
+    centrality: bool = Query(False, description="中心性（degree・pagerank・betweenness）を付けるか"),
+    observationLimit: int = Query(
+        DEFAULT_OBSERVATION_LIMIT,
+        ge=0,
+        le=MAX_OBSERVATION_LIMIT,
+        description="返す observations の最大件数（総数は observationCount、続きは /observations で取得）"
+    ),
+    client: MemoryMCPClient = Depends(get_graph_client)
 ) -> EntityDetail:
     """特定のエンティティの詳細情報を取得
 
     Args:
         entity_name: エンティティ名
+        centrality: 中心性を付けるか（未計算の版では計算を待つ）
+        observationLimit: 返す observations の最大件数（observationCount に総数を返し、
+            残りはクライアントが /observations でページ取得する）
 
     Returns:
         EntityDetail: エンティティの詳細（observations、関連エンティティ等）
@@ -71,7 +608,7 @@ async def get_entity(
         HTTPException: エンティティが見つからない場合は404
     """
     try:
-        entity = await client.get_entity(entity_name)
+        entity = await client.get_entity(entity_name, centrality, observationLimit)
         if entity is None:
             raise HTTPException(
                 status_code=404,
@@ -87,11 +624,207 @@ async def get_entity(
         )
 
 
+@graph_endpoint(
+    "GET",
+    "/entities/{entity_name}/observations",
+    response_model=ObservationPage,
+    summary="エンティティの observations をページ単位で取得"
+)
+async def get_observations(
+    entity_name: str,
+    offset: int = Query(0, ge=0, description="先頭の位置"),
+    limit: int = Query(DEFAULT_OBSERVATION_LIMIT, ge=1, le=MAX_OBSERVATION_LIMIT, description="最大件数"),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> ObservationPage:
+    """エンティティの observations を offset 番目から最大 limit 件取得
+
+    observations の多いエンティティを、詳細を一度に受け取らずに少しずつ表示するために使う。
+
+    Args:
+        entity_name: エンティティ名
+
+    Returns:
+        ObservationPage: observations のページ（total に総数）
+
+    Raises:
+        HTTPException: エンティティが見つからない場合は404
+    """
+    try:
+        page = await client.get_observations(entity_name, offset, limit)
+        if page is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Entity '{entity_name}' not found"
+            )
+        return page
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch observations: {str(e)}"
+        )
+
+
+@graph_endpoint(
+    "GET",
+    "/entities/{entity_name}/neighborhood",
+    response_model=Subgraph,
+    summary="エンティティの近傍部分グラフを取得"
+)
+async def get_neighborhood(
+    request: Request,
+    entity_name: str,
+    depth: int = Query(1, ge=1, le=5, description="最大ホップ数"),
+    limit: int = Query(200, ge=1, le=5000, description="最大ノード数"),
+    relationType: Optional[List[str]] = Query(
+        None, description="たどるリレーション種類（複数指定可、省略時は全種類）"
+    ),
+    maxFanout: int = Query(
+        50, ge=1, le=1000, description="1ノードあたりの最大展開数（これを超える次数のハブは展開しない）"
+    ),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> Subgraph:
+    """エンティティを中心としたk-hop以内の誘導部分グラフを取得
+
+    グラフ全体をダウンロードせずに、大きなメモリを少しずつ探索するために使う。
+
+    Args:
+        entity_name: 中心エンティティ名
+
+    Returns:
+        Subgraph: 近傍の部分グラフ
+
+    Raises:
+        HTTPException: エンティティが見つからない場合は404
+    """
+    try:
+        subgraph = await client.get_neighborhood(
+            entity_name, depth, limit, relationType, maxFanout
+        )
+        if subgraph is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Entity '{entity_name}' not found"
+            )
+        return await _negotiated(request, subgraph)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch neighborhood: {str(e)}"
+        )
+
+
+@graph_endpoint("GET", "/paths", response_model=PathResult, summary="2つのエンティティを結ぶ最短経路を取得")
+async def get_paths(
+    request: Request,
+    source: str = Query(..., alias="from", description="始点エンティティ名"),
+    target: str = Query(..., alias="to", description="終点エンティティ名"),
+    maxDepth: int = Query(6, ge=1, le=10, description="最大ホップ数"),
+    k: int = Query(1, ge=1, le=20, description="返す最短経路の最大数"),
+    relationType: Optional[List[str]] = Query(
+        None, description="たどるリレーション種類（複数指定可、省略時は全種類）"
+    ),
+    maxFanout: int = Query(
+        1000, ge=1, le=100000, description="展開するノードの最大次数（これを超える次数のハブは展開しない）"
+    ),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> PathResult:
+    """2つのエンティティがどうつながっているかを最短経路で取得
+
+    リレーションの向きは区別せずにたどり、各ホップのリレーション（元の向き・種類）を返す。
+    経路が見つからない場合は paths が空になる。
+
+    Returns:
+        PathResult: 最短経路（同じ長さのものを最大k件）
+
+    Raises:
+        HTTPException: 始点・終点のエンティティが見つからない場合は404
+    """
+    try:
+        result = await client.get_paths(source, target, maxDepth, k, relationType, maxFanout)
+        if result is None:
+            store = await client.get_store()
+            missing = target if store.has_entity(source) else source
+            raise HTTPException(
+                status_code=404,
+                detail=f"Entity '{missing}' not found"
+            )
+        return await _negotiated(request, result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to find paths: {str(e)}"
+        )
+
+
+@graph_endpoint("GET", "/search", response_model=SearchResult, summary="エンティティを全文検索")
+async def search_entities(
+    q: str = Query(..., min_length=1, description="検索文字列（空白区切りでAND検索）"),
+    limit: int = Query(20, ge=1, le=200, description="最大件数"),
+    client: MemoryMCPClient = Depends(get_graph_client)
+) -> SearchResult:
+    """エンティティ名・observationsを部分一致で全文検索
+
+    文字bigramの転置インデックスを使うため、日本語も形態素解析なしで検索できる。
+    結果はスコア順で、一致箇所の位置（highlights）を含む。
+
+    Returns:
+        SearchResult: 検索結果
+    """
+    try:
+        return await client.search(q, limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to search entities: {str(e)}"
+        )
+
+
 @router.get("/health", summary="ヘルスチェック")
-async def health_check():
+async def health_check(
+    response: Response,
+    client: MemoryMCPClient = Depends(get_memory_client)
+):
     """APIサーバーのヘルスチェック
 
+    グラフの読み込みが完了するまでは 503（status: "starting"）を返すため、
+    ロードバランサー等の準備完了判定に使える。
+
     Returns:
-        dict: ステータス情報
+        dict: ステータス情報（ready: グラフを読み込み済みか、version: スナップショットの版番号）
     """
-    return {"status": "ok", "service": "memory-viz-api"}
+    ready = client.ready
+    if not ready:
+        response.status_code = 503
+    return {
+        "status": "ok" if ready else "starting",
+        "service": "memory-viz-api",
+        "ready": ready,
+        "version": client.version,
+    }
+
+
+@router.get("/graphs", response_model=GraphList, summary="提供できるグラフの一覧を取得")
+async def list_graphs() -> GraphList:
+    """MEMORY_GRAPHS_DIR のデータファイルごとのグラフと、読み込み状態を取得
+
+    各グラフは /api/graphs/{graph_id}/graph などで参照できる。
+
+    Returns:
+        GraphList: グラフの一覧と推定メモリ使用量
+
+    Raises:
+        HTTPException: 複数グラフの提供が無効な場合は404
+    """
+    registry = get_graph_registry()
+    if registry is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Multi-graph serving is not enabled"
+        )
+    return await asyncio.to_thread(registry.list_graphs)
@@ -0,0 +1,232 @@
+"""ノードの重要度（中心性）
+
+エンティティ間のリレーションから次の指標を計算する。
+
+- degree: 入出力リレーション数の合計（存在しない端点へのリレーションも数える）
+- pagerank: リレーションの向きに沿ったPageRank。リレーション配列（COO形式の疎行列）と
+  np.bincount による行列ベクトル積のべき乗法で求める。
+- betweenness: 媒介中心性の近似値。リレーションを無向とみなし、ランダムに選んだ始点からの
+  Brandes法（BFSと依存度の逆伝播）の結果を拡大して推定する。BFSは階層ごとに
+  フロンティアの隣接ノードをまとめて展開する。
+
+スナップショットごとに一度だけ計算し、表示の優先順位付けに使う。
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from models.memory import EntityCentrality, GraphAnalytics
+from services.compact_graph import csr
+from services.graph_store import GraphStore
+from services.layout import edge_index
+
+# 並べ替えに使える指標
+METRICS = ("degree", "pagerank", "betweenness")
+
+# PageRankの減衰係数・収束判定（L1誤差 / ノード数）・最大反復数
+DAMPING = 0.85
+TOLERANCE = 1e-9
+MAX_ITERATIONS = 100
+
+# 媒介中心性の推定に使う始点の数（ノード数以下なら厳密値）
+BETWEENNESS_SAMPLES = 32
+
+
+def pagerank(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    damping: float = DAMPING,
+    tolerance: float = TOLERANCE,
+    max_iterations: int = MAX_ITERATIONS,
+) -> np.ndarray:
+    """PageRankをべき乗法で求める
+
+    出リレーションのないノードの値は全ノードに均等に配る。
+    同じノード間の複数のリレーションは重みとして数える。
+
+    Args:
+        n: ノード数
+        src: リレーション始点インデックス
+        dst: リレーション終点インデックス
+        damping: 減衰係数
+        tolerance: 収束判定の閾値（1ノードあたりのL1誤差）
+        max_iterations: 最大反復数
+
+    Returns:
+        np.ndarray: ノードごとのPageRank（合計1）
+    """
+    if n == 0:
+        return np.zeros(0)
+    out_degree = np.bincount(src, minlength=n).astype(np.float64)
+    weight = 1.0 / out_degree[src]
+    dangling = out_degree == 0
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iterations):
+        flow = np.bincount(dst, weights=rank[src] * weight, minlength=n)
+        updated = (1.0 - damping) / n + damping * (flow + rank[dangling].sum() / n)
+        error = np.abs(updated - rank).sum()
+        rank = updated
+        if error < n * tolerance:
+            break
+    return rank
+
+
+def _expand(offsets: np.ndarray, targets: np.ndarray, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """フロンティアの全ノードの隣接ノードをまとめて展開する
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (展開元ノード, 隣接ノード) の組
+    """
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    owners = np.repeat(frontier, counts)
+    # 各組の隣接リスト上の位置 = 展開元の先頭位置 + 展開元内での連番
+    first = np.cumsum(counts) - counts
+    positions = np.arange(counts.sum()) + np.repeat(starts - first, counts)
+    return owners, targets[positions]
+
+
+def betweenness(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    samples: int = BETWEENNESS_SAMPLES,
+    seed: int = 0,
+) -> Tuple[np.ndarray, int]:
+    """媒介中心性を始点のサンプリングで近似する
+
+    リレーションを無向とみなし、同じノード間のリレーションは1本にまとめる。
+    値は「他の2ノード間の最短経路のうち、そのノードを通るものの割合」の合計を
+    (n-1)(n-2) で割った正規化値（0〜1）。
+
+    Args:
+        n: ノード数
+        src: リレーション始点インデックス
+        dst: リレーション終点インデックス
+        samples: 始点の数（ノード数以上なら全ノードから計算する）
+        seed: 始点を選ぶ乱数シード
+
+    Returns:
+        Tuple[np.ndarray, int]: (ノードごとの媒介中心性, 使った始点の数)
+    """
+    result = np.zeros(n)
+    if n < 3 or len(src) == 0:
+        return result, 0
+
+    lo, hi = np.minimum(src, dst), np.maximum(src, dst)
+    pairs = np.sort(lo * n + hi)
+    pairs = pairs[np.append(True, pairs[1:] != pairs[:-1])]
+    lo, hi = pairs // n, pairs % n
+    keys = np.concatenate([lo, hi])
+    offsets, order = csr(keys, n)
+    targets = np.concatenate([hi, lo])[order].astype(np.int32)
+
+    count = min(samples, n)
+    sources = np.random.default_rng(seed).choice(n, size=count, replace=False)
+    dist = np.empty(n, dtype=np.int32)
+    for source in sources.tolist():
+        dist.fill(-1)
+        dist[source] = 0
+        sigma = np.zeros(n)
+        sigma[source] = 1.0
+        levels: List[Tuple[np.ndarray, np.ndarray]] = []
+        frontier = np.array([source], dtype=np.int32)
+        depth = 0
+        # 前進: 階層ごとに最短経路DAGの辺と経路数を求める
+        while len(frontier):
+            owners, others = _expand(offsets, targets, frontier)
+            dist[others[dist[others] < 0]] = depth + 1
+            on_dag = dist[others] == depth + 1
+            owners, others = owners[on_dag], others[on_dag]
+            sigma += np.bincount(others, weights=sigma[owners], minlength=n)
+            levels.append((owners, others))
+            frontier = np.flatnonzero(dist == depth + 1)
+            depth += 1
+        # 後退: 深い階層から依存度を逆伝播する
+        delta = np.zeros(n)
+        for owners, others in reversed(levels):
+            delta += np.bincount(
+                owners, weights=sigma[owners] / sigma[others] * (1.0 + delta[others]), minlength=n
+            )
+        delta[source] = 0.0
+        result += delta
+
+    # 始点のサンプリングを全ノードに拡大し、順序付きの組の数で正規化する
+    result *= n / count / ((n - 1) * (n - 2))
+    return result, count
+
+
+class Centrality:
+    """スナップショットの中心性
+
+    指標はエンティティ番号（CompactGraphのエンティティID）順の配列で持つ。
+    """
+
+    def __init__(self, store: GraphStore, samples: int = BETWEENNESS_SAMPLES, seed: int = 0):
+        """中心性を計算する
+
+        Args:
+            store: グラフストア
+            samples: 媒介中心性の推定に使う始点の数
+            seed: 乱数シード
+        """
+        self.store = store
+        self.version = store.version
+        names, src, dst = edge_index(store)
+        n = len(names)
+        self.names = names
+
+        out_offsets, _, in_offsets, _ = store.adjacency
+        self.degree = np.diff(out_offsets)[:n] + np.diff(in_offsets)[:n]
+        self.pagerank = pagerank(n, src, dst)
+        self.betweenness, self.samples = betweenness(n, src, dst, samples, seed)
+
+    def scores(self, name: str) -> Optional[Tuple[int, float, float]]:
+        """エンティティの (degree, pagerank, betweenness)（存在しなければNone）"""
+        index = self.store.compact.entity_id(name)
+        if index is None:
+            return None
+        return int(self.degree[index]), float(self.pagerank[index]), float(self.betweenness[index])
+
+    def entry(self, index: int) -> EntityCentrality:
+        """エンティティ番号の指標をモデルにする"""
+        compact = self.store.compact
+        return EntityCentrality(
+            name=self.names[index],
+            entityType=compact.entity_types[int(compact.entity_type_ids[index])],
+            degree=int(self.degree[index]),
+            pagerank=float(self.pagerank[index]),
+            betweenness=float(self.betweenness[index]),
+        )
+
+    def top(self, metric: str = "pagerank", limit: int = 100) -> GraphAnalytics:
+        """指標の大きい順にエンティティを返す
+
+        Args:
+            metric: 並べ替えに使う指標（METRICS のいずれか）
+            limit: 返すエンティティの最大数
+
+        Returns:
+            GraphAnalytics: 上位のエンティティ
+
+        Raises:
+            ValueError: 未対応の指標が指定された場合
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        values = getattr(self, metric)
+        n = len(values)
+        shown = min(limit, n)
+        # 上位だけを部分選択してから並べる（同値はエンティティ番号順）
+        candidates = np.argpartition(-values, shown - 1)[:shown] if shown < n else np.arange(n)
+        order = candidates[np.lexsort((candidates, -values[candidates]))]
+        return GraphAnalytics(
+            version=self.version,
+            metric=metric,
+            entityCount=n,
+            betweennessSamples=self.samples,
+            entities=[self.entry(i) for i in order.tolist()],
+            truncated=shown < n,
+        )
@@ -0,0 +1,227 @@
+"""コミュニティ検出とクラスタ単位の縮約
+
+リレーションを無向グラフとみなし、ラベル伝播法でコミュニティを検出する。
+各反復は「ノード × 隣接ノードのラベル」の組を数えて最頻ラベルを選ぶ処理を
+NumPyでまとめて行う。同数のラベルはラベルごとに固定した乱数優先度で選び
+（少数のラベルに早く収束する）、振動を避けるため毎反復ランダムに選んだ
+半数のノードだけを更新する。
+
+スナップショットごとに一度だけ計算し、縮約グラフ（スーパーノード）と
+クラスタ単位の展開に使う。
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models.memory import (
+    ClusterEdge,
+    ClusterExpansion,
+    ClusterGraph,
+    ClusterLink,
+    ClusterNode,
+    Relation,
+)
+from services.graph_store import GraphStore
+from services.layout import edge_index
+
+# ラベル伝播の最大反復数
+MAX_ITERATIONS = 20
+
+# ラベルが変わったノードの割合がこれ以下になったら収束とみなす
+CONVERGENCE_RATIO = 0.001
+
+# クラスタごとに返すentityTypeの最大数
+MAX_ENTITY_TYPES = 5
+
+
+def label_propagation(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    max_iterations: int = MAX_ITERATIONS,
+    seed: int = 0,
+) -> np.ndarray:
+    """ラベル伝播法でコミュニティを検出する
+
+    Args:
+        n: ノード数
+        src: リレーション始点インデックス
+        dst: リレーション終点インデックス
+        max_iterations: 最大反復数
+        seed: 乱数シード（同点の解消と更新ノードの選択に使う）
+
+    Returns:
+        np.ndarray: ノードごとのラベル（ラベル値そのものに意味はない）
+    """
+    labels = np.arange(n, dtype=np.int64)
+    if n == 0 or len(src) == 0:
+        return labels
+
+    rng = np.random.default_rng(seed)
+    # 同数のラベルから選ぶときの優先度（1票未満の差にとどめる）
+    priority = rng.random(n) * 0.5
+    nodes = np.concatenate([src, dst])
+    others = np.concatenate([dst, src])
+
+    for _ in range(max_iterations):
+        keys, counts = np.unique(nodes * n + labels[others], return_counts=True)
+        key_nodes = keys // n
+        key_labels = keys % n
+        score = counts + priority[key_labels]
+        order = np.lexsort((score, key_nodes))
+        last = np.flatnonzero(np.append(key_nodes[order][1:] != key_nodes[order][:-1], True))
+        best = order[last]
+
+        proposed = labels.copy()
+        proposed[key_nodes[best]] = key_labels[best]
+        differs = proposed != labels
+        if differs.sum() <= n * CONVERGENCE_RATIO:
+            labels[differs] = proposed[differs]
+            break
+        changed = differs & (rng.random(n) < 0.5)
+        labels[changed] = proposed[changed]
+    return labels
+
+
+class Clustering:
+    """スナップショットのクラスタリング結果
+
+    クラスタIDはサイズの大きい順に c0, c1, ... を振る（版が変わると振り直される）。
+    """
+
+    def __init__(self, store: GraphStore, seed: int = 0):
+        """コミュニティ検出と集計を行う
+
+        Args:
+            store: グラフストア
+            seed: 乱数シード
+        """
+        self.store = store
+        self.version = store.version
+        names, src, dst = edge_index(store)
+        n = len(names)
+        self.names = names
+
+        labels = label_propagation(n, src, dst, seed=seed)
+
+        # サイズの大きい順にクラスタ番号を振り直す
+        uniq, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+        rank = np.empty(len(uniq), dtype=np.int64)
+        rank[np.argsort(-sizes, kind="stable")] = np.arange(len(uniq))
+        self.cluster_of = rank[inverse.reshape(-1)] if n else np.zeros(0, dtype=np.int64)
+        self.count = len(uniq)
+        self.sizes = np.bincount(self.cluster_of, minlength=self.count)
+
+        # クラスタごとの所属ノード（次数の大きい順）
+        self.degree = np.bincount(np.concatenate([src, dst]), minlength=n)
+        order = np.lexsort((-self.degree, self.cluster_of))
+        self._members = order
+        self._offsets = np.concatenate([[0], np.cumsum(self.sizes)])
+
+        # クラスタ間の集約エッジ（無向）
+        cs, cd = self.cluster_of[src], self.cluster_of[dst]
+        cross = cs != cd
+        lo = np.minimum(cs[cross], cd[cross])
+        hi = np.maximum(cs[cross], cd[cross])
+        keys, weights = np.unique(lo * self.count + hi, return_counts=True)
+        self._edges = (keys // self.count, keys % self.count, weights)
+
+        # クラスタごとのentityType件数
+        type_names = store.compact.entity_types
+        type_ids = store.compact.entity_type_ids.astype(np.int64)
+        keys, counts = np.unique(self.cluster_of * len(type_names) + type_ids, return_counts=True)
+        self._types: Dict[int, List[Tuple[str, int]]] = {}
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            cluster, type_id = divmod(key, len(type_names))
+            self._types.setdefault(cluster, []).append((type_names[type_id], count))
+
+    def members(self, cluster: int) -> np.ndarray:
+        """クラスタに所属するノード番号（次数の大きい順）"""
+        return self._members[self._offsets[cluster]:self._offsets[cluster + 1]]
+
+    def parse_id(self, cluster_id: str) -> Optional[int]:
+        """クラスタIDをクラスタ番号に変換（不正・範囲外ならNone）"""
+        if not cluster_id.startswith("c") or not cluster_id[1:].isdigit():
+            return None
+        cluster = int(cluster_id[1:])
+        return cluster if cluster < self.count else None
+
+    def node(self, cluster: int) -> ClusterNode:
+        """クラスタのスーパーノードを作成"""
+        types = sorted(self._types.get(cluster, []), key=lambda t: (-t[1], t[0]))
+        return ClusterNode(
+            id=f"c{cluster}",
+            size=int(self.sizes[cluster]),
+            label=self.names[int(self.members(cluster)[0])],
+            entityTypes=dict(types[:MAX_ENTITY_TYPES]),
+        )
+
+    def summary(self, limit: int = 200) -> ClusterGraph:
+        """縮約グラフを作成
+
+        Args:
+            limit: 返すクラスタの最大数（大きい順）
+
+        Returns:
+            ClusterGraph: スーパーノードと、返したクラスタ間の集約エッジ
+        """
+        shown = min(limit, self.count)
+        lo, hi, weights = self._edges
+        keep = (lo < shown) & (hi < shown)
+        return ClusterGraph(
+            version=self.version,
+            clusterCount=self.count,
+            clusters=[self.node(c) for c in range(shown)],
+            edges=[
+                ClusterEdge(source=f"c{a}", target=f"c{b}", weight=w)
+                for a, b, w in zip(lo[keep].tolist(), hi[keep].tolist(), weights[keep].tolist())
+            ],
+            truncated=shown < self.count,
+        )
+
+    def expand(self, cluster: int, limit: int = 500) -> ClusterExpansion:
+        """1つのクラスタを展開する
+
+        所属エンティティを次数の大きい順に最大limit件返し、それらの間のリレーションと、
+        他クラスタへの接続をクラスタ単位に集約したエッジを付ける。
+
+        Args:
+            cluster: クラスタ番号
+            limit: 返すエンティティの最大数
+
+        Returns:
+            ClusterExpansion: 展開結果
+        """
+        store = self.store
+        members = self.members(cluster)
+        selected = [self.names[i] for i in members[:limit].tolist()]
+        selected_set: Set[str] = set(selected)
+
+        relations: List[Relation] = []
+        links: Dict[Tuple[str, int], int] = {}
+        for name in selected:
+            for other, rel_type, outgoing in store.iter_edges(name):
+                if other in selected_set:
+                    if outgoing:
+                        relations.append(Relation(from_=name, to=other, relationType=rel_type))
+                    continue
+                index = store.compact.entity_id(other)
+                if index is None:
+                    continue
+                other_cluster = int(self.cluster_of[index])
+                if other_cluster != cluster:
+                    key = (name, other_cluster)
+                    links[key] = links.get(key, 0) + 1
+
+        return ClusterExpansion(
+            entities=[store.get_entity(name) for name in selected],
+            relations=relations,
+            cluster=self.node(cluster),
+            version=self.version,
+            externalEdges=[
+                ClusterLink(entity=name, cluster=f"c{c}", weight=w)
+                for (name, c), w in links.items()
+            ],
+            truncated=len(members) > limit,
+        )
@@ -0,0 +1,623 @@
+"""コンパクトなグラフ表現
+
+キャッシュ用の内部表現。エンティティ・リレーションをPydanticモデルとして保持せず、
+文字列は重複排除したテーブルに一度だけ格納し、残りは整数IDの配列で表す。
+
+- ノード: エンティティ名とリレーション端点の名前（エンティティが先頭、登録順）
+- エンティティ: entityType ID 列と、observations（共有文字列テーブルのID）のオフセット付き配列。
+  observations の文字列はブロック単位で圧縮して保持し、参照時に展開する
+- リレーション: 始点・終点ノードID列と relationType ID 列
+
+Pydanticモデルは API 応答を作るときにだけ、必要な分を組み立てる。
+"""
+
+import json
+import sys
+import threading
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+import numpy as np
+
+from models.memory import Entity, MemoryGraph, Relation
+
+T = TypeVar("T")
+
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+# observations を圧縮するブロックの大きさ（展開後のバイト数の目安）
+OBSERVATION_BLOCK_SIZE = 32 * 1024
+
+# zlibの圧縮レベル（読み込み時間を優先して最速のレベルにする）
+OBSERVATION_COMPRESS_LEVEL = 1
+
+# 展開済みのまま保持するブロック数
+OBSERVATION_BLOCK_CACHE = 8
+
+# (出オフセット, 出リレーション番号, 入オフセット, 入リレーション番号)
+Adjacency = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def csr(keys: np.ndarray, node_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """ノードIDごとのオフセットと、ノードID順（同一ノード内は登録順）のリレーション番号"""
+    order = np.argsort(keys, kind="stable").astype(np.uint32)
+    offsets = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=node_count), out=offsets[1:])
+    return offsets, order
+
+
+class StringTable:
+    """文字列の重複排除テーブル（文字列 ⇔ 連番ID）"""
+
+    __slots__ = ("strings", "_ids")
+
+    def __init__(self, strings: Iterable[str] = ()):
+        """初期化
+
+        Args:
+            strings: 初期登録する文字列（重複なし、この順にIDを振る）
+        """
+        self.strings: List[str] = list(strings)
+        self._ids: Dict[str, int] = {s: i for i, s in enumerate(self.strings)}
+
+    def intern(self, value: str) -> int:
+        """文字列を登録してIDを返す（登録済みなら既存のID）"""
+        index = self._ids.get(value)
+        if index is None:
+            index = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class LazySequence(Sequence[T]):
+    """要素を参照時に組み立てる読み取り専用シーケンス"""
+
+    def __init__(self, length: int, get: Callable[[int], T]):
+        self._length = length
+        self._get = get
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("sequence index out of range")
+        return self._get(index)
+
+    def __iter__(self) -> Iterator[T]:
+        get = self._get
+        for i in range(self._length):
+            yield get(i)
+
+
+class CompressedStrings(Sequence[str]):
+    """ブロック単位でzlib圧縮した読み取り専用の文字列シーケンス
+
+    文字列をUTF-8で連結し、約 block_size バイトごと（文字列の境界）に区切って圧縮する。
+    要素は参照時に、含まれるブロックだけを展開してデコードする。
+    直近に展開したブロックはいくつか保持する。
+    """
+
+    def __init__(
+        self,
+        strings: Iterable[str] = (),
+        base: Optional["CompressedStrings"] = None,
+        block_size: int = OBSERVATION_BLOCK_SIZE,
+        level: int = OBSERVATION_COMPRESS_LEVEL,
+    ):
+        """初期化（圧縮）
+
+        Args:
+            strings: 格納する文字列
+            base: 先頭に置く既存のシーケンス（圧縮済みのブロックを共有し、strings をその後ろに追加する）
+            block_size: ブロックの大きさ（展開後のバイト数の目安）
+            level: zlibの圧縮レベル
+        """
+        # 圧縮済みブロック、各ブロックの先頭の要素番号、連結したバイト列上の要素の境界
+        self._blocks: List[bytes] = []
+        self._firsts: List[int] = []
+        self._offsets = array("q", [0])
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        pending: List[bytes] = []
+        size = 0
+        first = 0
+        if base is not None:
+            self._blocks = base._blocks[:]
+            self._firsts = base._firsts[:]
+            self._offsets = base._offsets[:]
+            first = len(base)
+            if self._blocks:
+                tail = base._block(len(self._blocks) - 1)
+                if len(tail) < block_size // 2:
+                    # 小さい末尾ブロックは追加分とまとめて圧縮し直す
+                    self._blocks.pop()
+                    first = self._firsts.pop()
+                    pending.append(tail)
+                    size = len(tail)
+
+        offsets = self._offsets
+        for value in strings:
+            data = value.encode("utf-8")
+            if size and size + len(data) > block_size:
+                self._blocks.append(zlib.compress(b"".join(pending), level))
+                self._firsts.append(first)
+                pending, size, first = [], 0, len(offsets) - 1
+            pending.append(data)
+            size += len(data)
+            offsets.append(offsets[-1] + len(data))
+        if pending:
+            self._blocks.append(zlib.compress(b"".join(pending), level))
+            self._firsts.append(first)
+
+    @property
+    def nbytes(self) -> int:
+        """圧縮済みブロックと索引のおおよそのメモリ使用量（バイト）"""
+        return (
+            sum(map(sys.getsizeof, self._blocks))
+            + sys.getsizeof(self._blocks)
+            + sys.getsizeof(self._firsts)
+            + self._offsets.itemsize * len(self._offsets)
+        )
+
+    def _block(self, block: int) -> bytes:
+        """展開したブロック（直近に使ったものは保持する）"""
+        with self._lock:
+            raw = self._cache.get(block)
+            if raw is not None:
+                self._cache.move_to_end(block)
+                return raw
+        raw = zlib.decompress(self._blocks[block])
+        with self._lock:
+            self._cache[block] = raw
+            if len(self._cache) > OBSERVATION_BLOCK_CACHE:
+                self._cache.popitem(last=False)
+        return raw
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sequence index out of range")
+        block = bisect_right(self._firsts, index) - 1
+        raw = self._block(block)
+        offsets = self._offsets
+        base = offsets[self._firsts[block]]
+        return raw[offsets[index] - base:offsets[index + 1] - base].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        # 全体の走査ではブロックを順に一度ずつ展開する（保持はしない）
+        offsets = self._offsets
+        ends = self._firsts[1:] + [len(self)]
+        for block, first, end in zip(self._blocks, self._firsts, ends):
+            raw = zlib.decompress(block)
+            base = offsets[first]
+            for i in range(first, end):
+                yield raw[offsets[i] - base:offsets[i + 1] - base].decode("utf-8")
+
+
+class CompactGraph:
+    """整数IDと共有文字列テーブルによる不変のグラフ表現
+
+    ノードID 0〜entity_count-1 がエンティティ（登録順）、それ以降は
+    エンティティとして存在しないリレーション端点を表す。
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        entity_count: int,
+        entity_types: List[str],
+        entity_type_ids: np.ndarray,
+        observations: Sequence[str],
+        obs_offsets: np.ndarray,
+        obs_ids: np.ndarray,
+        relation_types: List[str],
+        rel_src: np.ndarray,
+        rel_dst: np.ndarray,
+        rel_type: np.ndarray,
+    ):
+        self.names = names
+        self.entity_count = entity_count
+        self.entity_types = entity_types
+        self.entity_type_ids = entity_type_ids
+        self.observations = observations
+        self.obs_offsets = obs_offsets
+        self.obs_ids = obs_ids
+        self.relation_types = relation_types
+        self.rel_src = rel_src
+        self.rel_dst = rel_dst
+        self.rel_type = rel_type
+        self._ids: Dict[str, int] = {name: i for i, name in enumerate(names)}
+
+    @classmethod
+    def from_graph(cls, graph: MemoryGraph, dedupe_relations: bool = False) -> "CompactGraph":
+        """MemoryGraphから変換する
+
+        Args:
+            graph: 変換元のグラフ
+            dedupe_relations: 同一リレーションを1件にまとめるか
+
+        Returns:
+            CompactGraph: 変換後のグラフ
+        """
+        builder = CompactGraphBuilder(dedupe_relations=dedupe_relations)
+        for entity in graph.entities:
+            builder.add_entity(entity)
+        for relation in graph.relations:
+            builder.add_relation(relation)
+        return builder.build()
+
+    @property
+    def node_count(self) -> int:
+        """ノード数（エンティティ＋存在しない端点）"""
+        return len(self.names)
+
+    @property
+    def relation_count(self) -> int:
+        """リレーション数"""
+        return len(self.rel_src)
+
+    def nbytes(self) -> int:
+        """保持しているデータのおおよそのメモリ使用量（バイト）
+
+        配列のバイト数に、文字列オブジェクトと名前の索引（dict）の大きさを加える。
+        圧縮した observations は圧縮後の大きさで数える。
+        文字列を走査するため、読み込み後に一度だけ呼ぶ想定。
+        """
+        arrays = (
+            self.entity_type_ids, self.obs_offsets, self.obs_ids, self.rel_src, self.rel_dst, self.rel_type,
+        )
+        strings = [self.names, self.entity_types, self.relation_types]
+        observations = getattr(self.observations, "nbytes", None)
+        if observations is None:
+            strings.append(self.observations)
+            observations = 0
+        return (
+            sum(memoryview(a).nbytes for a in arrays)
+            + sum(sys.getsizeof(s) + sum(map(sys.getsizeof, s)) for s in strings)
+            + observations
+            + sys.getsizeof(self._ids)
+        )
+
+    def node_id(self, name: str) -> Optional[int]:
+        """名前からノードIDを取得（未登録ならNone）"""
+        return self._ids.get(name)
+
+    def entity_id(self, name: str) -> Optional[int]:
+        """名前からエンティティIDを取得（エンティティでなければNone）"""
+        node = self.node_id(name)
+        return node if node is not None and node < self.entity_count else None
+
+    def adjacency(self) -> Adjacency:
+        """入出力の隣接リスト（CSR形式）を構築する"""
+        out_offsets, out_rel = csr(self.rel_src, self.node_count)
+        in_offsets, in_rel = csr(self.rel_dst, self.node_count)
+        return out_offsets, out_rel, in_offsets, in_rel
+
+    def subgraph(self, entities: np.ndarray, relations: np.ndarray) -> "CompactGraph":
+        """エンティティ・リレーションの部分集合からなるグラフを作成する
+
+        リレーションの端点のうち entities に含まれないノードは、存在しない端点として
+        後ろに並べる。observations は残すエンティティが参照するものだけで
+        テーブルを作り直す（本体の生成で全体をデコードしないため）。種類名のテーブルは元のグラフと共有する。
+
+        Args:
+            entities: 残すエンティティのID（昇順）
+            relations: 残すリレーションの番号（昇順）
+
+        Returns:
+            CompactGraph: 部分グラフ
+        """
+        entities = np.asarray(entities, dtype=np.int64)
+        src = self.rel_src[relations]
+        dst = self.rel_dst[relations]
+        kept = np.zeros(self.node_count, dtype=bool)
+        kept[entities] = True
+        endpoints = np.unique(np.concatenate([src, dst]))
+        order = np.concatenate([entities, endpoints[~kept[endpoints]]])
+        remap = np.zeros(self.node_count, dtype=np.uint32)
+        remap[order] = np.arange(len(order), dtype=np.uint32)
+
+        starts = self.obs_offsets[entities]
+        lengths = self.obs_offsets[entities + 1] - starts
+        offsets = np.zeros(len(entities) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        gather = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        obs_ids = self.obs_ids[gather]
+        used = np.unique(obs_ids)
+        if len(used) == len(self.observations):
+            observations = self.observations
+        else:
+            table = self.observations
+            observations = CompressedStrings(table[i] for i in used.tolist())
+            obs_ids = np.searchsorted(used, obs_ids).astype(self.obs_ids.dtype)
+
+        names = self.names
+        return CompactGraph(
+            names=[names[i] for i in order.tolist()],
+            entity_count=len(entities),
+            entity_types=self.entity_types,
+            entity_type_ids=self.entity_type_ids[entities],
+            observations=observations,
+            obs_offsets=offsets,
+            obs_ids=obs_ids,
+            relation_types=self.relation_types,
+            rel_src=remap[src],
+            rel_dst=remap[dst],
+            rel_type=self.rel_type[relations],
+        )
+
+    def entity_type(self, index: int) -> str:
+        """エンティティの entityType"""
+        return self.entity_types[self.entity_type_ids[index]]
+
+    def observation_count(self, index: int) -> int:
+        """エンティティの observations の数"""
+        return int(self.obs_offsets[index + 1] - self.obs_offsets[index])
+
+    def observations_of(self, index: int, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """エンティティの observations（start〜stop 番目だけをデコードする）"""
+        table = self.observations
+        first, end = int(self.obs_offsets[index]), int(self.obs_offsets[index + 1])
+        ids = self.obs_ids[first:end][start:stop]
+        return [table[i] for i in ids.tolist()]
+
+    def entity(self, index: int) -> Entity:
+        """エンティティのPydanticモデルを組み立てる"""
+        return Entity.model_construct(
+            type="entity",
+            name=self.names[index],
+            entityType=self.entity_type(index),
+            observations=self.observations_of(index),
+        )
+
+    def relation(self, index: int) -> Relation:
+        """リレーションのPydanticモデルを組み立てる"""
+        return Relation.model_construct(
+            type="relation",
+            from_=self.names[self.rel_src[index]],
+            to=self.names[self.rel_dst[index]],
+            relationType=self.relation_types[self.rel_type[index]],
+        )
+
+    @property
+    def entities(self) -> LazySequence[Entity]:
+        """エンティティのシーケンス（参照した要素だけを組み立てる）"""
+        return LazySequence(self.entity_count, self.entity)
+
+    @property
+    def relations(self) -> LazySequence[Relation]:
+        """リレーションのシーケンス（参照した要素だけを組み立てる）"""
+        return LazySequence(self.relation_count, self.relation)
+
+    def to_graph(self) -> MemoryGraph:
+        """グラフ全体をMemoryGraphに組み立てる"""
+        return MemoryGraph.model_construct(
+            entities=list(self.entities), relations=list(self.relations)
+        )
+
+    def render_json(self) -> bytes:
+        """MemoryGraph.model_dump_json(by_alias=True) と同じ形式のJSONを生成する
+
+        Pydanticモデルを経由せず、共有文字列はエンコード結果を使い回す。
+
+        Returns:
+            bytes: UTF-8のJSON本体
+        """
+        names = [_encode_json(n) for n in self.names]
+        observations = [_encode_json(o) for o in self.observations]
+        entity_types = [_encode_json(t) for t in self.entity_types]
+        relation_types = [_encode_json(t) for t in self.relation_types]
+
+        offsets = self.obs_offsets.tolist()
+        obs_ids = self.obs_ids.tolist()
+        type_ids = self.entity_type_ids.tolist()
+        parts = []
+        for i in range(self.entity_count):
+            obs = ",".join([observations[o] for o in obs_ids[offsets[i]:offsets[i + 1]]])
+            parts.append(
+                f'{{"type":"entity","name":{names[i]},"entityType":{entity_types[type_ids[i]]},'
+                f'"observations":[{obs}]}}'
+            )
+        entities_json = ",".join(parts)
+
+        parts = [
+            f'{{"type":"relation","from":{names[s]},"to":{names[d]},"relationType":{relation_types[t]}}}'
+            for s, d, t in zip(self.rel_src.tolist(), self.rel_dst.tolist(), self.rel_type.tolist())
+        ]
+        relations_json = ",".join(parts)
+        return f'{{"entities":[{entities_json}],"relations":[{relations_json}]}}'.encode("utf-8")
+
+
+class CompactGraphBuilder:
+    """CompactGraphをレコード単位で組み立てる
+
+    同名のエンティティは後から追加したもので置き換える（位置は最初の登録位置のまま）。
+    """
+
+    def __init__(self, dedupe_relations: bool = False):
+        """初期化
+
+        Args:
+            dedupe_relations: 同一リレーション（from, to, relationType）を1件にまとめるか
+        """
+        self._nodes = StringTable()
+        self._entity_types = StringTable()
+        self._relation_types = StringTable()
+        self._observations = StringTable()
+        # 圧縮済みの observations（from_compact で再開した場合）。展開せずにそのまま共有し、
+        # 追加分は _observations に len(base) 以降のIDで登録して build() で後ろに圧縮する
+        self._observation_base: Optional[CompressedStrings] = None
+        # ノードID → エンティティ番号（エンティティでなければ -1）
+        self._entity_of_node = array("i")
+        # エンティティ番号 → ノードID・entityType ID・observations の範囲
+        self._entity_node = array("I")
+        self._entity_type = array("I")
+        self._obs_start = array("Q")
+        self._obs_len = array("I")
+        self._obs_flat = array("I")
+        self._replaced = False
+        self._src = array("I")
+        self._dst = array("I")
+        self._rel_type = array("I")
+        self._seen: Optional[set] = set() if dedupe_relations else None
+
+    @classmethod
+    def from_compact(cls, graph: CompactGraph, dedupe_relations: bool = False) -> "CompactGraphBuilder":
+        """既存のグラフの内容から組み立てを再開する（追記の反映用）"""
+        builder = cls(dedupe_relations=dedupe_relations)
+        builder._nodes = StringTable(graph.names)
+        builder._entity_types = StringTable(graph.entity_types)
+        builder._relation_types = StringTable(graph.relation_types)
+        observations = graph.observations
+        if not isinstance(observations, CompressedStrings):
+            # メモリマップしたグラフなどはブロック単位に圧縮し直す（全体を文字列のまま持たない）
+            observations = CompressedStrings(observations)
+        builder._observation_base = observations
+        n = graph.entity_count
+        builder._entity_of_node = array("i", range(n))
+        builder._entity_of_node.extend([-1] * (graph.node_count - n))
+        builder._entity_node = array("I", range(n))
+        builder._entity_type = array("I", graph.entity_type_ids.astype(np.uint32).tobytes())
+        builder._obs_start = array("Q", graph.obs_offsets[:-1].astype(np.uint64).tobytes())
+        builder._obs_len = array("I", np.diff(graph.obs_offsets).astype(np.uint32).tobytes())
+        builder._obs_flat = array("I", graph.obs_ids.astype(np.uint32).tobytes())
+        builder._src = array("I", graph.rel_src.astype(np.uint32).tobytes())
+        builder._dst = array("I", graph.rel_dst.astype(np.uint32).tobytes())
+        builder._rel_type = array("I", graph.rel_type.astype(np.uint32).tobytes())
+        if builder._seen is not None:
+            builder._seen.update(zip(builder._src, builder._dst, builder._rel_type))
+        return builder
+
+    def _node(self, name: str) -> int:
+        """ノードIDを取得（未登録なら登録する）"""
+        node = self._nodes.intern(name)
+        if node == len(self._entity_of_node):
+            self._entity_of_node.append(-1)
+        return node
+
+    def add_entity(self, entity: Entity) -> None:
+        """エンティティを追加する（同名があれば置き換える）"""
+        node = self._node(entity.name)
+        type_id = self._entity_types.intern(entity.entityType)
+        start = len(self._obs_flat)
+        index = self._entity_of_node[node]
+        self._obs_flat.extend(self._observation_ids(entity.observations, index))
+
+        if index < 0:
+            self._entity_of_node[node] = len(self._entity_node)
+            self._entity_node.append(node)
+            self._entity_type.append(type_id)
+            self._obs_start.append(start)
+            self._obs_len.append(len(entity.observations))
+        else:
+            self._entity_type[index] = type_id
+            self._obs_start[index] = start
+            self._obs_len[index] = len(entity.observations)
+            self._replaced = True
+
+    def _observation_ids(self, observations: List[str], index: int) -> List[int]:
+        """observations の文字列IDを取得（未登録なら登録する）
+
+        圧縮済みのテーブルは展開しないため、その全体とは重複排除しない。
+        置き換えるエンティティの元の observations だけを展開して、同じ文字列は元のIDを使う。
+        """
+        base = self._observation_base
+        offset = len(base) if base is not None else 0
+        previous: Dict[str, int] = {}
+        if base is not None and index >= 0:
+            start = self._obs_start[index]
+            for i in self._obs_flat[start:start + self._obs_len[index]]:
+                if i < offset:
+                    previous[base[i]] = i
+        intern = self._observations.intern
+        ids = []
+        for value in observations:
+            i = previous.get(value)
+            ids.append(i if i is not None else offset + intern(value))
+        return ids
+
+    def add_relation(self, relation: Relation) -> None:
+        """リレーションを追加する"""
+        src = self._node(relation.from_)
+        dst = self._node(relation.to)
+        rel_type = self._relation_types.intern(relation.relationType)
+        if self._seen is not None:
+            key = (src, dst, rel_type)
+            if key in self._seen:
+                return
+            self._seen.add(key)
+        self._src.append(src)
+        self._dst.append(dst)
+        self._rel_type.append(rel_type)
+
+    def _compressed_observations(self) -> CompressedStrings:
+        """observations の文字列テーブルを圧縮する（再開した場合は追加分だけ）"""
+        return CompressedStrings(self._observations.strings, base=self._observation_base)
+
+    def build(self) -> CompactGraph:
+        """CompactGraphを作成する
+
+        エンティティが先頭に並ぶようノードIDを振り直す。
+        """
+        node_count = len(self._nodes)
+        entity_count = len(self._entity_node)
+
+        # 旧ノードID → 新ノードID（エンティティは登録順、端点だけのノードはその後ろ）
+        remap = np.full(node_count, -1, dtype=np.int64)
+        remap[np.frombuffer(self._entity_node, dtype=np.uint32)] = np.arange(entity_count)
+        dangling = remap < 0
+        remap[dangling] = np.arange(entity_count, node_count)
+        names = np.empty(node_count, dtype=object)
+        names[remap] = self._nodes.strings
+
+        lengths = np.frombuffer(self._obs_len, dtype=np.uint32).astype(np.int64)
+        offsets = np.zeros(entity_count + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        flat = np.frombuffer(self._obs_flat, dtype=np.uint32)
+        if self._replaced:
+            # 置き換えで使われなくなった範囲を詰める
+            starts = np.frombuffer(self._obs_start, dtype=np.uint64).astype(np.int64)
+            gather = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+            obs_ids = flat[gather]
+        else:
+            obs_ids = flat.copy()
+
+        def column(values: array) -> np.ndarray:
+            return remap[np.frombuffer(values, dtype=np.uint32)].astype(np.uint32)
+
+        return CompactGraph(
+            names=names.tolist(),
+            entity_count=entity_count,
+            entity_types=self._entity_types.strings,
+            entity_type_ids=np.frombuffer(self._entity_type, dtype=np.uint32).copy(),
+            observations=self._compressed_observations(),
+            obs_offsets=offsets,
+            obs_ids=obs_ids,
+            relation_types=self._relation_types.strings,
+            rel_src=column(self._src),
+            rel_dst=column(self._dst),
+            rel_type=np.frombuffer(self._rel_type, dtype=np.uint32).copy(),
+        )
+
+
+def as_compact(graph: Union[MemoryGraph, CompactGraph]) -> CompactGraph:
+    """MemoryGraphならCompactGraphに変換する"""
+    return graph if isinstance(graph, CompactGraph) else CompactGraph.from_graph(graph)
@@ -0,0 +1,158 @@
+"""データファイル監視
+
+データファイルの変更を検知し、バックグラウンドでグラフを再構築する。
+watchfiles（inotify等）が利用できればOSの変更通知を使い、
+利用できない環境では mtime・サイズのポーリングで検知する。
+短時間に連続した書き込みはデバウンスして1回の再構築にまとめる。
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+
+from services.memory_client import MemoryMCPClient
+
+try:
+    from watchfiles import awatch
+except ImportError:  # watchfiles未インストール時はポーリングで監視
+    awatch = None
+
+logger = logging.getLogger(__name__)
+
+# 停止時に通知スレッドの終了を待つ最大時間（秒）
+STOP_TIMEOUT = 2.0
+
+# (mtime_ns, size, inode)
+FileSignature = Optional[Tuple[int, int, int]]
+
+
+def file_signature(path: Path) -> FileSignature:
+    """変更検知用のファイル署名を取得
+
+    Args:
+        path: 対象ファイルパス
+
+    Returns:
+        FileSignature: (mtime_ns, size, inode)、ファイルが存在しない場合はNone
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class FileWatcher:
+    """データファイル監視タスク
+
+    変更を検知すると client.reload() を呼び出す。
+    再構築中も既存のスナップショットが提供され続け、完成後に差し替わる。
+    """
+
+    def __init__(
+        self,
+        client: MemoryMCPClient,
+        debounce: float = 0.5,
+        poll_interval: float = 1.0,
+        use_notify: Optional[bool] = None,
+    ):
+        """初期化
+
+        Args:
+            client: 再構築対象のMemory MCPクライアント
+            debounce: 最後の変更から再構築までの待ち時間（秒）
+            poll_interval: ポーリング間隔（秒）
+            use_notify: OSの変更通知を使うか（Noneなら利用可能な場合に使う）
+        """
+        self.client = client
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_notify = awatch is not None if use_notify is None else use_notify
+        self.reload_count = 0
+        self._changed = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._tasks: list = []
+
+    @property
+    def path(self) -> Optional[Path]:
+        """監視対象のファイルパス"""
+        return self.client.data_file
+
+    def start(self) -> None:
+        """監視を開始する"""
+        if self._tasks or self.path is None:
+            return
+        self._stop.clear()
+        detector = self._watch_notify() if self.use_notify else self._watch_poll()
+        self._tasks = [
+            asyncio.create_task(detector),
+            asyncio.create_task(self._reload_loop()),
+        ]
+        logger.info(
+            "Watching %s (%s)", self.path, "notify" if self.use_notify else "polling"
+        )
+
+    async def stop(self) -> None:
+        """監視を停止する
+
+        OSの変更通知はワーカースレッドで待ち受けているため、停止イベントで
+        スレッドが終了するのを待ってからタスクを取り消す（終了前にプロセスが
+        終わるとスレッドが強制終了され、異常終了することがある）。
+        """
+        self._stop.set()
+        if self._tasks and self.use_notify:
+            await asyncio.wait(self._tasks[:1], timeout=STOP_TIMEOUT)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _watch_notify(self) -> None:
+        """OSの変更通知でファイル変更を検知する"""
+        target = self.path.resolve()
+
+        def only_target(_change, changed_path: str) -> bool:
+            return Path(changed_path).resolve() == target
+
+        # アトミックな置き換え（rename）も拾えるよう親ディレクトリを監視する
+        async for _ in awatch(
+            target.parent,
+            watch_filter=only_target,
+            debounce=int(self.debounce * 1000),
+            stop_event=self._stop,
+            recursive=False,
+        ):
+            self._changed.set()
+
+    async def _watch_poll(self) -> None:
+        """mtime・サイズのポーリングでファイル変更を検知する"""
+        last = file_signature(self.path)
+        while not self._stop.is_set():
+            await asyncio.sleep(self.poll_interval)
+            current = file_signature(self.path)
+            if current != last:
+                last = current
+                self._changed.set()
+
+    async def _reload_loop(self) -> None:
+        """変更通知をデバウンスして再構築する"""
+        while not self._stop.is_set():
+            await self._changed.wait()
+            # 連続した書き込みが落ち着くまで待つ
+            while True:
+                self._changed.clear()
+                await asyncio.sleep(self.debounce)
+                if not self._changed.is_set():
+                    break
+
+            if file_signature(self.path) is None:
+                continue  # 置き換え途中で一時的に存在しない
+
+            try:
+                await self.client.reload()
+                self.reload_count += 1
+                logger.info("Reloaded graph from %s", self.path)
+            except Exception:
+                # 失敗しても既存のスナップショットを提供し続ける
+                logger.exception("Failed to reload graph from %s", self.path)
@@ -0,0 +1,151 @@
+"""スナップショット間の構造差分"""
+
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+from models.memory import MemoryGraph, Entity, Relation, GraphDelta, ObservationChange
+from services.compact_graph import CompactGraph, as_compact
+
+RelationKey = Tuple[str, str, str]
+
+
+def _relation_keys(graph: CompactGraph) -> Dict[RelationKey, None]:
+    """(from, to, relationType) の順序付き集合"""
+    names = graph.names
+    types = graph.relation_types
+    return dict.fromkeys(
+        (names[s], names[d], types[t])
+        for s, d, t in zip(graph.rel_src.tolist(), graph.rel_dst.tolist(), graph.rel_type.tolist())
+    )
+
+
+class _EntityChanges:
+    """エンティティ・observations の差分の集計"""
+
+    def __init__(self, old: CompactGraph, new: CompactGraph):
+        self.old = old
+        self.new = new
+        self.added_entities: List[Entity] = []
+        self.removed_entities: List[str] = []
+        self.added_obs: List[ObservationChange] = []
+        self.removed_obs: List[ObservationChange] = []
+
+    def compare(self, index: int, name: str) -> None:
+        """new のエンティティを old の同名エンティティと比較する"""
+        old, new = self.old, self.new
+        before = old.entity_id(name)
+        if before is None:
+            self.added_entities.append(new.entity(index))
+            return
+        if old.entity_type(before) != new.entity_type(index):
+            # 種類の変更は削除→追加として表す
+            self.removed_entities.append(name)
+            self.added_entities.append(new.entity(index))
+            return
+        old_observations = old.observations_of(before)
+        new_observations = new.observations_of(index)
+        if old_observations == new_observations:
+            return
+        old_set: Set[str] = set(old_observations)
+        new_set: Set[str] = set(new_observations)
+        added = [o for o in new_observations if o not in old_set]
+        removed = [o for o in old_observations if o not in new_set]
+        if added:
+            self.added_obs.append(ObservationChange(entityName=name, observations=added))
+        if removed:
+            self.removed_obs.append(ObservationChange(entityName=name, observations=removed))
+
+    def delta(
+        self,
+        from_version: int,
+        to_version: int,
+        added_relations: List[Relation],
+        removed_relations: List[Relation],
+    ) -> GraphDelta:
+        """集計した差分とリレーションの差分から GraphDelta を作成する"""
+        return GraphDelta(
+            fromVersion=from_version,
+            toVersion=to_version,
+            addedEntities=self.added_entities,
+            removedEntities=self.removed_entities,
+            addedObservations=self.added_obs,
+            removedObservations=self.removed_obs,
+            addedRelations=added_relations,
+            removedRelations=removed_relations,
+        )
+
+
+def diff_graphs(
+    old: Union[MemoryGraph, CompactGraph],
+    new: Union[MemoryGraph, CompactGraph],
+    from_version: int,
+    to_version: int,
+) -> GraphDelta:
+    """2つのグラフの構造差分を求める
+
+    エンティティは名前、リレーションは (from, to, relationType) で同一性を判定する。
+    変更のあったエンティティ・リレーションだけをPydanticモデルに組み立てる。
+
+    Args:
+        old: 変更前のグラフ
+        new: 変更後のグラフ
+        from_version: 変更前の版番号
+        to_version: 変更後の版番号
+
+    Returns:
+        GraphDelta: 構造差分
+    """
+    old = as_compact(old)
+    new = as_compact(new)
+
+    changes = _EntityChanges(old, new)
+    changes.removed_entities.extend(
+        n for n in old.names[:old.entity_count] if new.entity_id(n) is None
+    )
+    for index, name in enumerate(new.names[:new.entity_count]):
+        changes.compare(index, name)
+
+    old_relations = _relation_keys(old)
+    new_relations = _relation_keys(new)
+    return changes.delta(
+        from_version,
+        to_version,
+        [
+            Relation(from_=f, to=t, relationType=r)
+            for f, t, r in new_relations if (f, t, r) not in old_relations
+        ],
+        [
+            Relation(from_=f, to=t, relationType=r)
+            for f, t, r in old_relations if (f, t, r) not in new_relations
+        ],
+    )
+
+
+def diff_appended(
+    old: CompactGraph,
+    new: CompactGraph,
+    entity_names: Iterable[str],
+    from_version: int,
+    to_version: int,
+) -> GraphDelta:
+    """追記レコードを反映したグラフの差分を求める（JSONLの追記の反映用）
+
+    追記ではエンティティ・リレーションは削除されず、追加されたリレーションは
+    new の末尾に並ぶ（merge_records の結果）。追記されたエンティティだけを比較し、
+    グラフ全体は走査しない。
+
+    Args:
+        old: 追記前のグラフ
+        new: old に追記レコードを反映したグラフ
+        entity_names: 追記されたエンティティ名
+        from_version: 変更前の版番号
+        to_version: 変更後の版番号
+
+    Returns:
+        GraphDelta: 構造差分（diff_graphs と同じ内容）
+    """
+    changes = _EntityChanges(old, new)
+    # diff_graphs と同じく new のエンティティ順に比較する
+    for index in sorted({new.entity_id(name) for name in entity_names}):
+        changes.compare(index, new.names[index])
+    added_relations = [new.relation(i) for i in range(old.relation_count, new.relation_count)]
+    return changes.delta(from_version, to_version, added_relations, [])
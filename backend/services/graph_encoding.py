@@ -0,0 +1,153 @@
+"""グラフのエンコード済みレスポンス
+
+スナップショットごとにJSON本体を一度だけ生成し、gzip / brotli 圧縮版とともに保持する。
+ETagは本体のハッシュから作るため、同じ内容なら再起動後やワーカー間でも一致する。
+"""
+
+import gzip
+import hashlib
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli未インストール時はgzipのみ提供
+    brotli = None
+
+IDENTITY = "identity"
+
+# 圧縮方式 → 圧縮関数（優先度の高い順）
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=5)
+COMPRESSORS["gzip"] = lambda body: gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Iterable[str] = COMPRESSORS) -> str:
+    """Accept-Encodingヘッダーから使用する圧縮方式を選ぶ
+
+    Args:
+        accept_encoding: Accept-Encodingヘッダー値
+        available: サーバー側で利用可能な圧縮方式（優先度の高い順）
+
+    Returns:
+        str: 圧縮方式（該当なしなら "identity"）
+    """
+    if not accept_encoding:
+        return IDENTITY
+
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+
+    best, best_q = IDENTITY, 0.0
+    for coding in available:
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Matchヘッダーが指定ETagに一致するか（弱い比較）
+
+    圧縮方式ごとのETag（"<hash>-gzip" 等）も同じ版として一致とみなす。
+
+    Args:
+        if_none_match: If-None-Matchヘッダー値
+        etag: 現在の版のETag（identity版）
+
+    Returns:
+        bool: 一致すればTrue
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    base = etag.strip('"')
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag == base or tag.split("-", 1)[0] == base:
+            return True
+    return False
+
+
+class EncodedBody:
+    """エンコード済みレスポンス本体
+
+    JSON本体と圧縮版を遅延生成してキャッシュする。スレッドセーフ。
+    """
+
+    def __init__(self, render: Callable[[], bytes]):
+        """初期化
+
+        Args:
+            render: JSON本体を生成する関数（初回アクセス時に一度だけ呼ばれる）
+        """
+        self._render = render
+        self._lock = threading.Lock()
+        self._variants: Dict[str, bytes] = {}
+        self._etag: Optional[str] = None
+
+    def ready(self, encoding: str = IDENTITY) -> bool:
+        """指定方式の本体が生成済みか"""
+        return encoding in self._variants
+
+    @property
+    def nbytes(self) -> int:
+        """生成済みの本体の合計バイト数"""
+        return sum(len(body) for body in list(self._variants.values()))
+
+    @property
+    def etag(self) -> str:
+        """identity版の強いETag"""
+        self.get(IDENTITY)
+        return self._etag
+
+    def etag_for(self, encoding: str) -> str:
+        """圧縮方式ごとの強いETag"""
+        if encoding == IDENTITY:
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+    def get(self, encoding: str = IDENTITY) -> bytes:
+        """指定方式の本体を取得（未生成なら生成する）
+
+        Args:
+            encoding: "identity"、"gzip"、"br" のいずれか
+
+        Returns:
+            bytes: レスポンス本体
+        """
+        body = self._variants.get(encoding)
+        if body is not None:
+            return body
+
+        with self._lock:
+            if encoding == IDENTITY:
+                return self._identity_locked()
+            body = self._variants.get(encoding)
+            if body is None:
+                body = COMPRESSORS[encoding](self._identity_locked())
+                self._variants[encoding] = body
+            return body
+
+    def _identity_locked(self) -> bytes:
+        """identity版を取得（ロック取得済みの状態で呼ぶ）"""
+        body = self._variants.get(IDENTITY)
+        if body is None:
+            body = self._render()
+            self._etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            self._variants[IDENTITY] = body
+        return body
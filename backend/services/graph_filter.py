@@ -0,0 +1,154 @@
+"""サーバー側のグラフ絞り込み
+
+entityType・relationType の包含／除外と最小次数でグラフを絞り込む。
+種類ごとのID集合（CSR形式）と次数順のノード列をスナップショットの読み込み時に
+構築しておき、絞り込みは集合の和・差・積（ブール配列の演算）で求める。
+"""
+
+from typing import Collection, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from services.compact_graph import Adjacency, CompactGraph, csr
+
+
+class GraphFilter(NamedTuple):
+    """グラフの絞り込み条件（キャッシュのキーにも使う）"""
+
+    entity_types: Optional[Tuple[str, ...]] = None
+    exclude_entity_types: Tuple[str, ...] = ()
+    relation_types: Optional[Tuple[str, ...]] = None
+    exclude_relation_types: Tuple[str, ...] = ()
+    min_degree: int = 0
+
+    @classmethod
+    def of(
+        cls,
+        entity_types: Optional[Collection[str]] = None,
+        exclude_entity_types: Optional[Collection[str]] = None,
+        relation_types: Optional[Collection[str]] = None,
+        exclude_relation_types: Optional[Collection[str]] = None,
+        min_degree: int = 0,
+    ) -> "GraphFilter":
+        """指定順・重複に依存しない正規化した条件を作成する"""
+
+        def normalize(values: Optional[Collection[str]]) -> Optional[Tuple[str, ...]]:
+            return None if values is None else tuple(sorted(set(values)))
+
+        return cls(
+            normalize(entity_types),
+            normalize(exclude_entity_types) or (),
+            normalize(relation_types),
+            normalize(exclude_relation_types) or (),
+            max(0, min_degree),
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        """絞り込み条件がないか"""
+        return self == GraphFilter()
+
+    @property
+    def filters_entities(self) -> bool:
+        """エンティティを絞り込む条件があるか"""
+        return self.entity_types is not None or bool(self.exclude_entity_types) or self.min_degree > 0
+
+
+class TypeIndex:
+    """種類ごとのID集合と次数順のノード列
+
+    スナップショットごとに一度だけ構築する。
+    """
+
+    def __init__(self, graph: CompactGraph, adjacency: Adjacency):
+        """初期化（索引構築）
+
+        Args:
+            graph: 対象のグラフ
+            adjacency: graph の隣接リスト（次数の計算に使う）
+        """
+        self.graph = graph
+        # entityType → エンティティID、relationType → リレーション番号
+        self._entity_offsets, self._entity_members = csr(
+            np.asarray(graph.entity_type_ids, dtype=np.int64), len(graph.entity_types)
+        )
+        self._relation_offsets, self._relation_members = csr(
+            np.asarray(graph.rel_type, dtype=np.int64), len(graph.relation_types)
+        )
+        self._entity_type_ids = {t: i for i, t in enumerate(graph.entity_types)}
+        self._relation_type_ids = {t: i for i, t in enumerate(graph.relation_types)}
+
+        # エンティティを次数の昇順に並べ、最小次数の条件を二分探索で求める
+        out_offsets, _, in_offsets, _ = adjacency
+        count = graph.entity_count
+        degree = np.diff(out_offsets)[:count] + np.diff(in_offsets)[:count]
+        self._by_degree = np.argsort(degree, kind="stable")
+        self._sorted_degree = degree[self._by_degree]
+
+    def arrays(self) -> Tuple[np.ndarray, ...]:
+        """索引の配列（メモリ使用量の見積もり用）"""
+        return (
+            self._entity_offsets, self._entity_members, self._relation_offsets,
+            self._relation_members, self._by_degree, self._sorted_degree,
+        )
+
+    def _entity_mask(self, types: Collection[str]) -> np.ndarray:
+        """指定した entityType のエンティティ集合（ブール配列）"""
+        mask = np.zeros(self.graph.entity_count, dtype=bool)
+        for name in types:
+            type_id = self._entity_type_ids.get(name)
+            if type_id is not None:
+                mask[self._entity_members[self._entity_offsets[type_id]:self._entity_offsets[type_id + 1]]] = True
+        return mask
+
+    def _relation_mask(self, types: Collection[str]) -> np.ndarray:
+        """指定した relationType のリレーション集合（ブール配列）"""
+        mask = np.zeros(self.graph.relation_count, dtype=bool)
+        for name in types:
+            type_id = self._relation_type_ids.get(name)
+            if type_id is not None:
+                mask[self._relation_members[self._relation_offsets[type_id]:self._relation_offsets[type_id + 1]]] = True
+        return mask
+
+    def select(self, graph_filter: GraphFilter) -> Tuple[np.ndarray, np.ndarray]:
+        """条件に一致するエンティティID・リレーション番号を求める
+
+        最小次数は絞り込み前のグラフでの次数（入出力リレーション数の合計）で判定する。
+        リレーションは両端が残る場合だけ残す。エンティティを絞り込む条件がある場合、
+        エンティティとして存在しない端点へのリレーションは残さない。
+
+        Args:
+            graph_filter: 絞り込み条件
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (エンティティID, リレーション番号)（いずれも昇順）
+        """
+        graph = self.graph
+        f = graph_filter
+        if f.entity_types is not None:
+            entities = self._entity_mask(f.entity_types)
+        else:
+            entities = np.ones(graph.entity_count, dtype=bool)
+        if f.exclude_entity_types:
+            entities &= ~self._entity_mask(f.exclude_entity_types)
+        if f.min_degree > 0:
+            start = np.searchsorted(self._sorted_degree, f.min_degree, side="left")
+            entities[self._by_degree[:start]] = False
+
+        if f.relation_types is not None:
+            relations = self._relation_mask(f.relation_types)
+        else:
+            relations = np.ones(graph.relation_count, dtype=bool)
+        if f.exclude_relation_types:
+            relations &= ~self._relation_mask(f.exclude_relation_types)
+
+        # ノード単位の集合（存在しない端点はエンティティの条件がなければ残す）
+        nodes = np.full(graph.node_count, not f.filters_entities, dtype=bool)
+        nodes[:graph.entity_count] = entities
+        relations &= nodes[graph.rel_src] & nodes[graph.rel_dst]
+        return np.flatnonzero(entities), np.flatnonzero(relations)
+
+    def apply(self, graph_filter: GraphFilter) -> CompactGraph:
+        """条件で絞り込んだ部分グラフを作成する"""
+        entities, relations = self.select(graph_filter)
+        return self.graph.subgraph(entities, relations)
@@ -0,0 +1,202 @@
+"""グラフのワイヤーフォーマット
+
+Acceptヘッダーに応じて、JSON（デフォルト）のほかに次の形式でグラフを返す。
+
+- MessagePack（application/msgpack）: JSONと同じ構造のバイナリ表現
+- Arrow IPCストリーム（application/vnd.apache.arrow.stream）: 列指向の表現。
+  ノード表（name, entityType, observations, isEntity）とリレーション表
+  （source, target, relationType）の2つのストリームを連結して返す。
+  source / target はノード表の行番号、entityType / relationType は辞書エンコードされる。
+
+それぞれのライブラリ（msgpack / pyarrow）がインストールされている場合のみ提供する。
+"""
+
+import json
+from typing import Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from models.memory import MemoryGraph
+from services.compact_graph import CompactGraph
+
+try:
+    import msgpack
+except ImportError:  # msgpack未インストール時はMessagePackを提供しない
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow未インストール時はArrowを提供しない
+    pa = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+# 提供する形式（同じ優先度ならこの順で選ぶ）
+MEDIA_TYPES: List[str] = [JSON]
+if msgpack is not None:
+    MEDIA_TYPES.append(MSGPACK)
+if pa is not None:
+    MEDIA_TYPES.append(ARROW)
+
+# グラフ以外の応答（経路・エンティティ詳細など）で提供する形式
+RECORD_MEDIA_TYPES: List[str] = [t for t in MEDIA_TYPES if t != ARROW]
+
+# 別名 → 正式なメディアタイプ
+_ALIASES = {"application/x-msgpack": MSGPACK}
+
+
+def choose_media_type(accept: Optional[str], available: List[str] = MEDIA_TYPES) -> Optional[str]:
+    """Acceptヘッダーから応答形式を選ぶ
+
+    q値が同じ場合は、ワイルドカードより明示的に指定された形式を優先する。
+
+    Args:
+        accept: Acceptヘッダー値（未指定ならJSON）
+        available: サーバー側で提供可能な形式（優先度の高い順）
+
+    Returns:
+        str: メディアタイプ、受け入れ可能な形式がなければNone
+    """
+    if not accept:
+        return JSON
+
+    accepted: Dict[str, float] = {}
+    for part in accept.split(","):
+        media_range, *params = part.strip().split(";")
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media_range = media_range.strip().lower()
+        accepted[_ALIASES.get(media_range, media_range)] = q
+
+    best, best_score = None, (0.0, -1)
+    for media_type in available:
+        major = media_type.split("/")[0]
+        for specificity, key in enumerate(("*/*", f"{major}/*", media_type)):
+            q = accepted.get(key)
+            if q is None:
+                continue
+            if (q, specificity) > best_score:
+                best, best_score = media_type, (q, specificity)
+    return best if best_score[0] > 0 else None
+
+
+def _graph_document(graph: CompactGraph) -> dict:
+    """JSONと同じ構造のdictを作成"""
+    return {
+        "entities": [
+            {
+                "type": "entity",
+                "name": graph.names[i],
+                "entityType": graph.entity_type(i),
+                "observations": graph.observations_of(i),
+            }
+            for i in range(graph.entity_count)
+        ],
+        "relations": [
+            {"type": "relation", "from": graph.names[s], "to": graph.names[d], "relationType": graph.relation_types[t]}
+            for s, d, t in zip(graph.rel_src.tolist(), graph.rel_dst.tolist(), graph.rel_type.tolist())
+        ],
+    }
+
+
+def _write_stream(sink, table, table_name: str, meta: Optional[dict]) -> None:
+    """1つの表をArrow IPCストリームとして書き出す"""
+    metadata = {"table": table_name}
+    if meta:
+        metadata["meta"] = json.dumps(meta, ensure_ascii=False)
+    table = table.replace_schema_metadata(metadata)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def render_arrow(graph: CompactGraph, meta: Optional[dict] = None) -> bytes:
+    """Arrow IPC形式（ノード表とリレーション表の2ストリーム）で出力する
+
+    Args:
+        graph: 出力するグラフ
+        meta: ノード表のスキーマメタデータ "meta" に付けるJSON（任意）
+
+    Returns:
+        bytes: 連結したArrow IPCストリーム
+    """
+    n = graph.entity_count
+    dangling = graph.node_count - n
+    type_ids = pa.array(
+        np.concatenate([graph.entity_type_ids.astype(np.int32), np.zeros(dangling, dtype=np.int32)]),
+        mask=np.arange(graph.node_count) >= n,
+    )
+    offsets = np.concatenate([graph.obs_offsets, np.full(dangling, graph.obs_offsets[-1])])
+    observations = pa.array(graph.observations, type=pa.string()).take(pa.array(graph.obs_ids))
+    nodes = pa.table({
+        "name": pa.array(graph.names, type=pa.string()),
+        "entityType": pa.DictionaryArray.from_arrays(type_ids, pa.array(graph.entity_types, type=pa.string())),
+        "observations": pa.ListArray.from_arrays(pa.array(offsets.astype(np.int32)), observations),
+        "isEntity": pa.array(np.arange(graph.node_count) < n),
+    })
+    relations = pa.table({
+        "source": pa.array(graph.rel_src),
+        "target": pa.array(graph.rel_dst),
+        "relationType": pa.DictionaryArray.from_arrays(
+            pa.array(graph.rel_type.astype(np.int32)), pa.array(graph.relation_types, type=pa.string())
+        ),
+    })
+
+    sink = pa.BufferOutputStream()
+    _write_stream(sink, nodes, "nodes", meta)
+    _write_stream(sink, relations, "relations", None)
+    return sink.getvalue().to_pybytes()
+
+
+def render_graph(graph: CompactGraph, media_type: str) -> bytes:
+    """グラフ全体を指定形式で出力する
+
+    Args:
+        graph: 出力するグラフ
+        media_type: MSGPACK または ARROW（JSONは CompactGraph.render_json を使う）
+
+    Returns:
+        bytes: レスポンス本体
+
+    Raises:
+        ValueError: 提供していない形式が指定された場合
+    """
+    if media_type == JSON:
+        return graph.render_json()
+    if media_type == MSGPACK and msgpack is not None:
+        return msgpack.packb(_graph_document(graph), use_bin_type=True)
+    if media_type == ARROW and pa is not None:
+        return render_arrow(graph)
+    raise ValueError(f"Unsupported media type: {media_type}")
+
+
+def render_model(model: BaseModel, media_type: str) -> bytes:
+    """応答モデル（Subgraph等）を指定形式で出力する
+
+    MessagePackではJSONと同じ構造、Arrowでは entities / relations 以外のフィールドを
+    ノード表のスキーマメタデータ "meta" にJSONで格納する（MemoryGraphを継承したモデルのみ）。
+
+    Args:
+        model: 応答モデル
+        media_type: MSGPACK または ARROW
+
+    Returns:
+        bytes: レスポンス本体
+
+    Raises:
+        ValueError: 提供していない形式が指定された場合
+    """
+    if media_type == MSGPACK and msgpack is not None:
+        return msgpack.packb(model.model_dump(mode="json", by_alias=True), use_bin_type=True)
+    if media_type == ARROW and pa is not None and isinstance(model, MemoryGraph):
+        meta = model.model_dump(mode="json", by_alias=True, exclude={"entities", "relations"})
+        return render_arrow(CompactGraph.from_graph(model), meta or None)
+    raise ValueError(f"Unsupported media type: {media_type}")
@@ -0,0 +1,395 @@
+"""グラフデータのストリーミングローダー
+
+memory_graph.json を一括で json.load せず、チャンク単位で読みながら
+entities / relations 配列の要素を1件ずつ取り出す。
+生テキスト・dictツリー・Pydanticオブジェクトが同時にメモリへ載らないため、
+巨大なエクスポートでもピークメモリを抑えられる。
+各レコードはPydanticで検証した後、すぐにコンパクト表現（CompactGraph）へ格納する。
+
+Memory MCPサーバーが保存するJSONL形式（1行1レコード）も直接読み込める。
+JSONLは読み込み位置を記録し、追記された行だけを差分で読み込む。
+"""
+
+import codecs
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from models.memory import Entity, Relation
+from services.compact_graph import CompactGraph, CompactGraphBuilder
+
+try:
+    import resource
+except ImportError:  # Windowsではresourceモジュールが存在しない
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# 1回に読み込むバイト数
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# 進捗を報告するレコード間隔
+PROGRESS_INTERVAL = 50_000
+
+# (読み込み済みバイト数, 総バイト数, 処理済みレコード数)
+ProgressCallback = Callable[[int, int, int], None]
+
+_WHITESPACE = " \t\r\n"
+_RECORD_KEYS = {"entities": "entity", "relations": "relation"}
+
+
+@dataclass
+class LoadStats:
+    """読み込み統計"""
+    path: str
+    bytes_total: int = 0
+    entity_count: int = 0
+    relation_count: int = 0
+    duration_sec: float = 0.0
+    peak_rss_bytes: Optional[int] = None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """プロセスのピークRSS（バイト）を取得
+
+    Returns:
+        int: ピークRSS、取得できない環境ではNone
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss はmacOSではバイト単位、Linuxなどでは KB 単位
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _ChunkReader:
+    """UTF-8テキストをチャンク単位で読み進めるバッファ"""
+
+    def __init__(self, f, chunk_size: int):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+
+    def fill(self) -> bool:
+        """次のチャンクを読み込む（EOFならFalse）"""
+        if self.eof:
+            return False
+        raw = self._f.read(self._chunk_size)
+        self.bytes_read += len(raw)
+        if not raw:
+            self.eof = True
+            self.buf += self._decoder.decode(b"", final=True)
+            return False
+        # 消費済み部分を捨ててバッファを小さく保つ
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += self._decoder.decode(raw)
+        return True
+
+    def skip_ws(self) -> None:
+        """空白を読み飛ばす"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self.fill():
+                return
+
+    def peek(self) -> str:
+        """空白を飛ばした次の1文字を返す（EOFなら空文字）"""
+        self.skip_ws()
+        return self.buf[self.pos] if self.pos < len(self.buf) else ""
+
+    def expect(self, char: str) -> None:
+        """次の1文字が指定文字であることを確認して消費する"""
+        actual = self.peek()
+        if actual != char:
+            raise ValueError(
+                f"Unexpected {actual!r} at byte ~{self.bytes_read}, expected {char!r}"
+            )
+        self.pos += 1
+
+    def decode_value(self, decoder: json.JSONDecoder):
+        """次のJSON値を1つデコードする（不足分は追加で読み込む）"""
+        self.skip_ws()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # 数値等がチャンク境界で途切れている可能性があるため、末尾ならもう一度読む
+            if end == len(self.buf) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_graph_records(
+    path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> Iterator[Tuple[str, dict]]:
+    """グラフJSONファイルからレコードを1件ずつ取り出す
+
+    Args:
+        path: memory_graph.json 形式のファイルパス
+        chunk_size: 1回に読み込むバイト数
+        progress: 進捗コールバック（任意）
+
+    Yields:
+        Tuple[str, dict]: ("entity" または "relation", レコードdict)
+    """
+    total = Path(path).stat().st_size
+    decoder = json.JSONDecoder()
+    count = 0
+
+    with open(path, "rb") as f:
+        reader = _ChunkReader(f, chunk_size)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+
+        while True:
+            key = reader.decode_value(decoder)
+            reader.expect(":")
+            kind = _RECORD_KEYS.get(key)
+
+            if kind is None:
+                # 未知のキーは値ごと読み飛ばす
+                reader.decode_value(decoder)
+            else:
+                reader.expect("[")
+                if reader.peek() == "]":
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield kind, reader.decode_value(decoder)
+                        count += 1
+                        if progress and count % PROGRESS_INTERVAL == 0:
+                            progress(reader.bytes_read, total, count)
+                        if reader.peek() == ",":
+                            reader.pos += 1
+                            continue
+                        reader.expect("]")
+                        break
+
+            if reader.peek() == ",":
+                reader.pos += 1
+                continue
+            reader.expect("}")
+            break
+
+        if progress:
+            progress(reader.bytes_read, total, count)
+
+
+def log_progress(bytes_read: int, total: int, records: int) -> None:
+    """進捗をログに出力する（デフォルトの進捗コールバック）"""
+    percent = bytes_read * 100 / total if total else 100.0
+    logger.info(
+        "Loading graph: %.1f%% (%d/%d bytes, %d records)",
+        percent, bytes_read, total, records,
+    )
+
+
+def load_graph_streaming(
+    path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = log_progress,
+) -> Tuple[CompactGraph, LoadStats]:
+    """グラフJSONファイルをストリーミングで読み込む
+
+    レコードごとにPydanticモデルで検証してコンパクト表現に格納するため、
+    dictツリーやモデルの一覧は保持しない。同名のエンティティは後のレコードで置き換える。
+
+    Args:
+        path: memory_graph.json 形式のファイルパス
+        chunk_size: 1回に読み込むバイト数
+        progress: 進捗コールバック（Noneで無効）
+
+    Returns:
+        Tuple[CompactGraph, LoadStats]: グラフデータと読み込み統計
+    """
+    started = time.perf_counter()
+    builder = CompactGraphBuilder()
+
+    for kind, record in iter_graph_records(path, chunk_size, progress):
+        if kind == "entity":
+            builder.add_entity(Entity.model_validate(record))
+        else:
+            builder.add_relation(Relation.model_validate(record))
+
+    graph = builder.build()
+    stats = LoadStats(
+        path=str(path),
+        bytes_total=Path(path).stat().st_size,
+        entity_count=graph.entity_count,
+        relation_count=graph.relation_count,
+        duration_sec=time.perf_counter() - started,
+        peak_rss_bytes=peak_rss_bytes(),
+    )
+    logger.info(
+        "Loaded graph from %s: %d entities, %d relations in %.2fs (peak RSS %s)",
+        path, stats.entity_count, stats.relation_count, stats.duration_sec,
+        stats.peak_rss_bytes,
+    )
+    return graph, stats
+
+
+@dataclass
+class JsonlCursor:
+    """JSONLファイルの読み込み位置
+
+    追記のみを前提に、次回は offset 以降の行だけを読む。
+    ファイルが置き換え・切り詰め・書き換えられた場合は inode と
+    offset 直前のバイト列（anchor）の不一致で検出し、全件読み直しに切り替える。
+    """
+    offset: int = 0
+    inode: int = 0
+    anchor: bytes = b""
+
+
+# 書き換え検出のため offset 直前から保持するバイト数
+JSONL_ANCHOR_SIZE = 256
+
+
+def jsonl_cursor_valid(path: Path, cursor: JsonlCursor) -> bool:
+    """カーソル位置からの追記読み込みが可能か判定する
+
+    Args:
+        path: JSONLファイルパス
+        cursor: 前回の読み込み位置
+
+    Returns:
+        bool: 前回読み込み済みの内容が変わっていなければTrue
+    """
+    st = Path(path).stat()
+    if st.st_ino != cursor.inode or st.st_size < cursor.offset:
+        return False
+    with open(path, "rb") as f:
+        f.seek(cursor.offset - len(cursor.anchor))
+        return f.read(len(cursor.anchor)) == cursor.anchor
+
+
+def _scan_jsonl(
+    path: Path,
+    cursor: Optional[JsonlCursor],
+    on_entity: Callable[[Entity], None],
+    on_relation: Callable[[Relation], None],
+) -> JsonlCursor:
+    """JSONLファイルのカーソル以降のレコードを検証して1件ずつ渡す
+
+    改行で終わっていない最終行は、JSONとして完結している場合のみ読み込む
+    （Memory MCPサーバーは末尾に改行を付けずに保存するため）。
+    書き込み途中の行は消費せず、次回の読み込みに回す。
+
+    Returns:
+        JsonlCursor: 新しい読み込み位置
+    """
+    offset = cursor.offset if cursor else 0
+
+    with open(path, "rb") as f:
+        inode = Path(path).stat().st_ino
+        f.seek(offset)
+        for line in f:
+            stripped = line.strip()
+            if stripped:
+                try:
+                    record = json.loads(stripped)
+                except json.JSONDecodeError:
+                    if not line.endswith(b"\n"):
+                        break  # 書き込み途中の行
+                    raise
+                kind = record.get("type")
+                if kind == "entity":
+                    on_entity(Entity.model_validate(record))
+                elif kind == "relation":
+                    on_relation(Relation.model_validate(record))
+                else:
+                    logger.warning("Skipping unknown JSONL record type: %r", kind)
+            offset += len(line)
+
+        anchor_start = max(0, offset - JSONL_ANCHOR_SIZE)
+        f.seek(anchor_start)
+        anchor = f.read(offset - anchor_start)
+
+    return JsonlCursor(offset=offset, inode=inode, anchor=anchor)
+
+
+def read_jsonl_records(
+    path: Path,
+    cursor: Optional[JsonlCursor] = None,
+) -> Tuple[List[Entity], List[Relation], JsonlCursor]:
+    """JSONLファイルからカーソル以降のレコードを読み込む
+
+    Args:
+        path: JSONLファイルパス
+        cursor: 前回の読み込み位置（Noneなら先頭から）
+
+    Returns:
+        Tuple: (エンティティリスト, リレーションリスト, 新しい読み込み位置)
+    """
+    entities: List[Entity] = []
+    relations: List[Relation] = []
+    cursor = _scan_jsonl(path, cursor, entities.append, relations.append)
+    return entities, relations, cursor
+
+
+def merge_records(
+    graph: CompactGraph,
+    entities: List[Entity],
+    relations: List[Relation],
+) -> CompactGraph:
+    """既存グラフに追記レコードを反映した新しいグラフを作成する
+
+    同名エンティティは後のレコードで置き換え、同一リレーションは重複させない。
+    元のグラフは変更しない。
+
+    Args:
+        graph: 既存のグラフデータ
+        entities: 追加エンティティ
+        relations: 追加リレーション
+
+    Returns:
+        CompactGraph: 反映後のグラフデータ
+    """
+    builder = CompactGraphBuilder.from_compact(graph, dedupe_relations=True)
+    for entity in entities:
+        builder.add_entity(entity)
+    for relation in relations:
+        builder.add_relation(relation)
+    return builder.build()
+
+
+def load_graph_jsonl(path: Path) -> Tuple[CompactGraph, LoadStats, JsonlCursor]:
+    """Memory MCPのJSONLファイルを全件読み込む
+
+    Args:
+        path: JSONLファイルパス
+
+    Returns:
+        Tuple: (グラフデータ, 読み込み統計, 読み込み位置)
+    """
+    started = time.perf_counter()
+    builder = CompactGraphBuilder(dedupe_relations=True)
+    cursor = _scan_jsonl(path, None, builder.add_entity, builder.add_relation)
+    graph = builder.build()
+    stats = LoadStats(
+        path=str(path),
+        bytes_total=cursor.offset,
+        entity_count=graph.entity_count,
+        relation_count=graph.relation_count,
+        duration_sec=time.perf_counter() - started,
+        peak_rss_bytes=peak_rss_bytes(),
+    )
+    return graph, stats, cursor
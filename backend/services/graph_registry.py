@@ -0,0 +1,292 @@
+"""複数グラフの提供
+
+ディレクトリ内のデータファイル（{graph_id}.jsonl / {graph_id}.json）を
+/api/graphs/{graph_id}/... で提供する。グラフごとに MemoryMCPClient を作り、
+読み込み（シングルフライト）・キャッシュはクライアント単位で行うため、
+あるグラフの読み込み中も他のグラフへの要求は待たされない。
+
+読み込んだグラフはLRUで保持し、合計の推定メモリ使用量が予算を超えたら
+最近使われていないグラフから破棄する。一定時間使われていないグラフも破棄する。
+破棄したグラフは次の要求で読み込み直す（コンパイル済みキャッシュがあれば高速）。
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from models.memory import GraphInfo, GraphList
+from services.memory_client import MemoryMCPClient
+from services.metrics import REGISTRY, record_cache
+from services.snapshot_cache import SnapshotCache
+
+logger = logging.getLogger(__name__)
+
+# グラフID（ファイル名の拡張子を除いた部分、パスの区切りは含まない）
+_GRAPH_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+# 対応するデータファイルの拡張子（優先順）
+SUFFIXES = (".jsonl", ".json")
+
+# データファイルの変更を確認する最短間隔（秒）
+STAT_INTERVAL = 1.0
+
+LOADED_GRAPHS = REGISTRY.gauge("graph_registry_loaded", "Graphs currently held by the registry.")
+LOADED_BYTES = REGISTRY.gauge(
+    "graph_registry_bytes", "Estimated memory used by the graphs held by the registry."
+)
+
+# データファイルの変更検知用 (mtime_ns, size)
+SourceSignature = Tuple[int, int]
+
+
+def _signature(path: Path) -> SourceSignature:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+class GraphEntry:
+    """読み込み済み（または読み込み中）のグラフ"""
+
+    def __init__(self, graph_id: str, path: Path, client: MemoryMCPClient, now: float):
+        self.graph_id = graph_id
+        self.path = path
+        self.client = client
+        self.last_used = now
+        self.last_checked = now
+        self.nbytes = 0
+        # 推定メモリ使用量を数えた版（グラフ・索引の大きさは版ごとに一度だけ数える）
+        self.measured_version = 0
+        # 読み込み開始時点のデータファイルの署名
+        self.signature: Optional[SourceSignature] = None
+        # グラフごとの排他（メモリ使用量の計測・再読み込みの開始）
+        self.lock = asyncio.Lock()
+        self.refresh: Optional[asyncio.Task] = None
+
+
+class GraphRegistry:
+    """グラフIDごとのクライアントをLRUで保持する"""
+
+    def __init__(
+        self,
+        directory: Path,
+        memory_budget: int,
+        idle_timeout: float = 600.0,
+        snapshot_cache: Optional[SnapshotCache] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """初期化
+
+        Args:
+            directory: データファイルを置くディレクトリ
+            memory_budget: 保持するグラフの推定メモリ使用量の合計の上限（バイト）
+            idle_timeout: この時間（秒）使われていないグラフを破棄する
+            snapshot_cache: データファイルのコンパイル済みスナップショットのキャッシュ（オプション）
+            clock: 現在時刻（単調増加、秒）を返す関数
+        """
+        self.directory = Path(directory)
+        self.memory_budget = memory_budget
+        self.idle_timeout = idle_timeout
+        self.snapshot_cache = snapshot_cache
+        self._clock = clock
+        self._entries: "OrderedDict[str, GraphEntry]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def nbytes(self) -> int:
+        """保持しているグラフの推定メモリ使用量の合計"""
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def path_for(self, graph_id: str) -> Optional[Path]:
+        """グラフIDのデータファイル（不正なID・存在しなければNone）"""
+        if not _GRAPH_ID.match(graph_id):
+            return None
+        for suffix in SUFFIXES:
+            path = self.directory / f"{graph_id}{suffix}"
+            if path.is_file():
+                return path
+        return None
+
+    async def get(self, graph_id: str) -> Optional[MemoryMCPClient]:
+        """グラフのクライアントを取得（未読み込みなら読み込む）
+
+        データファイルが更新されていれば、現在のスナップショットを返しつつ
+        バックグラウンドで読み込み直す。
+
+        Args:
+            graph_id: グラフID
+
+        Returns:
+            MemoryMCPClient: 読み込み済みのクライアント、グラフが存在しない場合はNone
+        """
+        now = self._clock()
+        entry = self._entries.get(graph_id)
+        record_cache("graphs", entry is not None and entry.client.ready)
+        if entry is None:
+            path = self.path_for(graph_id)
+            if path is None:
+                return None
+            client = MemoryMCPClient(
+                data_file=path, snapshot_cache=self.snapshot_cache, report_snapshot=False
+            )
+            entry = self._entries[graph_id] = GraphEntry(graph_id, path, client, now)
+            entry.signature = _signature(path)
+        elif now - entry.last_checked >= STAT_INTERVAL:
+            entry.last_checked = now
+            try:
+                signature = _signature(entry.path)
+            except FileNotFoundError:
+                self._evict(graph_id, "removed")
+                return None
+            if signature != entry.signature and (entry.refresh is None or entry.refresh.done()):
+                entry.signature = signature
+                entry.refresh = asyncio.create_task(self._refresh(entry))
+        entry.last_used = now
+        self._entries.move_to_end(graph_id)
+
+        await entry.client.get_store()
+        await self._measure(entry)
+        return entry.client
+
+    async def _refresh(self, entry: GraphEntry) -> None:
+        """更新されたデータファイルを読み込み直す"""
+        try:
+            await entry.client.reload()
+            await self._measure(entry)
+        except Exception:
+            # 失敗しても既存のスナップショットを提供し続ける
+            logger.exception("Failed to reload graph %s", entry.graph_id)
+
+    async def _measure(self, entry: GraphEntry) -> None:
+        """メモリ使用量を数え直し、予算を超えていれば他のグラフを破棄する"""
+        store = await entry.client.get_store()
+        if entry.measured_version != store.version:
+            async with entry.lock:
+                if entry.measured_version != store.version:
+                    entry.nbytes = await asyncio.to_thread(store.nbytes)
+                    entry.measured_version = store.version
+        else:
+            # エンコード済み本体は要求に応じて増えるため毎回数える
+            entry.nbytes = store.nbytes()
+        if self._entries.get(entry.graph_id) is entry:
+            self._enforce_budget(keep=entry.graph_id)
+        self._report()
+
+    def _enforce_budget(self, keep: str) -> None:
+        """予算を超えている間、最近使われていないグラフから破棄する（keep は残す）"""
+        total = self.nbytes
+        for graph_id in list(self._entries):
+            if total <= self.memory_budget:
+                return
+            # 読み込み中のグラフ（未計測）は破棄しても減らない
+            if graph_id != keep and self._entries[graph_id].nbytes:
+                total -= self._entries[graph_id].nbytes
+                self._evict(graph_id, "memory budget")
+        if total > self.memory_budget:
+            logger.warning(
+                "Graph %s alone exceeds the memory budget (%d > %d bytes)", keep, total, self.memory_budget
+            )
+
+    def evict_idle(self) -> List[str]:
+        """idle_timeout 以上使われていないグラフを破棄する
+
+        Returns:
+            List[str]: 破棄したグラフID
+        """
+        deadline = self._clock() - self.idle_timeout
+        idle = [graph_id for graph_id, entry in self._entries.items() if entry.last_used <= deadline]
+        for graph_id in idle:
+            self._evict(graph_id, "idle")
+        self._report()
+        return idle
+
+    def _evict(self, graph_id: str, reason: str) -> None:
+        """グラフを破棄する（処理中の要求は参照中のスナップショットをそのまま使う）"""
+        entry = self._entries.pop(graph_id, None)
+        if entry is None:
+            return
+        if entry.refresh is not None:
+            entry.refresh.cancel()
+        logger.info("Evicted graph %s (%s, %d bytes)", graph_id, reason, entry.nbytes)
+        self._report()
+
+    def _report(self) -> None:
+        """保持しているグラフの数・推定メモリ使用量をメトリクスに出力する"""
+        LOADED_GRAPHS.set(len(self._entries))
+        LOADED_BYTES.set(self.nbytes)
+
+    def list_graphs(self) -> GraphList:
+        """提供できるグラフの一覧（読み込み済みかどうかを含む）
+
+        Returns:
+            GraphList: データファイルのあるグラフと保持中のグラフの状態
+        """
+        ids = {
+            path.name[:-len(suffix)]
+            for suffix in SUFFIXES
+            for path in self.directory.glob(f"*{suffix}")
+        }
+        graphs = []
+        for graph_id in sorted(i for i in ids if _GRAPH_ID.match(i)):
+            entry = self._entries.get(graph_id)
+            loaded = entry is not None and entry.client.ready
+            graphs.append(GraphInfo(
+                id=graph_id,
+                loaded=loaded,
+                version=entry.client.version if loaded else None,
+                bytes=entry.nbytes if loaded else None,
+            ))
+        return GraphList(graphs=graphs, memoryBudget=self.memory_budget, memoryUsed=self.nbytes)
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """使われていないグラフを定期的に破棄するタスクを開始する
+
+        Args:
+            interval: 確認間隔（秒、省略時は idle_timeout の半分、最大60秒）
+        """
+        if self._task is None:
+            interval = interval or min(max(self.idle_timeout / 2, 0.1), 60.0)
+            self._task = asyncio.create_task(self._sweep(interval))
+
+    async def stop(self) -> None:
+        """定期破棄のタスクを停止する"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        for entry in self._entries.values():
+            if entry.refresh is not None:
+                entry.refresh.cancel()
+
+    async def _sweep(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
+
+
+# グローバルインスタンス（MEMORY_GRAPHS_DIR を設定した場合のみ）
+_registry_instance: Optional[GraphRegistry] = None
+
+
+def get_graph_registry() -> Optional[GraphRegistry]:
+    """複数グラフのレジストリを取得（未設定ならNone）
+
+    FastAPIの依存性注入で使用
+
+    Returns:
+        GraphRegistry: レジストリ
+    """
+    return _registry_instance
+
+
+def set_graph_registry(registry: Optional[GraphRegistry]) -> None:
+    """複数グラフのレジストリを設定する
+
+    Args:
+        registry: レジストリ（Noneで解除）
+    """
+    global _registry_instance
+    _registry_instance = registry
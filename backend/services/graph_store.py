@@ -0,0 +1,266 @@
+"""グラフストア
+
+読み込み済みのグラフ（CompactGraph）に対する索引（入出力隣接リスト）を保持する。
+キャッシュ充填時に一度だけ構築し、エンティティ参照や隣接探索を O(次数) で行う。
+隣接リストはノードIDごとのオフセットとリレーション番号の配列（CSR形式）で持つ。
+"""
+
+import threading
+import weakref
+from functools import partial
+from typing import Collection, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from models.memory import MemoryGraph, Entity, Relation
+from services.compact_graph import CompactGraph, LazySequence, as_compact
+from services.graph_encoding import EncodedBody
+from services.graph_filter import TypeIndex
+from services.graph_formats import JSON, render_graph
+
+
+class EncodedGraph:
+    """グラフの形式ごとのエンコード済み本体
+
+    本体は形式ごとに初回要求時に一度だけ生成する。
+    """
+
+    def __init__(self, compact: CompactGraph):
+        """初期化
+
+        Args:
+            compact: エンコード対象のグラフ
+        """
+        self.compact = compact
+        self._bodies: Dict[str, EncodedBody] = {JSON: EncodedBody(compact.render_json)}
+        self._lock = threading.Lock()
+
+    def get(self, media_type: str = JSON) -> EncodedBody:
+        """指定形式のエンコード済み本体を取得
+
+        Args:
+            media_type: graph_formats.MEDIA_TYPES のいずれか
+
+        Returns:
+            EncodedBody: エンコード済み本体
+        """
+        body = self._bodies.get(media_type)
+        if body is not None:
+            return body
+        with self._lock:
+            body = self._bodies.get(media_type)
+            if body is None:
+                body = self._bodies[media_type] = EncodedBody(
+                    partial(render_graph, self.compact, media_type)
+                )
+            return body
+
+    @property
+    def nbytes(self) -> int:
+        """生成済みの本体の合計バイト数"""
+        return sum(body.nbytes for body in list(self._bodies.values()))
+
+
+class GraphStore:
+    """インデックス付きグラフストア
+
+    グラフの不変スナップショットとその索引をまとめて保持する。
+    スナップショットごとに新しいインスタンスを作成し、変更はしない。
+    """
+
+    def __init__(self, graph: Union[MemoryGraph, CompactGraph], version: int = 0):
+        """初期化（索引構築）
+
+        Args:
+            graph: 索引対象のグラフデータ（MemoryGraphはCompactGraphに変換して保持する）
+            version: スナップショットの版番号
+        """
+        compact = as_compact(graph)
+        self.compact = compact
+        self.version = version
+        # /api/graph 用の形式ごとのエンコード済み本体（初回要求時に一度だけ生成）
+        self.bodies = EncodedGraph(compact)
+        self.encoded = self.bodies.get(JSON)
+        self._graph_ref: Optional[weakref.ref] = None
+
+        self.adjacency = compact.adjacency()
+        self._out_offsets, self._out_rel, self._in_offsets, self._in_rel = self.adjacency
+        # 絞り込み用の種類ごとのID集合・次数順のノード列
+        self.type_index = TypeIndex(compact, self.adjacency)
+        self._base_nbytes: Optional[int] = None
+
+    def encoded_as(self, media_type: str = JSON) -> EncodedBody:
+        """指定形式のエンコード済み本体を取得（本体は初回要求時に一度だけ生成）
+
+        Args:
+            media_type: graph_formats.MEDIA_TYPES のいずれか
+
+        Returns:
+            EncodedBody: エンコード済み本体
+        """
+        return self.bodies.get(media_type)
+
+    def nbytes(self) -> int:
+        """おおよそのメモリ使用量（バイト）
+
+        グラフ・索引の大きさは初回呼び出し時に一度だけ数え、
+        エンコード済み本体（遅延生成）は呼び出しごとに数える。
+        """
+        if self._base_nbytes is None:
+            indexes = self.adjacency + self.type_index.arrays()
+            self._base_nbytes = self.compact.nbytes() + sum(a.nbytes for a in indexes)
+        return self._base_nbytes + self.bodies.nbytes
+
+    @property
+    def graph(self) -> MemoryGraph:
+        """グラフ全体のPydanticモデル（API応答用）
+
+        呼び出し時に組み立てる。参照が残っている間は同じオブジェクトを返し、
+        不要になれば解放される。
+        """
+        graph = self._graph_ref() if self._graph_ref is not None else None
+        if graph is None:
+            graph = self.compact.to_graph()
+            self._graph_ref = weakref.ref(graph)
+        return graph
+
+    @property
+    def entities(self) -> LazySequence[Entity]:
+        """エンティティのシーケンス（参照した要素だけを組み立てる）"""
+        return self.compact.entities
+
+    @property
+    def relations(self) -> LazySequence[Relation]:
+        """リレーションのシーケンス（参照した要素だけを組み立てる）"""
+        return self.compact.relations
+
+    @property
+    def entity_count(self) -> int:
+        """エンティティ数"""
+        return self.compact.entity_count
+
+    def entity_names(self) -> List[str]:
+        """エンティティ名の一覧（重複なし、読み込み順）"""
+        return self.compact.names[:self.compact.entity_count]
+
+    def get_entity(self, name: str) -> Optional[Entity]:
+        """名前からエンティティを取得
+
+        Args:
+            name: エンティティ名
+
+        Returns:
+            Entity: エンティティ、存在しない場合はNone
+        """
+        index = self.compact.entity_id(name)
+        return self.compact.entity(index) if index is not None else None
+
+    def entity_type(self, name: str) -> Optional[str]:
+        """エンティティの entityType（存在しなければNone）"""
+        index = self.compact.entity_id(name)
+        return self.compact.entity_type(index) if index is not None else None
+
+    def get_observations(
+        self, name: str, offset: int = 0, limit: Optional[int] = None
+    ) -> Optional[Tuple[List[str], int]]:
+        """エンティティの observations の一部を取得（範囲内だけをデコードする）
+
+        Args:
+            name: エンティティ名
+            offset: 先頭の位置
+            limit: 最大件数（Noneなら末尾まで）
+
+        Returns:
+            Tuple[List[str], int]: (observations, 総数)、エンティティが存在しない場合はNone
+        """
+        index = self.compact.entity_id(name)
+        if index is None:
+            return None
+        stop = offset + limit if limit is not None else None
+        return self.compact.observations_of(index, offset, stop), self.compact.observation_count(index)
+
+    def has_entity(self, name: str) -> bool:
+        """エンティティが存在するか"""
+        return self.compact.entity_id(name) is not None
+
+    def out_neighbors(self, name: str, relation_type: Optional[str] = None) -> List[str]:
+        """出リレーションの終点エンティティ名を取得
+
+        Args:
+            name: 起点エンティティ名
+            relation_type: 絞り込むリレーション種類（Noneなら全種類）
+
+        Returns:
+            List[str]: 終点エンティティ名リスト（重複あり）
+        """
+        types = None if relation_type is None else (relation_type,)
+        return [other for other, _, outgoing in self.iter_edges(name, types) if outgoing]
+
+    def in_neighbors(self, name: str, relation_type: Optional[str] = None) -> List[str]:
+        """入リレーションの起点エンティティ名を取得
+
+        Args:
+            name: 終点エンティティ名
+            relation_type: 絞り込むリレーション種類（Noneなら全種類）
+
+        Returns:
+            List[str]: 起点エンティティ名リスト（重複あり）
+        """
+        types = None if relation_type is None else (relation_type,)
+        return [other for other, _, outgoing in self.iter_edges(name, types) if not outgoing]
+
+    def neighbors(self, name: str, relation_type: Optional[str] = None) -> List[str]:
+        """双方向の隣接エンティティ名を取得（重複削除、出→入の順）
+
+        Args:
+            name: エンティティ名
+            relation_type: 絞り込むリレーション種類（Noneなら全種類）
+
+        Returns:
+            List[str]: 隣接エンティティ名リスト
+        """
+        types = None if relation_type is None else (relation_type,)
+        return list(dict.fromkeys(other for other, _, _ in self.iter_edges(name, types)))
+
+    def iter_edges(
+        self, name: str, relation_types: Optional[Collection[str]] = None
+    ) -> Iterator[Tuple[str, str, bool]]:
+        """隣接エッジを列挙する（出→入の順、それぞれリレーションの登録順）
+
+        Args:
+            name: エンティティ名
+            relation_types: 絞り込むリレーション種類（Noneなら全種類）
+
+        Yields:
+            Tuple[str, str, bool]: (隣接エンティティ名, relationType, 出方向ならTrue)
+        """
+        compact = self.compact
+        node = compact.node_id(name)
+        if node is None:
+            return
+        type_ids = None
+        if relation_types is not None:
+            type_ids = [i for i, t in enumerate(compact.relation_types) if t in relation_types]
+            if not type_ids:
+                return
+
+        names = compact.names
+        type_names = compact.relation_types
+        for offsets, rels, others, outgoing in (
+            (self._out_offsets, self._out_rel, compact.rel_dst, True),
+            (self._in_offsets, self._in_rel, compact.rel_src, False),
+        ):
+            edges = rels[offsets[node]:offsets[node + 1]]
+            if type_ids is not None:
+                edges = edges[np.isin(compact.rel_type[edges], type_ids)]
+            for other, rel_type in zip(others[edges].tolist(), compact.rel_type[edges].tolist()):
+                yield names[other], type_names[rel_type], outgoing
+
+    def degree(self, name: str) -> int:
+        """エンティティの次数（入出力リレーション数の合計）"""
+        node = self.compact.node_id(name)
+        if node is None:
+            return 0
+        out_deg = self._out_offsets[node + 1] - self._out_offsets[node]
+        in_deg = self._in_offsets[node + 1] - self._in_offsets[node]
+        return int(out_deg + in_deg)
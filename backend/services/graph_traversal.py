@@ -0,0 +1,229 @@
+"""グラフ探索
+
+GraphStoreの隣接リストを使った近傍探索・最短経路探索。
+探索量は訪問ノードの次数に比例し、グラフ全体の大きさには依存しない。
+"""
+
+from itertools import islice
+from typing import Collection, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models.memory import Entity, GraphPath, Relation
+from services.graph_store import GraphStore
+
+
+def neighborhood(
+    store: GraphStore,
+    center: str,
+    depth: int = 1,
+    limit: int = 200,
+    relation_types: Optional[Collection[str]] = None,
+    max_fanout: int = 50,
+) -> Tuple[List[Entity], List[Relation], bool]:
+    """中心エンティティからk-hop以内の誘導部分グラフを求める（幅優先探索）
+
+    ハブの爆発を防ぐため、1ノードから展開する隣接は max_fanout 件までとし、
+    次数が max_fanout を超えるノード（中心を除く）は含めるが展開しない。
+    ハブの全隣接は列挙しないため、探索で通っていないハブ同士のリレーションは出力しない。
+
+    Args:
+        store: グラフストア
+        center: 中心エンティティ名
+        depth: 最大ホップ数
+        limit: 最大ノード数（中心を含む）
+        relation_types: たどるリレーション種類（Noneなら全種類）
+        max_fanout: 1ノードあたりの最大展開数
+
+    Returns:
+        Tuple: (エンティティリスト, リレーションリスト, 打ち切りが発生したか)
+    """
+    types = set(relation_types) if relation_types else None
+    visited: Dict[str, int] = {center: 0}
+    frontier = [center]
+    truncated = False
+    seen: Set[Tuple[str, str, str]] = set()
+    relations: List[Relation] = []
+
+    def add_relation(name: str, other: str, rel_type: str, outgoing: bool) -> None:
+        key = (name, other, rel_type) if outgoing else (other, name, rel_type)
+        if key not in seen:
+            seen.add(key)
+            relations.append(Relation(from_=key[0], to=key[1], relationType=rel_type))
+
+    for hop in range(1, depth + 1):
+        next_frontier: List[str] = []
+        for name in frontier:
+            if name != center and store.degree(name) > max_fanout:
+                truncated = True  # ハブは展開しない
+                continue
+            expanded = 0
+            for other, rel_type, outgoing in store.iter_edges(name, types):
+                if other in visited:
+                    continue
+                if expanded >= max_fanout or len(visited) >= limit:
+                    truncated = True
+                    break
+                visited[other] = hop
+                next_frontier.append(other)
+                add_relation(name, other, rel_type, outgoing)
+                expanded += 1
+        frontier = next_frontier
+        if not frontier:
+            break
+
+    # 残りの誘導リレーションは次数の小さいノードの側から列挙する
+    # （ハブ同士のリレーションは探索で通ったもの以外は出力しない）
+    hubs = {name for name in visited if store.degree(name) > max_fanout}
+    for name in visited:
+        if name in hubs:
+            continue
+        for other, rel_type, outgoing in store.iter_edges(name, types):
+            if other not in visited:
+                continue
+            # 非ハブ同士のエッジは出方向側でのみ数え、ハブとのエッジは両方向から拾う
+            if outgoing or other in hubs:
+                add_relation(name, other, rel_type, outgoing)
+
+    entities = [e for e in (store.get_entity(n) for n in visited) if e is not None]
+    return entities, relations, truncated
+
+
+def _path_halves(parents: Dict[int, List[int]], node: int) -> Iterator[List[int]]:
+    """BFSの親リストをたどり、探索の起点から node までの経路を列挙する（起点→node の順）"""
+    preds = parents[node]
+    if not preds:
+        yield [node]
+        return
+    for pred in preds:
+        for half in _path_halves(parents, pred):
+            yield half + [node]
+
+
+def shortest_paths(
+    store: GraphStore,
+    source: str,
+    target: str,
+    max_depth: int = 6,
+    k: int = 1,
+    relation_types: Optional[Collection[str]] = None,
+    max_fanout: int = 1000,
+    max_visits: int = 100_000,
+) -> Tuple[List[GraphPath], bool]:
+    """2つのエンティティを結ぶ最短経路を求める（双方向幅優先探索）
+
+    リレーションの向きは区別せずにたどる。始点側・終点側のうち、次に展開する層の
+    次数の合計が小さい方を1層ずつ広げ、両側の探索が出会った層で打ち切る。
+    同じ長さの最短経路が複数あれば k 件まで返す（ノード列が異なるものを別の経路とし、
+    同じノード間に複数のリレーションがあれば最初のものを使う）。
+
+    ハブの爆発を防ぐため、次数が max_fanout を超えるノード（始点・終点を除く）は
+    経由地として到達はするが展開しない。両側から到達したハブは経路に含まれる。
+    訪問ノード数が max_visits を超えた場合も探索を打ち切る。
+
+    Args:
+        store: グラフストア
+        source: 始点エンティティ名
+        target: 終点エンティティ名
+        max_depth: 最大ホップ数
+        k: 返す経路の最大数
+        relation_types: たどるリレーション種類（Noneなら全種類）
+        max_fanout: 展開するノードの最大次数
+        max_visits: 訪問ノード数の上限
+
+    Returns:
+        Tuple: (最短経路リスト（見つからなければ空）, 打ち切りが発生したか)
+    """
+    compact = store.compact
+    start, goal = compact.node_id(source), compact.node_id(target)
+    if start is None or goal is None:
+        return [], False
+    if start == goal:
+        return [GraphPath(entities=[source], relations=[])], False
+
+    out_offsets, out_rel, in_offsets, in_rel = store.adjacency
+    allowed = None
+    if relation_types is not None:
+        allowed = np.isin(np.asarray(compact.relation_types, dtype=object), list(relation_types))
+
+    def edges(node: int) -> Tuple[np.ndarray, np.ndarray]:
+        """node の出・入リレーション番号（種類で絞り込み済み）"""
+        out_edges = out_rel[out_offsets[node]:out_offsets[node + 1]]
+        in_edges = in_rel[in_offsets[node]:in_offsets[node + 1]]
+        if allowed is not None:
+            out_edges = out_edges[allowed[compact.rel_type[out_edges]]]
+            in_edges = in_edges[allowed[compact.rel_type[in_edges]]]
+        return out_edges, in_edges
+
+    def degrees(nodes: List[int]) -> np.ndarray:
+        ids = np.asarray(nodes)
+        return out_offsets[ids + 1] - out_offsets[ids] + in_offsets[ids + 1] - in_offsets[ids]
+
+    # 起点・終点それぞれからのBFS（ノード → 親ノードのリスト、ノード → 距離）
+    parents: Tuple[Dict[int, List[int]], Dict[int, List[int]]] = ({start: []}, {goal: []})
+    dist: Tuple[Dict[int, int], Dict[int, int]] = ({start: 0}, {goal: 0})
+    frontiers: List[List[int]] = [[start], [goal]]
+    depths = [0, 0]
+    truncated = False
+    meets: List[int] = []
+
+    while frontiers[0] and frontiers[1] and depths[0] + depths[1] < max_depth:
+        sizes = [degrees(frontier) for frontier in frontiers]
+        side = 0 if sizes[0].sum() <= sizes[1].sum() else 1
+        mine, other = parents[side], parents[1 - side]
+        layer: Dict[int, List[int]] = {}
+        for node, size in zip(frontiers[side], sizes[side].tolist()):
+            if node != start and node != goal and size > max_fanout:
+                truncated = True  # ハブは展開しない
+                continue
+            out_edges, in_edges = edges(node)
+            neighbors = np.concatenate([compact.rel_dst[out_edges], compact.rel_src[in_edges]])
+            for nxt in dict.fromkeys(neighbors.tolist()):
+                if nxt in mine:
+                    continue
+                preds = layer.get(nxt)
+                if preds is None:
+                    layer[nxt] = [node]
+                else:
+                    preds.append(node)
+
+        depths[side] += 1
+        mine.update(layer)
+        dist[side].update((node, depths[side]) for node in layer)
+        frontiers[side] = list(layer)
+        meets = [node for node in layer if node in other]
+        if meets:
+            break
+        if len(parents[0]) + len(parents[1]) > max_visits:
+            truncated = True
+            break
+
+    if not meets:
+        return [], truncated
+
+    # 出会ったノードのうち、合計の距離が最小のものを経由する経路だけを返す
+    lengths = {node: dist[0][node] + dist[1][node] for node in meets}
+    shortest = min(lengths.values())
+    node_paths = (
+        head + tail[::-1][1:]
+        for meet in sorted(node for node, length in lengths.items() if length == shortest)
+        for head in _path_halves(parents[0], meet)
+        for tail in _path_halves(parents[1], meet)
+    )
+
+    names = compact.names
+    type_names = compact.relation_types
+    paths = []
+    for nodes in islice(node_paths, k):
+        relations = []
+        for a, b in zip(nodes, nodes[1:]):
+            out_edges, in_edges = edges(a)
+            forward = out_edges[compact.rel_dst[out_edges] == b]
+            rel = int(forward[0]) if len(forward) else int(in_edges[compact.rel_src[in_edges] == b][0])
+            relations.append(Relation(
+                from_=names[compact.rel_src[rel]],
+                to=names[compact.rel_dst[rel]],
+                relationType=type_names[compact.rel_type[rel]],
+            ))
+        paths.append(GraphPath(entities=[names[n] for n in nodes], relations=relations))
+    return paths, truncated
@@ -0,0 +1,243 @@
+"""グラフレイアウト計算
+
+NumPyでベクトル化したforce-directed（Fruchterman-Reingold）レイアウト。
+ノード数が多い場合、斥力はグリッドのセル重心で近似する（セル数を上限で抑え、
+1反復あたり O(ノード数 × セル数)）。引力はリレーションごとにまとめて計算する。
+
+前回のレイアウトがあれば、その座標から少ない反復で再計算する（ウォームスタート）。
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.graph_store import GraphStore
+
+# 対応アルゴリズム
+ALGORITHMS = ("force", "circle")
+
+# 出力座標の範囲（0〜CANVAS）
+CANVAS = 1000.0
+
+# これ以下のノード数なら斥力を厳密に計算する
+EXACT_LIMIT = 1500
+
+# グリッド近似の1辺あたりの最大セル数
+MAX_GRID = 32
+
+# 一度に斥力を計算するノード数（メモリ使用量の上限）
+CHUNK = 2048
+
+# 中心への引き寄せの強さ（非連結成分が離れすぎないように）
+GRAVITY = 0.05
+
+# エンティティ名 → [x, y]
+Positions = Dict[str, List[float]]
+
+
+def edge_index(store: GraphStore) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """ノード名リストと、リレーションの始点・終点インデックス配列を作成
+
+    存在しないエンティティを参照するリレーションと自己ループは除外する。
+
+    Args:
+        store: グラフストア
+
+    Returns:
+        Tuple: (ノード名リスト, 始点インデックス, 終点インデックス)
+    """
+    compact = store.compact
+    n = compact.entity_count
+    src = compact.rel_src.astype(np.int64)
+    dst = compact.rel_dst.astype(np.int64)
+    keep = (src < n) & (dst < n) & (src != dst)
+    return store.entity_names(), src[keep], dst[keep]
+
+
+def _repulsion(pos: np.ndarray, k: float) -> np.ndarray:
+    """斥力による変位を計算する（大規模時はグリッド重心で近似）"""
+    n = len(pos)
+    eps = (k * 0.01) ** 2
+    disp = np.zeros_like(pos)
+
+    if n <= EXACT_LIMIT:
+        for start in range(0, n, CHUNK):
+            block = pos[start:start + CHUNK]
+            delta = block[:, None, :] - pos[None, :, :]
+            dist2 = np.einsum("ijk,ijk->ij", delta, delta)
+            dist2[np.arange(len(block)), np.arange(start, start + len(block))] = np.inf
+            np.maximum(dist2, eps, out=dist2)
+            disp[start:start + len(block)] = np.einsum("ijk,ij->ik", delta, k * k / dist2)
+        return disp
+
+    # グリッドのセルごとに質量（ノード数）と重心を求める
+    grid = int(np.clip(math.sqrt(n) / 4, 4, MAX_GRID))
+    lo = pos.min(axis=0)
+    span = max(float((pos.max(axis=0) - lo).max()), 1e-9)
+    cells = np.minimum(((pos - lo) / span * grid).astype(np.int64), grid - 1)
+    cell_id = cells[:, 0] * grid + cells[:, 1]
+    counts = np.bincount(cell_id, minlength=grid * grid).astype(float)
+    sums = np.stack([
+        np.bincount(cell_id, weights=pos[:, 0], minlength=grid * grid),
+        np.bincount(cell_id, weights=pos[:, 1], minlength=grid * grid),
+    ], axis=1)
+    occupied = np.flatnonzero(counts)
+    masses = counts[occupied]
+    centers = sums[occupied] / masses[:, None]
+    own = np.searchsorted(occupied, cell_id)
+
+    for start in range(0, n, CHUNK):
+        block = pos[start:start + CHUNK]
+        delta = block[:, None, :] - centers[None, :, :]
+        dist2 = np.maximum(np.einsum("ijk,ijk->ij", delta, delta), eps)
+        force = k * k * masses[None, :] / dist2
+        # 自分のセルは自分自身を除いた重心で計算し直す
+        rows = np.arange(len(block))
+        force[rows, own[start:start + len(block)]] = 0.0
+        disp[start:start + len(block)] = np.einsum("ijk,ij->ik", delta, force)
+
+    own_count = counts[cell_id] - 1
+    has_peers = own_count > 0
+    peer_center = (sums[cell_id] - pos)[has_peers] / own_count[has_peers, None]
+    delta = pos[has_peers] - peer_center
+    dist2 = np.maximum(np.einsum("ij,ij->i", delta, delta), eps)
+    disp[has_peers] += delta * (k * k * own_count[has_peers] / dist2)[:, None]
+    return disp
+
+
+def force_layout(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    initial: Optional[np.ndarray] = None,
+    iterations: Optional[int] = None,
+    seed: int = 0,
+) -> np.ndarray:
+    """Fruchterman-Reingold法でレイアウトを計算する
+
+    Args:
+        n: ノード数
+        src: リレーション始点インデックス
+        dst: リレーション終点インデックス
+        initial: 初期座標（単位正方形内、n×2）。指定時は低温から少ない反復で調整する
+        iterations: 反復回数（Noneならノード数から決める）
+        seed: 乱数シード
+
+    Returns:
+        np.ndarray: 単位正方形内の座標（n×2）
+    """
+    if n == 0:
+        return np.zeros((0, 2))
+    rng = np.random.default_rng(seed)
+    warm = initial is not None
+    pos = initial.astype(float).copy() if warm else rng.random((n, 2))
+    if n == 1:
+        return np.full((1, 2), 0.5)
+
+    if iterations is None:
+        iterations = 300 if n < 1000 else 100 if n < 20000 else 50
+        if warm:
+            iterations = max(iterations // 4, 10)
+    k = math.sqrt(1.0 / n)
+    t0 = 0.02 if warm else 0.1
+
+    for i in range(iterations):
+        disp = _repulsion(pos, k)
+
+        if len(src):
+            delta = pos[src] - pos[dst]
+            dist = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+            pull = delta * (dist / k)[:, None]
+            for axis in (0, 1):
+                disp[:, axis] -= np.bincount(src, weights=pull[:, axis], minlength=n)
+                disp[:, axis] += np.bincount(dst, weights=pull[:, axis], minlength=n)
+
+        disp -= (pos - pos.mean(axis=0)) * (GRAVITY * n * k)
+
+        length = np.sqrt(np.einsum("ij,ij->i", disp, disp))
+        length[length == 0] = 1.0
+        temperature = t0 * (1 - i / iterations)
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+
+    return pos
+
+
+def circle_layout(n: int) -> np.ndarray:
+    """ノードを円周上に等間隔で並べる"""
+    angles = np.linspace(0, 2 * math.pi, n, endpoint=False)
+    return np.stack([0.5 + 0.5 * np.cos(angles), 0.5 + 0.5 * np.sin(angles)], axis=1)
+
+
+def _to_canvas(pos: np.ndarray) -> np.ndarray:
+    """座標をアスペクト比を保って 0〜CANVAS に収める"""
+    if len(pos) == 0:
+        return pos
+    lo = pos.min(axis=0)
+    span = max(float((pos.max(axis=0) - lo).max()), 1e-9)
+    size = (pos.max(axis=0) - lo) / span
+    return ((pos - lo) / span + (1 - size) / 2) * CANVAS
+
+
+def _warm_start(
+    names: Sequence[str], src: np.ndarray, dst: np.ndarray, previous: Positions, seed: int
+) -> Optional[np.ndarray]:
+    """前回の座標から初期座標を作る（新規ノードは配置済みの隣接ノードの平均付近に置く）"""
+    known = np.array([name in previous for name in names])
+    if not known.any():
+        return None
+
+    rng = np.random.default_rng(seed)
+    n = len(names)
+    pos = rng.random((n, 2))
+    pos[known] = np.array([previous[name] for name, k in zip(names, known) if k]) / CANVAS
+
+    new = ~known
+    if new.any() and len(src):
+        # 既知ノードとつながる新規ノードは、既知の隣接ノードの重心に置く
+        ends = np.concatenate([src, dst])
+        others = np.concatenate([dst, src])
+        usable = new[ends] & known[others]
+        ends, others = ends[usable], others[usable]
+        counts = np.bincount(ends, minlength=n)
+        has = counts > 0
+        for axis in (0, 1):
+            sums = np.bincount(ends, weights=pos[others, axis], minlength=n)
+            pos[has, axis] = sums[has] / counts[has]
+        jitter = math.sqrt(1.0 / n) * 0.1
+        pos[has] += rng.normal(scale=jitter, size=(int(has.sum()), 2))
+    return pos
+
+
+def compute_layout(
+    store: GraphStore,
+    algorithm: str = "force",
+    previous: Optional[Positions] = None,
+    seed: int = 0,
+) -> Positions:
+    """グラフ全体のレイアウトを計算する
+
+    Args:
+        store: グラフストア
+        algorithm: "force" または "circle"
+        previous: 前回のレイアウト（forceのウォームスタートに使う）
+        seed: 乱数シード
+
+    Returns:
+        Positions: エンティティ名 → [x, y]（0〜CANVAS）
+
+    Raises:
+        ValueError: 未知のアルゴリズムが指定された場合
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown layout algorithm: {algorithm} (allowed: {', '.join(ALGORITHMS)})")
+
+    names, src, dst = edge_index(store)
+    if algorithm == "circle":
+        pos = circle_layout(len(names))
+    else:
+        initial = _warm_start(names, src, dst, previous, seed) if previous else None
+        pos = force_layout(len(names), src, dst, initial=initial, seed=seed)
+
+    pos = _to_canvas(pos)
+    return {name: [round(float(x), 2), round(float(y), 2)] for name, (x, y) in zip(names, pos)}
@@ -0,0 +1,411 @@
+"""Memory MCPサーバーとのstdio接続
+
+Memory MCPサーバー（@modelcontextprotocol/server-memory 等）を子プロセスとして起動し、
+標準入出力上の改行区切りJSON-RPCで通信する。
+
+- 接続は使い回す（起動時に一度だけ initialize ハンドシェイクを行う）
+- 1つの接続に複数のリクエストを同時に送り（パイプライン）、応答はidで対応付ける
+- 呼び出しごとにタイムアウトを設け、応答しない接続は閉じて次の呼び出しで起動し直す
+- 少数の接続をプールし、処理中のリクエストが最も少ない接続に振り分ける
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from models.memory import MemoryGraph
+
+logger = logging.getLogger(__name__)
+
+# 既定のサーバー起動コマンド（MEMORY_MCP_COMMAND で変更可能）
+DEFAULT_COMMAND = "npx -y @modelcontextprotocol/server-memory"
+
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "memory-viz", "version": "0.1.0"}
+
+# 1メッセージ（1行）の最大サイズ（read_graphはグラフ全体を1行で返す）
+MAX_MESSAGE_BYTES = 512 * 1024 * 1024
+
+# これより大きい行はワーカースレッドでデコードする（イベントループを止めない）
+INLINE_DECODE_BYTES = 64 * 1024
+
+# 終了要求後、強制終了するまでの待ち時間（秒）
+CLOSE_TIMEOUT = 2.0
+
+
+class MCPError(Exception):
+    """MCPサーバーがエラーを返した"""
+
+
+class MCPConnectionError(MCPError):
+    """MCPサーバーとの接続が切れた（または起動できなかった）"""
+
+
+class MCPTimeoutError(MCPError):
+    """MCPサーバーの応答がタイムアウトした"""
+
+
+class StdioConnection:
+    """1つのMCPサーバープロセスとのJSON-RPC接続
+
+    リクエストは応答を待たずに続けて送ることができ、
+    受信タスクが応答のidから対応するFutureを完了させる。
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        env: Optional[Mapping[str, str]] = None,
+        timeout: float = 30.0,
+    ):
+        """初期化
+
+        Args:
+            command: サーバーの起動コマンド
+            env: サーバープロセスの環境変数（Noneなら親プロセスを引き継ぐ）
+            timeout: 既定の呼び出しタイムアウト（秒）
+        """
+        self.command = list(command)
+        self.env = dict(env) if env is not None else None
+        self.timeout = timeout
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._closed = False
+        self.server_info: Dict[str, Any] = {}
+
+    @property
+    def alive(self) -> bool:
+        """接続が使用可能か"""
+        return (
+            not self._closed
+            and self._process is not None
+            and self._process.returncode is None
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """応答待ちのリクエスト数"""
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """サーバーを起動し、initializeハンドシェイクを行う
+
+        Raises:
+            MCPConnectionError: 起動・ハンドシェイクに失敗した場合
+        """
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                env=self.env,
+                limit=MAX_MESSAGE_BYTES,
+            )
+        except OSError as e:
+            self._closed = True
+            raise MCPConnectionError(f"Failed to start MCP server: {e}") from e
+        self._reader = asyncio.ensure_future(self._read_loop())
+
+        try:
+            result = await self.request("initialize", {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": CLIENT_INFO,
+            })
+            self.server_info = (result or {}).get("serverInfo", {})
+            await self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        except MCPError:
+            await self.close()
+            raise
+
+    async def request(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """リクエストを送り、応答を待つ
+
+        Args:
+            method: JSON-RPCメソッド名
+            params: パラメータ
+            timeout: タイムアウト（秒、Noneなら既定値）
+
+        Returns:
+            応答の result
+
+        Raises:
+            MCPError: サーバーがエラーを返した場合
+            MCPConnectionError: 接続が切れている・切れた場合
+            MCPTimeoutError: タイムアウトした場合
+        """
+        if not self.alive:
+            raise MCPConnectionError("MCP server connection is closed")
+
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        message: Dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+
+        limit = self.timeout if timeout is None else timeout
+        try:
+            await self._send(message)
+            return await asyncio.wait_for(future, limit)
+        except asyncio.TimeoutError:
+            raise MCPTimeoutError(f"MCP request '{method}' timed out after {limit}s") from None
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        """メッセージを1行のJSONとして書き込む"""
+        data = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+        async with self._write_lock:
+            try:
+                self._process.stdin.write(data)
+                await self._process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError) as e:
+                self._closed = True
+                raise MCPConnectionError(f"MCP server connection lost: {e}") from e
+
+    async def _read_loop(self) -> None:
+        """応答を読み、idで対応するリクエストに渡す"""
+        try:
+            while True:
+                line = await self._process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    if len(line) > INLINE_DECODE_BYTES:
+                        message = await asyncio.to_thread(json.loads, line)
+                    else:
+                        message = json.loads(line)
+                except ValueError:
+                    message = None
+                if not isinstance(message, dict):
+                    logger.warning("Ignoring non JSON-RPC output from MCP server: %r", line[:200])
+                    continue
+                if "method" in message:
+                    await self._handle_server_message(message)
+                    continue
+                future = self._pending.get(message.get("id"))
+                if future is None or future.done():
+                    # タイムアウト済みのリクエストへの応答は捨てる
+                    continue
+                error = message.get("error")
+                if error is not None:
+                    detail = error.get("message", "MCP error") if isinstance(error, dict) else str(error)
+                    future.set_exception(MCPError(detail))
+                else:
+                    future.set_result(message.get("result"))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("MCP server connection failed")
+        finally:
+            self._closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(MCPConnectionError("MCP server connection closed"))
+
+    async def _handle_server_message(self, message: Dict[str, Any]) -> None:
+        """サーバーからの通知・リクエストを処理する（pingにだけ応答する）"""
+        if "id" not in message:
+            return
+        if message["method"] == "ping":
+            reply = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+        else:
+            reply = {
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "error": {"code": -32601, "message": "Method not found"},
+            }
+        try:
+            await self._send(reply)
+        except MCPConnectionError:
+            pass
+
+    async def close(self) -> None:
+        """接続を閉じ、サーバープロセスを終了させる"""
+        self._closed = True
+        process = self._process
+        if process is not None and process.returncode is None:
+            try:
+                process.stdin.close()
+            except Exception:
+                pass
+            try:
+                await asyncio.wait_for(process.wait(), CLOSE_TIMEOUT)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(MCPConnectionError("MCP server connection closed"))
+
+
+def tool_payload(result: Dict[str, Any]) -> Any:
+    """tools/call の結果からJSONの内容を取り出す
+
+    structuredContent があればそれを、なければテキストコンテンツをJSONとして解析する。
+
+    Args:
+        result: tools/call の result
+
+    Returns:
+        ツールが返したJSONの内容
+
+    Raises:
+        MCPError: ツールがエラーを返した場合
+    """
+    text = "".join(
+        c.get("text", "") for c in result.get("content", []) if c.get("type") == "text"
+    )
+    if result.get("isError"):
+        raise MCPError(text or "MCP tool call failed")
+    if result.get("structuredContent") is not None:
+        return result["structuredContent"]
+    return json.loads(text) if text else None
+
+
+def parse_graph(result: Dict[str, Any]) -> MemoryGraph:
+    """グラフを返すツール（read_graph等）の結果をMemoryGraphに変換する"""
+    return MemoryGraph.model_validate(tool_payload(result) or {})
+
+
+class MemoryServerPool:
+    """Memory MCPサーバーへの接続プール
+
+    接続は必要になった時点で起動し、最大 size 本まで増やす。
+    すべての接続が処理中なら、処理中のリクエストが最も少ない接続に続けて送る。
+    切断された接続はプールから外し、次の呼び出しで起動し直す。
+    ツールは読み取り専用のため、切断で失敗した呼び出しは一度だけ再試行する。
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        env: Optional[Mapping[str, str]] = None,
+        size: int = 2,
+        timeout: float = 30.0,
+    ):
+        """初期化
+
+        Args:
+            command: サーバーの起動コマンド
+            env: サーバープロセスの環境変数（Noneなら親プロセスを引き継ぐ）
+            size: 最大接続数
+            timeout: 既定の呼び出しタイムアウト（秒）
+        """
+        self.command = list(command)
+        self.env = env
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._connections: List[StdioConnection] = []
+        self._lock: Optional[asyncio.Lock] = None
+        # 起動中の接続の枠（起動が終わると完了する）
+        self._starting: List[asyncio.Future] = []
+        # 起動した接続の累計（再起動の回数を含む）
+        self.started = 0
+
+    async def _acquire(self) -> StdioConnection:
+        """リクエストを送る接続を選ぶ（必要なら起動する）"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        while True:
+            async with self._lock:
+                self._connections = [c for c in self._connections if c.alive]
+                best = min(self._connections, key=lambda c: c.in_flight, default=None)
+                full = len(self._connections) + len(self._starting) >= self.size
+                if best is not None and (best.in_flight == 0 or full):
+                    return best
+                if not full:
+                    # 枠だけ確保し、起動（プロセス生成・初期化）はロックの外で行う
+                    slot = asyncio.get_running_loop().create_future()
+                    self._starting.append(slot)
+                    break
+                # すべての枠が起動中なら、どれかの起動が終わるのを待って選び直す
+                pending = self._starting[0]
+            await asyncio.wait([pending])
+
+        connection = StdioConnection(self.command, self.env, self.timeout)
+        try:
+            await connection.start()
+            self.started += 1
+            self._connections.append(connection)
+        finally:
+            self._starting.remove(slot)
+            slot.set_result(None)
+        return connection
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """ツールを呼び出す
+
+        タイムアウトした接続は応答しなくなっているとみなして閉じる
+        （同じ接続で処理中だった他の呼び出しは別の接続で再試行される）。
+
+        Args:
+            name: ツール名
+            arguments: ツール引数
+            timeout: タイムアウト（秒、Noneなら既定値）
+
+        Returns:
+            tools/call の result
+
+        Raises:
+            MCPError: ツール呼び出しに失敗した場合
+        """
+        params = {"name": name, "arguments": arguments or {}}
+        try:
+            return await self._request(params, timeout)
+        except MCPConnectionError:
+            logger.warning("MCP server connection lost, retrying on a new connection")
+        return await self._request(params, timeout)
+
+    async def _request(self, params: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        """接続を選んで tools/call を送る（タイムアウトした接続は閉じる）"""
+        connection = await self._acquire()
+        try:
+            return await connection.request("tools/call", params, timeout)
+        except MCPTimeoutError:
+            await connection.close()
+            raise
+
+    async def read_graph(self) -> MemoryGraph:
+        """グラフ全体を取得する"""
+        result = await self.call_tool("read_graph")
+        # 大きなグラフの解析・検証はワーカースレッドで行う
+        return await asyncio.to_thread(parse_graph, result)
+
+    async def open_nodes(self, names: List[str]) -> MemoryGraph:
+        """指定したエンティティと、それらの間のリレーションを取得する"""
+        result = await self.call_tool("open_nodes", {"names": names})
+        return await asyncio.to_thread(parse_graph, result)
+
+    async def search_nodes(self, query: str) -> MemoryGraph:
+        """名前・種類・observationsにqueryを含むエンティティを取得する"""
+        result = await self.call_tool("search_nodes", {"query": query})
+        return await asyncio.to_thread(parse_graph, result)
+
+    async def close(self) -> None:
+        """すべての接続を閉じる"""
+        connections, self._connections = self._connections, []
+        await asyncio.gather(*(c.close() for c in connections))
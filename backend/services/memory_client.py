@@ -1,30 +1,302 @@
 """Memory MCP クライアント
 
 Memory MCPサーバーとの通信を担当するクライアント。
-現在はダミーデータを返す実装。将来的にMCPプロトコル経由での通信を実装予定。
+グラフの取得元は次の優先順で選ぶ。
+
+1. Memory MCPサーバー（stdio接続のプール、MEMORY_MCP_ENABLED=true の場合）
+2. データファイル（JSON / Memory MCPのJSONL）
+3. ダミーデータ（開発用）
+
+複数ワーカー構成で共有スナップショット（services.shared_snapshot）を設定した場合は、
+リーダーのワーカーだけが上記から読み込んで公開し、他のワーカーはそれをメモリマップする。
 """
 
-import json
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Dict, Optional, List
-from models.memory import MemoryGraph, Entity, Relation, EntityDetail
+from typing import Collection, Deque, Dict, List, Optional, Tuple, Union
+from models.memory import (
+    MemoryGraph,
+    Entity,
+    Relation,
+    EntityDetail,
+    EntityBatch,
+    ObservationPage,
+    Subgraph,
+    GraphDelta,
+    GraphChanges,
+    SearchHit,
+    SearchResult,
+    GraphLayout,
+    ClusterGraph,
+    ClusterExpansion,
+    GraphAnalytics,
+    PathResult,
+)
+from services.graph_loader import (
+    JsonlCursor,
+    LoadStats,
+    jsonl_cursor_valid,
+    load_graph_jsonl,
+    load_graph_streaming,
+    merge_records,
+    peak_rss_bytes,
+    read_jsonl_records,
+)
+from services.compact_graph import CompactGraph
+from services.graph_diff import diff_appended, diff_graphs
+from services.graph_encoding import IDENTITY
+from services.graph_formats import JSON
+from services.graph_filter import GraphFilter
+from services.graph_store import EncodedGraph, GraphStore
+from services.graph_traversal import neighborhood, shortest_paths
+from services.layout import ALGORITHMS, compute_layout
+from services.mcp_stdio import MemoryServerPool
+from services.metrics import (
+    GRAPH_INDEX_DURATION,
+    GRAPH_LOAD_DURATION,
+    SERIALIZATION_DURATION,
+    record_cache,
+    record_snapshot,
+)
+from services.centrality import Centrality
+from services.clustering import Clustering
+from services.search_index import SearchIndex
+from services.shared_snapshot import SharedSnapshot
+from services.snapshot_cache import SnapshotCache, source_key
+from services.snapshot_file import open_snapshot
+
+# 絞り込み結果のキャッシュの最大件数（(epoch, 版, 条件) ごと、LRUで破棄）
+FILTER_CACHE_SIZE = 32
 
 
 class MemoryMCPClient:
     """Memory MCP クライアント
 
-    Phase 1では簡易実装（ダミーデータまたはJSONファイル読み込み）
-    Phase 2以降でMCPプロトコル経由の通信を実装予定
+    取得したグラフを索引付きスナップショットとしてキャッシュし、各APIに提供する。
     """
 
-    def __init__(self, data_file: Optional[Path] = None):
+    def __init__(
+        self,
+        data_file: Optional[Path] = None,
+        history_size: int = 100,
+        mcp: Optional[MemoryServerPool] = None,
+        shared: Optional[SharedSnapshot] = None,
+        snapshot_cache: Optional[SnapshotCache] = None,
+        report_snapshot: bool = True,
+    ):
         """初期化
 
         Args:
             data_file: Memory MCPデータのJSONファイルパス（オプション）
+            history_size: 保持するスナップショット間差分の最大数
+            mcp: Memory MCPサーバーへの接続プール（指定時はdata_fileより優先）
+            shared: ワーカー間で共有するスナップショット（オプション）
+            snapshot_cache: データファイルのコンパイル済みスナップショットのキャッシュ（オプション）
+            report_snapshot: スナップショットの版・件数をメトリクスに出力するか
+                （複数グラフを提供する場合、グラフごとのクライアントでは出力しない）
         """
         self.data_file = data_file
-        self._cache: Optional[MemoryGraph] = None
+        self.mcp = mcp
+        self.shared = shared
+        self.snapshot_cache = snapshot_cache
+        self.report_snapshot = report_snapshot
+        self._store: Optional[GraphStore] = None
+        self._version = 0
+        # サーバーインスタンス識別子（再起動後の版番号の取り違えを防ぐ）
+        self.epoch = uuid.uuid4().hex[:12]
+        self._history: Deque[GraphDelta] = deque(maxlen=history_size)
+        # 全文検索インデックス（初回検索時に構築し、以降は差分で更新）
+        self._search_index = SearchIndex()
+        self._search_lock: Optional[asyncio.Lock] = None
+        self._search_task: Optional[asyncio.Task] = None
+        # アルゴリズム → 最新のレイアウト（次の版のウォームスタートにも使う）
+        self._layouts: Dict[str, GraphLayout] = {}
+        self._layout_locks: Dict[str, asyncio.Lock] = {}
+        # コミュニティ検出結果（版ごとに初回要求時に計算）
+        self._clustering: Optional[Clustering] = None
+        self._clustering_lock: Optional[asyncio.Lock] = None
+        # 中心性（版ごとに初回要求時に計算）
+        self._centrality: Optional[Centrality] = None
+        self._centrality_lock: Optional[asyncio.Lock] = None
+        # 絞り込んだグラフのエンコード済み本体（LRU）
+        self._filtered: "OrderedDict[tuple, EncodedGraph]" = OrderedDict()
+        self.last_load_stats: Optional[LoadStats] = None
+        self._jsonl_cursor: Optional[JsonlCursor] = None
+        # 進行中の読み込み（同時要求はこのFutureに合流する）
+        self._inflight: Optional[asyncio.Future] = None
+        # 進行中の読み込み完了後に行う再読み込み
+        self._queued: Optional[asyncio.Future] = None
+
+    @property
+    def _cache(self) -> Optional[MemoryGraph]:
+        """キャッシュ中のグラフデータ（未読み込みならNone、参照時にPydanticモデルを組み立てる）"""
+        return self._store.graph if self._store is not None else None
+
+    @property
+    def ready(self) -> bool:
+        """グラフを読み込み済みか（ヘルスチェック用）"""
+        return self._store is not None
+
+    @property
+    def version(self) -> int:
+        """現在のスナップショットの版番号（未読み込みなら0）"""
+        store = self._store
+        return store.version if store is not None else 0
+
+    def _set_graph(
+        self,
+        graph: Union[MemoryGraph, CompactGraph],
+        version: Optional[int] = None,
+        delta: Optional[GraphDelta] = None,
+    ) -> GraphStore:
+        """グラフをキャッシュし、索引を構築する
+
+        新しい版番号を割り当て、直前のスナップショットとの差分を履歴に記録する。
+        キャッシュはコンパクト表現で保持する（MemoryGraphは変換する）。
+
+        Args:
+            graph: キャッシュするグラフデータ
+            version: 版番号（省略時は直前の版の次、共有スナップショットではリーダーの版）
+            delta: 直前のスナップショットからの差分（省略時はグラフ全体を比較して求める）
+
+        Returns:
+            GraphStore: キャッシュしたグラフストア
+        """
+        previous = self._store
+        version = self._version + 1 if version is None else version
+        with GRAPH_INDEX_DURATION.time():
+            store = GraphStore(graph, version=version)
+            if delta is not None:
+                self._history.append(delta)
+            elif previous is not None:
+                self._history.append(
+                    diff_graphs(previous.compact, store.compact, previous.version, version)
+                )
+        self._version = version
+        self._store = store
+        if self.report_snapshot:
+            record_snapshot(version, store.entity_count, store.compact.relation_count)
+        return store
+
+    def get_changes(self, since: int, epoch: Optional[str] = None) -> GraphChanges:
+        """指定した版以降の差分を取得
+
+        Args:
+            since: クライアントが保持している版番号
+            epoch: クライアントが保持しているサーバーインスタンス識別子（任意）
+
+        Returns:
+            GraphChanges: 差分リスト。履歴が足りない・版が不明な場合は fullReloadRequired
+        """
+        current = self.version
+        changes = GraphChanges(version=current, epoch=self.epoch)
+        if since == current and (epoch is None or epoch == self.epoch):
+            return changes
+
+        deltas = None
+        if (epoch is None or epoch == self.epoch) and since <= current:
+            deltas = self._delta_chain(since, current)
+        if deltas is None:
+            changes.fullReloadRequired = True
+            return changes
+
+        changes.changes = deltas
+        return changes
+
+    def _delta_chain(self, since: int, until: int) -> Optional[List[GraphDelta]]:
+        """since から until までを途切れずにつなぐ差分の列
+
+        共有スナップショットのフォロワーは公開された版だけを読み込むため、
+        履歴の版番号は連続しないことがある（例: 3→5, 5→8）。
+
+        Returns:
+            List[GraphDelta]: 古い順の差分、履歴で until まで追えない場合はNone
+        """
+        chain: List[GraphDelta] = []
+        version = since
+        for delta in list(self._history):
+            if version == until:
+                break
+            if delta.fromVersion < version:
+                continue
+            if delta.fromVersion != version:
+                return None
+            chain.append(delta)
+            version = delta.toVersion
+        return chain if version == until else None
+
+    async def get_store(self) -> GraphStore:
+        """索引付きグラフストアを取得（未読み込みなら読み込む）
+
+        Returns:
+            GraphStore: 現在のグラフストア
+        """
+        store = self._store
+        record_cache("snapshot", store is not None)
+        if store is None:
+            store = await self._load(fresh=False)
+        return store
+
+    async def get_encoded_graph(
+        self,
+        encoding: str = IDENTITY,
+        media_type: str = JSON,
+        graph_filter: Optional[GraphFilter] = None,
+    ) -> Tuple[bytes, str]:
+        """エンコード済みのグラフ本体を取得
+
+        本体はスナップショット・形式ごとに一度だけ生成・圧縮してキャッシュする。
+        未生成の場合はワーカースレッドで生成する。
+
+        Args:
+            encoding: 圧縮方式（"identity"、"gzip"、"br"）
+            media_type: 応答形式（JSON、MessagePack、Arrow）
+            graph_filter: 絞り込み条件（指定時は絞り込んだグラフを返す）
+
+        Returns:
+            Tuple[bytes, str]: (レスポンス本体, ETag)
+        """
+        store = await self.get_store()
+        if graph_filter is None or graph_filter.is_empty:
+            bodies = store.bodies
+        else:
+            bodies = await self._get_filtered(store, graph_filter)
+        encoded = bodies.get(media_type)
+        ready = encoded.ready(encoding)
+        record_cache("encoded", ready)
+        if not ready:
+            with SERIALIZATION_DURATION.time(media_type, encoding):
+                await asyncio.to_thread(encoded.get, encoding)
+        return encoded.get(encoding), encoded.etag_for(encoding)
+
+    async def _get_filtered(self, store: GraphStore, graph_filter: GraphFilter) -> EncodedGraph:
+        """絞り込んだグラフを取得（(epoch, 版, 条件) ごとにLRUでキャッシュ）
+
+        Args:
+            store: 絞り込み対象のグラフストア
+            graph_filter: 絞り込み条件
+
+        Returns:
+            EncodedGraph: 絞り込んだグラフのエンコード済み本体
+        """
+        key = (self.epoch, store.version, graph_filter)
+        bodies = self._filtered.get(key)
+        record_cache("filtered", bodies is not None)
+        if bodies is not None:
+            self._filtered.move_to_end(key)
+            return bodies
+
+        compact = await asyncio.to_thread(store.type_index.apply, graph_filter)
+        # 古いスナップショットの絞り込み結果は使われないため破棄する
+        for stale in [k for k in self._filtered if k[:2] != key[:2]]:
+            del self._filtered[stale]
+        bodies = self._filtered[key] = EncodedGraph(compact)
+        while len(self._filtered) > FILTER_CACHE_SIZE:
+            self._filtered.popitem(last=False)
+        return bodies
 
     async def read_graph(self) -> MemoryGraph:
         """Memory MCPからグラフ全体を取得
@@ -32,29 +304,228 @@ class MemoryMCPClient:
         Returns:
             MemoryGraph: エンティティとリレーションを含むグラフデータ
         """
-        # キャッシュがあればそれを返す
-        if self._cache:
-            return self._cache
+        # キャッシュがあればそれを、未読み込みなら読み込んで返す
+        # （同時要求は1回の読み込みにまとめる）
+        return (await self.get_store()).graph
+
+    async def _load(self, fresh: bool) -> GraphStore:
+        """読み込みを開始、または進行中の読み込みに合流する（シングルフライト）
+
+        Args:
+            fresh: Trueの場合、呼び出し時点より後に開始した読み込みの結果を待つ。
+                進行中の読み込みは変更前の内容を読んでいる可能性があるため、
+                その完了後にもう一度だけ読み込む（後続の要求もこれに合流する）。
+
+        Returns:
+            GraphStore: 読み込んだグラフストア
+        """
+        inflight = self._inflight
+        if inflight is None or inflight.done():
+            inflight = self._start_load()
+        elif fresh:
+            if self._queued is None:
+                self._queued = asyncio.ensure_future(self._load_after(inflight))
+            inflight = self._queued
+
+        # 呼び出し元のキャンセルで共有の読み込みが中断されないよう保護する
+        return await asyncio.shield(inflight)
+
+    def _start_load(self) -> asyncio.Future:
+        """新しい読み込みを開始する"""
+        self._inflight = asyncio.ensure_future(self._run_load())
+        return self._inflight
+
+    async def _load_after(self, previous: asyncio.Future) -> GraphStore:
+        """進行中の読み込みの完了を待ってから再度読み込む"""
+        await asyncio.wait([previous])
+        self._queued = None
+        return await self._start_load()
+
+    async def _run_load(self) -> GraphStore:
+        """グラフを読み込んでキャッシュを差し替える
+
+        ファイルI/O・JSON解析・Pydantic検証はワーカースレッドで実行し、
+        イベントループを止めない。完成した新しいスナップショットは
+        一度の代入で差し替えるため、読み込み中も既存のキャッシュが返され続ける。
+
+        Returns:
+            GraphStore: 読み込んだグラフストア
+        """
+        shared = self.shared
+        store = None
+        if shared is not None and not shared.is_leader:
+            store = await self._load_shared(shared)
+        if store is None:
+            # フォロワーでもリーダーが公開しなかった場合は自分で読み込む（公開はしない）
+            store = await self._load_source()
+        if shared is not None and shared.is_leader:
+            store = await asyncio.to_thread(self._publish_shared, store)
 
+        # 検索インデックスが構築済みなら、差分をバックグラウンドで反映しておく
+        if self._search_index.version:
+            self._search_task = asyncio.ensure_future(self._sync_search_index())
+        return store
+
+    async def _load_source(self) -> GraphStore:
+        """データソース（Memory MCPサーバー・データファイル・ダミーデータ）から読み込む"""
+        if self.mcp is not None:
+            # Memory MCPサーバーから取得する（解析・検証はプール側でワーカースレッド実行）
+            with GRAPH_LOAD_DURATION.time("mcp"):
+                graph = await self.mcp.read_graph()
+            return await asyncio.to_thread(self._set_graph, graph)
         # データファイルが指定されていれば読み込む
         if self.data_file and self.data_file.exists():
-            return self._load_from_file()
-
+            return await asyncio.to_thread(self._reload_from_file)
         # ダミーデータを返す（開発用）
-        return self._get_dummy_data()
+        return self._set_graph(self._get_dummy_data())
+
+    async def _load_shared(self, shared: SharedSnapshot) -> Optional[GraphStore]:
+        """リーダーが公開したスナップショットをメモリマップしてキャッシュする（フォロワー）
+
+        版番号・epochはリーダーのものを引き継ぐため、どのワーカーに問い合わせても
+        同じ版は同じ内容を指す。差分履歴は各ワーカーが受け取った版の間で記録する。
+
+        Returns:
+            GraphStore: マップしたグラフストア、公開を待ちきれなかった場合はNone
+        """
+        with GRAPH_LOAD_DURATION.time("shared"):
+            mapped = await shared.wait_current()
+        if mapped is None:
+            return None
+
+        version = int(mapped.meta.get("version", self._version + 1))
+        epoch = mapped.meta.get("epoch", self.epoch)
+        current = self._store
+        if current is not None and epoch == self.epoch and version == current.version:
+            return current
+        if epoch != self.epoch:
+            # リーダーが替わった（版番号の系列が異なる）ため、差分履歴は引き継がない
+            self._history.clear()
+            self._store = None
+            self.epoch = epoch
+        return await asyncio.to_thread(self._set_graph, mapped, version)
+
+    def _publish_shared(self, store: GraphStore) -> GraphStore:
+        """読み込んだスナップショットを公開し、自身もマップしたものに差し替える（リーダー）
 
-    def _load_from_file(self) -> MemoryGraph:
+        Args:
+            store: 読み込んだグラフストア
+
+        Returns:
+            GraphStore: 公開したスナップショットをマップしたグラフストア
+        """
+        path = self.shared.publish(
+            store.compact, {"version": store.version, "epoch": self.epoch}, store.adjacency
+        )
+        mapped = GraphStore(open_snapshot(path), version=store.version)
+        # 差分履歴・メトリクスは読み込み時に記録済みのため、キャッシュだけ差し替える
+        if self._store is store:
+            self._store = mapped
+        return mapped
+
+    def _load_from_file(self) -> GraphStore:
         """JSONファイルからデータを読み込む
 
+        ファイル全体を一括で読み込まず、レコード単位でストリーミングする。
+        拡張子が .jsonl の場合はMemory MCPのJSONL形式として読み込み、
+        次回の差分読み込みのために読み込み位置を記録する。
+        読み込み統計（所要時間・ピークRSS）は last_load_stats に保持する。
+        コンパイル済みスナップショットのキャッシュがあれば、解析せずにそれをマップする。
+
         Returns:
-            MemoryGraph: 読み込んだグラフデータ
+            GraphStore: 読み込んだグラフストア
         """
-        with open(self.data_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        cache = self.snapshot_cache
+        key = None
+        if cache is not None:
+            # 解析中に書き換えられても次回は不一致になるよう、照合キーは解析前に取る
+            key = source_key(self.data_file)
+            store = self._load_compiled(cache, key)
+            if store is not None:
+                return store
+
+        if self._is_jsonl():
+            with GRAPH_LOAD_DURATION.time("jsonl"):
+                graph, self.last_load_stats, self._jsonl_cursor = load_graph_jsonl(self.data_file)
+        else:
+            with GRAPH_LOAD_DURATION.time("json"):
+                graph, self.last_load_stats = load_graph_streaming(self.data_file)
+        store = self._set_graph(graph)
+
+        if cache is not None:
+            meta = {}
+            if self._jsonl_cursor is not None:
+                cursor = self._jsonl_cursor
+                meta["jsonl_cursor"] = {
+                    "offset": cursor.offset, "inode": cursor.inode, "anchor": cursor.anchor.hex(),
+                }
+            cache.save(self.data_file, key, store.compact, meta, store.adjacency)
+        return store
 
-        graph = MemoryGraph(**data)
-        self._cache = graph
-        return graph
+    def _load_compiled(self, cache: SnapshotCache, key: dict) -> Optional[GraphStore]:
+        """コンパイル済みスナップショットをマップしてキャッシュする
+
+        Args:
+            cache: スナップショットキャッシュ
+            key: データファイルの照合キー
+
+        Returns:
+            GraphStore: マップしたグラフストア、キャッシュが使えない場合はNone
+        """
+        started = time.perf_counter()
+        mapped = cache.load(self.data_file, key)
+        if mapped is None:
+            return None
+        duration = time.perf_counter() - started
+        GRAPH_LOAD_DURATION.observe(duration, "compiled")
+
+        cursor = mapped.meta.get("jsonl_cursor")
+        self._jsonl_cursor = None
+        if cursor is not None and self._is_jsonl():
+            self._jsonl_cursor = JsonlCursor(
+                offset=cursor["offset"], inode=cursor["inode"], anchor=bytes.fromhex(cursor["anchor"]),
+            )
+        self.last_load_stats = LoadStats(
+            path=str(self.data_file),
+            bytes_total=key["size"],
+            entity_count=mapped.entity_count,
+            relation_count=mapped.relation_count,
+            duration_sec=duration,
+            peak_rss_bytes=peak_rss_bytes(),
+        )
+        return self._set_graph(mapped)
+
+    def _is_jsonl(self) -> bool:
+        """データファイルがJSONL形式か"""
+        return self.data_file is not None and self.data_file.suffix.lower() == ".jsonl"
+
+    def _tail_jsonl(self) -> Optional[GraphStore]:
+        """JSONLファイルの追記分だけを読み込んでキャッシュに反映する
+
+        Returns:
+            GraphStore: 反映後のグラフストア、差分読み込みできない場合はNone
+        """
+        if (
+            self._store is None
+            or self._jsonl_cursor is None
+            or not self._is_jsonl()
+            or not self.data_file.exists()
+            or not jsonl_cursor_valid(self.data_file, self._jsonl_cursor)
+        ):
+            return None
+
+        with GRAPH_LOAD_DURATION.time("jsonl_tail"):
+            entities, relations, cursor = read_jsonl_records(self.data_file, self._jsonl_cursor)
+            self._jsonl_cursor = cursor
+            if not entities and not relations:
+                return self._store
+            previous = self._store
+            graph = merge_records(previous.compact, entities, relations)
+            # 追記分だけから差分を求める（グラフ全体は比較しない）
+            delta = diff_appended(
+                previous.compact, graph, [e.name for e in entities], previous.version, self._version + 1
+            )
+        return self._set_graph(graph, delta=delta)
 
     def _get_dummy_data(self) -> MemoryGraph:
         """ダミーデータを生成（開発・テスト用）
@@ -107,62 +578,442 @@ class MemoryMCPClient:
             Relation(from_="Memory MCP", to="Windows環境", relationType="runs on"),
         ]
 
-        graph = MemoryGraph(entities=entities, relations=relations)
-        self._cache = graph
-        return graph
+        return MemoryGraph(entities=entities, relations=relations)
 
-    async def get_entity(self, entity_name: str) -> Optional[EntityDetail]:
+    async def get_entity(
+        self,
+        entity_name: str,
+        include_centrality: bool = False,
+        observation_limit: Optional[int] = None,
+    ) -> Optional[EntityDetail]:
         """特定のエンティティの詳細を取得
 
         Args:
             entity_name: エンティティ名
+            include_centrality: 中心性（degree・pagerank・betweenness）を付けるか
+            observation_limit: 返す observations の最大件数（Noneなら全件）
 
         Returns:
             EntityDetail: エンティティ詳細、存在しない場合はNone
         """
-        graph = await self.read_graph()
+        centrality, store = await self._detail_source(include_centrality)
+
+        # 名前索引から参照（O(1)）
+        return self._entity_detail(store, entity_name, centrality, observation_limit)
+
+    async def get_entities(
+        self,
+        entity_names: Collection[str],
+        include_centrality: bool = False,
+        observation_limit: Optional[int] = None,
+    ) -> EntityBatch:
+        """複数のエンティティの詳細を一括で取得
+
+        すべての名前を同じスナップショットから解決する（途中で版が替わっても混在しない）。
+
+        Args:
+            entity_names: エンティティ名リスト（重複は1件にまとめる）
+            include_centrality: 中心性（degree・pagerank・betweenness）を付けるか
+            observation_limit: エンティティごとに返す observations の最大件数（Noneなら全件）
+
+        Returns:
+            EntityBatch: 見つかったエンティティの詳細と、見つからなかった名前
+        """
+        centrality, store = await self._detail_source(include_centrality)
+        batch = EntityBatch(version=store.version)
+        for name in dict.fromkeys(entity_names):
+            detail = self._entity_detail(store, name, centrality, observation_limit)
+            if detail is None:
+                batch.notFound.append(name)
+                continue
+            batch.entities.append(detail)
+        return batch
+
+    async def get_observations(
+        self, entity_name: str, offset: int = 0, limit: int = 100
+    ) -> Optional[ObservationPage]:
+        """エンティティの observations をページ単位で取得
+
+        圧縮して保持している observations のうち、ページの範囲だけをデコードする。
 
-        # エンティティを検索
-        entity = next(
-            (e for e in graph.entities if e.name == entity_name),
-            None
+        Args:
+            entity_name: エンティティ名
+            offset: 先頭の位置
+            limit: 最大件数
+
+        Returns:
+            ObservationPage: observations のページ、エンティティが存在しない場合はNone
+        """
+        store = await self.get_store()
+        found = store.get_observations(entity_name, offset, limit)
+        if found is None:
+            return None
+        observations, total = found
+        return ObservationPage(
+            name=entity_name,
+            observations=observations,
+            offset=offset,
+            total=total,
+            version=store.version,
+        )
+
+    async def _detail_source(self, include_centrality: bool) -> Tuple[Optional[Centrality], GraphStore]:
+        """エンティティ詳細の参照先（中心性を付ける場合は計算したスナップショットを使う）"""
+        if include_centrality:
+            centrality = await self.get_centrality()
+            return centrality, centrality.store
+        return None, await self.get_store()
+
+    @staticmethod
+    def _entity_detail(
+        store: GraphStore,
+        entity_name: str,
+        centrality: Optional[Centrality] = None,
+        observation_limit: Optional[int] = None,
+    ) -> Optional[EntityDetail]:
+        """エンティティ詳細を作成（centrality指定時は中心性も付ける、存在しなければNone）"""
+        found = store.get_observations(entity_name, limit=observation_limit)
+        if found is None:
+            return None
+        observations, total = found
+        detail = EntityDetail(
+            name=entity_name,
+            entityType=store.entity_type(entity_name),
+            observations=observations,
+            observationCount=total,
+            # 隣接リストから関連エンティティを収集（O(次数)、重複削除済み）
+            relatedEntities=store.neighbors(entity_name)
+        )
+        scores = centrality.scores(entity_name) if centrality is not None else None
+        if scores is not None:
+            detail.degree, detail.pagerank, detail.betweenness = scores
+        return detail
+
+    async def get_neighborhood(
+        self,
+        entity_name: str,
+        depth: int = 1,
+        limit: int = 200,
+        relation_types: Optional[Collection[str]] = None,
+        max_fanout: int = 50,
+    ) -> Optional[Subgraph]:
+        """エンティティの近傍（k-hop以内の誘導部分グラフ）を取得
+
+        Args:
+            entity_name: 中心エンティティ名
+            depth: 最大ホップ数
+            limit: 最大ノード数
+            relation_types: たどるリレーション種類（Noneなら全種類）
+            max_fanout: 1ノードあたりの最大展開数（これを超える次数のノードは展開しない）
+
+        Returns:
+            Subgraph: 部分グラフ、中心エンティティが存在しない場合はNone
+        """
+        store = await self.get_store()
+        if not store.has_entity(entity_name):
+            return None
+
+        entities, relations, truncated = neighborhood(
+            store, entity_name, depth, limit, relation_types, max_fanout
+        )
+        return Subgraph(
+            entities=entities,
+            relations=relations,
+            center=entity_name,
+            depth=depth,
+            truncated=truncated,
         )
 
-        if not entity:
+    async def get_paths(
+        self,
+        source: str,
+        target: str,
+        max_depth: int = 6,
+        k: int = 1,
+        relation_types: Optional[Collection[str]] = None,
+        max_fanout: int = 1000,
+    ) -> Optional[PathResult]:
+        """2つのエンティティを結ぶ最短経路を取得
+
+        Args:
+            source: 始点エンティティ名
+            target: 終点エンティティ名
+            max_depth: 最大ホップ数
+            k: 返す経路の最大数
+            relation_types: たどるリレーション種類（Noneなら全種類）
+            max_fanout: 展開するノードの最大次数（これを超える次数のノードは展開しない）
+
+        Returns:
+            PathResult: 探索結果、始点・終点のいずれかが存在しない場合はNone
+        """
+        store = await self.get_store()
+        if not store.has_entity(source) or not store.has_entity(target):
             return None
 
-        # 関連エンティティを収集
-        related: List[str] = []
-        for rel in graph.relations:
-            if rel.from_ == entity_name:
-                related.append(rel.to)
-            elif rel.to == entity_name:
-                related.append(rel.from_)
-
-        return EntityDetail(
-            name=entity.name,
-            entityType=entity.entityType,
-            observations=entity.observations,
-            relatedEntities=list(set(related))  # 重複削除
+        paths, truncated = shortest_paths(
+            store, source, target, max_depth, k, relation_types, max_fanout
+        )
+        return PathResult(
+            source=source,
+            target=target,
+            length=len(paths[0].relations) if paths else None,
+            paths=paths,
+            version=store.version,
+            truncated=truncated,
         )
 
+    async def search(self, query: str, limit: int = 20) -> SearchResult:
+        """エンティティ名・observationsを全文検索
+
+        Args:
+            query: 検索文字列（空白区切りの語をすべて含むエンティティを返す）
+            limit: 最大件数
+
+        Returns:
+            SearchResult: スコア順の検索結果
+        """
+        store = await self._sync_search_index()
+        # インデックスは正規化済みテキストしか持たないため、一致箇所の元テキストは
+        # インデックスと同じ版のスナップショットからヒットしたエンティティ分だけ取り出す
+        def observations_of(name: str) -> List[str]:
+            page = store.get_observations(name)
+            return page[0] if page is not None else []
+
+        total, hits = await asyncio.to_thread(self._search_index.search, query, limit, observations_of)
+
+        results = []
+        for hit in hits:
+            entity_type = store.entity_type(hit["name"])
+            if entity_type is not None:
+                results.append(SearchHit(entityType=entity_type, **hit))
+        return SearchResult(query=query, total=total, hits=results, version=store.version)
+
+    async def _sync_search_index(self) -> GraphStore:
+        """検索インデックスを現在のスナップショットに追いつかせる
+
+        差分履歴がインデックスの版から連続していれば差分だけを適用し、
+        そうでなければ全件から作り直す。処理はワーカースレッドで行う。
+
+        Returns:
+            GraphStore: インデックスが対応しているグラフストア
+        """
+        if self._search_lock is None:
+            self._search_lock = asyncio.Lock()
+        async with self._search_lock:
+            store = await self.get_store()
+            if self._search_index.version != store.version:
+                await asyncio.to_thread(self._update_search_index, store)
+            return store
+
+    def _update_search_index(self, store: GraphStore) -> None:
+        """検索インデックスを指定スナップショットまで更新する（ブロッキング）"""
+        index = self._search_index
+        deltas = self._delta_chain(index.version, store.version) if index.version > 0 else None
+        if deltas:
+            for delta in deltas:
+                index.apply(delta)
+        else:
+            index.build(store.entities, store.version)
+
+    async def get_layout(self, algorithm: str = "force") -> GraphLayout:
+        """グラフ全体のレイアウトを取得
+
+        レイアウトは版ごとに一度だけワーカースレッドで計算してキャッシュする。
+        グラフが更新されていれば、前の版の座標から計算し直す（ウォームスタート）。
+
+        Args:
+            algorithm: レイアウトアルゴリズム（"force" または "circle"）
+
+        Returns:
+            GraphLayout: エンティティごとの座標
+
+        Raises:
+            ValueError: 未知のアルゴリズムが指定された場合
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown layout algorithm: {algorithm}")
+
+        lock = self._layout_locks.setdefault(algorithm, asyncio.Lock())
+        async with lock:
+            store = await self.get_store()
+            cached = self._layouts.get(algorithm)
+            hit = cached is not None and cached.version == store.version
+            record_cache("layout", hit)
+            if hit:
+                return cached
+
+            previous = cached.positions if cached is not None else None
+            positions = await asyncio.to_thread(compute_layout, store, algorithm, previous)
+            layout = GraphLayout.model_construct(
+                algorithm=algorithm, version=store.version, positions=positions
+            )
+            self._layouts[algorithm] = layout
+            return layout
+
+    async def get_clustering(self) -> Clustering:
+        """現在のスナップショットのコミュニティ検出結果を取得
+
+        版ごとに一度だけワーカースレッドで計算してキャッシュする。
+
+        Returns:
+            Clustering: クラスタリング結果
+        """
+        if self._clustering_lock is None:
+            self._clustering_lock = asyncio.Lock()
+        async with self._clustering_lock:
+            store = await self.get_store()
+            clustering = self._clustering
+            hit = clustering is not None and clustering.version == store.version
+            record_cache("clustering", hit)
+            if not hit:
+                clustering = await asyncio.to_thread(Clustering, store)
+                self._clustering = clustering
+            return clustering
+
+    async def get_centrality(self) -> Centrality:
+        """現在のスナップショットの中心性を取得
+
+        版ごとに一度だけワーカースレッドで計算してキャッシュする。
+
+        Returns:
+            Centrality: 中心性
+        """
+        if self._centrality_lock is None:
+            self._centrality_lock = asyncio.Lock()
+        async with self._centrality_lock:
+            store = await self.get_store()
+            centrality = self._centrality
+            hit = centrality is not None and centrality.version == store.version
+            record_cache("centrality", hit)
+            if not hit:
+                centrality = await asyncio.to_thread(Centrality, store)
+                self._centrality = centrality
+            return centrality
+
+    async def get_analytics(self, metric: str = "pagerank", limit: int = 100) -> GraphAnalytics:
+        """中心性の上位エンティティを取得
+
+        Args:
+            metric: 並べ替えに使う指標（degree・pagerank・betweenness）
+            limit: 返すエンティティの最大数
+
+        Returns:
+            GraphAnalytics: 指標の大きい順のエンティティ
+        """
+        centrality = await self.get_centrality()
+        return centrality.top(metric, limit)
+
+    async def get_clusters(self, limit: int = 200) -> ClusterGraph:
+        """クラスタ単位に縮約したグラフを取得
+
+        Args:
+            limit: 返すクラスタの最大数（大きい順）
+
+        Returns:
+            ClusterGraph: スーパーノードとクラスタ間の集約エッジ
+        """
+        clustering = await self.get_clustering()
+        return clustering.summary(limit)
+
+    async def expand_cluster(self, cluster_id: str, limit: int = 500) -> Optional[ClusterExpansion]:
+        """1つのクラスタを展開する
+
+        Args:
+            cluster_id: クラスタID（/api/graph/clusters の id）
+            limit: 返すエンティティの最大数
+
+        Returns:
+            ClusterExpansion: 展開結果、クラスタが存在しない場合はNone
+        """
+        clustering = await self.get_clustering()
+        cluster = clustering.parse_id(cluster_id)
+        if cluster is None:
+            return None
+        return await asyncio.to_thread(clustering.expand, cluster, limit)
+
     async def refresh(self) -> MemoryGraph:
-        """キャッシュをクリアして最新データを取得
+        """最新データを読み込んでキャッシュを差し替える
+
+        JSONLファイルの場合は前回の読み込み位置以降の追記分だけを反映する。
+        ファイルが置き換え・切り詰められていた場合は全件読み直す。
+        読み込みが完了するまで、他の呼び出し元には既存のキャッシュが返される。
 
         Returns:
             MemoryGraph: 最新のグラフデータ
         """
-        self._cache = None
-        return await self.read_graph()
+        return (await self._load(fresh=True)).graph
+
+    async def reload(self) -> GraphStore:
+        """リクエスト処理を止めずにグラフを再構築する（ファイル監視用）
+
+        グラフ全体のPydanticモデルは組み立てず、索引付きストアを返す。
+
+        Returns:
+            GraphStore: 再構築後のグラフストア
+        """
+        return await self._load(fresh=True)
+
+    def _reload_from_file(self) -> GraphStore:
+        """データファイルから再構築する（ブロッキング）
+
+        Returns:
+            GraphStore: 再構築後のグラフストア
+        """
+        store = self._tail_jsonl()
+        if store is not None:
+            return store
+        return self._load_from_file()
 
     def set_data_file(self, file_path: Path):
         """データファイルを設定
 
         Args:
-            file_path: JSONファイルパス
+            file_path: JSONファイルまたはMemory MCPのJSONLファイルパス
         """
         self.data_file = file_path
-        self._cache = None  # キャッシュクリア
+        self._store = None  # キャッシュクリア
+        self._history.clear()
+        self._layouts.clear()
+        self._clustering = None
+        self._centrality = None
+        self._filtered.clear()
+        self._jsonl_cursor = None
+
+    def set_shared_snapshot(self, shared: Optional[SharedSnapshot]):
+        """ワーカー間で共有するスナップショットを設定
+
+        Args:
+            shared: 共有スナップショット（Noneで解除）
+        """
+        self.shared = shared
+        self._store = None  # キャッシュクリア
+        self._history.clear()
+        self._layouts.clear()
+        self._clustering = None
+        self._centrality = None
+        self._filtered.clear()
+
+    def set_snapshot_cache(self, cache: Optional[SnapshotCache]):
+        """データファイルのコンパイル済みスナップショットのキャッシュを設定
+
+        Args:
+            cache: スナップショットキャッシュ（Noneで解除）
+        """
+        self.snapshot_cache = cache
+
+    def set_mcp_pool(self, pool: Optional[MemoryServerPool]):
+        """Memory MCPサーバーへの接続プールを設定
+
+        Args:
+            pool: 接続プール（Noneならデータファイル・ダミーデータに戻す）
+        """
+        self.mcp = pool
+        self._store = None  # キャッシュクリア
+        self._history.clear()
+        self._layouts.clear()
+        self._clustering = None
+        self._centrality = None
+        self._filtered.clear()
 
 
 # グローバルインスタンス（シングルトンパターン）
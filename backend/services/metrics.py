@@ -0,0 +1,356 @@
+"""メトリクス（Prometheusテキスト形式）
+
+常時有効にしておけるよう、計測は「ロックを取って数値を足す」だけにとどめる。
+文字列の組み立ては /metrics の取得時にだけ行う。
+
+メトリクス一覧:
+    http_requests_total{method, route, status}: リクエスト数
+    http_request_duration_seconds{method, route}: ルートごとの処理時間
+    http_requests_in_flight: 処理中のリクエスト数
+    graph_load_duration_seconds{source}: グラフの読み込み・解析時間
+    graph_index_duration_seconds: 索引（GraphStore）の構築時間
+    graph_serialization_duration_seconds{format, encoding}: 応答本体のエンコード時間
+    graph_cache_requests_total{cache, result}: キャッシュのヒット・ミス数
+    graph_snapshot_version / graph_snapshot_age_seconds: 現在のスナップショットの版と経過時間
+    graph_entities / graph_relations: 現在のスナップショットの件数
+"""
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LabelValues = Tuple[str, ...]
+
+# 既定のバケット（秒）
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOAD_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    """ラベル値のエスケープ"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Iterable[str]) -> str:
+    """{name="value",...} 形式のラベル（ラベルなしなら空文字列）"""
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """数値の出力形式"""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """メトリクスの共通部分"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """HELP・TYPE行とサンプル行"""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    """単調増加するカウンター"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """加算する（ラベル値は定義順に渡す）"""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def get(self, *labels: str) -> float:
+        """現在値"""
+        return self._values.get(labels, 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, k)} {_format_value(v)}" for k, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """増減する値
+
+    set_function() で関数を設定すると、出力時にその戻り値を使う（Noneなら出力しない）。
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], Optional[float]]] = None
+
+    def set(self, value: float, *labels: str) -> None:
+        """値を設定する"""
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """加算する"""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        """減算する"""
+        self.inc(*labels, amount=-amount)
+
+    def get(self, *labels: str) -> Optional[float]:
+        """現在値（未設定ならNone）"""
+        if self._function is not None:
+            return self._function()
+        return self._values.get(labels)
+
+    def set_function(self, function: Callable[[], Optional[float]]) -> None:
+        """出力時に値を計算する関数を設定する（ラベルなしのゲージ用）"""
+        self._function = function
+
+    def _samples(self) -> List[str]:
+        if self._function is not None:
+            value = self._function()
+            return [] if value is None else [f"{self.name} {_format_value(value)}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, k)} {_format_value(v)}" for k, v in items
+        ]
+
+
+class Histogram(_Metric):
+    """分布（累積バケット・合計・件数）"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # ラベル値 → [バケットごとの件数..., +Infの件数, 合計]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """値を記録する"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    def count(self, *labels: str) -> int:
+        """記録した件数"""
+        state = self._values.get(labels)
+        return int(sum(state[:-1])) if state else 0
+
+    def time(self, *labels: str) -> "_Timer":
+        """with文の処理時間を記録するタイマー"""
+        return _Timer(self, labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        for labels, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    self.label_names + ("le",), labels + (_format_value(bound),)
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {_format_value(cumulative)}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{label_text} {_format_value(cumulative)}")
+        return lines
+
+
+class _Timer:
+    """Histogram.time() のコンテキストマネージャー"""
+
+    def __init__(self, histogram: Histogram, labels: LabelValues):
+        self._histogram = histogram
+        self._labels = labels
+        self._started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._histogram.observe(time.perf_counter() - self._started, *self._labels)
+
+
+class Registry:
+    """メトリクスの登録先"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        """カウンターを登録する"""
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        """ゲージを登録する"""
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """ヒストグラムを登録する"""
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        """Prometheusテキスト形式で出力する"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route"),
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight", "HTTP requests currently being processed."
+)
+GRAPH_LOAD_DURATION = REGISTRY.histogram(
+    "graph_load_duration_seconds", "Time to read and parse the graph from its source.",
+    ("source",), LOAD_BUCKETS,
+)
+GRAPH_INDEX_DURATION = REGISTRY.histogram(
+    "graph_index_duration_seconds", "Time to build a snapshot index (GraphStore) and its delta.",
+    buckets=LOAD_BUCKETS,
+)
+SERIALIZATION_DURATION = REGISTRY.histogram(
+    "graph_serialization_duration_seconds", "Time to encode graph response bodies.",
+    ("format", "encoding"),
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "graph_cache_requests_total", "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+)
+SNAPSHOT_VERSION = REGISTRY.gauge(
+    "graph_snapshot_version", "Version number of the current graph snapshot."
+)
+SNAPSHOT_TIMESTAMP = REGISTRY.gauge(
+    "graph_snapshot_timestamp_seconds", "Unix time when the current snapshot was installed."
+)
+SNAPSHOT_AGE = REGISTRY.gauge(
+    "graph_snapshot_age_seconds", "Seconds since the current snapshot was installed."
+)
+GRAPH_ENTITIES = REGISTRY.gauge("graph_entities", "Entities in the current snapshot.")
+GRAPH_RELATIONS = REGISTRY.gauge("graph_relations", "Relations in the current snapshot.")
+
+
+def _snapshot_age() -> Optional[float]:
+    loaded_at = SNAPSHOT_TIMESTAMP.get()
+    return None if loaded_at is None else max(0.0, time.time() - loaded_at)
+
+
+SNAPSHOT_AGE.set_function(_snapshot_age)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """キャッシュのヒット・ミスを記録する"""
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+
+def record_snapshot(version: int, entities: int, relations: int) -> None:
+    """新しいスナップショットの版・件数を記録する"""
+    SNAPSHOT_VERSION.set(version)
+    SNAPSHOT_TIMESTAMP.set(time.time())
+    GRAPH_ENTITIES.set(entities)
+    GRAPH_RELATIONS.set(relations)
+
+
+class MetricsMiddleware:
+    """HTTPリクエストの件数・処理時間・処理中件数を記録するASGIミドルウェア
+
+    ルートはパスではなくルーティング後のテンプレート（/api/entities/{entity_name}）で
+    集計し、ラベルの種類が増え続けないようにする。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, template, status)
+            HTTP_DURATION.observe(elapsed, method, template)
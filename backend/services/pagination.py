@@ -0,0 +1,174 @@
+"""グラフのページング・フィールド射影
+
+カーソルにはスナップショットの版番号とオフセットを埋め込む。
+ページングの途中でグラフが再読み込みされた場合は、古いカーソルを検出して
+最初から取り直すよう呼び出し元に伝える。
+"""
+
+import base64
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from models.memory import Relation
+from services.compact_graph import CompactGraph
+
+# エンティティで指定可能なフィールド（nameは常に含める）
+ENTITY_FIELDS = ("type", "name", "entityType", "observations")
+
+# フィールドの値を CompactGraph の列から取り出す関数（observations は指定時だけデコードする）
+_ENTITY_GETTERS: Dict[str, Callable[[CompactGraph, int], Any]] = {
+    "type": lambda graph, index: "entity",
+    "name": lambda graph, index: graph.names[index],
+    "entityType": lambda graph, index: graph.entity_type(index),
+    "observations": lambda graph, index: graph.observations_of(index),
+}
+
+
+class StaleCursorError(ValueError):
+    """カーソル発行後にスナップショットが差し替えられた"""
+
+
+def encode_cursor(version: int, offset: int) -> str:
+    """カーソル文字列を作成
+
+    Args:
+        version: スナップショットの版番号
+        offset: 次に返す要素の位置
+
+    Returns:
+        str: URLセーフなカーソル文字列
+    """
+    raw = f"{version}:{offset}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], version: int) -> int:
+    """カーソル文字列からオフセットを取り出す
+
+    Args:
+        cursor: カーソル文字列（Noneなら先頭）
+        version: 現在のスナップショットの版番号
+
+    Returns:
+        int: オフセット
+
+    Raises:
+        ValueError: カーソルが不正な場合
+        StaleCursorError: カーソルが別の版のものである場合
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_version, offset = base64.urlsafe_b64decode(padded).decode("ascii").split(":")
+        cursor_version, offset = int(cursor_version), int(offset)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if cursor_version != version or offset < 0:
+        raise StaleCursorError("Graph snapshot changed; restart pagination without a cursor")
+    return offset
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """fieldsパラメータを解析する
+
+    Args:
+        fields: カンマ区切りのフィールド名（Noneなら全フィールド）
+
+    Returns:
+        Tuple[str, ...]: 出力するフィールド名
+
+    Raises:
+        ValueError: 未知のフィールドが指定された場合
+    """
+    if not fields:
+        return ENTITY_FIELDS
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(ENTITY_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(sorted(unknown))} (allowed: {', '.join(ENTITY_FIELDS)})"
+        )
+    requested.add("name")
+    return tuple(f for f in ENTITY_FIELDS if f in requested)
+
+
+def project_entity(graph: CompactGraph, index: int, fields: Sequence[str]) -> Dict[str, Any]:
+    """エンティティを指定フィールドだけのdictに変換する
+
+    Entityモデルを組み立てず、グラフの列から指定フィールドだけを取り出す。
+
+    Args:
+        graph: グラフ
+        index: エンティティID
+        fields: 出力フィールド
+
+    Returns:
+        Dict[str, Any]: 指定フィールドのdict
+    """
+    return {f: _ENTITY_GETTERS[f](graph, index) for f in fields}
+
+
+def relation_to_dict(relation: Relation) -> Dict[str, Any]:
+    """リレーションをAPI出力形式（from エイリアス）のdictに変換する"""
+    return {
+        "type": relation.type,
+        "from": relation.from_,
+        "to": relation.to,
+        "relationType": relation.relationType,
+    }
+
+
+def paginate(items: Sequence, offset: int, limit: int, version: int) -> Tuple[List, Optional[str]]:
+    """シーケンスから1ページ分を切り出す
+
+    Args:
+        items: ページング対象
+        offset: 開始位置
+        limit: 最大件数
+        version: スナップショットの版番号
+
+    Returns:
+        Tuple[List, Optional[str]]: (ページ要素, 次ページのカーソル（最終ページならNone）)
+    """
+    page = list(items[offset:offset + limit])
+    end = offset + len(page)
+    next_cursor = encode_cursor(version, end) if end < len(items) else None
+    return page, next_cursor
+
+
+def iter_ndjson(
+    graph: CompactGraph,
+    relations: Iterable[Relation],
+    fields: Sequence[str],
+    header: Dict[str, Any],
+    batch_size: int = 1000,
+) -> Iterator[bytes]:
+    """グラフをNDJSON（1行1レコード）としてバッチ単位で出力する
+
+    1行目にメタ情報、続いてエンティティ、リレーションの順に出力する。
+    各行はMemory MCPのJSONL形式と同じく "type" を持つ。
+
+    Args:
+        graph: エンティティを出力するグラフ
+        relations: リレーション
+        fields: エンティティの出力フィールド（observations を含まなければデコードしない）
+        header: 1行目に出力するメタ情報
+        batch_size: 1チャンクにまとめる行数
+
+    Yields:
+        bytes: NDJSONのチャンク
+    """
+    lines: List[str] = [json.dumps({"type": "meta", **header}, ensure_ascii=False)]
+    records = (
+        ({"type": "entity", **project_entity(graph, i, fields)} for i in range(graph.entity_count)),
+        (relation_to_dict(r) for r in relations),
+    )
+    for source in records:
+        for record in source:
+            lines.append(json.dumps(record, ensure_ascii=False))
+            if len(lines) >= batch_size:
+                yield ("\n".join(lines) + "\n").encode("utf-8")
+                lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
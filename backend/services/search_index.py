@@ -0,0 +1,327 @@
+"""全文検索インデックス
+
+エンティティ名とobservationsに対する文字bigram（と1文字検索用のunigram）の転置インデックス。
+形態素解析器なしで日本語（CJK）を部分一致検索できる。
+bigramの積集合で候補を絞り込み、正規化したテキストへの部分一致で確認する。
+
+グラフの再読み込み時は、スナップショット間の差分（GraphDelta）を適用して
+追加・削除された文書だけを更新する。削除された文書は墓標として残し、
+一定割合を超えたら作り直す。
+
+保持するのは正規化済みテキストだけで、元テキストは持たない（observationsの
+元テキストは CompactGraph が圧縮して保持している）。正規化済みテキストは
+bigram候補の確認（連続した部分一致か）に必要なため、検索のたびに圧縮領域を
+展開しないようここで保持する。ヒットの表示用テキストは、ヒットした
+エンティティのobservationsだけを呼び出し側から取得して復元する。
+"""
+
+import math
+import re
+import threading
+import unicodedata
+from array import array
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from models.memory import Entity, GraphDelta
+
+# 1件のヒットに含める一致箇所の最大数
+MAX_MATCHES_PER_HIT = 3
+
+# エンティティ名一致のスコア倍率
+NAME_WEIGHT = 10.0
+
+# 墓標の割合がこれを超えたら作り直す
+COMPACT_RATIO = 0.5
+
+
+def normalize(text: str) -> str:
+    """検索用の正規化（NFKC + 大文字小文字の同一視）"""
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def _grams(text: str) -> Set[str]:
+    """正規化済みテキストの文字bigram集合"""
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _index_keys(text: str) -> Set[str]:
+    """索引に登録するキー（文字bigramと1文字検索用のunigram）"""
+    keys = set(text)
+    keys.update(text[i:i + 2] for i in range(len(text) - 1))
+    return keys
+
+
+class SearchIndex:
+    """文字bigram転置インデックス
+
+    スレッドセーフ。更新と検索は内部ロックで排他される。
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        """空の状態に戻す"""
+        # 文書ID → 正規化済みテキスト（削除済みはNone）
+        self._norms: List[Optional[str]] = []
+        # 文書ID → 所属エンティティ名
+        self._owners: List[str] = []
+        # 文書ID → エンティティ名の文書なら1
+        self._is_name = bytearray()
+        # bigram（および1文字） → 文書IDの昇順配列
+        self._postings: Dict[str, array] = {}
+        # エンティティ名 → 有効な文書ID
+        self._by_entity: Dict[str, List[int]] = {}
+        self._deleted = 0
+
+    @property
+    def document_count(self) -> int:
+        """有効な文書数"""
+        return len(self._norms) - self._deleted
+
+    def build(self, entities: Iterable[Entity], version: int) -> None:
+        """エンティティ全件からインデックスを作り直す
+
+        Args:
+            entities: 索引対象のエンティティ
+            version: 対応するスナップショットの版番号
+        """
+        with self._lock:
+            self._reset()
+            for entity in entities:
+                self._add_entity(entity)
+            self.version = version
+
+    def apply(self, delta: GraphDelta) -> None:
+        """スナップショット間の差分を適用する
+
+        Args:
+            delta: 適用する差分（fromVersion が現在の版と一致すること）
+
+        Raises:
+            ValueError: 差分の起点が現在の版と一致しない場合
+        """
+        with self._lock:
+            if delta.fromVersion != self.version:
+                raise ValueError(
+                    f"Delta from version {delta.fromVersion} does not apply to index version {self.version}"
+                )
+            for name in delta.removedEntities:
+                for doc_id in self._by_entity.pop(name, ()):
+                    self._delete_doc(doc_id)
+            for entity in delta.addedEntities:
+                self._add_entity(entity)
+            for change in delta.removedObservations:
+                # 正規化後に同じになるobservationもあるため件数で照合する
+                removed = Counter(normalize(text) for text in change.observations)
+                docs = self._by_entity.get(change.entityName, [])
+                kept = []
+                for doc_id in docs:
+                    norm = self._norms[doc_id]
+                    if not self._is_name[doc_id] and removed[norm] > 0:
+                        removed[norm] -= 1
+                        self._delete_doc(doc_id)
+                    else:
+                        kept.append(doc_id)
+                self._by_entity[change.entityName] = kept
+            for change in delta.addedObservations:
+                for text in change.observations:
+                    self._add_doc(change.entityName, normalize(text), is_name=False)
+            self.version = delta.toVersion
+
+            if self._deleted > len(self._norms) * COMPACT_RATIO:
+                self._compact()
+
+    def _add_entity(self, entity: Entity) -> None:
+        """エンティティ名とobservationsを文書として追加する"""
+        self._add_doc(entity.name, normalize(entity.name), is_name=True)
+        for text in entity.observations:
+            self._add_doc(entity.name, normalize(text), is_name=False)
+
+    def _add_doc(self, owner: str, norm: str, is_name: bool) -> None:
+        """正規化済みの文書を1件追加する"""
+        doc_id = len(self._norms)
+        self._norms.append(norm)
+        self._owners.append(owner)
+        self._is_name.append(1 if is_name else 0)
+        self._by_entity.setdefault(owner, []).append(doc_id)
+
+        postings_map = self._postings
+        for key in _index_keys(norm):
+            postings = postings_map.get(key)
+            if postings is None:
+                postings = postings_map[key] = array("I")
+            postings.append(doc_id)
+
+    def _delete_doc(self, doc_id: int) -> None:
+        """文書を墓標にする（転置リストからは作り直し時に消える）"""
+        if self._norms[doc_id] is not None:
+            self._norms[doc_id] = None
+            self._deleted += 1
+
+    def _compact(self) -> None:
+        """墓標を取り除いて作り直す"""
+        live = [
+            (self._owners[i], self._norms[i], self._is_name[i])
+            for i in range(len(self._norms))
+            if self._norms[i] is not None
+        ]
+        self._reset()
+        for owner, norm, is_name in live:
+            self._add_doc(owner, norm, bool(is_name))
+
+    def _candidates(self, term: str) -> Set[int]:
+        """正規化済みの検索語を含む文書IDを求める"""
+        norms = self._norms
+        if len(term) <= 2:
+            # 1〜2文字の語は転置リストがそのまま一致文書になる
+            return {d for d in self._postings.get(term, ()) if norms[d] is not None}
+
+        lists = []
+        for gram in _grams(term):
+            postings = self._postings.get(gram)
+            if postings is None:
+                return set()
+            lists.append(postings)
+        lists.sort(key=len)
+        docs = set(lists[0])
+        for postings in lists[1:]:
+            docs.intersection_update(postings)
+            if not docs:
+                return docs
+
+        # bigramがすべて含まれていても連続しているとは限らないため確認する
+        return {d for d in docs if norms[d] is not None and term in norms[d]}
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        observations_of: Optional[Callable[[str], Sequence[str]]] = None,
+    ) -> Tuple[int, List[dict]]:
+        """検索する
+
+        空白区切りの各語をすべて含むエンティティを（名前・observationsのいずれかで）返す。
+        スコアは語ごとの希少度（idf）× 一致数で、エンティティ名の一致を重く扱う。
+
+        Args:
+            query: 検索文字列
+            limit: 最大件数
+            observations_of: エンティティ名からobservationsの元テキストを返す関数。
+                一致箇所の表示用テキストの復元に使う（省略時は正規化済みテキストを返す）
+
+        Returns:
+            Tuple[int, List[dict]]: (一致したエンティティ総数, スコア順のヒット)
+                ヒットは name, score, matches（field, text, highlights）を持つ
+        """
+        terms = list(dict.fromkeys(t for t in normalize(query).split() if t))
+        if not terms:
+            return 0, []
+
+        with self._lock:
+            total_docs = max(self.document_count, 1)
+            scores: Dict[str, float] = {}
+            matched_docs: Dict[str, List[int]] = {}
+
+            for i, term in enumerate(terms):
+                docs = self._candidates(term)
+                idf = math.log(1 + total_docs / (1 + len(docs)))
+                term_scores: Dict[str, float] = {}
+                for doc_id in docs:
+                    owner = self._owners[doc_id]
+                    if i and owner not in scores:
+                        continue
+                    if self._is_name[doc_id]:
+                        bonus = 2.0 if self._norms[doc_id] == term else 1.0
+                        weight = NAME_WEIGHT * bonus
+                    else:
+                        weight = 1.0
+                    term_scores[owner] = term_scores.get(owner, 0.0) + weight * idf
+                    matched_docs.setdefault(owner, []).append(doc_id)
+
+                # すべての語を含むエンティティだけを残す
+                scores = {
+                    owner: scores.get(owner, 0.0) + score
+                    for owner, score in term_scores.items()
+                }
+                if not scores:
+                    return 0, []
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            hits = []
+            for owner, score in ranked[:limit]:
+                docs = sorted(set(matched_docs[owner]), key=lambda d: (not self._is_name[d], d))
+                hits.append((owner, score, docs[:MAX_MATCHES_PER_HIT]))
+            hits = [
+                {
+                    "name": owner,
+                    "score": round(score, 4),
+                    "matches": self._matches(owner, docs, terms, observations_of),
+                }
+                for owner, score, docs in hits
+            ]
+            return len(scores), hits
+
+    def _matches(
+        self,
+        owner: str,
+        docs: List[int],
+        terms: List[str],
+        observations_of: Optional[Callable[[str], Sequence[str]]],
+    ) -> List[dict]:
+        """ヒットした文書の一致箇所を元テキストで組み立てる"""
+        raw: Dict[str, List[str]] = {}
+        if observations_of is not None and not all(self._is_name[d] for d in docs):
+            for text in observations_of(owner) or ():
+                raw.setdefault(normalize(text), []).append(text)
+
+        matches = []
+        for d in docs:
+            if self._is_name[d]:
+                text = owner
+            else:
+                # 同じ正規化結果のobservationが複数あれば順に対応させる
+                candidates = raw.get(self._norms[d])
+                text = candidates.pop(0) if candidates else self._norms[d]
+            matches.append({
+                "field": "name" if self._is_name[d] else "observation",
+                "text": text,
+                "highlights": highlight_spans(text, terms),
+            })
+        return matches
+
+
+def highlight_spans(text: str, terms: List[str]) -> List[List[int]]:
+    """テキスト中の検索語の出現位置を求める
+
+    Args:
+        text: 元テキスト
+        terms: 正規化済みの検索語
+
+    Returns:
+        List[List[int]]: [開始, 終了) の位置リスト（重なりは結合済み）
+    """
+    norm = normalize(text)
+    spans: List[List[int]] = []
+    for term in terms:
+        if len(norm) == len(text):
+            # 正規化で長さが変わらなければ位置はそのまま対応する
+            start = norm.find(term)
+            while start != -1:
+                spans.append([start, start + len(term)])
+                start = norm.find(term, start + 1)
+        else:
+            for m in re.finditer(re.escape(term), text, re.IGNORECASE):
+                spans.append([m.start(), m.end()])
+
+    spans.sort()
+    merged: List[List[int]] = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
@@ -0,0 +1,159 @@
+"""ワーカー間で共有するスナップショット
+
+uvicorn を複数ワーカーで起動した場合に、グラフの読み込み・索引構築を1プロセスに集約する。
+
+- リーダー: ディレクトリ内のロックファイルを排他ロックできたワーカー。
+  データソースからグラフを読み込み、スナップショットファイル（services.snapshot_file）を
+  書き出してから、現在の版を指すポインタファイルを os.replace で置き換える。
+- フォロワー: それ以外のワーカー。ポインタファイルが指すスナップショットを
+  読み取り専用でメモリマップして使う（解析・複製は行わず、ページキャッシュを共有する）。
+
+リーダーのプロセスが終了するとロックは OS によって解放され、フォロワーの1つが引き継ぐ。
+"""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from services.compact_graph import Adjacency, CompactGraph
+from services.snapshot_file import MappedCompactGraph, open_snapshot, write_snapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+LOCK_FILE = "leader.lock"
+POINTER_FILE = "current"
+
+# ポインタファイルの変更検知用 (mtime_ns, size, inode)
+PointerSignature = Optional[Tuple[int, int, int]]
+
+
+class SharedSnapshot:
+    """スナップショットを共有するディレクトリ
+
+    リーダーの選出（ファイルロック）、スナップショットの公開、
+    現在のスナップショットのメモリマップを担当する。
+    """
+
+    def __init__(self, directory: Path, wait_timeout: float = 60.0, poll_interval: float = 0.2):
+        """初期化
+
+        Args:
+            directory: スナップショットを置くディレクトリ（全ワーカーで同じパス）
+            wait_timeout: フォロワーが最初の公開を待つ最大時間（秒）
+            poll_interval: 公開待ちのポーリング間隔（秒）
+        """
+        self.directory = Path(directory)
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._lock_file = None
+
+    @property
+    def is_leader(self) -> bool:
+        """このプロセスがリーダーか"""
+        return self._lock_file is not None
+
+    def try_acquire(self) -> bool:
+        """リーダーのロックを取得する（取得済みならそのまま、ブロックしない）
+
+        Returns:
+            bool: リーダーになれたか
+        """
+        if self._lock_file is not None:
+            return True
+        self.directory.mkdir(parents=True, exist_ok=True)
+        f = open(self.directory / LOCK_FILE, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            f.close()
+            return False
+        self._lock_file = f
+        logger.info("Became snapshot leader for %s", self.directory)
+        return True
+
+    def release(self) -> None:
+        """リーダーのロックを解放する"""
+        f, self._lock_file = self._lock_file, None
+        if f is not None:
+            f.close()  # ロックはファイルを閉じると解放される
+
+    def publish(self, graph: CompactGraph, meta: Dict[str, Any], adjacency: Optional[Adjacency] = None) -> Path:
+        """スナップショットを書き出し、現在の版として公開する
+
+        ファイル名は版ごとに変え、ポインタファイルの置き換えで切り替える。
+        フォロワーがマップ中の古いファイルは削除しても（POSIXでは）参照し続けられる。
+
+        Args:
+            graph: 公開するグラフ
+            meta: ヘッダーに格納するメタデータ（version・epoch）
+            adjacency: 構築済みの隣接リスト
+
+        Returns:
+            Path: 書き出したスナップショットファイルのパス
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"snapshot-{meta.get('epoch', '')}-{meta.get('version', 0)}.bin"
+        path = write_snapshot(graph, self.directory / name, meta=meta, adjacency=adjacency)
+
+        pointer = self.directory / POINTER_FILE
+        tmp = pointer.with_name(f".{POINTER_FILE}.{os.getpid()}.tmp")
+        tmp.write_text(name, encoding="utf-8")
+        os.replace(tmp, pointer)
+        self._remove_stale(keep=name)
+        return path
+
+    def _remove_stale(self, keep: str) -> None:
+        """公開中以外のスナップショットを削除する（使用中で削除できなければ残す）"""
+        for path in self.directory.glob("snapshot-*.bin"):
+            if path.name != keep:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def signature(self) -> PointerSignature:
+        """ポインタファイルの署名（未公開ならNone）"""
+        try:
+            st = (self.directory / POINTER_FILE).stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def open_current(self) -> Optional[MappedCompactGraph]:
+        """現在公開中のスナップショットをメモリマップする
+
+        Returns:
+            MappedCompactGraph: 公開中のスナップショット、未公開ならNone
+        """
+        try:
+            name = (self.directory / POINTER_FILE).read_text(encoding="utf-8").strip()
+            return open_snapshot(self.directory / name)
+        except FileNotFoundError:
+            # 未公開、または読む間に次の版に置き換わった（次の呼び出しで新しい版を開く）
+            return None
+
+    async def wait_current(self) -> Optional[MappedCompactGraph]:
+        """公開を待ってスナップショットをメモリマップする
+
+        Returns:
+            MappedCompactGraph: 公開中のスナップショット、wait_timeout 内に公開されなければNone
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            mapped = await asyncio.to_thread(self.open_current)
+            if mapped is not None or time.monotonic() >= deadline:
+                return mapped
+            await asyncio.sleep(self.poll_interval)
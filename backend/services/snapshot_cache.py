@@ -0,0 +1,116 @@
+"""コンパイル済みスナップショットのキャッシュ
+
+データファイルを解析した結果をスナップショットファイル（services.snapshot_file）として保存し、
+次回の起動時はJSON解析・Pydantic検証を行わずにメモリマップして使う。
+キャッシュはデータファイルのサイズ・mtime・内容のハッシュで照合し、一致しなければ作り直す。
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from services.compact_graph import Adjacency, CompactGraph
+from services.snapshot_file import (
+    MappedCompactGraph,
+    SnapshotFormatError,
+    open_snapshot,
+    read_header,
+    write_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+# 解析結果の形式を変えたら上げる（古いキャッシュを使わないため）
+COMPILER_VERSION = 1
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def source_key(path: Path) -> Dict[str, Any]:
+    """データファイルの照合キー（サイズ・mtime・内容のハッシュ）
+
+    Args:
+        path: データファイルパス
+
+    Returns:
+        Dict[str, Any]: 照合キー
+    """
+    st = path.stat()
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return {
+        "compiler": COMPILER_VERSION,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "blake2b": digest.hexdigest(),
+    }
+
+
+class SnapshotCache:
+    """データファイルごとのコンパイル済みスナップショットを置くディレクトリ"""
+
+    def __init__(self, directory: Path):
+        """初期化
+
+        Args:
+            directory: キャッシュディレクトリ
+        """
+        self.directory = Path(directory)
+
+    def path_for(self, source: Path) -> Path:
+        """データファイルに対応するキャッシュファイルのパス"""
+        digest = hashlib.sha1(str(Path(source).resolve()).encode("utf-8")).hexdigest()[:12]
+        return self.directory / f"{Path(source).name}.{digest}.snap"
+
+    def load(self, source: Path, key: Dict[str, Any]) -> Optional[MappedCompactGraph]:
+        """照合キーが一致するキャッシュをメモリマップする
+
+        Args:
+            source: データファイルパス
+            key: 現在のデータファイルの照合キー（source_key）
+
+        Returns:
+            MappedCompactGraph: キャッシュ、存在しない・一致しない・壊れている場合はNone
+        """
+        path = self.path_for(source)
+        try:
+            if read_header(path).get("meta", {}).get("source") != key:
+                return None
+            return open_snapshot(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, SnapshotFormatError):
+            logger.warning("Ignoring broken snapshot cache %s", path, exc_info=True)
+            return None
+
+    def save(
+        self,
+        source: Path,
+        key: Dict[str, Any],
+        graph: CompactGraph,
+        meta: Optional[Dict[str, Any]] = None,
+        adjacency: Optional[Adjacency] = None,
+    ) -> Optional[Path]:
+        """解析結果をキャッシュに保存する（失敗しても読み込みは続けるためNoneを返す）
+
+        Args:
+            source: データファイルパス
+            key: 解析前に取得したデータファイルの照合キー
+            graph: 解析結果
+            meta: 追加のメタデータ（JSONLの読み込み位置など）
+            adjacency: 構築済みの隣接リスト
+
+        Returns:
+            Path: 保存したキャッシュファイルのパス、失敗した場合はNone
+        """
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            return write_snapshot(
+                graph, self.path_for(source), meta={**(meta or {}), "source": key}, adjacency=adjacency
+            )
+        except OSError:
+            logger.warning("Failed to write snapshot cache for %s", source, exc_info=True)
+            return None
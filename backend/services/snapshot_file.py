@@ -0,0 +1,300 @@
+"""スナップショットファイル
+
+CompactGraph と隣接リストを、そのままメモリマップできるバイナリファイルに書き出す。
+読み込み側は mmap（読み取り専用）した領域を NumPy 配列・文字列プールとして直接参照するため、
+解析や複製を行わず、同じファイルを開いた複数のプロセスでページキャッシュを共有できる。
+
+ファイル構成:
+    MAGIC（8バイト） / ヘッダー長（8バイト, little endian） / ヘッダーJSON / 各セクション
+    ヘッダーには任意のメタデータと、セクションごとの (offset, dtype, length) を持つ。
+    セクションは8バイト境界に揃える。
+
+文字列（ノード名・observations）は UTF-8 バイト列を連結したプールとオフセット配列で表す。
+ノード名にはオープンアドレス法のハッシュ表（CRC32、線形探索）を併せて持ち、
+名前からノードIDを引くときも辞書を作らずにファイル上の表を参照する。
+"""
+
+import json
+import mmap
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.compact_graph import Adjacency, CompactGraph
+
+MAGIC = b"MVSNAP1\n"
+_ALIGN = 8
+
+
+def _aligned(size: int) -> int:
+    """8バイト境界に切り上げる"""
+    return -(-size // _ALIGN) * _ALIGN
+
+
+def _int_view(array: np.ndarray) -> memoryview:
+    """整数配列を要素単位で参照するためのmemoryview（要素はPythonのintになる）"""
+    return memoryview(array).cast("B").cast(array.dtype.char)
+
+
+class SnapshotFormatError(ValueError):
+    """スナップショットファイルの形式が不正"""
+
+
+class StringPool(Sequence[str]):
+    """連結したUTF-8バイト列とオフセット配列で表す読み取り専用の文字列シーケンス
+
+    要素は参照時にデコードする。ハッシュ表（table）があれば find() で番号を引ける。
+    """
+
+    def __init__(self, data: memoryview, offsets: np.ndarray, table: Optional[np.ndarray] = None):
+        self._data = data
+        self._offsets = offsets
+        # 要素単位の参照はNumPyスカラーを作らないようmemoryview経由で行う
+        self._bounds = _int_view(offsets)
+        self._table = _int_view(table) if table is not None else None
+        self._mask = len(table) - 1 if table is not None else 0
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def _bytes(self, index: int) -> bytes:
+        return bytes(self._data[self._bounds[index]:self._bounds[index + 1]])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("string pool index out of range")
+        return self._bytes(index).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        data = self._data
+        offsets = self._offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield bytes(data[start:end]).decode("utf-8")
+
+    def find(self, value: str) -> Optional[int]:
+        """文字列の番号をハッシュ表から取得（存在しなければNone）"""
+        table = self._table
+        if table is None:
+            raise TypeError("string pool has no hash table")
+        key = value.encode("utf-8")
+        slot = zlib.crc32(key) & self._mask
+        while True:
+            entry = table[slot]
+            if entry == 0:
+                return None
+            if self._bytes(entry - 1) == key:
+                return entry - 1
+            slot = (slot + 1) & self._mask
+
+
+class MappedCompactGraph(CompactGraph):
+    """スナップショットファイルをメモリマップしたCompactGraph
+
+    配列・文字列はファイルの領域を直接参照する（変更不可）。
+    名前の索引（dict）は作らず、ノード名はファイル上のハッシュ表で引く。
+    """
+
+    def __init__(self, path: Path, buffer: mmap.mmap, header: Dict[str, Any]):
+        view = memoryview(buffer)
+
+        def section(name: str) -> np.ndarray:
+            spec = header["sections"][name]
+            dtype = np.dtype(spec["dtype"])
+            return np.frombuffer(buffer, dtype=dtype, count=spec["length"], offset=spec["offset"])
+
+        def pool(name: str, table: Optional[str] = None) -> StringPool:
+            data = header["sections"][f"{name}_data"]
+            return StringPool(
+                view[data["offset"]:data["offset"] + data["length"]],
+                section(f"{name}_offsets"),
+                section(table) if table else None,
+            )
+
+        self.path = path
+        self.meta: Dict[str, Any] = header.get("meta", {})
+        self.names = pool("names", "names_hash")
+        self.entity_count = header["entity_count"]
+        self.entity_types = header["entity_types"]
+        self.entity_type_ids = section("entity_type_ids")
+        self.observations = pool("observations")
+        self.obs_offsets = section("obs_offsets")
+        self.obs_ids = section("obs_ids")
+        self.relation_types = header["relation_types"]
+        self.rel_src = section("rel_src")
+        self.rel_dst = section("rel_dst")
+        self.rel_type = section("rel_type")
+        self._adjacency: Adjacency = (
+            section("out_offsets"), section("out_rel"), section("in_offsets"), section("in_rel"),
+        )
+        # mmapはこのオブジェクトと配列のビューが参照されている間だけ維持される
+        self._buffer = buffer
+
+    def nbytes(self) -> int:
+        """メモリマップしたファイルの大きさ（ページキャッシュはプロセス間で共有される）"""
+        return len(self._buffer)
+
+    def node_id(self, name: str) -> Optional[int]:
+        """名前からノードIDを取得（未登録ならNone）"""
+        return self.names.find(name)
+
+    def adjacency(self) -> Adjacency:
+        """ファイルに格納済みの隣接リスト"""
+        return self._adjacency
+
+
+def _string_pool(strings: Sequence[str]) -> Tuple[List[bytes], np.ndarray]:
+    """文字列をUTF-8にエンコードし、オフセット配列を作る"""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return encoded, offsets
+
+
+def _hash_table(encoded: List[bytes]) -> np.ndarray:
+    """文字列のハッシュ表（スロットには番号+1、空きは0）"""
+    size = 1
+    while size < 2 * len(encoded):
+        size *= 2
+    mask = size - 1
+    table = [0] * size
+    crc32 = zlib.crc32
+    for i, key in enumerate(encoded):
+        slot = crc32(key) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = i + 1
+    return np.array(table, dtype=np.uint32)
+
+
+def write_snapshot(
+    graph: CompactGraph,
+    path: Path,
+    meta: Optional[Dict[str, Any]] = None,
+    adjacency: Optional[Adjacency] = None,
+) -> Path:
+    """スナップショットファイルを書き出す
+
+    一時ファイルに書いてから置き換えるため、読み込み側が書きかけのファイルを開くことはない。
+
+    Args:
+        graph: 書き出すグラフ
+        path: 出力先パス
+        meta: ヘッダーに格納する任意のメタデータ（JSON）
+        adjacency: 構築済みの隣接リスト（省略時は構築する）
+
+    Returns:
+        Path: 出力先パス
+    """
+    names, name_offsets = _string_pool(graph.names)
+    observations, obs_str_offsets = _string_pool(graph.observations)
+    out_offsets, out_rel, in_offsets, in_rel = adjacency or graph.adjacency()
+
+    arrays: List[Tuple[str, Any]] = [
+        ("names_data", names),
+        ("names_offsets", name_offsets),
+        ("names_hash", _hash_table(names)),
+        ("observations_data", observations),
+        ("observations_offsets", obs_str_offsets),
+        ("entity_type_ids", np.asarray(graph.entity_type_ids, dtype=np.uint32)),
+        ("obs_offsets", np.asarray(graph.obs_offsets, dtype=np.int64)),
+        ("obs_ids", np.asarray(graph.obs_ids, dtype=np.uint32)),
+        ("rel_src", np.asarray(graph.rel_src, dtype=np.uint32)),
+        ("rel_dst", np.asarray(graph.rel_dst, dtype=np.uint32)),
+        ("rel_type", np.asarray(graph.rel_type, dtype=np.uint32)),
+        ("out_offsets", np.asarray(out_offsets, dtype=np.int64)),
+        ("out_rel", np.asarray(out_rel, dtype=np.uint32)),
+        ("in_offsets", np.asarray(in_offsets, dtype=np.int64)),
+        ("in_rel", np.asarray(in_rel, dtype=np.uint32)),
+    ]
+
+    # セクションの配置（offsetはデータ領域の先頭からの相対位置）
+    sections: Dict[str, Dict[str, Any]] = {}
+    position = 0
+    for name, value in arrays:
+        if isinstance(value, list):
+            nbytes = sum(len(b) for b in value)
+            sections[name] = {"offset": position, "dtype": "u1", "length": nbytes}
+        else:
+            nbytes = value.nbytes
+            sections[name] = {"offset": position, "dtype": value.dtype.str, "length": len(value)}
+        position += _aligned(nbytes)
+
+    encoded = json.dumps({
+        "meta": meta or {},
+        "entity_count": graph.entity_count,
+        "entity_types": list(graph.entity_types),
+        "relation_types": list(graph.relation_types),
+        "sections": sections,
+    }, ensure_ascii=False).encode("utf-8")
+    base = _aligned(len(MAGIC) + 8 + len(encoded))
+
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(encoded).to_bytes(8, "little"))
+        f.write(encoded)
+        f.write(b"\0" * (base - f.tell()))
+        for _, value in arrays:
+            if isinstance(value, list):
+                for chunk in value:
+                    f.write(chunk)
+                nbytes = sum(len(b) for b in value)
+            else:
+                f.write(value.tobytes())
+                nbytes = value.nbytes
+            f.write(b"\0" * (_aligned(nbytes) - nbytes))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return path
+
+
+def read_header(path: Path) -> Dict[str, Any]:
+    """ヘッダーだけを読む（セクションのoffsetはファイル先頭からの位置に変換する）
+
+    Raises:
+        SnapshotFormatError: 形式が不正な場合
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise SnapshotFormatError(f"Not a graph snapshot: {path}")
+        length = int.from_bytes(f.read(8), "little")
+        try:
+            header = json.loads(f.read(length))
+        except ValueError as e:
+            raise SnapshotFormatError(f"Broken snapshot header: {path}") from e
+    base = _aligned(len(MAGIC) + 8 + length)
+    for spec in header["sections"].values():
+        spec["offset"] += base
+    return header
+
+
+def open_snapshot(path: Path) -> MappedCompactGraph:
+    """スナップショットファイルを読み取り専用でメモリマップする
+
+    Args:
+        path: スナップショットファイルのパス
+
+    Returns:
+        MappedCompactGraph: ファイルを直接参照するグラフ
+
+    Raises:
+        SnapshotFormatError: 形式が不正な場合
+    """
+    path = Path(path)
+    header = read_header(path)
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    end = max((s["offset"] + s["length"] * np.dtype(s["dtype"]).itemsize
+               for s in header["sections"].values()), default=0)
+    if end > len(buffer):
+        raise SnapshotFormatError(f"Truncated snapshot: {path}")
+    return MappedCompactGraph(path, buffer, header)
@@ -0,0 +1,85 @@
+"""共有スナップショットの同期
+
+フォロワーのワーカーで、リーダーが新しいスナップショットを公開したら
+マップし直す（client.reload()）。リーダーのロックが解放されたら引き継ぎ、
+以降はデータソースからの読み込みと公開を担当する。
+"""
+
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from services.memory_client import MemoryMCPClient
+from services.shared_snapshot import SharedSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotSync:
+    """共有スナップショットの同期タスク"""
+
+    def __init__(
+        self,
+        client: MemoryMCPClient,
+        shared: SharedSnapshot,
+        poll_interval: float = 0.5,
+        on_leader: Optional[Callable[[], None]] = None,
+    ):
+        """初期化
+
+        Args:
+            client: 同期対象のMemory MCPクライアント
+            shared: 共有スナップショット
+            poll_interval: ポインタファイル・リーダーのロックの確認間隔（秒）
+            on_leader: リーダーを引き継いだときに呼ぶ関数（ファイル監視の開始など）
+        """
+        self.client = client
+        self.shared = shared
+        self.poll_interval = poll_interval
+        self.on_leader = on_leader
+        self.reload_count = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """同期を開始する（リーダーなら何もしない）"""
+        if self._task is None and not self.shared.is_leader:
+            self._task = asyncio.create_task(self._follow())
+
+    async def stop(self) -> None:
+        """同期を停止する"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _follow(self) -> None:
+        """公開を検知してマップし直し、リーダーが不在になったら引き継ぐ"""
+        last = self.shared.signature()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+
+            if self.shared.try_acquire():
+                await self._promote()
+                return
+
+            current = self.shared.signature()
+            if current == last:
+                continue
+            last = current
+            try:
+                await self.client.reload()
+                self.reload_count += 1
+            except Exception:
+                # 失敗しても既存のスナップショットを提供し続ける
+                logger.exception("Failed to map shared snapshot")
+
+    async def _promote(self) -> None:
+        """リーダーを引き継ぎ、データソースから読み込んで公開する"""
+        logger.info("Taking over as snapshot leader")
+        if self.on_leader is not None:
+            self.on_leader()
+        try:
+            await self.client.reload()
+            self.reload_count += 1
+        except Exception:
+            logger.exception("Failed to publish shared snapshot")
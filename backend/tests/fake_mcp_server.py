@@ -0,0 +1,136 @@
+"""テスト用のMemory MCPサーバー
+
+@modelcontextprotocol/server-memory と同じ形式（stdio上の改行区切りJSON-RPC、
+ツール結果はJSONテキスト）で read_graph / open_nodes / search_nodes に応答する。
+リクエストはスレッドで並行に処理するため、応答は届いた順とは限らない。
+
+環境変数:
+    FAKE_MCP_GRAPH: 返すグラフのJSONファイル（省略時は組み込みの小さなグラフ）
+    FAKE_MCP_DELAY: 各ツール呼び出しの処理時間（秒）
+
+テスト用の特殊な検索語:
+    "__slow__:<秒>": 指定秒数待ってから応答する
+    "__crash__": 応答せずにプロセスを終了する
+    "__junk__": 応答の前に、辞書でないJSONの行（配列・数値）を出力する
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+DEFAULT_GRAPH = {
+    "entities": [
+        {"type": "entity", "name": "Alice", "entityType": "person", "observations": ["likes graphs"]},
+        {"type": "entity", "name": "Bob", "entityType": "person", "observations": []},
+        {"type": "entity", "name": "memory-viz", "entityType": "project", "observations": ["FastAPI"]},
+    ],
+    "relations": [
+        {"type": "relation", "from": "Alice", "to": "memory-viz", "relationType": "created"},
+        {"type": "relation", "from": "Bob", "to": "Alice", "relationType": "knows"},
+    ],
+}
+
+_write_lock = threading.Lock()
+
+
+def _load_graph() -> dict:
+    path = os.environ.get("FAKE_MCP_GRAPH")
+    if not path:
+        return DEFAULT_GRAPH
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _subgraph(graph: dict, names: set) -> dict:
+    return {
+        "entities": [e for e in graph["entities"] if e["name"] in names],
+        "relations": [
+            r for r in graph["relations"] if r["from"] in names and r["to"] in names
+        ],
+    }
+
+
+def _search(graph: dict, query: str) -> dict:
+    query = query.lower()
+    names = {
+        e["name"]
+        for e in graph["entities"]
+        if query in e["name"].lower()
+        or query in e["entityType"].lower()
+        or any(query in o.lower() for o in e["observations"])
+    }
+    return _subgraph(graph, names)
+
+
+def _send(message: dict) -> None:
+    with _write_lock:
+        sys.stdout.write(json.dumps(message, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+
+def _call_tool(name: str, arguments: dict) -> dict:
+    delay = float(os.environ.get("FAKE_MCP_DELAY", "0"))
+    if delay:
+        time.sleep(delay)
+
+    graph = _load_graph()
+    if name == "read_graph":
+        payload = graph
+    elif name == "open_nodes":
+        payload = _subgraph(graph, set(arguments.get("names", [])))
+    elif name == "search_nodes":
+        query = arguments.get("query", "")
+        if query == "__crash__":
+            os._exit(1)
+        if query == "__junk__":
+            with _write_lock:
+                sys.stdout.write("[1, 2, 3]\n42\n\"text\"\n")
+                sys.stdout.flush()
+            query = ""
+        if query.startswith("__slow__:"):
+            time.sleep(float(query.split(":", 1)[1]))
+            query = ""
+        payload = _search(graph, query)
+    else:
+        return {"content": [{"type": "text", "text": f"Unknown tool: {name}"}], "isError": True}
+    return {"content": [{"type": "text", "text": json.dumps(payload, ensure_ascii=False)}]}
+
+
+def _handle(message: dict) -> None:
+    method = message.get("method")
+    if "id" not in message:
+        return  # 通知
+    if method == "initialize":
+        result = {
+            "protocolVersion": message["params"]["protocolVersion"],
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "fake-memory-server", "version": "0.0.1", "pid": os.getpid()},
+        }
+    elif method == "tools/call":
+        params = message.get("params", {})
+        result = _call_tool(params.get("name"), params.get("arguments", {}))
+    else:
+        _send({
+            "jsonrpc": "2.0",
+            "id": message["id"],
+            "error": {"code": -32601, "message": f"Method not found: {method}"},
+        })
+        return
+    _send({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+
+def main() -> None:
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        message = json.loads(line)
+        if message.get("method") == "initialize":
+            _handle(message)
+        else:
+            threading.Thread(target=_handle, args=(message,), daemon=True).start()
+
+
+if __name__ == "__main__":
+    main()
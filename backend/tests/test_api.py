@@ -1,7 +1,12 @@
 """APIエンドポイントのテスト"""
 
+import json
 import pytest
 from fastapi import status
+from main import app
+from services.compact_graph import CompactGraph
+from services.graph_registry import GraphRegistry, set_graph_registry
+from services.memory_client import MemoryMCPClient, get_memory_client
 
 
 class TestRootEndpoint:
@@ -25,12 +30,50 @@ class TestHealthEndpoint:
     @pytest.mark.unit
     def test_health_check(self, client):
         """ヘルスチェックが正常に応答することを確認"""
+        client.get("/api/graph")  # 起動時の読み込みの完了を待つ
         response = client.get("/api/health")
         assert response.status_code == status.HTTP_200_OK
 
         data = response.json()
         assert data["status"] == "ok"
         assert data["service"] == "memory-viz-api"
+        assert data["ready"] is True
+
+    @pytest.mark.unit
+    def test_health_check_before_load(self, client):
+        """グラフの読み込み前は準備中（503）を返すことを確認"""
+        app.dependency_overrides[get_memory_client] = lambda: MemoryMCPClient()
+        try:
+            response = client.get("/api/health")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["status"] == "starting"
+        assert response.json()["ready"] is False
+
+
+class TestMetricsEndpoint:
+    """メトリクスエンドポイントのテスト"""
+
+    @pytest.mark.unit
+    def test_metrics(self, client):
+        """ルートテンプレートごとの処理時間とスナップショットの情報が出力されることを確認"""
+        graph = client.get("/api/graph").json()
+        name = graph["entities"][0]["name"]
+        client.get(f"/api/entities/{name}")
+
+        response = client.get("/metrics")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+
+        text = response.text
+        assert 'http_requests_total{method="GET",route="/api/entities/{entity_name}",status="200"}' in text
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/graph"}' in text
+        assert "http_requests_in_flight 1" in text.splitlines()
+        assert f"graph_entities {len(graph['entities'])}" in text.splitlines()
+        assert 'graph_cache_requests_total{cache="snapshot",result="hit"}' in text
+        assert "graph_snapshot_age_seconds " in text
 
 
 class TestGraphEndpoint:
@@ -48,6 +91,15 @@ class TestGraphEndpoint:
         assert isinstance(data["entities"], list)
         assert isinstance(data["relations"], list)
 
+    @pytest.mark.unit
+    def test_graph_version_header_exposed(self, client):
+        """別オリジンのフロントエンドが版番号のヘッダーを読めることを確認"""
+        response = client.get("/api/graph", headers={"Origin": "http://localhost:5173"})
+        exposed = response.headers["access-control-expose-headers"]
+
+        assert "X-Graph-Version" in exposed
+        assert int(response.headers["x-graph-version"]) >= 1
+
     @pytest.mark.unit
     def test_get_graph_returns_valid_structure(self, client):
         """取得したグラフが正しい構造を持つことを確認"""
@@ -68,6 +120,138 @@ class TestGraphEndpoint:
             assert "to" in relation
             assert "relationType" in relation
 
+    @pytest.mark.unit
+    def test_get_graph_returns_etag_and_304(self, client):
+        """ETagが返され、If-None-Matchが一致すれば304になることを確認"""
+        response = client.get("/api/graph")
+        etag = response.headers["etag"]
+        assert etag.startswith('"')
+
+        cached = client.get("/api/graph", headers={"If-None-Match": etag})
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+        assert cached.content == b""
+
+        stale = client.get("/api/graph", headers={"If-None-Match": '"stale"'})
+        assert stale.status_code == status.HTTP_200_OK
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("encoding", ["gzip", "br"])
+    def test_get_graph_compressed(self, client, encoding):
+        """Accept-Encodingに応じた圧縮済み本体が返ることを確認"""
+        if encoding == "br":
+            pytest.importorskip("brotli")
+
+        plain = client.get("/api/graph", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+
+        response = client.get("/api/graph", headers={"Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json() == plain.json()
+
+    @pytest.mark.unit
+    def test_get_graph_msgpack(self, client):
+        """Acceptでapplication/msgpackを指定するとMessagePackで返ることを確認"""
+        msgpack = pytest.importorskip("msgpack")
+        plain = client.get("/api/graph")
+
+        response = client.get("/api/graph", headers={"Accept": "application/msgpack"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/msgpack"
+        assert "Accept" in response.headers["vary"]
+        assert response.headers["etag"] != plain.headers["etag"]
+        assert msgpack.unpackb(response.content, raw=False) == plain.json()
+
+        cached = client.get(
+            "/api/graph",
+            headers={"Accept": "application/msgpack", "If-None-Match": response.headers["etag"]},
+        )
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.unit
+    def test_get_graph_arrow(self, client):
+        """AcceptでArrowを指定すると、ノード表とリレーション表が返ることを確認"""
+        pa = pytest.importorskip("pyarrow")
+        plain = client.get("/api/graph").json()
+
+        response = client.get(
+            "/api/graph", headers={"Accept": "application/vnd.apache.arrow.stream"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        reader = pa.BufferReader(response.content)
+        nodes = pa.ipc.open_stream(reader).read_all()
+        relations = pa.ipc.open_stream(reader).read_all()
+        assert nodes.column("name").to_pylist()[:len(plain["entities"])] == [
+            e["name"] for e in plain["entities"]
+        ]
+        assert relations.num_rows == len(plain["relations"])
+
+    @pytest.mark.unit
+    def test_get_graph_not_acceptable(self, client):
+        """受け入れ可能な形式がなければ406になることを確認"""
+        response = client.get("/api/graph", headers={"Accept": "text/csv"})
+        assert response.status_code == status.HTTP_406_NOT_ACCEPTABLE
+
+    @pytest.mark.unit
+    def test_get_graph_filtered(self, client):
+        """entityType・relationTypeで絞り込んだグラフと専用のETagが返ることを確認"""
+        plain = client.get("/api/graph")
+        response = client.get(
+            "/api/graph", params=[("entityType", "user"), ("entityType", "project")]
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != plain.headers["etag"]
+
+        data = response.json()
+        kept = {e["name"] for e in data["entities"]}
+        assert data["entities"] == [
+            e for e in plain.json()["entities"] if e["entityType"] in ("user", "project")
+        ]
+        assert all(r["from"] in kept and r["to"] in kept for r in data["relations"])
+
+        cached = client.get(
+            "/api/graph",
+            params=[("entityType", "project"), ("entityType", "user")],
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+
+        uses = client.get("/api/graph", params={"relationType": "uses"}).json()
+        assert uses["relations"]
+        assert {r["relationType"] for r in uses["relations"]} == {"uses"}
+
+    @pytest.mark.unit
+    def test_get_graph_min_degree(self, client):
+        """minDegree未満のエンティティが除かれることを確認"""
+        data = client.get("/api/graph").json()
+        degree = {e["name"]: 0 for e in data["entities"]}
+        for r in data["relations"]:
+            for name in (r["from"], r["to"]):
+                if name in degree:
+                    degree[name] += 1
+
+        filtered = client.get("/api/graph", params={"minDegree": 3}).json()
+        assert [e["name"] for e in filtered["entities"]] == [
+            name for name, d in degree.items() if d >= 3
+        ]
+        assert client.get("/api/graph", params={"minDegree": -1}).status_code == 422
+
+    @pytest.mark.unit
+    def test_graph_changes_after_refresh(self, client):
+        """/api/graphの版を起点に変更フィードを取得できることを確認"""
+        response = client.get("/api/graph")
+        version = int(response.headers["x-graph-version"])
+        epoch = response.headers["x-graph-epoch"]
+
+        client.get("/api/graph/refresh")
+        changes = client.get(
+            "/api/graph/changes", params={"since": version, "epoch": epoch}
+        ).json()
+
+        assert changes["version"] == version + 1
+        assert not changes["fullReloadRequired"]
+        assert changes["changes"][0]["fromVersion"] == version
+
     @pytest.mark.unit
     def test_refresh_graph(self, client):
         """グラフのリフレッシュが正常に動作することを確認"""
@@ -79,6 +263,258 @@ class TestGraphEndpoint:
         assert "relations" in data
 
 
+class TestGraphPaginationEndpoint:
+    """ページング・射影・ストリーミングエンドポイントのテスト"""
+
+    @pytest.mark.unit
+    def test_entity_pages_cover_all_entities(self, client):
+        """カーソルをたどると全エンティティを取得できることを確認"""
+        expected = [e["name"] for e in client.get("/api/graph").json()["entities"]]
+
+        names, cursor = [], None
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get("/api/graph/entities", params=params).json()
+            names.extend(e["name"] for e in page["entities"])
+            cursor = page["nextCursor"]
+            if cursor is None:
+                break
+
+        assert names == expected
+        assert page["total"] == len(expected)
+
+    @pytest.mark.unit
+    def test_entity_fields_projection(self, client):
+        """fieldsで指定したフィールドだけが返ることを確認"""
+        response = client.get("/api/graph/entities", params={"fields": "entityType"})
+        assert response.status_code == status.HTTP_200_OK
+
+        entity = response.json()["entities"][0]
+        assert set(entity) == {"name", "entityType"}
+
+    @pytest.mark.unit
+    def test_fields_without_observations_skip_decoding(self, client, monkeypatch):
+        """observations を指定しない射影では observations をデコードしないことを確認"""
+        graph = client.get("/api/graph").json()
+
+        def fail(self, *args):
+            raise AssertionError("observations decoded")
+
+        monkeypatch.setattr(CompactGraph, "observations_of", fail)
+        page = client.get("/api/graph/entities", params={"fields": "name,entityType"}).json()
+        assert page["entities"][0] == {
+            "name": graph["entities"][0]["name"], "entityType": graph["entities"][0]["entityType"]
+        }
+        stream = client.get("/api/graph/stream", params={"fields": "entityType"})
+        assert len(stream.text.splitlines()) == 1 + len(graph["entities"]) + len(graph["relations"])
+
+    @pytest.mark.unit
+    def test_invalid_fields_and_cursor(self, client):
+        """不正なfields・カーソルで400が返ることを確認"""
+        assert client.get("/api/graph/entities", params={"fields": "secret"}).status_code == 400
+        assert client.get("/api/graph/entities", params={"cursor": "!!"}).status_code == 400
+
+    @pytest.mark.unit
+    def test_stale_cursor_returns_410(self, client):
+        """グラフ更新後の古いカーソルで410が返ることを確認"""
+        page = client.get("/api/graph/relations", params={"limit": 1}).json()
+        assert page["relations"][0]["from"]
+
+        client.get("/api/graph/refresh")
+        response = client.get("/api/graph/relations", params={"cursor": page["nextCursor"]})
+        assert response.status_code == status.HTTP_410_GONE
+
+    @pytest.mark.unit
+    def test_stream_ndjson(self, client):
+        """NDJSONでメタ情報・エンティティ・リレーションが流れることを確認"""
+        graph = client.get("/api/graph").json()
+        response = client.get("/api/graph/stream", params={"fields": "name"})
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0]["type"] == "meta"
+        assert lines[0]["entities"] == len(graph["entities"])
+        entities = [r for r in lines if r["type"] == "entity"]
+        relations = [r for r in lines if r["type"] == "relation"]
+        assert entities[0] == {"type": "entity", "name": graph["entities"][0]["name"]}
+        assert len(relations) == len(graph["relations"])
+
+
+class TestSearchEndpoint:
+    """全文検索エンドポイントのテスト"""
+
+    @pytest.mark.unit
+    def test_search_by_entity_name(self, client):
+        """エンティティ名で検索できることを確認"""
+        entity_name = client.get("/api/graph").json()["entities"][0]["name"]
+
+        response = client.get("/api/search", params={"q": entity_name})
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data["total"] >= 1
+        assert data["hits"][0]["name"] == entity_name
+        assert data["hits"][0]["matches"][0]["highlights"]
+
+    @pytest.mark.unit
+    def test_search_requires_query(self, client):
+        """検索文字列が必須であることを確認"""
+        response = client.get("/api/search")
+        assert response.status_code == 422
+
+
+class TestLayoutEndpoint:
+    """レイアウトエンドポイントのテスト"""
+
+    @pytest.mark.unit
+    def test_layout_covers_all_entities(self, client):
+        """全エンティティの座標が返ることを確認"""
+        graph = client.get("/api/graph").json()
+
+        response = client.get("/api/graph/layout", params={"algorithm": "circle"})
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data["algorithm"] == "circle"
+        assert set(data["positions"]) == {e["name"] for e in graph["entities"]}
+        assert all(len(p) == 2 for p in data["positions"].values())
+
+    @pytest.mark.unit
+    def test_unknown_algorithm(self, client):
+        """未知のアルゴリズムは422になることを確認"""
+        response = client.get("/api/graph/layout", params={"algorithm": "spiral"})
+        assert response.status_code == 422
+
+
+class TestClusterEndpoint:
+    """クラスタエンドポイントのテスト"""
+
+    @pytest.mark.unit
+    def test_clusters_cover_all_entities(self, client):
+        """クラスタのサイズ合計がエンティティ数と一致し、展開できることを確認"""
+        graph = client.get("/api/graph").json()
+
+        response = client.get("/api/graph/clusters")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert sum(c["size"] for c in data["clusters"]) == len(graph["entities"])
+
+        cluster = data["clusters"][0]
+        response = client.get(f"/api/graph/clusters/{cluster['id']}")
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["entities"]) == cluster["size"]
+
+    @pytest.mark.unit
+    def test_expand_cluster_msgpack(self, client):
+        """クラスタ展開もAcceptに応じてMessagePackで返ることを確認"""
+        msgpack = pytest.importorskip("msgpack")
+        cluster = client.get("/api/graph/clusters").json()["clusters"][0]
+        url = f"/api/graph/clusters/{cluster['id']}"
+
+        response = client.get(url, headers={"Accept": "application/msgpack"})
+        assert response.headers["content-type"] == "application/msgpack"
+        assert msgpack.unpackb(response.content, raw=False) == client.get(url).json()
+
+    @pytest.mark.unit
+    def test_unknown_cluster(self, client):
+        """存在しないクラスタは404になることを確認"""
+        response = client.get("/api/graph/clusters/c999")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestAnalyticsEndpoint:
+    """中心性エンドポイントのテスト"""
+
+    @pytest.mark.unit
+    def test_analytics_ranking(self, client):
+        """指標の大きい順にエンティティが返ることを確認"""
+        graph = client.get("/api/graph").json()
+
+        response = client.get("/api/graph/analytics", params={"metric": "degree", "limit": 3})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["metric"] == "degree"
+        assert data["entityCount"] == len(graph["entities"])
+        assert len(data["entities"]) == 3
+        degrees = [e["degree"] for e in data["entities"]]
+        assert degrees == sorted(degrees, reverse=True)
+
+        ranks = client.get("/api/graph/analytics", params={"limit": 5000}).json()["entities"]
+        assert sum(e["pagerank"] for e in ranks) == pytest.approx(1.0)
+
+    @pytest.mark.unit
+    def test_unknown_metric(self, client):
+        """未対応の指標は422になることを確認"""
+        response = client.get("/api/graph/analytics", params={"metric": "closeness"})
+        assert response.status_code == 422
+
+    @pytest.mark.unit
+    def test_entity_detail_centrality(self, client):
+        """centrality=true 指定時だけエンティティ詳細に中心性が付くことを確認"""
+        top = client.get("/api/graph/analytics", params={"limit": 1}).json()["entities"][0]
+
+        plain = client.get(f"/api/entities/{top['name']}").json()
+        assert plain["pagerank"] is None
+
+        detail = client.get(f"/api/entities/{top['name']}", params={"centrality": "true"}).json()
+        assert detail["degree"] == top["degree"]
+        assert detail["pagerank"] == top["pagerank"]
+        assert detail["betweenness"] == top["betweenness"]
+
+        batch = client.post(
+            "/api/entities:batch", params={"centrality": "true"}, json={"names": [top["name"]]}
+        ).json()
+        assert batch["entities"] == [detail]
+
+
+class TestGraphsEndpoint:
+    """複数グラフのエンドポイントのテスト"""
+
+    @pytest.fixture
+    def registry(self, tmp_path):
+        """2つのグラフを置いたディレクトリのレジストリを設定"""
+        for graph_id, names in {"alice": ["A1", "A2"], "bob": ["B1"]}.items():
+            (tmp_path / f"{graph_id}.json").write_text(json.dumps({
+                "entities": [{"name": n, "entityType": "note", "observations": []} for n in names],
+                "relations": [],
+            }), encoding="utf-8")
+        registry = GraphRegistry(tmp_path, memory_budget=1 << 30)
+        set_graph_registry(registry)
+        yield registry
+        set_graph_registry(None)
+
+    @pytest.mark.unit
+    def test_graph_routes_per_graph(self, client, registry):
+        """/api/graphs/{graph_id}/... がグラフごとのデータを返すことを確認"""
+        alice = client.get("/api/graphs/alice/graph").json()
+        assert [e["name"] for e in alice["entities"]] == ["A1", "A2"]
+
+        entity = client.get("/api/graphs/bob/entities/B1")
+        assert entity.status_code == status.HTTP_200_OK
+        assert client.get("/api/graphs/alice/entities/B1").status_code == status.HTTP_404_NOT_FOUND
+
+        listing = client.get("/api/graphs").json()
+        assert [(g["id"], g["loaded"]) for g in listing["graphs"]] == [("alice", True), ("bob", True)]
+
+        # 既定のグラフは従来のパスのまま
+        default = client.get("/api/graph").json()
+        assert default["entities"] != alice["entities"]
+
+    @pytest.mark.unit
+    def test_unknown_graph(self, client, registry):
+        """存在しない・不正なグラフIDは404になることを確認"""
+        assert client.get("/api/graphs/carol/graph").status_code == status.HTTP_404_NOT_FOUND
+        assert client.get("/api/graphs/-bad/graph").status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.unit
+    def test_graphs_disabled(self, client):
+        """レジストリ未設定なら /api/graphs は404になることを確認"""
+        assert client.get("/api/graphs").status_code == status.HTTP_404_NOT_FOUND
+        assert client.get("/api/graphs/alice/graph").status_code == status.HTTP_404_NOT_FOUND
+
+
 class TestEntityEndpoint:
     """エンティティ詳細エンドポイントのテスト"""
 
@@ -129,3 +565,148 @@ class TestEntityEndpoint:
             data = response.json()
             # 関連エンティティがリストとして含まれることを確認
             assert isinstance(data["relatedEntities"], list)
+
+    @pytest.mark.unit
+    def test_get_entities_batch(self, client):
+        """複数のエンティティ詳細を一括で取得でき、見つからない名前が返ることを確認"""
+        names = [e["name"] for e in client.get("/api/graph").json()["entities"]][:3]
+
+        response = client.post(
+            "/api/entities:batch", json={"names": names + ["存在しないエンティティ", names[0]]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert [e["name"] for e in data["entities"]] == names
+        assert data["entities"][0] == client.get(f"/api/entities/{names[0]}").json()
+        assert data["notFound"] == ["存在しないエンティティ"]
+        assert data["version"] >= 1
+
+    @pytest.mark.unit
+    def test_get_entity_observation_limit(self, client):
+        """observationLimit で返す observations を減らし、総数を返すことを確認"""
+        full = client.get("/api/entities/湧心くん").json()
+        assert full["observationCount"] == len(full["observations"]) > 2
+
+        data = client.get("/api/entities/湧心くん", params={"observationLimit": 2}).json()
+        assert data["observations"] == full["observations"][:2]
+        assert data["observationCount"] == full["observationCount"]
+
+        batch = client.post(
+            "/api/entities:batch", params={"observationLimit": 0}, json={"names": ["湧心くん"]}
+        ).json()
+        assert batch["entities"][0]["observations"] == []
+
+    @pytest.mark.unit
+    def test_observation_limit_defaults_to_bounded_page(self, client, tmp_path):
+        """observationLimit 省略時も observations は既定件数までに抑えられることを確認"""
+        path = tmp_path / "graph.json"
+        observations = [f"観測{i}" for i in range(150)]
+        path.write_text(json.dumps({
+            "entities": [{"name": "A", "entityType": "note", "observations": observations}],
+            "relations": [],
+        }), encoding="utf-8")
+        app.dependency_overrides[get_memory_client] = lambda: MemoryMCPClient(data_file=path)
+        try:
+            data = client.get("/api/entities/A").json()
+            batch = client.post("/api/entities:batch", json={"names": ["A"]}).json()
+            too_large = client.get("/api/entities/A", params={"observationLimit": 1001})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert data["observations"] == observations[:100]
+        assert data["observationCount"] == 150
+        assert batch["entities"][0]["observations"] == observations[:100]
+        assert too_large.status_code == 422
+
+    @pytest.mark.unit
+    def test_get_observations(self, client):
+        """observations を offset・limit でページ単位に取得できることを確認"""
+        full = client.get("/api/entities/湧心くん").json()["observations"]
+
+        response = client.get("/api/entities/湧心くん/observations", params={"offset": 1, "limit": 2})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["observations"] == full[1:3]
+        assert (data["offset"], data["total"]) == (1, len(full))
+        assert data["version"] >= 1
+
+        data = client.get("/api/entities/湧心くん/observations", params={"offset": len(full)}).json()
+        assert data["observations"] == []
+
+    @pytest.mark.unit
+    def test_get_observations_errors(self, client):
+        """存在しないエンティティは404、不正な範囲は422になることを確認"""
+        assert client.get("/api/entities/存在しないエンティティ/observations").status_code == 404
+        assert client.get("/api/entities/湧心くん/observations", params={"limit": 0}).status_code == 422
+        assert client.get("/api/entities/湧心くん/observations", params={"offset": -1}).status_code == 422
+
+    @pytest.mark.unit
+    def test_get_entities_batch_validation(self, client):
+        """names がない要求は422になることを確認"""
+        response = client.post("/api/entities:batch", json={})
+        assert response.status_code == 422
+
+    @pytest.mark.unit
+    def test_get_neighborhood(self, client):
+        """近傍部分グラフを取得できることを確認"""
+        graph_data = client.get("/api/graph").json()
+        entity_name = graph_data["relations"][0]["from"]
+
+        response = client.get(f"/api/entities/{entity_name}/neighborhood", params={"depth": 1})
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data["center"] == entity_name
+        assert entity_name in [e["name"] for e in data["entities"]]
+        assert len(data["relations"]) > 0
+
+    @pytest.mark.unit
+    def test_get_neighborhood_not_found(self, client):
+        """存在しないエンティティの近傍で404が返ることを確認"""
+        response = client.get("/api/entities/存在しないエンティティ/neighborhood")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestPathsEndpoint:
+    """最短経路エンドポイントのテスト"""
+
+    @pytest.mark.unit
+    def test_get_paths(self, client):
+        """リレーションでつながった2つのエンティティの経路を取得できることを確認"""
+        relation = client.get("/api/graph").json()["relations"][0]
+
+        response = client.get("/api/paths", params={"from": relation["to"], "to": relation["from"]})
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data["length"] == 1
+        path = data["paths"][0]
+        assert path["entities"] == [relation["to"], relation["from"]]
+        assert path["relations"][0]["from"] == relation["from"]
+        assert path["relations"][0]["relationType"]
+
+    @pytest.mark.unit
+    def test_get_paths_formats(self, client):
+        """経路はMessagePackでも取得でき、Arrowは406になることを確認"""
+        msgpack = pytest.importorskip("msgpack")
+        relation = client.get("/api/graph").json()["relations"][0]
+        params = {"from": relation["from"], "to": relation["to"]}
+
+        response = client.get("/api/paths", params=params, headers={"Accept": "application/msgpack"})
+        assert response.status_code == status.HTTP_200_OK
+        assert msgpack.unpackb(response.content)["length"] == 1
+
+        response = client.get(
+            "/api/paths", params=params, headers={"Accept": "application/vnd.apache.arrow.stream"}
+        )
+        assert response.status_code == status.HTTP_406_NOT_ACCEPTABLE
+
+    @pytest.mark.unit
+    def test_get_paths_not_found(self, client):
+        """存在しないエンティティを指定すると404が返ることを確認"""
+        name = client.get("/api/graph").json()["entities"][0]["name"]
+
+        response = client.get("/api/paths", params={"from": name, "to": "存在しないエンティティ"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert "存在しないエンティティ" in response.json()["detail"]
@@ -0,0 +1,148 @@
+"""中心性のテスト"""
+
+from collections import deque
+import numpy as np
+import pytest
+from services.centrality import Centrality, betweenness, pagerank
+from services.graph_store import GraphStore
+from models.memory import MemoryGraph, Entity, Relation
+
+
+def _random_edges(n, m, seed=0):
+    """自己ループを除いたランダムな辺配列を作成"""
+    rng = np.random.default_rng(seed)
+    src, dst = rng.integers(0, n, m), rng.integers(0, n, m)
+    keep = src != dst
+    return src[keep], dst[keep]
+
+
+def _exact_betweenness(n, src, dst):
+    """全ノード対の最短経路を数えて求めた媒介中心性（正規化済み、無向）"""
+    adjacency = [set() for _ in range(n)]
+    for a, b in zip(src.tolist(), dst.tolist()):
+        adjacency[a].add(b)
+        adjacency[b].add(a)
+
+    def bfs(source):
+        dist, sigma, queue = {source: 0}, {source: 1}, deque([source])
+        while queue:
+            u = queue.popleft()
+            for v in adjacency[u]:
+                if v not in dist:
+                    dist[v], sigma[v] = dist[u] + 1, 0
+                    queue.append(v)
+                if dist[v] == dist[u] + 1:
+                    sigma[v] += sigma[u]
+        return dist, sigma
+
+    tables = [bfs(s) for s in range(n)]
+    result = np.zeros(n)
+    for s in range(n):
+        dist_s, sigma_s = tables[s]
+        for t, d in dist_s.items():
+            for v in dist_s:
+                if v in (s, t):
+                    continue
+                dist_v, sigma_v = tables[v]
+                if dist_v.get(t, -1) + dist_s[v] == d:
+                    result[v] += sigma_s[v] * sigma_v[t] / sigma_s[t]
+    return result / ((n - 1) * (n - 2))
+
+
+def _store():
+    """ハブ H とその先の鎖 H → C1 → C2、孤立ノード Z を持つグラフ"""
+    return GraphStore(MemoryGraph(
+        entities=[Entity(name=n, entityType="hub" if n == "H" else "leaf")
+                  for n in ["H", "A", "B", "C1", "C2", "Z"]],
+        relations=[
+            Relation(from_="A", to="H", relationType="rel"),
+            Relation(from_="B", to="H", relationType="rel"),
+            Relation(from_="H", to="C1", relationType="rel"),
+            Relation(from_="C1", to="C2", relationType="rel"),
+            Relation(from_="C2", to="存在しない", relationType="rel"),
+        ],
+    ), version=4)
+
+
+class TestPagerank:
+    """pagerank()のテストクラス"""
+
+    @pytest.mark.unit
+    def test_matches_dense_power_iteration(self):
+        """密行列のべき乗法と一致し、合計が1になることを確認"""
+        n = 30
+        src, dst = _random_edges(n, 80)
+        matrix = np.zeros((n, n))
+        np.add.at(matrix, (dst, src), 1.0)
+        out = matrix.sum(axis=0)
+        transition = np.where(out > 0, matrix / np.where(out > 0, out, 1), 1.0 / n)
+        expected = np.full(n, 1.0 / n)
+        for _ in range(300):
+            expected = 0.15 / n + 0.85 * transition @ expected
+
+        rank = pagerank(n, src, dst)
+        np.testing.assert_allclose(rank, expected, atol=1e-8)
+        assert rank.sum() == pytest.approx(1.0)
+
+
+class TestBetweenness:
+    """betweenness()のテストクラス"""
+
+    @pytest.mark.unit
+    def test_all_sources_is_exact(self):
+        """始点数がノード数以上なら厳密値と一致することを確認"""
+        n = 40
+        src, dst = _random_edges(n, 90, seed=3)
+        result, samples = betweenness(n, src, dst, samples=n)
+
+        assert samples == n
+        np.testing.assert_allclose(result, _exact_betweenness(n, src, dst), atol=1e-12)
+
+    @pytest.mark.unit
+    def test_sampling_estimates_bridge(self):
+        """サンプリングでも2つの密な群をつなぐノード（0, 30, 31）が上位になることを確認"""
+        a = [(i, j) for i in range(30) for j in range(i + 1, 30)]
+        b = [(i, j) for i in range(31, 61) for j in range(i + 1, 61)]
+        edges = np.array(a + b + [(0, 30), (30, 31)])
+        result, samples = betweenness(61, edges[:, 0], edges[:, 1], samples=8)
+
+        assert samples == 8
+        assert set(np.argsort(-result)[:3].tolist()) == {0, 30, 31}
+        assert 0.0 <= result.min() and result.max() <= 1.0
+
+
+class TestCentrality:
+    """Centralityのテストクラス"""
+
+    @pytest.mark.unit
+    def test_scores(self):
+        """エンティティ名で各指標を参照できることを確認"""
+        centrality = Centrality(_store())
+
+        assert centrality.version == 4
+        degree, _, between = centrality.scores("H")
+        assert degree == 3
+        assert between > 0
+        # 存在しない端点へのリレーションも次数に数える
+        assert centrality.scores("C2")[0] == 2
+        assert centrality.scores("Z")[0::2] == (0, 0.0)
+        assert centrality.scores("存在しない") is None
+
+    @pytest.mark.unit
+    def test_top(self):
+        """指標の大きい順に上位のエンティティを返すことを確認"""
+        centrality = Centrality(_store())
+
+        result = centrality.top("degree", limit=2)
+        assert [e.name for e in result.entities] == ["H", "C1"]
+        assert result.entities[0].entityType == "hub"
+        assert result.entityCount == 6
+        assert result.truncated
+
+        ranked = centrality.top("pagerank", limit=10)
+        values = [e.pagerank for e in ranked.entities]
+        assert values == sorted(values, reverse=True)
+        assert not ranked.truncated
+
+        with pytest.raises(ValueError):
+            centrality.top("unknown")
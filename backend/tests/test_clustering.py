@@ -0,0 +1,113 @@
+"""コミュニティ検出のテスト"""
+
+import random
+import numpy as np
+import pytest
+from services.clustering import Clustering, label_propagation
+from services.graph_store import GraphStore
+from models.memory import MemoryGraph, Entity, Relation
+
+
+def _planted(groups, size, edges_per_group, seed=0):
+    """グループ内だけを密につないだ辺配列を作成"""
+    rng = random.Random(seed)
+    src, dst = [], []
+    for g in range(groups):
+        for _ in range(edges_per_group):
+            src.append(g * size + rng.randrange(size))
+            dst.append(g * size + rng.randrange(size))
+    return np.array(src), np.array(dst)
+
+
+def _store(edges, extra_nodes=()):
+    """エッジリスト (from, to) からグラフストアを作成"""
+    names = dict.fromkeys([n for edge in edges for n in edge] + list(extra_nodes))
+    return GraphStore(MemoryGraph(
+        entities=[Entity(name=n, entityType="hub" if n.endswith("0") else "leaf") for n in names],
+        relations=[Relation(from_=f, to=t, relationType="rel") for f, t in edges],
+    ), version=3)
+
+
+def _two_cliques():
+    """2つの完全グラフ（A*, B*）を1本の辺でつないだグラフ"""
+    a = [(f"A{i}", f"A{j}") for i in range(6) for j in range(i + 1, 6)]
+    b = [(f"B{i}", f"B{j}") for i in range(6) for j in range(i + 1, 6)]
+    return _store(a + b + [("A0", "B0")], extra_nodes=["Z"])
+
+
+class TestLabelPropagation:
+    """label_propagation()のテストクラス"""
+
+    @pytest.mark.unit
+    def test_planted_groups_are_not_mixed(self):
+        """別グループのノードが同じラベルにならないことを確認"""
+        src, dst = _planted(groups=5, size=40, edges_per_group=300)
+        labels = label_propagation(200, src, dst)
+
+        for g in range(5):
+            group = set(labels[g * 40:(g + 1) * 40].tolist())
+            others = set(labels[:g * 40].tolist()) | set(labels[(g + 1) * 40:].tolist())
+            assert not group & others
+
+    @pytest.mark.unit
+    def test_isolated_nodes_keep_own_label(self):
+        """孤立ノードはそれぞれ単独のラベルになることを確認"""
+        labels = label_propagation(3, np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+        assert len(set(labels.tolist())) == 3
+
+
+class TestClustering:
+    """Clusteringのテストクラス"""
+
+    @pytest.mark.unit
+    def test_summary(self):
+        """スーパーノードと集約エッジが大きい順に返ることを確認"""
+        summary = Clustering(_two_cliques()).summary()
+
+        assert summary.version == 3
+        assert summary.clusterCount == 3
+        assert [c.size for c in summary.clusters] == [6, 6, 1]
+        assert summary.clusters[0].label in ("A0", "B0")
+        assert summary.clusters[0].entityTypes == {"leaf": 5, "hub": 1}
+        assert [(e.source, e.target, e.weight) for e in summary.edges] == [("c0", "c1", 1)]
+        assert summary.truncated is False
+
+    @pytest.mark.unit
+    def test_summary_limit(self):
+        """上限を超えるクラスタとそのエッジが省かれることを確認"""
+        summary = Clustering(_two_cliques()).summary(limit=1)
+
+        assert len(summary.clusters) == 1
+        assert summary.edges == []
+        assert summary.truncated is True
+
+    @pytest.mark.unit
+    def test_expand(self):
+        """展開結果にクラスタ内リレーションと他クラスタへの集約エッジが含まれることを確認"""
+        clustering = Clustering(_two_cliques())
+        cluster = int(clustering.cluster_of[clustering.names.index("A0")])
+        expansion = clustering.expand(cluster)
+
+        assert {e.name for e in expansion.entities} == {f"A{i}" for i in range(6)}
+        assert len(expansion.relations) == 15
+        assert [(edge.entity, edge.weight) for edge in expansion.externalEdges] == [("A0", 1)]
+        assert expansion.truncated is False
+
+    @pytest.mark.unit
+    def test_expand_limit(self):
+        """展開時に次数の大きいエンティティから上限件数だけ返すことを確認"""
+        clustering = Clustering(_two_cliques())
+        cluster = int(clustering.cluster_of[clustering.names.index("A0")])
+        expansion = clustering.expand(cluster, limit=1)
+
+        assert [e.name for e in expansion.entities] == ["A0"]
+        assert expansion.relations == []
+        assert expansion.truncated is True
+
+    @pytest.mark.unit
+    def test_parse_id(self):
+        """クラスタIDの変換と不正値の扱いを確認"""
+        clustering = Clustering(_two_cliques())
+        assert clustering.parse_id("c2") == 2
+        assert clustering.parse_id("c3") is None
+        assert clustering.parse_id("x1") is None
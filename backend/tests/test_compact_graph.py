@@ -0,0 +1,179 @@
+"""コンパクトなグラフ表現のテスト"""
+
+import sys
+import pytest
+from services.compact_graph import CompactGraph, CompactGraphBuilder, CompressedStrings
+from services.graph_loader import merge_records
+from models.memory import MemoryGraph, Entity, Relation
+
+
+@pytest.fixture
+def graph():
+    """observationsの重複・存在しない端点・特殊文字を含むグラフ"""
+    return MemoryGraph(
+        entities=[
+            Entity(name="湧心くん", entityType="user", observations=["Pythonが好き", '引用符 " と \\ と\n改行']),
+            Entity(name="B", entityType="tool", observations=["Pythonが好き"]),
+            Entity(name="C", entityType="user"),
+        ],
+        relations=[
+            Relation(from_="湧心くん", to="B", relationType="uses"),
+            Relation(from_="B", to="存在しない", relationType="uses"),
+            Relation(from_="C", to="湧心くん", relationType="knows\t"),
+        ],
+    )
+
+
+class TestCompactGraph:
+    """CompactGraphのテストクラス"""
+
+    @pytest.mark.unit
+    def test_round_trip(self, graph):
+        """MemoryGraphとの相互変換で内容が変わらないことを確認"""
+        compact = CompactGraph.from_graph(graph)
+
+        assert compact.to_graph().model_dump() == graph.model_dump()
+        assert compact.entity_count == 3
+        assert compact.node_count == 4
+        assert compact.entity_id("存在しない") is None
+        assert compact.node_id("存在しない") == 3
+
+    @pytest.mark.unit
+    def test_strings_are_interned(self, graph):
+        """同じ文字列がテーブルに一度だけ格納されることを確認"""
+        compact = CompactGraph.from_graph(graph)
+
+        assert compact.observations.count("Pythonが好き") == 1
+        assert sorted(compact.entity_types) == ["tool", "user"]
+        assert sorted(compact.relation_types) == ["knows\t", "uses"]
+
+    @pytest.mark.unit
+    def test_render_json_matches_pydantic(self, graph):
+        """生成したJSONがPydanticの出力とバイト単位で一致することを確認"""
+        compact = CompactGraph.from_graph(graph)
+        assert compact.render_json() == graph.model_dump_json(by_alias=True).encode("utf-8")
+
+    @pytest.mark.unit
+    def test_lazy_sequences(self, graph):
+        """エンティティ・リレーションを必要な分だけ取り出せることを確認"""
+        compact = CompactGraph.from_graph(graph)
+
+        assert len(compact.entities) == 3
+        assert compact.entities[-1].name == "C"
+        assert [e.name for e in compact.entities[1:]] == ["B", "C"]
+        assert compact.relations[1].to == "存在しない"
+        with pytest.raises(IndexError):
+            compact.entities[3]
+
+    @pytest.mark.unit
+    def test_observation_pages(self, graph):
+        """エンティティの observations を範囲指定で取得できることを確認"""
+        compact = CompactGraph.from_graph(graph)
+
+        assert isinstance(compact.observations, CompressedStrings)
+        assert compact.observation_count(0) == 2
+        assert compact.observations_of(0, 1) == graph.entities[0].observations[1:]
+        assert compact.observations_of(0, 0, 1) == ["Pythonが好き"]
+        assert compact.observations_of(2, 0, 10) == []
+
+
+class TestCompressedStrings:
+    """ブロック圧縮した文字列シーケンスのテストクラス"""
+
+    @pytest.mark.unit
+    def test_round_trip(self):
+        """複数ブロックに分かれても、要素参照・スライス・走査で元の文字列が得られることを確認"""
+        strings = [f"観測{i} " * (i % 7) for i in range(200)]
+        compressed = CompressedStrings(strings, block_size=64)
+
+        assert len(compressed._blocks) > 1
+        assert len(compressed) == 200
+        assert list(compressed) == strings
+        assert [compressed[i] for i in (0, 57, 199, -1)] == [strings[0], strings[57], strings[199], strings[-1]]
+        assert compressed[10:13] == strings[10:13]
+        with pytest.raises(IndexError):
+            compressed[200]
+
+    @pytest.mark.unit
+    def test_extend_shares_blocks(self):
+        """base の後ろに追加した場合、圧縮済みのブロックを共有し元のシーケンスは変わらないことを確認"""
+        base = CompressedStrings([f"observation {i:04d}" for i in range(100)], block_size=256)
+        extended = CompressedStrings(["追加1", "追加2"], base=base, block_size=256)
+
+        assert list(extended) == list(base) + ["追加1", "追加2"]
+        assert len(base) == 100
+        # 十分な大きさのブロックはそのまま共有し、小さい末尾ブロックだけを圧縮し直す
+        assert extended._blocks[:-1] == base._blocks[:-1]
+        assert extended._blocks[0] is base._blocks[0]
+
+    @pytest.mark.unit
+    def test_smaller_than_strings(self):
+        """繰り返しの多い文字列が元の文字列オブジェクトより小さく保持されることを確認"""
+        strings = [f"フルスタックエンジニアとして開発している（{i}）" for i in range(1000)]
+        compressed = CompressedStrings(strings)
+
+        assert compressed.nbytes < sum(map(sys.getsizeof, strings)) / 2
+
+
+class TestCompactGraphBuilder:
+    """CompactGraphBuilderのテストクラス"""
+
+    @pytest.mark.unit
+    def test_entity_replacement_keeps_position(self):
+        """同名エンティティは最初の位置のまま内容が置き換わることを確認"""
+        builder = CompactGraphBuilder()
+        builder.add_relation(Relation(from_="B", to="A", relationType="uses"))
+        builder.add_entity(Entity(name="A", entityType="user", observations=["old"]))
+        builder.add_entity(Entity(name="B", entityType="tool"))
+        builder.add_entity(Entity(name="A", entityType="user", observations=["new", "newer"]))
+        compact = builder.build()
+
+        assert [e.name for e in compact.entities] == ["A", "B"]
+        assert compact.entities[0].observations == ["new", "newer"]
+        assert compact.relations[0].from_ == "B"
+
+    @pytest.mark.unit
+    def test_dedupe_relations(self):
+        """dedupe_relations指定時に同一リレーションが1件になることを確認"""
+        builder = CompactGraphBuilder(dedupe_relations=True)
+        for _ in range(2):
+            builder.add_relation(Relation(from_="A", to="B", relationType="uses"))
+        builder.add_relation(Relation(from_="A", to="B", relationType="created"))
+
+        assert builder.build().relation_count == 2
+
+    @pytest.mark.unit
+    def test_merge_records(self, graph):
+        """既存グラフへの追記が元のグラフを変えずに反映されることを確認"""
+        compact = CompactGraph.from_graph(graph)
+
+        merged = merge_records(
+            compact,
+            [Entity(name="B", entityType="tool", observations=["更新"]), Entity(name="存在しない", entityType="x")],
+            [Relation(from_="湧心くん", to="B", relationType="uses"), Relation(from_="B", to="C", relationType="uses")],
+        )
+
+        assert [e.name for e in merged.entities] == ["湧心くん", "B", "C", "存在しない"]
+        assert merged.entities[1].observations == ["更新"]
+        assert merged.entities[0].observations == graph.entities[0].observations
+        assert merged.relation_count == 4
+        assert compact.to_graph().model_dump() == graph.model_dump()
+
+    @pytest.mark.unit
+    def test_merge_keeps_compressed_observations(self, graph, monkeypatch):
+        """追記の反映で圧縮済みの observations 全体を展開せず、追加分だけを後ろに加えることを確認"""
+        compact = CompactGraph.from_graph(graph)
+        base = compact.observations
+        decoded = []
+        original = CompressedStrings.__iter__
+        monkeypatch.setattr(CompressedStrings, "__iter__", lambda self: decoded.append(self) or original(self))
+
+        merged = merge_records(
+            compact, [Entity(name="湧心くん", entityType="user", observations=["Pythonが好き", "追加"])], []
+        )
+
+        assert decoded == []
+        assert merged.entities[0].observations == ["Pythonが好き", "追加"]
+        # 置き換え前と同じ文字列は元のIDを使い、新しい文字列だけが追加される
+        assert len(merged.observations) == len(base) + 1
+        assert merged.observations[:len(base)] == list(base)
@@ -0,0 +1,113 @@
+"""データファイル監視のテスト"""
+
+import asyncio
+import pytest
+from services import file_watcher
+from services.file_watcher import FileWatcher, file_signature
+from services.memory_client import MemoryMCPClient
+from models.memory import MemoryGraph, Entity
+
+
+def _write_graph(path, names):
+    """指定した名前のエンティティを持つグラフファイルを書き込む"""
+    graph = MemoryGraph(entities=[Entity(name=n, entityType="test") for n in names])
+    path.write_text(graph.model_dump_json(by_alias=True), encoding="utf-8")
+
+
+async def _wait_for(predicate, timeout=5.0):
+    """条件が満たされるまで待つ"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.02)
+
+
+class TestFileWatcher:
+    """FileWatcherのテストクラス"""
+
+    @pytest.mark.unit
+    def test_file_signature(self, tmp_path):
+        """ファイル署名が変更を反映し、存在しない場合はNoneになることを確認"""
+        path = tmp_path / "graph.json"
+        assert file_signature(path) is None
+
+        path.write_text("{}", encoding="utf-8")
+        first = file_signature(path)
+        path.write_text("{ }", encoding="utf-8")
+
+        assert file_signature(path) != first
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "use_notify",
+        [
+            False,
+            pytest.param(
+                True,
+                marks=pytest.mark.skipif(file_watcher.awatch is None, reason="watchfiles not installed"),
+            ),
+        ],
+    )
+    async def test_burst_of_writes_is_debounced(self, tmp_path, use_notify):
+        """連続した書き込みが1回の再構築にまとめられることを確認"""
+        path = tmp_path / "graph.json"
+        _write_graph(path, ["A"])
+        client = MemoryMCPClient(data_file=path)
+        await client.read_graph()
+
+        watcher = FileWatcher(client, debounce=0.3, poll_interval=0.05, use_notify=use_notify)
+        watcher.start()
+        try:
+            await asyncio.sleep(0.2)
+            for i in range(5):
+                _write_graph(path, ["A", f"B{i}"])
+                await asyncio.sleep(0.05)
+
+            await _wait_for(lambda: watcher.reload_count > 0)
+            await asyncio.sleep(0.5)
+
+            assert watcher.reload_count == 1
+            assert [e.name for e in client._cache.entities] == ["A", "B4"]
+        finally:
+            await watcher.stop()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reload_keeps_serving_previous_snapshot(self, tmp_path):
+        """再構築中も既存のスナップショットが返されることを確認"""
+        path = tmp_path / "graph.json"
+        _write_graph(path, ["A"])
+        client = MemoryMCPClient(data_file=path)
+        old = await client.read_graph()
+
+        _write_graph(path, ["A", "B"])
+        reload_task = asyncio.create_task(client.reload())
+        during = await client.read_graph()
+        new = await reload_task
+
+        assert during is old
+        assert await client.get_store() is new
+        assert len((await client.read_graph()).entities) == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_reload_keeps_snapshot(self, tmp_path):
+        """不正なファイルへの変更では既存のスナップショットが維持されることを確認"""
+        path = tmp_path / "graph.json"
+        _write_graph(path, ["A"])
+        client = MemoryMCPClient(data_file=path)
+        old = await client.read_graph()
+
+        watcher = FileWatcher(client, debounce=0.05, poll_interval=0.05, use_notify=False)
+        watcher.start()
+        try:
+            await asyncio.sleep(0.1)
+            path.write_text('{"entities": [', encoding="utf-8")
+            await asyncio.sleep(0.5)
+
+            assert watcher.reload_count == 0
+            assert client._cache is old
+        finally:
+            await watcher.stop()
@@ -0,0 +1,51 @@
+"""ベンチマーク用の合成グラフ生成のテスト"""
+
+import json
+import pytest
+from benchmarks.generate_graph import GraphSpec, iter_records, write_graph
+from services.graph_loader import load_graph_jsonl, load_graph_streaming
+
+
+class TestGenerateGraph:
+    """合成グラフ生成のテストクラス"""
+
+    @pytest.mark.unit
+    def test_seeded(self):
+        """同じシードからは同じグラフが生成されることを確認"""
+        spec = GraphSpec(200, seed=1)
+        assert list(iter_records(spec)) == list(iter_records(GraphSpec(200, seed=1)))
+        assert list(iter_records(spec)) != list(iter_records(GraphSpec(200, seed=2)))
+
+    @pytest.mark.unit
+    def test_power_law_degrees(self):
+        """少数のハブと多数の低次数ノードができることを確認"""
+        degree = {}
+        for record in iter_records(GraphSpec(2000, relations_per_entity=2.0)):
+            if record["type"] == "relation":
+                assert record["from"] != record["to"]
+                for name in (record["from"], record["to"]):
+                    degree[name] = degree.get(name, 0) + 1
+        values = sorted(degree.values())
+        assert values[-1] > 20 * values[len(values) // 2]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("fmt", ["json", "jsonl"])
+    def test_written_file_loads(self, tmp_path, fmt):
+        """生成したファイルをローダーで読み込めることを確認"""
+        spec = GraphSpec(300, relation_types=10, entity_types=3)
+        path = write_graph(tmp_path / f"graph.{fmt}", spec)
+
+        if fmt == "json":
+            graph, _ = load_graph_streaming(path, progress=None)
+            assert len(json.loads(path.read_text(encoding="utf-8"))["relations"]) == spec.relations
+        else:
+            graph, _, _ = load_graph_jsonl(path)
+        assert graph.entity_count == 300
+        assert len(graph.relation_types) == 10
+        assert set(graph.entity_types) <= {"user", "project", "tool"}
+
+    @pytest.mark.unit
+    def test_invalid_exponent(self):
+        """べき指数が2以下の場合はValueErrorになることを確認"""
+        with pytest.raises(ValueError):
+            GraphSpec(10, exponent=2.0)
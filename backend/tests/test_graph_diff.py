@@ -0,0 +1,129 @@
+"""スナップショット差分・変更フィードのテスト"""
+
+import pytest
+from services.compact_graph import CompactGraph
+from services.graph_diff import diff_appended, diff_graphs
+from services.graph_loader import merge_records
+from services.memory_client import MemoryMCPClient
+from models.memory import MemoryGraph, Entity, Relation
+
+
+def _graph(entities, relations=()):
+    """(name, entityType, observations) と (from, to, relationType) からグラフを作成"""
+    return MemoryGraph(
+        entities=[Entity(name=n, entityType=t, observations=list(o)) for n, t, o in entities],
+        relations=[Relation(from_=f, to=to, relationType=r) for f, to, r in relations],
+    )
+
+
+class TestDiffGraphs:
+    """diff_graphs()のテストクラス"""
+
+    @pytest.mark.unit
+    def test_structural_diff(self):
+        """エンティティ・observations・リレーションの追加削除を検出できることを確認"""
+        old = _graph(
+            [("A", "user", ["a1", "a2"]), ("B", "tool", []), ("C", "project", [])],
+            [("A", "B", "uses"), ("A", "C", "created")],
+        )
+        new = _graph(
+            [("A", "user", ["a2", "a3"]), ("B", "concept", []), ("D", "project", ["d"])],
+            [("A", "B", "uses"), ("A", "D", "created")],
+        )
+
+        delta = diff_graphs(old, new, 1, 2)
+
+        assert (delta.fromVersion, delta.toVersion) == (1, 2)
+        assert [e.name for e in delta.addedEntities] == ["B", "D"]
+        assert delta.removedEntities == ["C", "B"]
+        assert [(c.entityName, c.observations) for c in delta.addedObservations] == [("A", ["a3"])]
+        assert [(c.entityName, c.observations) for c in delta.removedObservations] == [("A", ["a1"])]
+        assert [(r.from_, r.to) for r in delta.addedRelations] == [("A", "D")]
+        assert [(r.from_, r.to) for r in delta.removedRelations] == [("A", "C")]
+
+    @pytest.mark.unit
+    def test_identical_graphs(self):
+        """同一内容なら空の差分になることを確認"""
+        graph = _graph([("A", "user", ["a"])], [("A", "A", "self")])
+        delta = diff_graphs(graph, graph.model_copy(deep=True), 1, 2)
+
+        assert delta.model_dump(exclude={"fromVersion", "toVersion"}) == {
+            "addedEntities": [], "removedEntities": [],
+            "addedObservations": [], "removedObservations": [],
+            "addedRelations": [], "removedRelations": [],
+        }
+
+    @pytest.mark.unit
+    def test_appended_matches_full_diff(self):
+        """追記レコードからの差分がグラフ全体の比較と一致することを確認"""
+        old = CompactGraph.from_graph(_graph(
+            [("A", "user", ["a1"]), ("B", "tool", []), ("C", "project", [])],
+            [("A", "B", "uses")],
+        ))
+        entities = [
+            Entity(name="D", entityType="project", observations=["d"]),
+            Entity(name="A", entityType="user", observations=["a1", "a2"]),
+            Entity(name="B", entityType="concept"),
+            Entity(name="C", entityType="project"),
+        ]
+        relations = [Relation(from_="A", to="B", relationType="uses"), Relation(from_="A", to="D", relationType="created")]
+        new = merge_records(old, entities, relations)
+
+        delta = diff_appended(old, new, [e.name for e in entities], 1, 2)
+
+        assert delta.model_dump() == diff_graphs(old, new, 1, 2).model_dump()
+        assert [(r.from_, r.to) for r in delta.addedRelations] == [("A", "D")]
+
+
+class TestChangeFeed:
+    """MemoryMCPClient.get_changes()のテストクラス"""
+
+    @pytest.fixture
+    def client(self):
+        client = MemoryMCPClient(history_size=2)
+        client._set_graph(_graph([("A", "user", [])]))
+        client._set_graph(_graph([("A", "user", []), ("B", "tool", [])]))
+        client._set_graph(_graph([("B", "tool", [])]))
+        return client
+
+    @pytest.mark.unit
+    def test_changes_since_version(self, client):
+        """指定版以降の差分が古い順に返ることを確認"""
+        changes = client.get_changes(since=1)
+
+        assert changes.version == 3
+        assert not changes.fullReloadRequired
+        assert [(d.fromVersion, d.toVersion) for d in changes.changes] == [(1, 2), (2, 3)]
+        assert changes.changes[1].removedEntities == ["A"]
+
+    @pytest.mark.unit
+    def test_up_to_date(self, client):
+        """最新版を指定すると差分なしになることを確認"""
+        changes = client.get_changes(since=3, epoch=client.epoch)
+
+        assert changes.changes == []
+        assert not changes.fullReloadRequired
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("since, epoch", [(0, None), (99, None), (2, "other-epoch")])
+    def test_full_reload_required(self, client, since, epoch):
+        """履歴外・未知の版・別インスタンスの版では全件再取得が必要になることを確認"""
+        changes = client.get_changes(since=since, epoch=epoch)
+
+        assert changes.fullReloadRequired
+        assert changes.changes == []
+
+    @pytest.mark.unit
+    def test_gap_in_history(self):
+        """版番号が飛んだ履歴（フォロワー）では、途切れた範囲を全件再取得にすることを確認"""
+        client = MemoryMCPClient()
+        client._set_graph(_graph([("A", "user", [])]), version=3)
+        client._set_graph(_graph([("A", "user", []), ("B", "tool", [])]), version=5)
+        client._set_graph(_graph([("B", "tool", [])]), version=8)
+
+        assert [(d.fromVersion, d.toVersion) for d in client.get_changes(since=3).changes] == [(3, 5), (5, 8)]
+        assert [(d.fromVersion, d.toVersion) for d in client.get_changes(since=5).changes] == [(5, 8)]
+        for since in (4, 6, 7):
+            changes = client.get_changes(since=since)
+            assert changes.fullReloadRequired
+            assert changes.changes == []
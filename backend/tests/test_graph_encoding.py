@@ -0,0 +1,56 @@
+"""エンコード済みレスポンスのテスト"""
+
+import gzip
+import pytest
+from services.graph_encoding import EncodedBody, choose_encoding, etag_matches
+
+
+class TestChooseEncoding:
+    """choose_encoding()のテストクラス"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            (None, "identity"),
+            ("gzip, deflate", "gzip"),
+            ("gzip, br", "br"),
+            ("br;q=0.5, gzip", "gzip"),
+            ("gzip;q=0", "identity"),
+            ("*", "br"),
+        ],
+    )
+    def test_choose_encoding(self, header, expected):
+        """q値を考慮して圧縮方式が選ばれることを確認"""
+        assert choose_encoding(header, available=["br", "gzip"]) == expected
+
+
+class TestEncodedBody:
+    """EncodedBodyのテストクラス"""
+
+    @pytest.mark.unit
+    def test_body_rendered_once(self):
+        """本体の生成が一度だけ行われ、圧縮版も同じ内容になることを確認"""
+        calls = []
+
+        def render():
+            calls.append(1)
+            return b'{"entities":[],"relations":[]}'
+
+        body = EncodedBody(render)
+        assert not body.ready()
+
+        assert gzip.decompress(body.get("gzip")) == body.get()
+        assert body.get() is body.get()
+        assert len(calls) == 1
+
+    @pytest.mark.unit
+    def test_etag_variants_match(self):
+        """圧縮方式ごとのETagも同じ版として一致することを確認"""
+        body = EncodedBody(lambda: b"{}")
+
+        assert body.etag_for("gzip") != body.etag
+        assert etag_matches(body.etag, body.etag)
+        assert etag_matches(f"W/{body.etag_for('gzip')}", body.etag)
+        assert etag_matches('"other", ' + body.etag, body.etag)
+        assert not etag_matches('"other"', body.etag)
@@ -0,0 +1,79 @@
+"""サーバー側のグラフ絞り込みのテスト"""
+
+import pytest
+from services.graph_filter import GraphFilter
+from services.graph_store import GraphStore
+from models.memory import MemoryGraph, Entity, Relation
+
+
+@pytest.fixture
+def store():
+    """種類・次数の異なるエンティティと、存在しない端点へのリレーションを含むグラフ"""
+    return GraphStore(MemoryGraph(
+        entities=[
+            Entity(name="U", entityType="user", observations=["u1", "u2"]),
+            Entity(name="P1", entityType="project", observations=["p1"]),
+            Entity(name="P2", entityType="project"),
+            Entity(name="T", entityType="tool", observations=["t1"]),
+        ],
+        relations=[
+            Relation(from_="U", to="P1", relationType="created"),
+            Relation(from_="U", to="P2", relationType="created"),
+            Relation(from_="U", to="T", relationType="uses"),
+            Relation(from_="P1", to="T", relationType="uses"),
+            Relation(from_="T", to="存在しない", relationType="depends on"),
+        ],
+    ), version=1)
+
+
+def _apply(store, **kwargs):
+    graph = store.type_index.apply(GraphFilter.of(**kwargs)).to_graph()
+    return (
+        [e.name for e in graph.entities],
+        [(r.from_, r.to, r.relationType) for r in graph.relations],
+    )
+
+
+class TestGraphFilter:
+    """GraphFilter・TypeIndexのテストクラス"""
+
+    @pytest.mark.unit
+    def test_normalized_key(self):
+        """指定順・重複に依存しない条件になることを確認"""
+        assert GraphFilter.of(["b", "a", "a"]) == GraphFilter.of(["a", "b"])
+        assert GraphFilter.of().is_empty
+        assert not GraphFilter.of(min_degree=1).is_empty
+
+    @pytest.mark.unit
+    def test_entity_type_include_exclude(self, store):
+        """entityTypeの包含・除外で絞り込み、両端が残るリレーションだけを返すことを確認"""
+        entities, relations = _apply(store, entity_types=["user", "project"])
+        assert entities == ["U", "P1", "P2"]
+        assert relations == [("U", "P1", "created"), ("U", "P2", "created")]
+
+        entities, relations = _apply(store, exclude_entity_types=["project"])
+        assert entities == ["U", "T"]
+        assert relations == [("U", "T", "uses")]
+
+    @pytest.mark.unit
+    def test_relation_type_and_min_degree(self, store):
+        """relationType・最小次数の条件を組み合わせられることを確認"""
+        entities, relations = _apply(store, relation_types=["uses", "depends on"])
+        assert entities == ["U", "P1", "P2", "T"]
+        # エンティティの条件がなければ存在しない端点へのリレーションも残す
+        assert relations == [("U", "T", "uses"), ("P1", "T", "uses"), ("T", "存在しない", "depends on")]
+
+        entities, relations = _apply(store, min_degree=2, exclude_relation_types=["created"])
+        assert entities == ["U", "P1", "T"]
+        assert relations == [("U", "T", "uses"), ("P1", "T", "uses")]
+
+    @pytest.mark.unit
+    def test_observations_are_kept(self, store):
+        """絞り込んだエンティティのobservationsが保たれることを確認"""
+        subgraph = store.type_index.apply(GraphFilter.of(entity_types=["tool", "user"]))
+        graph = subgraph.to_graph()
+        assert [(e.name, e.observations) for e in graph.entities] == [("U", ["u1", "u2"]), ("T", ["t1"])]
+        # 本体の生成でグラフ全体の observations をデコードしないよう、参照する分だけを持つ
+        assert sorted(subgraph.observations) == ["t1", "u1", "u2"]
+        assert subgraph.render_json() == graph.model_dump_json(by_alias=True).encode("utf-8")
+        assert _apply(store, entity_types=["unknown"]) == ([], [])
@@ -0,0 +1,118 @@
+"""ワイヤーフォーマット（MessagePack / Arrow）のテスト"""
+
+import json
+import pytest
+from models.memory import MemoryGraph, Entity, Relation, Subgraph
+from services.compact_graph import CompactGraph
+from services.graph_formats import (
+    ARROW,
+    JSON,
+    MSGPACK,
+    choose_media_type,
+    render_graph,
+    render_model,
+)
+
+AVAILABLE = [JSON, MSGPACK, ARROW]
+
+
+def _graph() -> CompactGraph:
+    """ダングリングリレーションを含むテスト用グラフ"""
+    return CompactGraph.from_graph(MemoryGraph(
+        entities=[
+            Entity(name="A", entityType="person", observations=["x", "y"]),
+            Entity(name="B", entityType="project", observations=[]),
+            Entity(name="C", entityType="person", observations=["x"]),
+        ],
+        relations=[
+            Relation(from_="A", to="B", relationType="works_on"),
+            Relation(from_="C", to="B", relationType="works_on"),
+            Relation(from_="A", to="Ghost", relationType="knows"),
+        ],
+    ))
+
+
+def _read_arrow(body: bytes):
+    """連結されたArrow IPCストリームを表名 → Tableのdictにする"""
+    pa = pytest.importorskip("pyarrow")
+    reader = pa.BufferReader(body)
+    tables = {}
+    while reader.tell() < reader.size():
+        table = pa.ipc.open_stream(reader).read_all()
+        tables[table.schema.metadata[b"table"].decode()] = table
+    return tables
+
+
+class TestChooseMediaType:
+    """choose_media_type()のテストクラス"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            (None, JSON),
+            ("*/*", JSON),
+            ("application/msgpack", MSGPACK),
+            ("application/x-msgpack", MSGPACK),
+            ("application/vnd.apache.arrow.stream, */*;q=0.1", ARROW),
+            ("application/json;q=0.5, application/msgpack", MSGPACK),
+            ("application/*, application/msgpack", MSGPACK),
+            ("text/html", None),
+            ("application/json;q=0", None),
+        ],
+    )
+    def test_choose_media_type(self, header, expected):
+        """q値と指定の具体性を考慮して形式が選ばれることを確認"""
+        assert choose_media_type(header, available=AVAILABLE) == expected
+
+    @pytest.mark.unit
+    def test_unavailable_format(self):
+        """提供していない形式だけを受け入れる場合はNoneになることを確認"""
+        assert choose_media_type("application/msgpack", available=[JSON]) is None
+
+
+class TestRenderGraph:
+    """render_graph()のテストクラス"""
+
+    @pytest.mark.unit
+    def test_msgpack_matches_json(self):
+        """MessagePackがJSONと同じ構造になることを確認"""
+        msgpack = pytest.importorskip("msgpack")
+        graph = _graph()
+        decoded = msgpack.unpackb(render_graph(graph, MSGPACK), raw=False)
+        assert decoded == json.loads(graph.render_json())
+
+    @pytest.mark.unit
+    def test_arrow_columns(self):
+        """Arrowのリレーションがノード表の行番号で表されることを確認"""
+        tables = _read_arrow(render_graph(_graph(), ARROW))
+        nodes = tables["nodes"].to_pydict()
+        relations = tables["relations"].to_pydict()
+
+        assert nodes["name"] == ["A", "B", "C", "Ghost"]
+        assert nodes["entityType"] == ["person", "project", "person", None]
+        assert nodes["observations"] == [["x", "y"], [], ["x"], []]
+        assert nodes["isEntity"] == [True, True, True, False]
+        names = nodes["name"]
+        assert [
+            (names[s], names[t], r)
+            for s, t, r in zip(relations["source"], relations["target"], relations["relationType"])
+        ] == [("A", "B", "works_on"), ("C", "B", "works_on"), ("A", "Ghost", "knows")]
+
+    @pytest.mark.unit
+    def test_unsupported_media_type(self):
+        """未対応の形式はValueErrorになることを確認"""
+        with pytest.raises(ValueError):
+            render_graph(_graph(), "text/csv")
+
+
+class TestRenderModel:
+    """render_model()のテストクラス"""
+
+    @pytest.mark.unit
+    def test_arrow_meta(self):
+        """エンティティ・リレーション以外のフィールドがメタデータに入ることを確認"""
+        subgraph = Subgraph(**_graph().to_graph().model_dump(by_alias=True), center="A", depth=1, truncated=False)
+        tables = _read_arrow(render_model(subgraph, ARROW))
+        meta = json.loads(tables["nodes"].schema.metadata[b"meta"])
+        assert meta == {"center": "A", "depth": 1, "truncated": False}
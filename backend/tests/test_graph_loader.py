@@ -0,0 +1,83 @@
+"""ストリーミングローダーのテスト"""
+
+import json
+import pytest
+from pathlib import Path
+from services import graph_loader
+from services.graph_loader import iter_graph_records, load_graph_streaming, peak_rss_bytes
+from models.memory import MemoryGraph
+
+
+DATA_FILE = Path(__file__).parent.parent / "data" / "memory_graph.json"
+
+
+class TestGraphLoader:
+    """ストリーミングローダーのテストクラス"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_matches_json_load(self, chunk_size):
+        """チャンクサイズに関わらずjson.loadと同じ結果になることを確認"""
+        # 1バイト単位ではマルチバイト文字がチャンク境界で分割される
+        with open(DATA_FILE, "r", encoding="utf-8") as f:
+            expected = MemoryGraph(**json.load(f))
+
+        graph, stats = load_graph_streaming(DATA_FILE, chunk_size=chunk_size, progress=None)
+
+        assert graph.to_graph().model_dump() == expected.model_dump()
+        assert stats.entity_count == len(expected.entities)
+        assert stats.relation_count == len(expected.relations)
+
+    @pytest.mark.unit
+    def test_skips_unknown_keys_and_empty_arrays(self, tmp_path):
+        """未知のキーや空配列を正しく扱えることを確認"""
+        test_file = tmp_path / "graph.json"
+        test_file.write_text(
+            json.dumps({
+                "meta": {"version": [1, 2, {"x": "]"}], "count": 12345},
+                "relations": [],
+                "entities": [{"name": "A", "entityType": "user", "observations": []}],
+            }),
+            encoding="utf-8",
+        )
+
+        records = list(iter_graph_records(test_file, chunk_size=3))
+
+        assert records == [("entity", {"name": "A", "entityType": "user", "observations": []})]
+
+    @pytest.mark.unit
+    def test_reports_progress(self, tmp_path, sample_graph):
+        """読み込み完了時に進捗が報告されることを確認"""
+        test_file = tmp_path / "graph.json"
+        test_file.write_text(sample_graph.model_dump_json(by_alias=True), encoding="utf-8")
+        calls = []
+
+        load_graph_streaming(test_file, progress=lambda *args: calls.append(args))
+
+        bytes_read, total, records = calls[-1]
+        assert bytes_read == total
+        assert records == 3
+
+    @pytest.mark.unit
+    def test_invalid_json_raises(self, tmp_path):
+        """不正なJSONで例外が発生することを確認"""
+        test_file = tmp_path / "broken.json"
+        test_file.write_text('{"entities": [{"name": "A"', encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            list(iter_graph_records(test_file))
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("platform, expected", [("linux", 2048), ("darwin", 2)])
+    def test_peak_rss_units(self, monkeypatch, platform, expected):
+        """ru_maxrss をプラットフォームの単位（Linux: KB、macOS: バイト）で換算することを確認"""
+        class FakeResource:
+            RUSAGE_SELF = 0
+
+            @staticmethod
+            def getrusage(who):
+                return type("Usage", (), {"ru_maxrss": 2})()
+
+        monkeypatch.setattr(graph_loader, "resource", FakeResource)
+        monkeypatch.setattr(graph_loader.sys, "platform", platform)
+        assert peak_rss_bytes() == expected
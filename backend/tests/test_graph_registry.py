@@ -0,0 +1,160 @@
+"""複数グラフのレジストリのテスト"""
+
+import asyncio
+import json
+import os
+import threading
+import pytest
+from services import graph_registry
+from services.graph_registry import GraphRegistry
+from services.memory_client import MemoryMCPClient
+
+
+def _write(path, names):
+    """エンティティ名のリストからJSONデータファイルを書き出す"""
+    path.write_text(json.dumps({
+        "entities": [{"name": n, "entityType": "note", "observations": [n * 50]} for n in names],
+        "relations": [{"from": a, "to": b, "relationType": "next"} for a, b in zip(names, names[1:])],
+    }), encoding="utf-8")
+    return path
+
+
+class FakeClock:
+    """進め方をテストから操作できる時計"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def graphs_dir(tmp_path):
+    """3つのグラフ（a, b: JSON、c: JSONL）を置いたディレクトリ"""
+    _write(tmp_path / "a.json", ["A1", "A2", "A3"])
+    _write(tmp_path / "b.json", ["B1", "B2"])
+    (tmp_path / "c.jsonl").write_text(
+        '{"type":"entity","name":"C1","entityType":"note","observations":[]}\n', encoding="utf-8"
+    )
+    return tmp_path
+
+
+class TestGraphRegistry:
+    """GraphRegistryのテストクラス"""
+
+    @pytest.mark.unit
+    async def test_get_loads_each_graph(self, graphs_dir):
+        """グラフIDごとに別のクライアントで読み込み、以降は同じクライアントを返すことを確認"""
+        registry = GraphRegistry(graphs_dir, memory_budget=1 << 30)
+
+        a = await registry.get("a")
+        c = await registry.get("c")
+        assert (await a.get_store()).entity_names() == ["A1", "A2", "A3"]
+        assert (await c.get_store()).entity_names() == ["C1"]
+        assert await registry.get("a") is a
+
+        listing = registry.list_graphs()
+        assert [(g.id, g.loaded) for g in listing.graphs] == [("a", True), ("b", False), ("c", True)]
+        assert listing.memoryUsed == sum(g.bytes for g in listing.graphs if g.loaded) > 0
+
+    @pytest.mark.unit
+    async def test_unknown_or_invalid_id(self, graphs_dir):
+        """存在しない・パスを含むグラフIDはNoneになることを確認"""
+        registry = GraphRegistry(graphs_dir, memory_budget=1 << 30)
+        assert await registry.get("missing") is None
+        assert await registry.get("../a") is None
+        assert await registry.get(".hidden") is None
+
+    @pytest.mark.unit
+    async def test_cold_load_does_not_block_other_graphs(self, graphs_dir, monkeypatch):
+        """あるグラフの読み込み中も、他のグラフの要求が待たされないことを確認"""
+        release = threading.Event()
+        original = MemoryMCPClient._reload_from_file
+
+        def slow_reload(self):
+            if self.data_file.stem == "a":
+                release.wait(5)
+            return original(self)
+
+        monkeypatch.setattr(MemoryMCPClient, "_reload_from_file", slow_reload)
+        registry = GraphRegistry(graphs_dir, memory_budget=1 << 30)
+
+        slow = asyncio.create_task(registry.get("a"))
+        await asyncio.sleep(0.05)
+        fast = await asyncio.wait_for(registry.get("b"), timeout=2)
+        assert (await fast.get_store()).entity_names() == ["B1", "B2"]
+        assert not slow.done()
+
+        release.set()
+        assert (await (await slow).get_store()).entity_count == 3
+
+    @pytest.mark.unit
+    async def test_memory_budget_evicts_least_recently_used(self, graphs_dir):
+        """予算を超えたら最近使われていないグラフから破棄することを確認"""
+        probe = GraphRegistry(graphs_dir, memory_budget=1 << 30)
+        await probe.get("a")
+        await probe.get("b")
+        # a・b のどちらか1つ分だけ収まる予算
+        budget = max(e.nbytes for e in probe._entries.values()) + 1
+        registry = GraphRegistry(graphs_dir, memory_budget=budget)
+
+        first = await registry.get("a")
+        await registry.get("b")
+        assert list(registry._entries) == ["b"]
+        assert registry.nbytes <= budget
+
+        # 破棄したグラフは次の要求で読み込み直す
+        again = await registry.get("a")
+        assert again is not first
+        assert list(registry._entries) == ["a"]
+
+    @pytest.mark.unit
+    async def test_graph_larger_than_budget_is_kept(self, graphs_dir):
+        """単独で予算を超えるグラフも、要求中のものは破棄しないことを確認"""
+        registry = GraphRegistry(graphs_dir, memory_budget=1)
+        client = await registry.get("a")
+        assert client.ready
+        assert list(registry._entries) == ["a"]
+
+    @pytest.mark.unit
+    async def test_evict_idle(self, graphs_dir):
+        """idle_timeout 以上使われていないグラフを破棄することを確認"""
+        clock = FakeClock()
+        registry = GraphRegistry(graphs_dir, memory_budget=1 << 30, idle_timeout=60, clock=clock)
+        await registry.get("a")
+        clock.now += 30
+        await registry.get("b")
+
+        clock.now += 40
+        assert registry.evict_idle() == ["a"]
+        assert list(registry._entries) == ["b"]
+
+    @pytest.mark.unit
+    async def test_changed_file_is_reloaded_in_background(self, graphs_dir):
+        """データファイルが更新されたら、既存の版を返しつつ読み込み直すことを確認"""
+        clock = FakeClock()
+        registry = GraphRegistry(graphs_dir, memory_budget=1 << 30, clock=clock)
+        client = await registry.get("b")
+        version = client.version
+
+        path = _write(graphs_dir / "b.json", ["B1", "B2", "B3"])
+        os.utime(path, ns=(1, 1))
+        clock.now += graph_registry.STAT_INTERVAL
+        assert await registry.get("b") is client
+
+        await registry._entries["b"].refresh
+        assert client.version == version + 1
+        assert (await client.get_store()).entity_names() == ["B1", "B2", "B3"]
+
+    @pytest.mark.unit
+    async def test_removed_file(self, graphs_dir):
+        """データファイルが削除されたグラフは破棄してNoneを返すことを確認"""
+        clock = FakeClock()
+        registry = GraphRegistry(graphs_dir, memory_budget=1 << 30, clock=clock)
+        await registry.get("b")
+
+        (graphs_dir / "b.json").unlink()
+        clock.now += graph_registry.STAT_INTERVAL
+        assert await registry.get("b") is None
+        assert "b" not in registry._entries
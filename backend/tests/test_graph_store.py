@@ -0,0 +1,56 @@
+"""グラフストアのテスト"""
+
+import pytest
+from services.graph_store import GraphStore
+from models.memory import MemoryGraph, Entity, Relation
+
+
+@pytest.fixture
+def store():
+    """索引テスト用のグラフストア"""
+    graph = MemoryGraph(
+        entities=[
+            Entity(name="A", entityType="user"),
+            Entity(name="B", entityType="tool"),
+            Entity(name="C", entityType="project"),
+        ],
+        relations=[
+            Relation(from_="A", to="B", relationType="uses"),
+            Relation(from_="A", to="C", relationType="created"),
+            Relation(from_="B", to="C", relationType="uses"),
+            Relation(from_="C", to="A", relationType="owned by"),
+        ],
+    )
+    return GraphStore(graph)
+
+
+class TestGraphStore:
+    """GraphStoreのテストクラス"""
+
+    @pytest.mark.unit
+    def test_get_entity(self, store):
+        """名前索引でエンティティを取得できることを確認"""
+        assert store.get_entity("A").entityType == "user"
+        assert store.get_entity("存在しない") is None
+        assert store.entity_count == 3
+
+    @pytest.mark.unit
+    def test_out_and_in_neighbors(self, store):
+        """入出力の隣接リストが正しく構築されることを確認"""
+        assert sorted(store.out_neighbors("A")) == ["B", "C"]
+        assert store.in_neighbors("C") == ["A", "B"]
+        assert store.out_neighbors("存在しない") == []
+
+    @pytest.mark.unit
+    def test_neighbors_filtered_by_relation_type(self, store):
+        """relationTypeで隣接を絞り込めることを確認"""
+        assert store.out_neighbors("A", "uses") == ["B"]
+        assert store.in_neighbors("C", "uses") == ["B"]
+        assert store.neighbors("C", "created") == ["A"]
+
+    @pytest.mark.unit
+    def test_neighbors_deduplicated(self, store):
+        """双方向の隣接が重複なく返ることを確認"""
+        # AはCへの出リレーションとCからの入リレーションを持つ
+        assert store.neighbors("A") == ["B", "C"]
+        assert store.degree("A") == 3
@@ -0,0 +1,154 @@
+"""グラフ探索のテスト"""
+
+import pytest
+from services.graph_store import GraphStore
+from services.graph_traversal import neighborhood, shortest_paths
+from models.memory import MemoryGraph, Entity, Relation
+
+
+def _store(edges, extra_nodes=()):
+    """エッジリスト (from, to, relationType) からグラフストアを作成"""
+    names = dict.fromkeys([n for f, t, _ in edges for n in (f, t)] + list(extra_nodes))
+    return GraphStore(MemoryGraph(
+        entities=[Entity(name=n, entityType="test") for n in names],
+        relations=[Relation(from_=f, to=t, relationType=r) for f, t, r in edges],
+    ))
+
+
+def _edges(relations):
+    return sorted((r.from_, r.to, r.relationType) for r in relations)
+
+
+class TestNeighborhood:
+    """neighborhood()のテストクラス"""
+
+    @pytest.fixture
+    def chain(self):
+        """A→B→C→D の鎖と、B⇄E の関係"""
+        return _store([
+            ("A", "B", "uses"),
+            ("B", "C", "uses"),
+            ("C", "D", "uses"),
+            ("E", "B", "created"),
+            ("B", "E", "uses"),
+        ])
+
+    @pytest.mark.unit
+    def test_depth_bounds_result(self, chain):
+        """depthで探索範囲が制限され、誘導リレーションが返ることを確認"""
+        entities, relations, truncated = neighborhood(chain, "A", depth=2)
+
+        assert [e.name for e in entities] == ["A", "B", "C", "E"]
+        assert _edges(relations) == [
+            ("A", "B", "uses"), ("B", "C", "uses"), ("B", "E", "uses"), ("E", "B", "created"),
+        ]
+        assert not truncated
+
+    @pytest.mark.unit
+    def test_relation_type_filter(self, chain):
+        """relationTypeでたどるリレーションを絞り込めることを確認"""
+        entities, relations, _ = neighborhood(chain, "B", depth=3, relation_types=["created"])
+
+        assert [e.name for e in entities] == ["B", "E"]
+        assert _edges(relations) == [("E", "B", "created")]
+
+    @pytest.mark.unit
+    def test_limit_truncates(self, chain):
+        """ノード数上限で打ち切られることを確認"""
+        entities, _, truncated = neighborhood(chain, "B", depth=2, limit=2)
+
+        assert len(entities) == 2
+        assert truncated
+
+    @pytest.mark.unit
+    def test_hub_is_not_expanded(self):
+        """高次数のハブは含まれるが展開されないことを確認"""
+        edges = [("center", "hub", "uses")] + [("hub", f"leaf{i}", "has") for i in range(100)]
+        store = _store(edges)
+
+        entities, relations, truncated = neighborhood(store, "center", depth=3, max_fanout=10)
+
+        assert [e.name for e in entities] == ["center", "hub"]
+        assert _edges(relations) == [("center", "hub", "uses")]
+        assert truncated
+
+    @pytest.mark.unit
+    def test_center_fanout_is_capped(self):
+        """中心が高次数でも展開数が制限されることを確認"""
+        store = _store([("center", f"leaf{i}", "has") for i in range(100)])
+
+        entities, relations, truncated = neighborhood(store, "center", depth=1, max_fanout=10)
+
+        assert len(entities) == 11
+        assert len(relations) == 10
+        assert truncated
+
+
+class TestShortestPaths:
+    """shortest_paths()のテストクラス"""
+
+    @pytest.fixture
+    def diamond(self):
+        """A→B→D と A→C←D の2経路、D→E→F の鎖、孤立したZ"""
+        return _store([
+            ("A", "B", "uses"),
+            ("B", "D", "uses"),
+            ("A", "C", "knows"),
+            ("D", "C", "created"),
+            ("D", "E", "uses"),
+            ("E", "F", "uses"),
+        ], extra_nodes=["Z"])
+
+    @pytest.mark.unit
+    def test_shortest_path_with_relations(self, diamond):
+        """最短経路と各ホップのリレーション（元の向き）が返ることを確認"""
+        paths, truncated = shortest_paths(diamond, "A", "F")
+
+        assert not truncated
+        assert len(paths) == 1
+        assert paths[0].entities[0] == "A" and paths[0].entities[-1] == "F"
+        assert len(paths[0].entities) == 5
+        hops = [(r.from_, r.to) for r in paths[0].relations]
+        assert hops[-2:] == [("D", "E"), ("E", "F")]
+        # 逆向きのリレーションもたどり、向きは元のまま返す
+        paths, _ = shortest_paths(diamond, "F", "C")
+        assert paths[0].entities == ["F", "E", "D", "C"]
+        assert _edges(paths[0].relations)[0] == ("D", "C", "created")
+
+    @pytest.mark.unit
+    def test_top_k_shortest_paths(self, diamond):
+        """同じ長さの最短経路を k 件まで返すことを確認"""
+        paths, _ = shortest_paths(diamond, "A", "D", k=5)
+
+        assert sorted(p.entities for p in paths) == [["A", "B", "D"], ["A", "C", "D"]]
+        assert len(shortest_paths(diamond, "A", "D", k=1)[0]) == 1
+
+    @pytest.mark.unit
+    def test_filters_and_bounds(self, diamond):
+        """リレーション種類・最大ホップ数で探索範囲が制限されることを確認"""
+        paths, _ = shortest_paths(diamond, "A", "D", k=5, relation_types=["uses"])
+        assert [p.entities for p in paths] == [["A", "B", "D"]]
+
+        assert shortest_paths(diamond, "A", "F", max_depth=3) == ([], False)
+        assert shortest_paths(diamond, "A", "Z") == ([], False)
+        assert shortest_paths(diamond, "A", "A")[0][0].entities == ["A"]
+
+    @pytest.mark.unit
+    def test_hub_is_not_expanded(self):
+        """ハブは経由地として到達するが展開しないことを確認"""
+        edges = (
+            [("H", f"h{i}", "has") for i in range(20)]
+            + [("G", f"g{i}", "has") for i in range(20)]
+            + [("X", "H", "uses"), ("H", "G", "knows"), ("Y", "G", "uses")]
+        )
+        store = _store(edges)
+
+        # 両側から到達したハブは経路に含まれる
+        paths, truncated = shortest_paths(store, "X", "h1", max_fanout=5)
+        assert paths[0].entities == ["X", "H", "h1"]
+
+        # ハブ同士のリレーションを通る経路は見つからず、打ち切りとして報告する
+        paths, truncated = shortest_paths(store, "X", "Y", max_fanout=5)
+        assert paths == []
+        assert truncated
+        assert shortest_paths(store, "X", "Y")[0][0].entities == ["X", "H", "G", "Y"]
@@ -0,0 +1,106 @@
+"""グラフレイアウトのテスト"""
+
+import math
+import pytest
+from services import layout
+from services.graph_store import GraphStore
+from services.layout import CANVAS, compute_layout
+from services.memory_client import MemoryMCPClient
+from models.memory import MemoryGraph, Entity, Relation
+
+
+def _store(edges, extra_nodes=()):
+    """エッジリスト (from, to) からグラフストアを作成"""
+    names = dict.fromkeys([n for edge in edges for n in edge] + list(extra_nodes))
+    return GraphStore(MemoryGraph(
+        entities=[Entity(name=n, entityType="test") for n in names],
+        relations=[Relation(from_=f, to=t, relationType="rel") for f, t in edges],
+    ))
+
+
+def _dist(positions, a, b):
+    (ax, ay), (bx, by) = positions[a], positions[b]
+    return math.hypot(ax - bx, ay - by)
+
+
+class TestComputeLayout:
+    """compute_layout()のテストクラス"""
+
+    @pytest.mark.unit
+    def test_positions_within_canvas(self):
+        """全エンティティの座標がキャンバス内に収まることを確認"""
+        store = _store([("A", "B"), ("B", "C"), ("C", "A")], extra_nodes=["D"])
+        positions = compute_layout(store, "force")
+
+        assert set(positions) == {"A", "B", "C", "D"}
+        for x, y in positions.values():
+            assert 0 <= x <= CANVAS and 0 <= y <= CANVAS
+
+    @pytest.mark.unit
+    def test_connected_nodes_are_closer(self):
+        """リレーションのあるノード同士が近くに配置されることを確認"""
+        # 2つの完全グラフを1本の辺でつなぐ
+        left = [(f"L{i}", f"L{j}") for i in range(5) for j in range(i + 1, 5)]
+        right = [(f"R{i}", f"R{j}") for i in range(5) for j in range(i + 1, 5)]
+        store = _store(left + right + [("L0", "R0")])
+        positions = compute_layout(store, "force")
+
+        assert _dist(positions, "L1", "L2") < _dist(positions, "L1", "R2")
+        assert _dist(positions, "R1", "R2") < _dist(positions, "R1", "L2")
+
+    @pytest.mark.unit
+    def test_deterministic(self):
+        """同じシードなら同じ座標になることを確認"""
+        store = _store([("A", "B"), ("B", "C")])
+        assert compute_layout(store, seed=1) == compute_layout(store, seed=1)
+
+    @pytest.mark.unit
+    def test_grid_approximation(self, monkeypatch):
+        """グリッド近似でも座標が有限でキャンバス内に収まることを確認"""
+        monkeypatch.setattr(layout, "EXACT_LIMIT", 10)
+        edges = [(f"N{i}", f"N{(i * 7 + 3) % 200}") for i in range(200)]
+        positions = compute_layout(_store(edges))
+
+        assert len(positions) == 200
+        for x, y in positions.values():
+            assert math.isfinite(x) and 0 <= x <= CANVAS
+            assert math.isfinite(y) and 0 <= y <= CANVAS
+
+    @pytest.mark.unit
+    def test_warm_start_places_new_node_near_neighbor(self):
+        """ウォームスタート時、新規ノードが既存の隣接ノードの近くに置かれることを確認"""
+        ring = [(f"N{i}", f"N{(i + 1) % 12}") for i in range(12)]
+        previous = compute_layout(_store(ring))
+
+        positions = compute_layout(_store(ring + [("N0", "X")]), previous=previous)
+
+        others = [_dist(positions, "X", f"N{i}") for i in range(4, 9)]
+        assert _dist(positions, "X", "N0") < min(others)
+
+    @pytest.mark.unit
+    def test_unknown_algorithm(self):
+        """未知のアルゴリズムでValueErrorになることを確認"""
+        with pytest.raises(ValueError):
+            compute_layout(_store([("A", "B")]), "spiral")
+
+
+class TestClientLayout:
+    """MemoryMCPClient.get_layout()のテストクラス"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_layout_cached_per_version(self, mocker):
+        """同じ版ではキャッシュを返し、更新後は前の座標から再計算することを確認"""
+        client = MemoryMCPClient()
+        spy = mocker.spy(layout, "compute_layout")
+        mocker.patch("services.memory_client.compute_layout", spy)
+
+        first = await client.get_layout("force")
+        assert await client.get_layout("force") is first
+        assert spy.call_count == 1
+
+        await client.refresh()
+        second = await client.get_layout("force")
+
+        assert second.version == first.version + 1
+        assert spy.call_args.args[2] == first.positions
@@ -0,0 +1,229 @@
+"""Memory MCPサーバーとのstdio接続のテスト（テスト用サーバー使用）"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from models.memory import MemoryGraph
+from services import mcp_stdio
+from services.mcp_stdio import (
+    MCPConnectionError,
+    MCPError,
+    MCPTimeoutError,
+    MemoryServerPool,
+    StdioConnection,
+    tool_payload,
+)
+from services.memory_client import MemoryMCPClient
+
+FAKE_SERVER = [sys.executable, str(Path(__file__).parent / "fake_mcp_server.py")]
+
+
+@pytest.fixture
+async def pool():
+    """テスト用サーバーへの接続プール"""
+    pool = MemoryServerPool(FAKE_SERVER, size=2, timeout=5.0)
+    yield pool
+    await pool.close()
+
+
+class TestToolPayload:
+    """tool_payload()のテストクラス"""
+
+    @pytest.mark.unit
+    def test_text_content(self):
+        """テキストコンテンツがJSONとして解析されることを確認"""
+        result = {"content": [{"type": "text", "text": '{"entities": []}'}]}
+        assert tool_payload(result) == {"entities": []}
+
+    @pytest.mark.unit
+    def test_structured_content(self):
+        """structuredContentがあればそれを使うことを確認"""
+        result = {
+            "content": [{"type": "text", "text": "ignored"}],
+            "structuredContent": {"entities": [], "relations": []},
+        }
+        assert tool_payload(result) == {"entities": [], "relations": []}
+
+    @pytest.mark.unit
+    def test_tool_error(self):
+        """isErrorの結果はMCPErrorになることを確認"""
+        result = {"content": [{"type": "text", "text": "boom"}], "isError": True}
+        with pytest.raises(MCPError, match="boom"):
+            tool_payload(result)
+
+
+class TestStdioConnection:
+    """StdioConnectionのテストクラス"""
+
+    @pytest.mark.integration
+    async def test_pipelined_requests(self):
+        """1つの接続で同時に送ったリクエストが、idで正しく対応付けられることを確認"""
+        connection = StdioConnection(FAKE_SERVER, timeout=5.0)
+        await connection.start()
+        try:
+            finished = []
+
+            async def call(query):
+                result = await connection.request(
+                    "tools/call", {"name": "search_nodes", "arguments": {"query": query}}
+                )
+                finished.append(query)
+                return tool_payload(result)
+
+            slow, fast = await asyncio.gather(call("__slow__:0.5"), call("alice"))
+            # 後から送ったリクエストの応答が先に届く
+            assert finished == ["alice", "__slow__:0.5"]
+            assert [e["name"] for e in fast["entities"]] == ["Alice"]
+            assert len(slow["entities"]) == 3
+        finally:
+            await connection.close()
+        assert not connection.alive
+
+    @pytest.mark.integration
+    async def test_non_object_messages_are_skipped(self):
+        """辞書でないJSONの行は読み飛ばし、接続を維持することを確認"""
+        connection = StdioConnection(FAKE_SERVER, timeout=5.0)
+        await connection.start()
+        try:
+            call = {"name": "search_nodes", "arguments": {"query": "__junk__"}}
+            assert len(tool_payload(await connection.request("tools/call", call))["entities"]) == 3
+            assert connection.alive
+        finally:
+            await connection.close()
+
+    @pytest.mark.integration
+    async def test_large_messages_decoded_in_thread(self, monkeypatch):
+        """大きい行はワーカースレッドでデコードすることを確認"""
+        decoded = []
+        to_thread = asyncio.to_thread
+
+        async def spy(func, *args):
+            decoded.append(func)
+            return await to_thread(func, *args)
+
+        monkeypatch.setattr(mcp_stdio, "INLINE_DECODE_BYTES", 0)
+        monkeypatch.setattr(mcp_stdio.asyncio, "to_thread", spy)
+        connection = StdioConnection(FAKE_SERVER, timeout=5.0)
+        await connection.start()
+        try:
+            await connection.request("tools/call", {"name": "read_graph", "arguments": {}})
+        finally:
+            await connection.close()
+        assert json.loads in decoded
+
+    @pytest.mark.integration
+    async def test_start_failure(self):
+        """起動できないコマンドはMCPConnectionErrorになることを確認"""
+        connection = StdioConnection(["/nonexistent/memory-server"])
+        with pytest.raises(MCPConnectionError):
+            await connection.start()
+
+
+class TestMemoryServerPool:
+    """MemoryServerPoolのテストクラス"""
+
+    @pytest.mark.integration
+    async def test_tools(self, pool):
+        """read_graph / open_nodes / search_nodes の結果がMemoryGraphになることを確認"""
+        graph = await pool.read_graph()
+        assert isinstance(graph, MemoryGraph)
+        assert [e.name for e in graph.entities] == ["Alice", "Bob", "memory-viz"]
+        assert graph.relations[0].from_ == "Alice"
+
+        opened = await pool.open_nodes(["Alice", "Bob"])
+        assert [r.relationType for r in opened.relations] == ["knows"]
+
+        found = await pool.search_nodes("fastapi")
+        assert [e.name for e in found.entities] == ["memory-viz"]
+
+    @pytest.mark.integration
+    async def test_connections_reused(self, pool):
+        """逐次の呼び出しは同じ接続を使い、同時呼び出しは最大size本に振り分けることを確認"""
+        for _ in range(3):
+            await pool.read_graph()
+        assert pool.started == 1
+
+        await asyncio.gather(*(pool.search_nodes("__slow__:0.2") for _ in range(5)))
+        assert pool.started == 2
+
+    @pytest.mark.integration
+    async def test_start_does_not_block_other_calls(self, pool, monkeypatch):
+        """接続の起動中も、他の呼び出しは既存の接続で処理されることを確認"""
+        await pool.read_graph()
+        start = StdioConnection.start
+
+        async def slow_start(self):
+            await asyncio.sleep(1.0)
+            await start(self)
+
+        monkeypatch.setattr(StdioConnection, "start", slow_start)
+        busy = asyncio.create_task(pool.search_nodes("__slow__:0.2"))
+        await asyncio.sleep(0.05)
+        starting = asyncio.create_task(pool.read_graph())
+        await asyncio.sleep(0.05)
+
+        graph = await asyncio.wait_for(pool.read_graph(), timeout=0.8)
+
+        assert len(graph.entities) == 3
+        assert not starting.done()
+        await asyncio.gather(busy, starting)
+        assert pool.started == 2
+
+    @pytest.mark.integration
+    async def test_timeout_restarts_connection(self, pool):
+        """タイムアウトした接続は閉じられ、次の呼び出しで起動し直すことを確認"""
+        with pytest.raises(MCPTimeoutError):
+            await pool.call_tool("search_nodes", {"query": "__slow__:5"}, timeout=0.2)
+
+        graph = await pool.read_graph()
+        assert len(graph.entities) == 3
+        assert pool.started == 2
+
+    @pytest.mark.integration
+    async def test_crash_restarts_connection(self, pool):
+        """サーバーが終了しても、次の呼び出しで起動し直すことを確認"""
+        await pool.read_graph()
+        with pytest.raises(MCPConnectionError):
+            await pool.search_nodes("__crash__")
+
+        graph = await pool.read_graph()
+        assert len(graph.entities) == 3
+
+    @pytest.mark.integration
+    async def test_unknown_tool(self, pool):
+        """ツールのエラーがMCPErrorとして伝わることを確認"""
+        with pytest.raises(MCPError, match="Unknown tool"):
+            tool_payload(await pool.call_tool("delete_entities"))
+
+
+class TestMemoryClientWithMCP:
+    """Memory MCPサーバーから読み込むクライアントのテストクラス"""
+
+    @pytest.mark.integration
+    async def test_client_reads_from_server(self, tmp_path, monkeypatch, pool):
+        """接続プールを設定したクライアントがサーバーのグラフを提供することを確認"""
+        data = tmp_path / "graph.json"
+        data.write_text(json.dumps({
+            "entities": [{"name": "X", "entityType": "t", "observations": []}],
+            "relations": [],
+        }))
+        monkeypatch.setenv("FAKE_MCP_GRAPH", str(data))
+
+        client = MemoryMCPClient(mcp=pool)
+        graph = await client.read_graph()
+        assert [e.name for e in graph.entities] == ["X"]
+
+        data.write_text(json.dumps({
+            "entities": [
+                {"name": "X", "entityType": "t", "observations": []},
+                {"name": "Y", "entityType": "t", "observations": []},
+            ],
+            "relations": [{"from": "X", "to": "Y", "relationType": "r"}],
+        }))
+        await client.refresh()
+        detail = await client.get_entity("X")
+        assert detail.relatedEntities == ["Y"]
+        assert client.get_changes(1).changes[0].addedEntities[0].name == "Y"
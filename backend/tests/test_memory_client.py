@@ -1,5 +1,8 @@
 """Memory MCPクライアントのテスト"""
 
+import asyncio
+import json
+import time
 import pytest
 from pathlib import Path
 from services.memory_client import MemoryMCPClient
@@ -115,3 +118,164 @@ class TestMemoryMCPClientWithFile:
         assert len(graph.entities) == len(sample_graph.entities)
         assert len(graph.relations) == len(sample_graph.relations)
         assert graph.entities[0].name == sample_graph.entities[0].name
+
+
+def _jsonl_line(record: dict) -> str:
+    """JSONL形式の1行を作成"""
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+class TestMemoryMCPClientWithJsonl:
+    """Memory MCPのJSONLファイル読み込みのテスト"""
+
+    @pytest.fixture
+    def jsonl_file(self, tmp_path):
+        """エンティティ2件・リレーション1件のJSONLファイル"""
+        path = tmp_path / "memory.jsonl"
+        path.write_text(
+            _jsonl_line({"type": "entity", "name": "A", "entityType": "user", "observations": ["a"]})
+            + _jsonl_line({"type": "entity", "name": "B", "entityType": "tool", "observations": []})
+            + _jsonl_line({"type": "relation", "from": "A", "to": "B", "relationType": "uses"}),
+            encoding="utf-8",
+        )
+        return path
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_load_jsonl(self, jsonl_file):
+        """set_data_file()でJSONLファイルを直接読み込めることを確認"""
+        client = MemoryMCPClient()
+        client.set_data_file(jsonl_file)
+        graph = await client.read_graph()
+
+        assert [e.name for e in graph.entities] == ["A", "B"]
+        assert graph.relations[0].from_ == "A"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_refresh_reads_only_appended_lines(self, jsonl_file, mocker):
+        """refresh()が追記された行だけを読み込むことを確認"""
+        client = MemoryMCPClient(data_file=jsonl_file)
+        await client.read_graph()
+        full_load = mocker.spy(client, "_load_from_file")
+
+        with open(jsonl_file, "a", encoding="utf-8") as f:
+            f.write(_jsonl_line({"type": "entity", "name": "C", "entityType": "project"}))
+            f.write(_jsonl_line({"type": "relation", "from": "A", "to": "C", "relationType": "created"}))
+            # 書き込み途中の行は次回まで読み込まない
+            f.write('{"type": "entity", "name": "D"')
+
+        graph = await client.refresh()
+
+        assert full_load.call_count == 0
+        assert [e.name for e in graph.entities] == ["A", "B", "C"]
+        assert len(graph.relations) == 2
+        detail = await client.get_entity("A")
+        assert set(detail.relatedEntities) == {"B", "C"}
+
+        with open(jsonl_file, "a", encoding="utf-8") as f:
+            f.write(', "entityType": "concept"}\n')
+
+        graph = await client.refresh()
+        assert [e.name for e in graph.entities] == ["A", "B", "C", "D"]
+        assert full_load.call_count == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_refresh_without_changes_keeps_snapshot(self, jsonl_file):
+        """追記がなければ同じスナップショットを返すことを確認"""
+        client = MemoryMCPClient(data_file=jsonl_file)
+        graph1 = await client.read_graph()
+        graph2 = await client.refresh()
+
+        assert graph1 is graph2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_refresh_after_rewrite_reloads_all(self, jsonl_file):
+        """ファイルが書き換えられた場合は全件読み直すことを確認"""
+        client = MemoryMCPClient(data_file=jsonl_file)
+        await client.read_graph()
+
+        jsonl_file.write_text(
+            _jsonl_line({"type": "entity", "name": "X", "entityType": "user", "observations": ["長い観測データ" * 20]}),
+            encoding="utf-8",
+        )
+        graph = await client.refresh()
+
+        assert [e.name for e in graph.entities] == ["X"]
+        assert graph.relations == []
+
+
+class TestMemoryMCPClientConcurrency:
+    """非同期読み込み・シングルフライトのテスト"""
+
+    @pytest.fixture
+    def slow_client(self, tmp_path, sample_graph, mocker):
+        """読み込みに時間がかかるクライアント"""
+        test_file = tmp_path / "test_data.json"
+        test_file.write_text(sample_graph.model_dump_json(by_alias=True), encoding="utf-8")
+        client = MemoryMCPClient(data_file=test_file)
+        original = client._load_from_file
+
+        def slow_load():
+            time.sleep(0.2)
+            return original()
+
+        mocker.patch.object(client, "_load_from_file", side_effect=slow_load)
+        return client
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_share_one_load(self, slow_client):
+        """同時のread_graph()が1回の読み込みにまとめられることを確認"""
+        graphs = await asyncio.gather(*(slow_client.read_graph() for _ in range(10)))
+
+        assert slow_client._load_from_file.call_count == 1
+        assert all(g is graphs[0] for g in graphs)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_load_does_not_block_event_loop(self, slow_client):
+        """読み込み中もイベントループが他の処理を進められることを確認"""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await slow_client.read_graph()
+        task.cancel()
+
+        assert ticks >= 5
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_refresh_serves_previous_snapshot(self, slow_client):
+        """refresh()中も既存のスナップショットが返されることを確認"""
+        old = await slow_client.read_graph()
+
+        refresh_task = asyncio.create_task(slow_client.refresh())
+        await asyncio.sleep(0.05)
+        during = await slow_client.read_graph()
+        new = await refresh_task
+
+        assert during is old
+        assert new is not old
+        assert await slow_client.read_graph() is new
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_refresh_during_load_reloads_once_more(self, slow_client):
+        """読み込み中のrefresh()は完了後の再読み込みにまとめられることを確認"""
+        first = asyncio.create_task(slow_client.read_graph())
+        await asyncio.sleep(0.05)
+        refreshed = await asyncio.gather(*(slow_client.refresh() for _ in range(5)))
+        await first
+
+        # 最初の読み込み + その後の再読み込み1回
+        assert slow_client._load_from_file.call_count == 2
+        assert all(g is refreshed[0] for g in refreshed)
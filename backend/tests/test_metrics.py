@@ -0,0 +1,63 @@
+"""メトリクスのテスト"""
+
+import pytest
+from services.metrics import Registry
+
+
+class TestRegistry:
+    """Registryのテストクラス"""
+
+    @pytest.mark.unit
+    def test_counter_and_gauge(self):
+        """カウンター・ゲージがPrometheusテキスト形式で出力されることを確認"""
+        registry = Registry()
+        counter = registry.counter("requests_total", "Requests.", ("route",))
+        gauge = registry.gauge("in_flight", "In flight.")
+        counter.inc("/a")
+        counter.inc("/a")
+        counter.inc('/b"c')
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        lines = registry.render().splitlines()
+        assert "# TYPE requests_total counter" in lines
+        assert 'requests_total{route="/a"} 2' in lines
+        assert 'requests_total{route="/b\\"c"} 1' in lines
+        assert "in_flight 1" in lines
+
+    @pytest.mark.unit
+    def test_histogram_buckets(self):
+        """ヒストグラムのバケットが累積で出力されることを確認"""
+        registry = Registry()
+        histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "/a")
+
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1"} 3' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+        assert 'latency_seconds_sum{route="/a"} 3.65' in lines
+        assert 'latency_seconds_count{route="/a"} 4' in lines
+        assert histogram.count("/a") == 4
+
+    @pytest.mark.unit
+    def test_gauge_function(self):
+        """関数を設定したゲージは出力時に値を計算し、Noneなら出力しないことを確認"""
+        registry = Registry()
+        gauge = registry.gauge("age_seconds", "Age.")
+        value = None
+        gauge.set_function(lambda: value)
+        assert not [line for line in registry.render().splitlines() if line.startswith("age_seconds")]
+
+        value = 2.5
+        assert "age_seconds 2.5" in registry.render().splitlines()
+
+    @pytest.mark.unit
+    def test_duplicate_name(self):
+        """同じ名前のメトリクスは登録できないことを確認"""
+        registry = Registry()
+        registry.counter("x_total", "X.")
+        with pytest.raises(ValueError):
+            registry.gauge("x_total", "X.")
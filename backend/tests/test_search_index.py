@@ -0,0 +1,142 @@
+"""全文検索インデックスのテスト"""
+
+import pytest
+from services.graph_diff import diff_graphs
+from services.memory_client import MemoryMCPClient
+from services.search_index import SearchIndex, highlight_spans
+from models.memory import MemoryGraph, Entity
+
+
+def _graph(entities):
+    """{name: observations} からグラフを作成"""
+    return MemoryGraph(entities=[
+        Entity(name=name, entityType="test", observations=obs) for name, obs in entities.items()
+    ])
+
+
+@pytest.fixture
+def index():
+    graph = _graph({
+        "湧心くん": ["Pythonが好き", "記憶システムに興味がある"],
+        "Memory MCP": ["ナレッジグラフベースの記憶システム"],
+        "kakuho": ["イベント予約管理システム", "ＦａｓｔＡＰＩ + React"],
+    })
+    index = SearchIndex()
+    index.build(graph.entities, version=1)
+    return index
+
+
+class TestSearchIndex:
+    """SearchIndexのテストクラス"""
+
+    @pytest.mark.unit
+    def test_japanese_substring_search(self, index):
+        """日本語の部分文字列で検索できることを確認"""
+        total, hits = index.search("記憶システム")
+
+        assert total == 2
+        assert {h["name"] for h in hits} == {"湧心くん", "Memory MCP"}
+        match = hits[0]["matches"][0]
+        assert match["text"][slice(*match["highlights"][0])] == "記憶システム"
+
+    @pytest.mark.unit
+    def test_single_character_and_case_insensitive(self, index):
+        """1文字検索・大文字小文字や全角半角の違いを吸収できることを確認"""
+        assert {h["name"] for h in index.search("予")[1]} == {"kakuho"}
+        assert {h["name"] for h in index.search("python")[1]} == {"湧心くん"}
+        assert {h["name"] for h in index.search("fastapi")[1]} == {"kakuho"}
+
+    @pytest.mark.unit
+    def test_multiple_terms_are_anded(self, index):
+        """空白区切りの語がAND検索になることを確認"""
+        total, hits = index.search("システム Python")
+
+        assert total == 1
+        assert hits[0]["name"] == "湧心くん"
+
+    @pytest.mark.unit
+    def test_name_match_ranks_first(self, index):
+        """エンティティ名の一致が上位になることを確認"""
+        _, hits = index.search("memory")
+
+        assert hits[0]["name"] == "Memory MCP"
+        assert hits[0]["matches"][0]["field"] == "name"
+
+    @pytest.mark.unit
+    def test_no_false_positive_from_bigrams(self, index):
+        """bigramがすべて含まれても連続していなければ一致しないことを確認"""
+        # 「ステ」「テム」は含まれるが「ステム」は含まれない文書のみ
+        index.build(_graph({"A": ["ステテム"]}).entities, version=1)
+
+        assert index.search("ステム") == (0, [])
+
+    @pytest.mark.unit
+    def test_apply_delta(self, index):
+        """差分適用で追加・削除が反映されることを確認"""
+        old = _graph({"A": ["古い観測"], "B": ["消える"]})
+        new = _graph({"A": ["新しい観測"], "C": ["追加された"]})
+        index.build(old.entities, version=1)
+
+        index.apply(diff_graphs(old, new, 1, 2))
+
+        assert index.version == 2
+        assert index.search("古い") == (0, [])
+        assert index.search("消える") == (0, [])
+        assert index.search("新しい")[1][0]["name"] == "A"
+        assert index.search("追加")[1][0]["name"] == "C"
+
+    @pytest.mark.unit
+    def test_matches_restore_original_text(self, index):
+        """一致箇所のテキストが呼び出し側のobservationsから復元されることを確認"""
+        observations = {"kakuho": ["イベント予約管理システム", "ＦａｓｔＡＰＩ + React"]}
+
+        _, hits = index.search("fastapi", observations_of=observations.get)
+        match = hits[0]["matches"][0]
+
+        assert match["text"] == "ＦａｓｔＡＰＩ + React"
+        assert match["text"][slice(*match["highlights"][0])] == "ＦａｓｔＡＰＩ"
+        # 元テキストを渡さなければ正規化済みテキストを返す
+        assert index.search("fastapi")[1][0]["matches"][0]["text"] == "fastapi + react"
+
+    @pytest.mark.unit
+    def test_apply_removes_only_one_of_equal_normalized_observations(self):
+        """正規化後に同じobservationは削除された件数だけ取り除かれることを確認"""
+        old = _graph({"A": ["ＡＢＣ", "abc"]})
+        new = _graph({"A": ["abc"]})
+        index = SearchIndex()
+        index.build(old.entities, version=1)
+
+        index.apply(diff_graphs(old, new, 1, 2))
+
+        assert index.document_count == 2
+        assert index.search("abc")[0] == 1
+
+    @pytest.mark.unit
+    def test_highlight_spans_merge(self):
+        """重なる一致位置が結合されることを確認"""
+        assert highlight_spans("記憶システム記憶", ["記憶", "憶シ"]) == [[0, 3], [6, 8]]
+
+
+class TestClientSearch:
+    """MemoryMCPClient.search()のテストクラス"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_search_updates_incrementally(self, tmp_path, mocker):
+        """再読み込み後は差分だけがインデックスに反映されることを確認"""
+        path = tmp_path / "graph.json"
+        path.write_text(_graph({"A": ["りんご"]}).model_dump_json(), encoding="utf-8")
+        client = MemoryMCPClient(data_file=path)
+
+        result = await client.search("りんご")
+        assert [h.name for h in result.hits] == ["A"]
+        assert result.hits[0].entityType == "test"
+
+        path.write_text(_graph({"A": ["りんご"], "B": ["みかん"]}).model_dump_json(), encoding="utf-8")
+        build = mocker.spy(client._search_index, "build")
+        await client.refresh()
+        result = await client.search("みかん")
+
+        assert [h.name for h in result.hits] == ["B"]
+        assert result.version == client.version
+        assert build.call_count == 0
@@ -0,0 +1,137 @@
+"""ワーカー間で共有するスナップショットのテスト"""
+
+import asyncio
+import json
+import pytest
+from services.memory_client import MemoryMCPClient
+from services.shared_snapshot import SharedSnapshot
+from services.snapshot_file import MappedCompactGraph
+from services.snapshot_sync import SnapshotSync
+
+
+def write_graph(path, names):
+    """エンティティ名の一覧からデータファイルを書き出す"""
+    path.write_text(json.dumps({
+        "entities": [{"name": n, "entityType": "tool", "observations": [f"{n}です"]} for n in names],
+        "relations": [{"from": a, "to": b, "relationType": "uses"} for a, b in zip(names, names[1:])],
+    }), encoding="utf-8")
+
+
+def make_client(data_file, directory):
+    """共有スナップショットを使うクライアント（ワーカー1つ分）"""
+    return MemoryMCPClient(
+        data_file=data_file,
+        shared=SharedSnapshot(directory, wait_timeout=2.0, poll_interval=0.01),
+    )
+
+
+class TestSharedSnapshot:
+    """共有スナップショットのテストクラス"""
+
+    @pytest.mark.unit
+    def test_single_leader(self, tmp_path):
+        """リーダーのロックは1つだけが取得でき、解放後は他が取得できることを確認"""
+        first = SharedSnapshot(tmp_path)
+        second = SharedSnapshot(tmp_path)
+
+        assert first.try_acquire()
+        assert first.try_acquire()
+        assert not second.try_acquire()
+        assert not second.is_leader
+
+        first.release()
+        assert second.try_acquire()
+        second.release()
+
+    @pytest.mark.unit
+    async def test_follower_maps_leader_snapshot(self, tmp_path):
+        """フォロワーがリーダーの公開したスナップショットを同じ版・epochで使うことを確認"""
+        data_file = tmp_path / "graph.json"
+        write_graph(data_file, ["A", "B", "C"])
+        leader = make_client(data_file, tmp_path / "shared")
+        follower = make_client(data_file, tmp_path / "shared")
+        assert leader.shared.try_acquire()
+
+        # フォロワーは公開を待ってからマップする
+        follower_store, leader_store = await asyncio.gather(follower.get_store(), leader.get_store())
+
+        assert isinstance(leader_store.compact, MappedCompactGraph)
+        assert isinstance(follower_store.compact, MappedCompactGraph)
+        assert follower_store.compact.path == leader_store.compact.path
+        assert (follower.version, follower.epoch) == (leader.version, leader.epoch)
+        assert await follower.get_entity("B") == await leader.get_entity("B")
+        leader.shared.release()
+
+    @pytest.mark.unit
+    async def test_follower_swaps_to_new_snapshot(self, tmp_path):
+        """リーダーの再読み込み後、同期タスクが新しい版に差し替えることを確認"""
+        data_file = tmp_path / "graph.json"
+        write_graph(data_file, ["A", "B"])
+        leader = make_client(data_file, tmp_path / "shared")
+        follower = make_client(data_file, tmp_path / "shared")
+        assert leader.shared.try_acquire()
+        await leader.get_store()
+        await follower.get_store()
+
+        sync = SnapshotSync(follower, follower.shared, poll_interval=0.01)
+        sync.start()
+        try:
+            write_graph(data_file, ["A", "B", "C"])
+            await leader.reload()
+            for _ in range(200):
+                if follower.version == leader.version:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await sync.stop()
+            leader.shared.release()
+
+        assert follower.version == 2
+        assert await follower.get_entity("C") is not None
+        changes = follower.get_changes(1, follower.epoch)
+        assert [e.name for d in changes.changes for e in d.addedEntities] == ["C"]
+        # 古いスナップショットは削除される
+        assert len(list((tmp_path / "shared").glob("snapshot-*.bin"))) == 1
+
+    @pytest.mark.unit
+    async def test_follower_takes_over(self, tmp_path):
+        """リーダーが不在になるとフォロワーが引き継いで公開することを確認"""
+        data_file = tmp_path / "graph.json"
+        write_graph(data_file, ["A", "B"])
+        leader = make_client(data_file, tmp_path / "shared")
+        follower = make_client(data_file, tmp_path / "shared")
+        assert leader.shared.try_acquire()
+        await leader.get_store()
+        await follower.get_store()
+
+        promoted = []
+        sync = SnapshotSync(
+            follower, follower.shared, poll_interval=0.01, on_leader=lambda: promoted.append(True)
+        )
+        sync.start()
+        leader.shared.release()
+        for _ in range(200):
+            if follower.shared.is_leader and follower.version == 2:
+                break
+            await asyncio.sleep(0.01)
+        await sync.stop()
+
+        assert promoted == [True]
+        assert follower.version == 2
+        assert follower.epoch == leader.epoch
+        follower.shared.release()
+
+    @pytest.mark.unit
+    async def test_follower_falls_back_without_leader(self, tmp_path):
+        """リーダーが公開しない場合、フォロワーは自分で読み込むことを確認"""
+        data_file = tmp_path / "graph.json"
+        write_graph(data_file, ["A", "B"])
+        client = MemoryMCPClient(
+            data_file=data_file,
+            shared=SharedSnapshot(tmp_path / "shared", wait_timeout=0.05, poll_interval=0.01),
+        )
+
+        store = await client.get_store()
+
+        assert store.entity_count == 2
+        assert not list((tmp_path / "shared").glob("snapshot-*.bin"))
@@ -0,0 +1,98 @@
+"""コンパイル済みスナップショットのキャッシュのテスト"""
+
+import json
+import os
+import pytest
+from services.memory_client import MemoryMCPClient
+from services.snapshot_cache import SnapshotCache
+from services.snapshot_file import MappedCompactGraph
+
+
+def write_json(path, names):
+    """エンティティ名の一覧からJSONデータファイルを書き出す"""
+    path.write_text(json.dumps({
+        "entities": [{"name": n, "entityType": "tool", "observations": [f"{n}です"]} for n in names],
+        "relations": [{"from": a, "to": b, "relationType": "uses"} for a, b in zip(names, names[1:])],
+    }), encoding="utf-8")
+
+
+def write_jsonl(path, names, mode="w"):
+    """エンティティ名の一覧からJSONLデータファイルを書き出す（mode="a"で追記）"""
+    with open(path, mode, encoding="utf-8") as f:
+        for n in names:
+            f.write(json.dumps({"type": "entity", "name": n, "entityType": "tool", "observations": []}) + "\n")
+
+
+def cold_start(data_file, cache_dir):
+    """再起動を模して、新しいクライアントで読み込む"""
+    client = MemoryMCPClient(data_file=data_file, snapshot_cache=SnapshotCache(cache_dir))
+    return client, client._load_from_file()
+
+
+class TestSnapshotCache:
+    """スナップショットキャッシュのテストクラス"""
+
+    @pytest.mark.unit
+    def test_second_start_maps_compiled_snapshot(self, tmp_path):
+        """2回目の起動ではデータファイルを解析せずキャッシュをマップすることを確認"""
+        data_file = tmp_path / "graph.json"
+        write_json(data_file, ["A", "B", "C"])
+
+        _, first = cold_start(data_file, tmp_path / "cache")
+        _, second = cold_start(data_file, tmp_path / "cache")
+
+        assert not isinstance(first.compact, MappedCompactGraph)
+        assert isinstance(second.compact, MappedCompactGraph)
+        assert second.compact.render_json() == first.compact.render_json()
+        assert second.get_entity("B") == first.get_entity("B")
+
+    @pytest.mark.unit
+    def test_changed_source_is_recompiled(self, tmp_path):
+        """データファイルが変わったらキャッシュを使わないことを確認"""
+        data_file = tmp_path / "graph.json"
+        write_json(data_file, ["A", "B"])
+        cold_start(data_file, tmp_path / "cache")
+
+        # サイズ・mtimeが同じでも内容が違えば作り直す
+        stat = data_file.stat()
+        write_json(data_file, ["A", "C"])
+        os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        _, store = cold_start(data_file, tmp_path / "cache")
+
+        assert not isinstance(store.compact, MappedCompactGraph)
+        assert store.has_entity("C")
+        assert not store.has_entity("B")
+
+        _, store = cold_start(data_file, tmp_path / "cache")
+        assert isinstance(store.compact, MappedCompactGraph)
+        assert store.has_entity("C")
+
+    @pytest.mark.unit
+    async def test_jsonl_tail_after_compiled_start(self, tmp_path):
+        """キャッシュから起動しても、JSONLの追記分だけを読み込めることを確認"""
+        data_file = tmp_path / "memory.jsonl"
+        write_jsonl(data_file, ["A", "B"])
+        cold_start(data_file, tmp_path / "cache")
+        client, store = cold_start(data_file, tmp_path / "cache")
+        assert isinstance(store.compact, MappedCompactGraph)
+
+        write_jsonl(data_file, ["C"], mode="a")
+        await client.reload()
+
+        assert client.last_load_stats.entity_count == 2  # 全件読み直していない
+        assert (await client.get_store()).entity_names() == ["A", "B", "C"]
+
+    @pytest.mark.unit
+    def test_broken_cache_is_ignored(self, tmp_path):
+        """壊れたキャッシュは無視して解析し直すことを確認"""
+        data_file = tmp_path / "graph.json"
+        write_json(data_file, ["A", "B"])
+        cache = SnapshotCache(tmp_path / "cache")
+        cold_start(data_file, tmp_path / "cache")
+        path = cache.path_for(data_file)
+        path.write_bytes(path.read_bytes()[:200])
+
+        _, store = cold_start(data_file, tmp_path / "cache")
+
+        assert store.entity_count == 2
+        assert not isinstance(store.compact, MappedCompactGraph)
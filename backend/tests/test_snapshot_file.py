@@ -0,0 +1,83 @@
+"""スナップショットファイルのテスト"""
+
+import pytest
+from services.compact_graph import CompactGraph
+from services.graph_store import GraphStore
+from services.graph_loader import merge_records
+from services.snapshot_file import SnapshotFormatError, open_snapshot, read_header, write_snapshot
+from models.memory import MemoryGraph, Entity, Relation
+
+
+@pytest.fixture
+def compact():
+    """存在しない端点・特殊文字を含むグラフ"""
+    return CompactGraph.from_graph(MemoryGraph(
+        entities=[
+            Entity(name="湧心くん", entityType="user", observations=["Pythonが好き", '引用符 " と\n改行']),
+            Entity(name="B", entityType="tool", observations=["Pythonが好き"]),
+            Entity(name="C", entityType="user"),
+        ],
+        relations=[
+            Relation(from_="湧心くん", to="B", relationType="uses"),
+            Relation(from_="B", to="存在しない", relationType="uses"),
+            Relation(from_="C", to="湧心くん", relationType="knows"),
+        ],
+    ))
+
+
+class TestSnapshotFile:
+    """スナップショットファイルのテストクラス"""
+
+    @pytest.mark.unit
+    def test_round_trip(self, tmp_path, compact):
+        """書き出したファイルをマップしても内容が変わらないことを確認"""
+        path = write_snapshot(compact, tmp_path / "graph.bin", meta={"version": 3})
+        mapped = open_snapshot(path)
+
+        assert mapped.meta == {"version": 3}
+        assert mapped.render_json() == compact.render_json()
+        assert mapped.to_graph().model_dump() == compact.to_graph().model_dump()
+        assert list(mapped.names) == list(compact.names)
+        assert mapped.names[-1] == "存在しない"
+        assert not list(tmp_path.glob(".*.tmp"))
+
+    @pytest.mark.unit
+    def test_name_lookup(self, tmp_path, compact):
+        """ノード名の索引（ハッシュ表）でIDを引けることを確認"""
+        mapped = open_snapshot(write_snapshot(compact, tmp_path / "graph.bin"))
+
+        for name in compact.names:
+            assert mapped.node_id(name) == compact.node_id(name)
+        assert mapped.entity_id("存在しない") is None
+        assert mapped.node_id("D") is None
+
+    @pytest.mark.unit
+    def test_store_on_mapped_graph(self, tmp_path, compact):
+        """マップしたグラフでもストアの参照・差分読み込みが使えることを確認"""
+        adjacency = compact.adjacency()
+        mapped = open_snapshot(write_snapshot(compact, tmp_path / "graph.bin", adjacency=adjacency))
+        store = GraphStore(mapped, version=1)
+        expected = GraphStore(compact, version=1)
+
+        assert store.get_entity("湧心くん") == expected.get_entity("湧心くん")
+        assert store.neighbors("B") == expected.neighbors("B")
+        for actual, original in zip(mapped.adjacency(), adjacency):
+            assert actual.tolist() == original.tolist()
+
+        merged = merge_records(mapped, [Entity(name="D", entityType="tool")], [])
+        assert merged.entity_id("D") is not None
+        assert merged.entity_count == 4
+
+    @pytest.mark.unit
+    def test_invalid_files(self, tmp_path, compact):
+        """形式が不正・途中で切れたファイルはエラーになることを確認"""
+        other = tmp_path / "other.bin"
+        other.write_bytes(b"not a snapshot")
+        with pytest.raises(SnapshotFormatError):
+            open_snapshot(other)
+
+        path = write_snapshot(compact, tmp_path / "graph.bin")
+        header_end = max(s["offset"] for s in read_header(path)["sections"].values())
+        path.write_bytes(path.read_bytes()[:header_end])
+        with pytest.raises(SnapshotFormatError):
+            open_snapshot(path)
@@ -12,7 +12,7 @@ import type { Entity } from './types/memory';
 import './App.css';
 
 function App() {
-  const { graph, loading, error, refresh } = useMemoryGraph();
+  const { graph, layout, loading, error, refresh } = useMemoryGraph();
   const [selectedNodeId, setSelectedNodeId] = useState<string | null>(null);
 
   /**
@@ -73,6 +73,7 @@ function App() {
         <Box sx={{ display: 'flex', gap: 2 }}>
           <GraphView
             graph={graph}
+            layout={layout}
             selectedNodeId={selectedNodeId}
             onNodeClick={handleNodeClick}
           />
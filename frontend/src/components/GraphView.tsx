@@ -4,16 +4,17 @@
 
 import { useEffect, useRef } from 'react';
 import cytoscape from 'cytoscape';
-import type { MemoryGraph } from '../types/memory';
+import type { GraphLayout, MemoryGraph } from '../types/memory';
 import { transformToCytoscape, cytoscapeStylesheet } from '../utils/graphTransform';
 
 interface GraphViewProps {
   graph: MemoryGraph | null;
+  layout?: GraphLayout | null;
   selectedNodeId?: string | null;
   onNodeClick?: (nodeId: string) => void;
 }
 
-export const GraphView = ({ graph, selectedNodeId, onNodeClick }: GraphViewProps) => {
+export const GraphView = ({ graph, layout: serverLayout, selectedNodeId, onNodeClick }: GraphViewProps) => {
   const containerRef = useRef<HTMLDivElement>(null);
   const cyRef = useRef<cytoscape.Core | null>(null);
 
@@ -72,24 +73,34 @@ export const GraphView = ({ graph, selectedNodeId, onNodeClick }: GraphViewProps
     // 新しい要素を追加
     cy.add(elements);
 
-    // coseレイアウト（force-directed）
-    const layout = cy.layout({
-      name: 'cose',
-      animate: false,
-      fit: false,  // 自動フィットを無効化
-      padding: 30,
-      nodeRepulsion: 400000,
-      idealEdgeLength: 100,
-      edgeElasticity: 100,
-      randomize: false,
-    });
+    // サーバー計算済みの座標があればpresetレイアウト、なければcose（force-directed）
+    const positions = serverLayout?.positions;
+    const layout = positions
+      ? cy.layout({
+          name: 'preset',
+          fit: false,
+          positions: (node: cytoscape.NodeSingular) => {
+            const pos = positions[node.id()];
+            return pos ? { x: pos[0], y: pos[1] } : { x: 0, y: 0 };
+          },
+        } as cytoscape.LayoutOptions)
+      : cy.layout({
+          name: 'cose',
+          animate: false,
+          fit: false,  // 自動フィットを無効化
+          padding: 30,
+          nodeRepulsion: 400000,
+          idealEdgeLength: 100,
+          edgeElasticity: 100,
+          randomize: false,
+        });
 
     layout.run();
 
     // レイアウト完了後、明示的に中央配置
     cy.fit(cy.elements(), 30);
     cy.center();
-  }, [graph]);
+  }, [graph, serverLayout]);
 
   // 選択ノードハイライト処理
   useEffect(() => {
@@ -3,11 +3,12 @@
  */
 
 import { useState, useEffect, useCallback } from 'react';
-import { getGraph, refreshGraph } from '../services/api';
-import type { MemoryGraph } from '../types/memory';
+import { getGraph, getGraphLayout, refreshGraph } from '../services/api';
+import type { GraphLayout, MemoryGraph } from '../types/memory';
 
 interface UseMemoryGraphReturn {
   graph: MemoryGraph | null;
+  layout: GraphLayout | null;
   loading: boolean;
   error: Error | null;
   refresh: () => Promise<void>;
@@ -21,9 +22,47 @@ interface UseMemoryGraphReturn {
  */
 export const useMemoryGraph = (autoFetch: boolean = true): UseMemoryGraphReturn => {
   const [graph, setGraph] = useState<MemoryGraph | null>(null);
+  const [layout, setLayout] = useState<GraphLayout | null>(null);
   const [loading, setLoading] = useState<boolean>(false);
   const [error, setError] = useState<Error | null>(null);
 
+  /**
+   * サーバー計算済みレイアウト取得（失敗時はnull = ブラウザ側のレイアウトにフォールバック）
+   */
+  const fetchLayout = useCallback(async (): Promise<GraphLayout | null> => {
+    try {
+      return await getGraphLayout();
+    } catch (err) {
+      console.warn('Server layout unavailable, falling back to client layout:', err);
+      return null;
+    }
+  }, []);
+
+  /**
+   * グラフと同じ版のレイアウトを選ぶ
+   *
+   * 版が異なるレイアウトには新しいノードの座標がないため使わない。レイアウトの方が
+   * 古ければ一度だけ取り直し、それでも一致しなければブラウザ側のレイアウトにフォールバックする。
+   */
+  const matchLayout = useCallback(
+    async (version: number | null, layout: GraphLayout | null): Promise<GraphLayout | null> => {
+      if (layout === null || version === null || layout.version === version) {
+        return layout;
+      }
+      if (layout.version < version) {
+        const retried = await fetchLayout();
+        if (retried !== null && retried.version === version) {
+          return retried;
+        }
+      }
+      console.warn(
+        `Server layout version ${layout.version} does not match graph version ${version}, falling back to client layout`,
+      );
+      return null;
+    },
+    [fetchLayout],
+  );
+
   /**
    * グラフデータ取得
    */
@@ -32,7 +71,9 @@ export const useMemoryGraph = (autoFetch: boolean = true): UseMemoryGraphReturn
     setError(null);
 
     try {
-      const data = await getGraph();
+      // グラフとレイアウトは並行して取得し、版を突き合わせる
+      const [{ graph: data, version }, serverLayout] = await Promise.all([getGraph(), fetchLayout()]);
+      setLayout(await matchLayout(version, serverLayout));
       setGraph(data);
       console.log('Memory Graph loaded:', data);
     } catch (err) {
@@ -42,7 +83,7 @@ export const useMemoryGraph = (autoFetch: boolean = true): UseMemoryGraphReturn
     } finally {
       setLoading(false);
     }
-  }, []);
+  }, [fetchLayout, matchLayout]);
 
   /**
    * グラフデータ強制リフレッシュ
@@ -52,7 +93,8 @@ export const useMemoryGraph = (autoFetch: boolean = true): UseMemoryGraphReturn
     setError(null);
 
     try {
-      const data = await refreshGraph();
+      const { graph: data, version } = await refreshGraph();
+      setLayout(await matchLayout(version, await fetchLayout()));
       setGraph(data);
       console.log('Memory Graph refreshed:', data);
     } catch (err) {
@@ -62,7 +104,7 @@ export const useMemoryGraph = (autoFetch: boolean = true): UseMemoryGraphReturn
     } finally {
       setLoading(false);
     }
-  }, []);
+  }, [fetchLayout, matchLayout]);
 
   /**
    * 初回自動取得
@@ -75,6 +117,7 @@ export const useMemoryGraph = (autoFetch: boolean = true): UseMemoryGraphReturn
 
   return {
     graph,
+    layout,
     loading,
     error,
     refresh,
@@ -3,7 +3,20 @@
  */
 
 import axios from 'axios';
-import type { GraphResponse, EntityResponse, HealthResponse } from '../types/memory';
+import type {
+  GraphResponse,
+  EntityResponse,
+  EntityPageResponse,
+  RelationPageResponse,
+  Subgraph,
+  GraphChangesResponse,
+  SearchResponse,
+  GraphLayout,
+  ClusterGraph,
+  ClusterExpansion,
+  HealthResponse,
+  VersionedGraph,
+} from '../types/memory';
 
 // APIベースURL（環境変数から取得、デフォルトはlocalhost）
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
@@ -18,18 +31,68 @@ const apiClient = axios.create({
 });
 
 /**
- * Memory MCPグラフデータ取得
+ * レスポンスヘッダー X-Graph-Version の版番号（ヘッダーがなければnull）
  */
-export const getGraph = async (): Promise<GraphResponse> => {
+const graphVersion = (header: unknown): number | null => {
+  const version = Number(header);
+  return Number.isInteger(version) ? version : null;
+};
+
+/**
+ * Memory MCPグラフデータ取得（グラフスナップショットの版番号付き）
+ */
+export const getGraph = async (): Promise<VersionedGraph> => {
   const response = await apiClient.get<GraphResponse>('/api/graph');
-  return response.data;
+  return { graph: response.data, version: graphVersion(response.headers['x-graph-version']) };
 };
 
 /**
- * Memory MCPグラフデータ強制リフレッシュ
+ * Memory MCPグラフデータ強制リフレッシュ（グラフスナップショットの版番号付き）
  */
-export const refreshGraph = async (): Promise<GraphResponse> => {
+export const refreshGraph = async (): Promise<VersionedGraph> => {
   const response = await apiClient.get<GraphResponse>('/api/graph/refresh');
+  return { graph: response.data, version: graphVersion(response.headers['x-graph-version']) };
+};
+
+/**
+ * 指定した版以降のグラフ差分取得
+ * version/epochは /api/graph のレスポンスヘッダー X-Graph-Version / X-Graph-Epoch
+ */
+export const getGraphChanges = async (
+  since: number,
+  epoch?: string,
+): Promise<GraphChangesResponse> => {
+  const response = await apiClient.get<GraphChangesResponse>('/api/graph/changes', {
+    params: { since, epoch },
+  });
+  return response.data;
+};
+
+/**
+ * エンティティをページ単位で取得
+ * fields例: 'name,entityType'（observationsを省略して軽量に取得）
+ */
+export const getEntityPage = async (
+  cursor?: string | null,
+  limit?: number,
+  fields?: string,
+): Promise<EntityPageResponse> => {
+  const response = await apiClient.get<EntityPageResponse>('/api/graph/entities', {
+    params: { cursor: cursor ?? undefined, limit, fields },
+  });
+  return response.data;
+};
+
+/**
+ * リレーションをページ単位で取得
+ */
+export const getRelationPage = async (
+  cursor?: string | null,
+  limit?: number,
+): Promise<RelationPageResponse> => {
+  const response = await apiClient.get<RelationPageResponse>('/api/graph/relations', {
+    params: { cursor: cursor ?? undefined, limit },
+  });
   return response.data;
 };
 
@@ -41,6 +104,62 @@ export const getEntity = async (name: string): Promise<EntityResponse> => {
   return response.data;
 };
 
+/**
+ * エンティティの近傍部分グラフ取得
+ */
+export const getNeighborhood = async (
+  name: string,
+  depth: number = 1,
+  limit?: number,
+  relationTypes?: string[],
+): Promise<Subgraph> => {
+  const params = new URLSearchParams({ depth: String(depth) });
+  if (limit !== undefined) params.append('limit', String(limit));
+  relationTypes?.forEach((t) => params.append('relationType', t));
+  const response = await apiClient.get<Subgraph>(
+    `/api/entities/${encodeURIComponent(name)}/neighborhood`,
+    { params },
+  );
+  return response.data;
+};
+
+/**
+ * エンティティ名・observationsの全文検索
+ */
+export const searchEntities = async (q: string, limit?: number): Promise<SearchResponse> => {
+  const response = await apiClient.get<SearchResponse>('/api/search', { params: { q, limit } });
+  return response.data;
+};
+
+/**
+ * サーバー側で計算済みのレイアウトを取得（presetレイアウト用）
+ */
+export const getGraphLayout = async (
+  algorithm: GraphLayout['algorithm'] = 'force',
+): Promise<GraphLayout> => {
+  const response = await apiClient.get<GraphLayout>('/api/graph/layout', { params: { algorithm } });
+  return response.data;
+};
+
+/**
+ * クラスタ単位に縮約したグラフを取得（大規模グラフの概観用）
+ */
+export const getClusters = async (limit?: number): Promise<ClusterGraph> => {
+  const response = await apiClient.get<ClusterGraph>('/api/graph/clusters', { params: { limit } });
+  return response.data;
+};
+
+/**
+ * クラスタを展開して所属エンティティを取得
+ */
+export const expandCluster = async (clusterId: string, limit?: number): Promise<ClusterExpansion> => {
+  const response = await apiClient.get<ClusterExpansion>(
+    `/api/graph/clusters/${encodeURIComponent(clusterId)}`,
+    { params: { limit } },
+  );
+  return response.data;
+};
+
 /**
  * ヘルスチェック
  */
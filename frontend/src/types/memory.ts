@@ -29,6 +29,65 @@ export interface MemoryGraph {
   relations: Relation[];
 }
 
+/**
+ * 部分グラフ（近傍探索の結果）
+ */
+export interface Subgraph extends MemoryGraph {
+  center: string;
+  depth: number;
+  truncated: boolean;
+}
+
+/**
+ * スナップショット間の構造差分
+ */
+export interface ObservationChange {
+  entityName: string;
+  observations: string[];
+}
+
+export interface GraphDelta {
+  fromVersion: number;
+  toVersion: number;
+  addedEntities: Entity[];
+  removedEntities: string[];
+  addedObservations: ObservationChange[];
+  removedObservations: ObservationChange[];
+  addedRelations: Relation[];
+  removedRelations: Relation[];
+}
+
+export interface GraphChangesResponse {
+  version: number;
+  epoch: string;
+  fullReloadRequired: boolean;
+  changes: GraphDelta[];
+}
+
+/**
+ * 全文検索結果
+ * highlightsは一致位置 [開始, 終了) の文字オフセット
+ */
+export interface SearchMatch {
+  field: 'name' | 'observation';
+  text: string;
+  highlights: Array<[number, number]>;
+}
+
+export interface SearchHit {
+  name: string;
+  entityType: string;
+  score: number;
+  matches: SearchMatch[];
+}
+
+export interface SearchResponse {
+  query: string;
+  total: number;
+  hits: SearchHit[];
+  version: number;
+}
+
 /**
  * APIレスポンス型
  */
@@ -37,9 +96,84 @@ export interface GraphResponse {
   relations: Relation[];
 }
 
+/**
+ * グラフデータとその版番号（レスポンスヘッダー X-Graph-Version、取得できなければnull）
+ */
+export interface VersionedGraph {
+  graph: GraphResponse;
+  version: number | null;
+}
+
 export interface EntityResponse extends Entity {}
 
+/**
+ * ページングAPIレスポンス型
+ * entitiesはfieldsで指定したフィールドのみを持つ（nameは常に含まれる）
+ */
+export interface EntityPageResponse {
+  entities: Array<Pick<Entity, 'name'> & Partial<Entity>>;
+  nextCursor: string | null;
+  total: number;
+  version: number;
+}
+
+export interface RelationPageResponse {
+  relations: Relation[];
+  nextCursor: string | null;
+  total: number;
+  version: number;
+}
+
 export interface HealthResponse {
   status: string;
   timestamp: string;
 }
+
+/**
+ * サーバー側で計算したグラフ全体のレイアウト
+ */
+export interface GraphLayout {
+  algorithm: 'force' | 'circle';
+  version: number;
+  positions: Record<string, [number, number]>;
+}
+
+/**
+ * クラスタ（スーパーノード）
+ */
+export interface ClusterNode {
+  id: string;
+  size: number;
+  label: string;
+  entityTypes: Record<string, number>;
+}
+
+/**
+ * クラスタ間の集約エッジ
+ */
+export interface ClusterEdge {
+  source: string;
+  target: string;
+  weight: number;
+}
+
+/**
+ * クラスタ単位に縮約したグラフ
+ */
+export interface ClusterGraph {
+  version: number;
+  clusterCount: number;
+  clusters: ClusterNode[];
+  edges: ClusterEdge[];
+  truncated: boolean;
+}
+
+/**
+ * クラスタの展開結果
+ */
+export interface ClusterExpansion extends MemoryGraph {
+  cluster: ClusterNode;
+  version: number;
+  externalEdges: { entity: string; cluster: string; weight: number }[];
+  truncated: boolean;
+}